@@ -0,0 +1,597 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+대시보드 데이터 분석기 벤치마크
+
+로컬 PostgreSQL에 합성 데이터(users, search_history, ai_analysis_reports,
+user_activities)를 채운 뒤 DashboardDataAnalyzer의 각 메서드,
+cleanup_old_data, run_full_analysis를 반복 실행해
+p50/p95 지연 시간, 스캔한 행 수, 메모리 피크를 JSON 리포트로 남긴다.
+--baseline 리포트보다 p95가 임계값 이상 느려지면 종료 코드 1로 실패한다.
+
+사용 예:
+    python dashboard_benchmark.py --scale 100k --reset --output bench.json
+    python dashboard_benchmark.py --skip-seed --baseline bench.json --threshold 0.2
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+from contextlib import redirect_stdout
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import psycopg2
+
+from dashboard_data_analysis_test import DashboardDataAnalyzer
+
+
+SCALES = {'100k': 100_000, '1m': 1_000_000, '10m': 10_000_000}
+
+BENCHMARK_TABLES = ('users', 'search_history', 'ai_analysis_reports', 'user_activities')
+
+# 기술 분야별 (검색어, IPC 코드) - 분야마다 개수를 같게 두어 SQL 2차원 배열로 전달
+FIELD_CATALOG = {
+    'AI/머신러닝': (['인공지능 학습 모델', '딥러닝 이미지 인식', '자연어 처리 챗봇', '강화학습 추천 시스템'],
+                  ['G06N3/08', 'G06N3/04', 'G06N20/00', 'G06F40/30']),
+    '반도체/전자': (['반도체 메모리 소자', '웨이퍼 식각 공정', '전력 반도체 모듈', '이미지 센서 패키지'],
+                  ['H01L21/02', 'H01L29/78', 'H01L27/146', 'G11C16/04']),
+    '교통/자동차': (['자율주행 차량 제어', '전기차 충전 장치', '차량용 라이다 센서', '운전자 보조 시스템'],
+                  ['B60W30/09', 'B60L53/10', 'G01S17/93', 'B60W50/14']),
+    '에너지/배터리': (['리튬 이차전지 양극재', '배터리 열관리 시스템', '전고체 전해질', '태양광 발전 모듈'],
+                    ['H01M10/052', 'H01M4/525', 'H01M10/0562', 'H02S40/38']),
+    '바이오/의료': (['항체 치료제 조성물', '유전자 편집 기술', '의료 영상 진단', '웨어러블 혈당 측정'],
+                  ['A61K39/395', 'C12N15/11', 'A61B6/03', 'A61B5/145']),
+    '블록체인/핀테크': (['블록체인 결제 플랫폼', '디지털 자산 지갑', '스마트 계약 검증', '간편 송금 서비스'],
+                     ['G06Q20/40', 'G06Q20/36', 'H04L9/32', 'G06Q40/04']),
+    '통신/네트워크': (['5G 기지국 빔포밍', '무선 통신 스케줄링', '사물인터넷 게이트웨이', '네트워크 슬라이싱'],
+                   ['H04B7/06', 'H04W72/12', 'H04L67/12', 'H04W48/18']),
+    'General': (['특허 검색', '선행기술 조사', '출원 동향 분석', '기술 가치 평가'],
+                ['G06Q50/18', 'G06F16/33', 'G06Q10/06', 'G06Q30/02']),
+}
+
+ANALYSIS_TYPES = ['market', 'business', 'technology']
+ACTIVITY_TYPES = ['login', 'search', 'view_patent', 'ai_analysis', 'logout']
+
+DEFAULT_MIGRATIONS = Path(__file__).resolve().parents[2] / 'supabase' / 'migrations'
+
+# 분석기가 의존하는 인덱스/롤업 테이블 마이그레이션 (적용 순서대로)
+ANALYZER_MIGRATIONS = (
+    '20261016_dashboard_keyset_indexes.sql',
+    '20261016_dashboard_field_daily_rollup.sql',
+    '20261016_dashboard_user_hash_indexes.sql',
+)
+
+
+class SyntheticDataSeeder:
+    """벤치마크용 합성 데이터 생성기 (모든 행은 서버에서 generate_series로 생성)"""
+
+    def __init__(self, conn, users: int = 1000, days: int = 130, skew: float = 2.0,
+                 null_field_ratio: float = 0.1, chunk_size: int = 500_000):
+        """
+        Args:
+            conn: psycopg2 연결
+            users: 생성할 사용자 수
+            days: 데이터를 흩뿌릴 기간 (보존 기간 100일보다 길어야 정리 대상이 생김)
+            skew: 사용자/분야 편중도 (1이면 균등, 클수록 일부 사용자에 집중)
+            null_field_ratio: technology_field가 NULL인 행 비율
+            chunk_size: 한 번에 INSERT/커밋할 행 수
+        """
+        self.conn = conn
+        self.users = users
+        self.days = days
+        self.skew = skew
+        self.null_field_ratio = null_field_ratio
+        self.chunk_size = chunk_size
+
+    def create_schema(self, migrations_dir: Optional[Path] = DEFAULT_MIGRATIONS):
+        """분석기가 사용하는 테이블 생성 후 대시보드 마이그레이션(인덱스/롤업 테이블) 적용"""
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS users (
+                id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+                email text UNIQUE,
+                name text,
+                created_at timestamptz DEFAULT now()
+            );
+            CREATE TABLE IF NOT EXISTS search_history (
+                id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+                user_id uuid REFERENCES users(id) ON DELETE CASCADE,
+                keyword varchar(500) NOT NULL,
+                applicant text,
+                technology_field text,
+                field_confidence numeric(3,2),
+                ipc_codes text[],
+                created_at timestamptz DEFAULT now()
+            );
+            CREATE TABLE IF NOT EXISTS ai_analysis_reports (
+                id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+                user_id uuid REFERENCES users(id) ON DELETE CASCADE,
+                application_number varchar NOT NULL,
+                invention_title text NOT NULL,
+                analysis_type text,
+                technology_field text,
+                ipc_codes text[],
+                created_at timestamptz DEFAULT now()
+            );
+            CREATE TABLE IF NOT EXISTS user_activities (
+                id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+                user_id uuid REFERENCES users(id) ON DELETE CASCADE,
+                activity_type text,
+                created_at timestamptz DEFAULT now()
+            );
+            CREATE INDEX IF NOT EXISTS idx_search_history_user_created ON search_history(user_id, created_at DESC);
+            CREATE INDEX IF NOT EXISTS idx_ai_analysis_reports_user_created ON ai_analysis_reports(user_id, created_at DESC);
+        """)
+        if migrations_dir and migrations_dir.is_dir():
+            for name in ANALYZER_MIGRATIONS:
+                cursor.execute((migrations_dir / name).read_text(encoding='utf-8'))
+                print(f"📄 마이그레이션 적용: {name}")
+        self.conn.commit()
+        cursor.close()
+
+    def reset(self):
+        """합성 데이터 테이블 비우기"""
+        cursor = self.conn.cursor()
+        cursor.execute(f"TRUNCATE {', '.join(BENCHMARK_TABLES)} CASCADE")
+        cursor.execute("""
+            DO $$ BEGIN
+                IF to_regclass('dashboard_field_daily_rollup') IS NOT NULL THEN
+                    TRUNCATE dashboard_field_daily_rollup, dashboard_rollup_watermarks;
+                END IF;
+            END $$
+        """)
+        self.conn.commit()
+        cursor.close()
+        print("🧹 기존 벤치마크 데이터 삭제")
+
+    def seed(self, search_rows: int) -> Dict[str, int]:
+        """
+        합성 데이터 생성 (리포트는 검색의 1/4, 활동 로그는 1/2 규모)
+
+        Args:
+            search_rows: 생성할 search_history 행 수
+
+        Returns:
+            테이블별 생성 행 수
+        """
+        counts = {
+            'users': self.users,
+            'search_history': search_rows,
+            'ai_analysis_reports': max(search_rows // 4, 1),
+            'user_activities': max(search_rows // 2, 1),
+        }
+        user_ids = [str(uuid.uuid4()) for _ in range(self.users)]
+        fields = list(FIELD_CATALOG)
+        params = {
+            'user_ids': user_ids,
+            'n_users': self.users,
+            'fields': fields,
+            'n_fields': len(fields),
+            'keywords': [FIELD_CATALOG[field][0] for field in fields],
+            'ipc_codes': [FIELD_CATALOG[field][1] for field in fields],
+            'per_field': len(FIELD_CATALOG[fields[0]][0]),
+            'analysis_types': ANALYSIS_TYPES,
+            'activity_types': ACTIVITY_TYPES,
+            'skew': self.skew,
+            'null_ratio': self.null_field_ratio,
+            'days': self.days,
+        }
+
+        cursor = self.conn.cursor()
+        started = time.perf_counter()
+        cursor.execute("""
+            INSERT INTO users (id, email, name, created_at)
+            SELECT id, 'bench-' || id || '@example.com', '벤치마크 사용자 ' || ord,
+                   now() - random() * make_interval(days => %(days)s)
+            FROM unnest(%(user_ids)s::uuid[]) WITH ORDINALITY AS u(id, ord)
+        """, params)
+        self.conn.commit()
+
+        # 사용자와 기술 분야 모두 power(random(), skew)로 앞쪽 인덱스에 편중
+        row_source = """
+            FROM (
+                SELECT g,
+                       1 + floor(power(random(), %(skew)s) * %(n_users)s)::int AS u,
+                       1 + floor(power(random(), %(skew)s) * %(n_fields)s)::int AS f,
+                       1 + floor(random() * %(per_field)s)::int AS k,
+                       random() AS r
+                FROM generate_series(%(start)s, %(stop)s) AS g
+            ) s
+        """
+        statements = {
+            'search_history': f"""
+                INSERT INTO search_history (user_id, keyword, applicant, technology_field, field_confidence,
+                                            ipc_codes, created_at)
+                SELECT (%(user_ids)s::uuid[])[u],
+                       (%(keywords)s::text[])[f][k],
+                       CASE WHEN r < 0.3 THEN '주식회사 벤치' || (g %% 50) END,
+                       CASE WHEN r < %(null_ratio)s THEN NULL ELSE (%(fields)s::text[])[f] END,
+                       round((0.5 + r / 2)::numeric, 2),
+                       CASE WHEN r < 0.4
+                            THEN ARRAY[(%(ipc_codes)s::text[])[f][k], (%(ipc_codes)s::text[])[f][1 + k %% %(per_field)s]]
+                            ELSE ARRAY[(%(ipc_codes)s::text[])[f][k]] END,
+                       now() - random() * make_interval(days => %(days)s)
+                {row_source}
+            """,
+            'ai_analysis_reports': f"""
+                INSERT INTO ai_analysis_reports (user_id, application_number, invention_title, analysis_type,
+                                                 technology_field, ipc_codes, created_at)
+                SELECT (%(user_ids)s::uuid[])[u],
+                       '10' || (2015 + g %% 10) || lpad((g %% 10000000)::text, 7, '0'),
+                       (%(keywords)s::text[])[f][k] || ' 발명 ' || g,
+                       (%(analysis_types)s::text[])[1 + g %% 3],
+                       CASE WHEN r < %(null_ratio)s THEN NULL ELSE (%(fields)s::text[])[f] END,
+                       ARRAY[(%(ipc_codes)s::text[])[f][k]],
+                       now() - random() * make_interval(days => %(days)s)
+                {row_source}
+            """,
+            'user_activities': f"""
+                INSERT INTO user_activities (user_id, activity_type, created_at)
+                SELECT (%(user_ids)s::uuid[])[u],
+                       (%(activity_types)s::text[])[1 + g %% 5],
+                       now() - random() * make_interval(days => %(days)s)
+                {row_source}
+            """,
+        }
+        for table, statement in statements.items():
+            for start in range(1, counts[table] + 1, self.chunk_size):
+                stop = min(start + self.chunk_size - 1, counts[table])
+                cursor.execute(statement, {**params, 'start': start, 'stop': stop})
+                self.conn.commit()
+            print(f"🌱 {table}: {counts[table]:,}행 생성")
+
+        cursor.execute(f"ANALYZE {', '.join(BENCHMARK_TABLES)}")
+        self.conn.commit()
+        cursor.close()
+        print(f"⏱️ 데이터 생성 완료: {time.perf_counter() - started:.1f}초")
+        return counts
+
+
+class BenchmarkRunner:
+    """분석기 메서드별 지연 시간/스캔 행 수/메모리 피크 측정"""
+
+    def __init__(self, db_config: Dict[str, str], repeats: int = 5, warmup: int = 1):
+        """
+        Args:
+            db_config: 벤치마크 데이터베이스 연결 설정
+            repeats: 측정 반복 횟수
+            warmup: 측정 전 버리는 실행 횟수 (캐시 예열)
+        """
+        self.db_config = db_config
+        self.repeats = repeats
+        self.warmup = warmup
+        self.analyzer = DashboardDataAnalyzer(db_config)
+        self.monitor = None
+        self.server_version = 0
+
+    def _quiet(self, func: Callable, *args, **kwargs):
+        """분석기의 콘솔 출력을 버리고 실행"""
+        with redirect_stdout(io.StringIO()):
+            return func(*args, **kwargs)
+
+    def _client_pids(self) -> List[int]:
+        cursor = self.monitor.cursor()
+        cursor.execute("""
+            SELECT pid FROM pg_stat_activity
+            WHERE datname = current_database() AND backend_type = 'client backend'
+        """)
+        pids = [row[0] for row in cursor.fetchall()]
+        cursor.close()
+        return pids
+
+    def _flush_stats(self, known_pids: List[int], timeout: float = 5.0):
+        """
+        측정 대상 연결의 테이블 통계를 공유 통계에 반영
+
+        열린 연결은 pg_stat_force_next_flush() 후 커밋하면 유휴 진입 시 즉시 반영되고,
+        run_full_analysis처럼 스스로 연결을 닫는 경우는 백엔드 종료 시 반영되므로 종료를 기다린다.
+        """
+        conn = self.analyzer._conn
+        if conn is not None and not conn.closed:
+            conn.rollback()
+            if self.server_version >= 150000:
+                cursor = conn.cursor()
+                cursor.execute("SELECT pg_stat_force_next_flush()")
+                cursor.close()
+                conn.commit()
+        deadline = time.monotonic() + timeout
+        while set(self._client_pids()) - set(known_pids) and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+    def _scanned_rows(self) -> Dict[str, int]:
+        """테이블별 누적 스캔 행 수 (순차 스캔 + 인덱스 조회)"""
+        cursor = self.monitor.cursor()
+        cursor.execute("SELECT pg_stat_clear_snapshot()")
+        cursor.execute("""
+            SELECT relname, COALESCE(seq_tup_read, 0) + COALESCE(idx_tup_fetch, 0)
+            FROM pg_stat_user_tables
+            WHERE relname = ANY(%s)
+        """, (list(BENCHMARK_TABLES),))
+        rows = dict(cursor.fetchall())
+        cursor.close()
+        return rows
+
+    def _ensure_connected(self):
+        conn = self.analyzer._conn
+        if conn is None or conn.closed:
+            self._quiet(self.analyzer.connect_database)
+
+    def measure(self, name: str, func: Callable, repeats: int = None, warmup: int = None) -> Dict:
+        """
+        하나의 벤치마크 케이스 측정
+
+        지연 시간은 추적 없이 repeats회 측정하고, 스캔 행 수와 메모리 피크는
+        tracemalloc 오버헤드가 지연 시간에 섞이지 않도록 별도 1회 실행에서 측정한다.
+        메모리 피크는 Python 힙 기준이라 libpq 결과 버퍼는 포함되지 않는다.
+
+        Args:
+            name: 케이스 이름
+            func: 분석기를 인자로 받는 실행 함수
+            repeats: 반복 횟수 (None이면 기본값)
+            warmup: 예열 횟수 (None이면 기본값)
+
+        Returns:
+            p50_ms, p95_ms, mean_ms, min_ms, max_ms, rows_scanned, peak_memory_mb 등
+        """
+        repeats = self.repeats if repeats is None else repeats
+        warmup = self.warmup if warmup is None else warmup
+
+        self._ensure_connected()
+        known_pids = self._client_pids()
+        self._flush_stats(known_pids)
+        before = self._scanned_rows()
+        tracemalloc.start()
+        try:
+            self._quiet(func, self.analyzer)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self._ensure_connected()
+        self._flush_stats(known_pids)
+        after = self._scanned_rows()
+        scanned = {table: after.get(table, 0) - before.get(table, 0) for table in after}
+
+        timings = []
+        for run in range(warmup + repeats):
+            self._ensure_connected()
+            started = time.perf_counter()
+            self._quiet(func, self.analyzer)
+            elapsed = (time.perf_counter() - started) * 1000
+            if run >= warmup:
+                timings.append(elapsed)
+
+        samples = np.array(timings)
+        result = {
+            'runs': len(timings),
+            'p50_ms': round(float(np.percentile(samples, 50)), 2),
+            'p95_ms': round(float(np.percentile(samples, 95)), 2),
+            'mean_ms': round(float(samples.mean()), 2),
+            'min_ms': round(float(samples.min()), 2),
+            'max_ms': round(float(samples.max()), 2),
+            'rows_scanned': sum(scanned.values()) if self.server_version >= 150000 else None,
+            'rows_scanned_by_table': scanned if self.server_version >= 150000 else None,
+            'peak_memory_mb': round(peak / 1024 / 1024, 2),
+        }
+        print(f"  ⏱️ {name:<40} p50 {result['p50_ms']:>9.1f}ms  p95 {result['p95_ms']:>9.1f}ms  "
+              f"스캔 {result['rows_scanned'] or 0:>12,}행  메모리 {result['peak_memory_mb']:>7.1f}MB")
+        return result
+
+    def cases(self, user_id: str, export_dir: str) -> List[Tuple[str, Callable, Dict]]:
+        """
+        측정할 케이스 목록 (이름, 실행 함수, measure 옵션)
+
+        읽기 전용 분석을 먼저 측정하고, 만료 데이터를 지우는 cleanup_old_data는 한 번만,
+        그 뒤 정리된 상태에서 run_full_analysis를 측정한다.
+        """
+        export_path = os.path.join(export_dir, 'search_history.csv')
+        return [
+            ('analyze_user_search_technology_fields',
+             lambda a: a.analyze_user_search_technology_fields(user_id), {}),
+            ('analyze_market_search_technology_fields',
+             lambda a: a.analyze_market_search_technology_fields(), {}),
+            ('analyze_user_report_technology_fields',
+             lambda a: a.analyze_user_report_technology_fields(user_id), {}),
+            ('analyze_market_report_technology_fields',
+             lambda a: a.analyze_market_report_technology_fields(), {}),
+            ('analyze_users_technology_fields',
+             lambda a: a.analyze_users_technology_fields('search'), {}),
+            ('analyze_ipc_hierarchy', lambda a: a.analyze_ipc_hierarchy(user_id), {}),
+            ('get_recent_searches', lambda a: a.get_recent_searches(), {}),
+            ('get_recent_reports', lambda a: a.get_recent_reports(), {}),
+            ('generate_summary_report', lambda a: a.generate_summary_report(), {}),
+            ('compute_field_coverage', lambda a: a.compute_field_coverage(), {}),
+            ('run_consolidated_analysis', lambda a: a.run_consolidated_analysis(user_id), {}),
+            ('run_columnar_analysis', lambda a: a.run_columnar_analysis(user_id), {}),
+            ('approximate_summary', lambda a: a.approximate_summary('search'), {}),
+            ('refresh_rollups', lambda a: a.refresh_rollups(rebuild=True), {}),
+            ('export_history', lambda a: a.export_history(export_path, 'search'), {}),
+            ('cleanup_old_data', lambda a: a.cleanup_old_data(), {'repeats': 1, 'warmup': 0}),
+            ('run_full_analysis', lambda a: a.run_full_analysis(user_id), {}),
+        ]
+
+    def run(self, user_id: str = None, only: List[str] = None, skip: List[str] = None) -> Dict[str, Dict]:
+        """
+        전체 벤치마크 실행
+
+        Args:
+            user_id: 사용자별 분석에 쓸 사용자 ID (None이면 검색이 가장 많은 사용자)
+            only: 지정하면 이 케이스만 실행
+            skip: 제외할 케이스
+
+        Returns:
+            케이스 이름 -> 측정 결과
+        """
+        self.monitor = psycopg2.connect(**self.db_config)
+        self.monitor.autocommit = True
+        self.server_version = self.monitor.server_version
+        if self.server_version < 150000:
+            print("⚠️ PostgreSQL 15 미만에서는 통계 반영이 지연되어 스캔 행 수를 기록하지 않습니다")
+
+        if user_id is None:
+            cursor = self.monitor.cursor()
+            cursor.execute("""
+                SELECT user_id FROM search_history
+                GROUP BY user_id ORDER BY COUNT(*) DESC LIMIT 1
+            """)
+            row = cursor.fetchone()
+            cursor.close()
+            user_id = str(row[0]) if row else None
+
+        results = {}
+        try:
+            with tempfile.TemporaryDirectory() as export_dir:
+                for name, func, options in self.cases(user_id, export_dir):
+                    if (only and name not in only) or (skip and name in skip):
+                        continue
+                    results[name] = self.measure(name, func, **options)
+        finally:
+            self._quiet(self.analyzer.close_connection)
+            self.monitor.close()
+        return results
+
+
+def table_counts(conn) -> Dict[str, int]:
+    cursor = conn.cursor()
+    counts = {}
+    for table in BENCHMARK_TABLES:
+        cursor.execute(f"SELECT COUNT(*) FROM {table}")
+        counts[table] = cursor.fetchone()[0]
+    cursor.close()
+    return counts
+
+
+def compare_reports(current: Dict, baseline: Dict, threshold: float) -> List[Dict]:
+    """
+    기준 리포트 대비 p95 회귀 검사
+
+    Args:
+        current: 이번 실행 리포트
+        baseline: 기준 리포트
+        threshold: 허용 비율 (0.2이면 기준 p95보다 20% 넘게 느릴 때 회귀)
+
+    Returns:
+        회귀한 케이스 목록
+    """
+    regressions = []
+    for name, result in current['results'].items():
+        base = baseline.get('results', {}).get(name)
+        if not base or not base.get('p95_ms'):
+            continue
+        ratio = result['p95_ms'] / base['p95_ms']
+        if ratio > 1 + threshold:
+            regressions.append({
+                'name': name,
+                'baseline_p95_ms': base['p95_ms'],
+                'p95_ms': result['p95_ms'],
+                'ratio': round(ratio, 3),
+            })
+    return regressions
+
+
+def parse_args(argv: List[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="대시보드 데이터 분석기 벤치마크")
+    parser.add_argument('--scale', default='100k', help="search_history 행 수 (100k, 1m, 10m 또는 정수)")
+    parser.add_argument('--users', type=int, default=1000, help="합성 사용자 수")
+    parser.add_argument('--days', type=int, default=130, help="데이터 분포 기간(일)")
+    parser.add_argument('--skew', type=float, default=2.0, help="사용자/분야 편중도 (1이면 균등)")
+    parser.add_argument('--reset', action='store_true', help="생성 전 벤치마크 테이블 비우기")
+    parser.add_argument('--skip-seed', action='store_true', help="기존 데이터로 측정만 실행")
+    parser.add_argument('--repeats', type=int, default=5, help="케이스별 측정 반복 횟수")
+    parser.add_argument('--warmup', type=int, default=1, help="케이스별 예열 실행 횟수")
+    parser.add_argument('--user-id', help="사용자별 분석에 사용할 사용자 ID")
+    parser.add_argument('--only', nargs='*', help="실행할 케이스 이름")
+    parser.add_argument('--skip', nargs='*', help="제외할 케이스 이름")
+    parser.add_argument('--output', default='dashboard_benchmark.json', help="JSON 리포트 경로")
+    parser.add_argument('--baseline', help="비교할 기준 JSON 리포트")
+    parser.add_argument('--threshold', type=float, default=0.2, help="p95 회귀 허용 비율")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] = None) -> int:
+    """벤치마크 실행 함수 (회귀 발생 시 1 반환)"""
+    args = parse_args(argv)
+
+    # 벤치마크는 데이터를 생성/삭제하므로 로컬 PostgreSQL 전용 환경변수 사용
+    db_config = {
+        'host': os.getenv('BENCHMARK_DB_HOST', 'localhost'),
+        'port': os.getenv('BENCHMARK_DB_PORT', '5432'),
+        'database': os.getenv('BENCHMARK_DB_NAME', 'dashboard_benchmark'),
+        'user': os.getenv('BENCHMARK_DB_USER', 'postgres'),
+        'password': os.getenv('BENCHMARK_DB_PASSWORD', ''),
+    }
+    if 'supabase' in db_config['host']:
+        print("❌ 벤치마크는 운영 데이터베이스에서 실행할 수 없습니다. 로컬 PostgreSQL을 지정해주세요.")
+        return 2
+
+    search_rows = SCALES.get(args.scale.lower())
+    if search_rows is None:
+        search_rows = int(args.scale)
+
+    print("\n" + "="*60)
+    print("🏁 대시보드 분석기 벤치마크")
+    print("="*60)
+
+    conn = psycopg2.connect(**db_config)
+    try:
+        if not args.skip_seed:
+            seeder = SyntheticDataSeeder(conn, users=args.users, days=args.days, skew=args.skew)
+            seeder.create_schema()
+            if args.reset:
+                seeder.reset()
+            seeder.seed(search_rows)
+        counts = table_counts(conn)
+    finally:
+        conn.close()
+    print(f"📊 데이터 규모: {', '.join(f'{table} {count:,}' for table, count in counts.items())}")
+
+    print("\n" + "="*60)
+    print("⏱️ 메서드별 측정")
+    print("="*60)
+    runner = BenchmarkRunner(db_config, repeats=args.repeats, warmup=args.warmup)
+    results = runner.run(args.user_id, only=args.only, skip=args.skip)
+
+    report = {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'scale': args.scale,
+        'settings': {'users': args.users, 'days': args.days, 'skew': args.skew,
+                     'repeats': args.repeats, 'warmup': args.warmup},
+        'server_version': runner.server_version,
+        'table_rows': counts,
+        'results': results,
+    }
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_reports(report, baseline, args.threshold)
+        report['regression_check'] = {'baseline': args.baseline, 'threshold': args.threshold,
+                                      'regressions': regressions}
+        print("\n" + "="*60)
+        print(f"📉 회귀 검사 (p95 허용 +{args.threshold:.0%})")
+        print("="*60)
+        for item in regressions:
+            print(f"  ❌ {item['name']}: {item['baseline_p95_ms']:.1f}ms → {item['p95_ms']:.1f}ms "
+                  f"(x{item['ratio']:.2f})")
+        if regressions:
+            exit_code = 1
+        else:
+            print("  ✅ 회귀 없음")
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n💾 리포트 저장: {args.output}")
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+기술 분야 분포 차트 렌더링
+
+사용자/시장 분포 DataFrame을 PNG/SVG 차트로 그린다.
+
+- 헤드리스 Agg 백엔드 사용 (디스플레이 없는 서버/배치 환경)
+- 여러 사용자의 차트를 ProcessPoolExecutor로 코어 수만큼 병렬 렌더링
+- 차트 입력 데이터의 콘텐츠 해시를 파일 이름으로 캐시하므로, 분포가 바뀌지 않은
+  사용자는 다시 그리지 않는다
+- 캐시 디렉터리는 max_entries개까지만 유지하고 가장 오래 사용하지 않은 차트부터 지운다 (LRU)
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import pandas as pd
+
+# 한글 폰트 설정 (설치된 첫 번째 폰트 사용, 없으면 DejaVu Sans)
+plt.rcParams['font.family'] = ['Malgun Gothic', 'AppleGothic', 'NanumGothic', 'Noto Sans CJK KR', 'DejaVu Sans']
+plt.rcParams['axes.unicode_minus'] = False
+
+# 차트 모양을 바꾸면 올려서 기존 캐시를 무효화
+RENDER_VERSION = 1
+
+CHART_FORMATS = ('png', 'svg')
+
+
+def distribution_payload(title: str, user_df: Optional[pd.DataFrame], market_df: pd.DataFrame,
+                         top_n: int = 10) -> Dict:
+    """
+    분포 DataFrame을 렌더링/해시용 순수 데이터로 변환
+
+    Args:
+        title: 차트 제목
+        user_df: 사용자 분포 (기술분야, 비율(%) 컬럼) - None이면 시장 분포만
+        market_df: 시장 분포 (기술분야, 비율(%) 컬럼)
+        top_n: 표시할 상위 분야 수 (시장 비율 기준)
+
+    Returns:
+        title, fields, user, market 키를 가진 딕셔너리
+    """
+    def shares(df: Optional[pd.DataFrame]) -> Dict[str, float]:
+        if df is None or df.empty:
+            return {}
+        return {str(field): round(float(share), 2) for field, share in zip(df['기술분야'], df['비율(%)'])}
+
+    market = shares(market_df)
+    user = shares(user_df)
+    ranked = sorted(set(market) | set(user), key=lambda field: (-market.get(field, 0.0), -user.get(field, 0.0), field))
+    fields = ranked[:top_n]
+    return {
+        'title': title,
+        'fields': fields,
+        'user': [user.get(field, 0.0) for field in fields] if user_df is not None else None,
+        'market': [market.get(field, 0.0) for field in fields],
+    }
+
+
+def content_hash(payload: Dict, fmt: str, dpi: int) -> str:
+    """차트 입력 데이터와 렌더링 설정의 해시 (캐시 키)"""
+    key = json.dumps({'payload': payload, 'fmt': fmt, 'dpi': dpi, 'version': RENDER_VERSION},
+                     ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+def render_chart(payload: Dict, path: str, fmt: str = 'png', dpi: int = 100) -> str:
+    """
+    분포 비교 가로 막대 차트 저장 (프로세스 풀 작업자에서도 호출되는 최상위 함수)
+
+    임시 파일에 쓴 뒤 os.replace로 옮기므로 동시에 같은 차트를 그려도 깨진 파일이 남지 않는다.
+    """
+    fields = payload['fields'][::-1]  # 가장 큰 분야를 위쪽에 표시
+    positions = range(len(fields))
+    fig, ax = plt.subplots(figsize=(8, max(2.5, 0.45 * len(fields) + 1.2)))
+    try:
+        if payload['user'] is not None:
+            height = 0.4
+            ax.barh([p + height / 2 for p in positions], payload['market'][::-1], height,
+                    label='시장', color='#9aa5b1')
+            ax.barh([p - height / 2 for p in positions], payload['user'][::-1], height,
+                    label='사용자', color='#2f6fde')
+            ax.legend(loc='lower right')
+        else:
+            ax.barh(list(positions), payload['market'][::-1], 0.6, color='#2f6fde')
+        ax.set_yticks(list(positions))
+        ax.set_yticklabels(fields)
+        ax.set_xlabel('비율(%)')
+        ax.set_title(payload['title'])
+        ax.grid(axis='x', alpha=0.3)
+        fig.tight_layout()
+
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        fig.savefig(tmp_path, format=fmt, dpi=dpi)
+        os.replace(tmp_path, path)
+    finally:
+        plt.close(fig)
+    return path
+
+
+def _render_job(job) -> str:
+    payload, path, fmt, dpi = job
+    return render_chart(payload, path, fmt, dpi)
+
+
+class ChartRenderer:
+    """콘텐츠 해시 캐시를 사용하는 분포 차트 렌더러"""
+
+    def __init__(self, cache_dir: str, fmt: str = 'png', dpi: int = 100, max_workers: int = None,
+                 max_entries: int = 2048):
+        """
+        Args:
+            cache_dir: 렌더링된 차트 저장 디렉터리 (파일 이름이 콘텐츠 해시)
+            fmt: 'png' 또는 'svg'
+            dpi: PNG 해상도
+            max_workers: 배치 렌더링 프로세스 수 (None이면 CPU 코어 수)
+            max_entries: 캐시 디렉터리에 유지할 최대 차트 수 (초과 시 가장 오래 사용하지 않은 차트 삭제)
+        """
+        if fmt not in CHART_FORMATS:
+            raise ValueError(f"지원하지 않는 차트 형식입니다: {fmt}")
+        self.cache_dir = cache_dir
+        self.fmt = fmt
+        self.dpi = dpi
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_entries = max_entries
+        self.rendered = 0
+        self.cached = 0
+        self.evicted = 0
+        os.makedirs(cache_dir, exist_ok=True)
+        # 캐시 파일 경로 -> None, 오래 사용하지 않은 순서 (파일 수정 시각을 사용 시각으로 쓰므로
+        # 렌더러를 새로 만들어도 이전 실행의 사용 순서가 이어진다)
+        extensions = tuple(f".{chart_format}" for chart_format in CHART_FORMATS)
+        self.cache = OrderedDict(
+            (path, None) for _, path in sorted(
+                (entry.stat().st_mtime_ns, entry.path) for entry in os.scandir(cache_dir)
+                if entry.is_file() and entry.name.endswith(extensions)
+            )
+        )
+
+    def cache_path(self, payload: Dict) -> str:
+        return os.path.join(self.cache_dir, f"{content_hash(payload, self.fmt, self.dpi)}.{self.fmt}")
+
+    def render(self, payload: Dict) -> str:
+        """차트 1개를 현재 프로세스에서 렌더링 (캐시에 있으면 재사용)"""
+        path = self.cache_path(payload)
+        if os.path.exists(path):
+            self.cached += 1
+            self._touch(path)
+            return path
+        self.rendered += 1
+        render_chart(payload, path, self.fmt, self.dpi)
+        self._touch(path)
+        self._evict(keep=(path,))
+        return path
+
+    def render_batch(self, payloads: Dict[str, Dict], chunksize: int = 8) -> Dict[str, str]:
+        """
+        여러 차트를 프로세스 풀에서 병렬 렌더링
+
+        캐시 확인과 중복 제거는 부모 프로세스에서 하므로 같은 데이터의 차트는
+        배치 안에서도 한 번만 그린다.
+
+        Args:
+            payloads: 차트 키(예: 사용자 ID) -> distribution_payload 결과
+            chunksize: 작업자에게 한 번에 넘길 차트 수
+
+        Returns:
+            차트 키 -> 캐시 파일 경로
+        """
+        paths = {key: self.cache_path(payload) for key, payload in payloads.items()}
+        pending = {}
+        for key, path in paths.items():
+            if os.path.exists(path):
+                self.cached += 1
+                self._touch(path)
+            elif path not in pending:
+                pending[path] = payloads[key]
+        jobs = [(payload, path, self.fmt, self.dpi) for path, payload in pending.items()]
+
+        if len(jobs) > 1 and self.max_workers > 1:
+            with ProcessPoolExecutor(max_workers=min(self.max_workers, len(jobs))) as executor:
+                list(executor.map(_render_job, jobs, chunksize=chunksize))
+        else:
+            for job in jobs:
+                _render_job(job)
+        self.rendered += len(jobs)
+        for path in pending:
+            self._touch(path)
+        # 이번 배치의 차트는 publish() 전에 지워지지 않도록 제외
+        self._evict(keep=set(paths.values()))
+        return paths
+
+    def _touch(self, path: str):
+        """차트를 가장 최근에 사용한 항목으로 표시 (파일 수정 시각도 갱신)"""
+        self.cache[path] = None
+        self.cache.move_to_end(path)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def _evict(self, keep: Iterable[str] = ()):
+        """max_entries를 넘는 만큼 가장 오래 사용하지 않은 차트 파일 삭제 (keep의 경로는 제외)"""
+        excess = len(self.cache) - self.max_entries
+        if excess <= 0:
+            return
+        for path in [path for path in self.cache if path not in keep][:excess]:
+            del self.cache[path]
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            self.evicted += 1
+
+    def publish(self, paths: Dict[str, str], output_dir: str, prefix: str = '') -> List[str]:
+        """
+        캐시 파일을 읽기 쉬운 이름(prefix + 키)으로 출력 디렉터리에 연결
+
+        가능하면 하드 링크를 만들어 복사 비용 없이 공개한다.
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        published = []
+        for key, path in paths.items():
+            target = os.path.join(output_dir, f"{prefix}{key}.{self.fmt}")
+            if os.path.exists(target):
+                os.remove(target)
+            try:
+                os.link(path, target)
+            except OSError:
+                shutil.copyfile(path, target)
+            published.append(target)
+        return published
+
+    def stats(self) -> Dict[str, int]:
+        return {'rendered': self.rendered, 'cached': self.cached, 'evicted': self.evicted}
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+대시보드 분석기 상주 데몬
+
+스크립트를 매번 실행하면 pandas 등 무거운 모듈 로딩과 Supabase TLS 연결 비용을
+요청마다 다시 치른다. 데몬은 표준 라이브러리만으로 먼저 소켓을 열고, 분석기 모듈
+로딩/연결 풀/결과 캐시 준비는 백그라운드에서 한 번만 한 뒤 계속 유지한다.
+
+로컬 HTTP(기본 127.0.0.1) 또는 Unix 소켓으로 JSON 응답을 제공한다.
+
+    GET /health                                 상태 (워밍업 여부, 캐시 통계)
+    GET /market/distribution?source=search      시장 기술 분야 분포
+    GET /market/recent?source=report&limit=10   최근 검색/리포트
+    GET /market/summary                         전체 요약 통계
+    GET /users/<user_id>/distribution?source=search&limit=20
+    GET /market/specialization?source=search    사용자 특화 점수 분포와 상위 사용자
+    GET /users/<user_id>/specialization         사용자 특화 점수와 비슷한 사용자
+    GET /history/search?page_size=20&cursor=...&direction=next&user_id=...&field=...
+                                                검색/리포트 이력 키셋 페이지
+
+사용 예:
+    python dashboard_daemon.py --port 8765
+    python dashboard_daemon.py --socket /tmp/dashboard-analyzer.sock
+    python dashboard_daemon.py --live --reconcile-interval 600   # 트리거 알림으로 분포/최근/요약 갱신
+    curl --unix-socket /tmp/dashboard-analyzer.sock "http://localhost/market/distribution?source=search"
+"""
+
+import argparse
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import time
+import uuid
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+
+class AnalyzerService:
+    """백그라운드에서 한 번 준비한 분석기(연결 풀 + 결과 캐시)를 요청 간에 공유"""
+
+    def __init__(self, db_config: Dict[str, str], pool_size: int = 4, cache_ttl: float = 300.0,
+                 use_rollups: bool = False, warmup_timeout: float = 30.0, live: bool = False,
+                 reconcile_interval: float = 600.0):
+        """
+        Args:
+            db_config: 데이터베이스 연결 설정
+            pool_size: 유지할 연결 수 (동시 요청 수 상한)
+            cache_ttl: 결과 캐시 유효 시간(초)
+            use_rollups: True이면 일별 롤업 테이블 사용
+            warmup_timeout: 워밍업 전에 들어온 요청이 기다릴 최대 시간(초)
+            live: True이면 LISTEN/NOTIFY 실시간 카운터로 분포/최근/요약 응답
+            reconcile_interval: 실시간 카운터 재조정 주기(초)
+        """
+        self.db_config = db_config
+        self.pool_size = pool_size
+        self.cache_ttl = cache_ttl
+        self.use_rollups = use_rollups
+        self.warmup_timeout = warmup_timeout
+        self.live = live
+        self.reconcile_interval = reconcile_interval
+        self.analyzer = None
+        self.error = None
+        self.ready = threading.Event()
+        self.started_at = time.time()
+        self.warmup_seconds = None
+
+    def warm_up(self):
+        """분석기 모듈 로딩, 연결 풀 생성, 캐시 설정 (백그라운드 스레드에서 실행)"""
+        started = time.perf_counter()
+        try:
+            # pandas/psycopg2 로딩은 소켓을 연 뒤로 미룸
+            from dashboard_data_analysis_test import DashboardDataAnalyzer
+
+            analyzer = DashboardDataAnalyzer(self.db_config)
+            analyzer.use_rollups = self.use_rollups
+            analyzer.enable_cache(ttl_seconds=self.cache_ttl)
+            if not analyzer.open_pool(maxconn=self.pool_size):
+                raise RuntimeError("연결 풀을 만들 수 없습니다")
+            if self.use_rollups:
+                with analyzer.pooled_connection():
+                    analyzer.refresh_rollups()
+            if self.live:
+                analyzer.start_live_counters(self.reconcile_interval)
+            self.analyzer = analyzer
+            self.warmup_seconds = round(time.perf_counter() - started, 3)
+            print(f"✅ 워밍업 완료 ({self.warmup_seconds}초, 연결 {self.pool_size}개)")
+        except Exception as e:
+            self.error = str(e)
+            print(f"❌ 워밍업 실패: {e}")
+        finally:
+            self.ready.set()
+
+    def query(self, analysis: str, **kwargs) -> Dict:
+        """풀에서 연결을 빌려 analysis_json 실행"""
+        if not self.ready.wait(self.warmup_timeout):
+            raise TimeoutError("분석기 워밍업이 끝나지 않았습니다")
+        if self.analyzer is None:
+            raise RuntimeError(f"분석기를 사용할 수 없습니다: {self.error}")
+        with self.analyzer.pooled_connection():
+            return self.analyzer.analysis_json(analysis, **kwargs)
+
+    def browse(self, source: str, **kwargs) -> Dict:
+        """풀에서 연결을 빌려 browse_history 실행"""
+        if not self.ready.wait(self.warmup_timeout):
+            raise TimeoutError("분석기 워밍업이 끝나지 않았습니다")
+        if self.analyzer is None:
+            raise RuntimeError(f"분석기를 사용할 수 없습니다: {self.error}")
+        with self.analyzer.pooled_connection():
+            return self.analyzer.browse_history(source, **kwargs)
+
+    def health(self) -> Dict:
+        cache = self.analyzer.cache.stats() if self.analyzer and self.analyzer.cache else None
+        live = dict(self.analyzer.live.counters.stats) if self.analyzer and self.analyzer.live else None
+        return {
+            'status': 'error' if self.error else ('ok' if self.analyzer else 'warming_up'),
+            'error': self.error,
+            'uptime_seconds': round(time.time() - self.started_at, 1),
+            'warmup_seconds': self.warmup_seconds,
+            'cache': cache,
+            'live': live,
+        }
+
+    def close(self):
+        if self.analyzer:
+            self.analyzer.close_connection()
+
+
+class AnalyzerRequestHandler(BaseHTTPRequestHandler):
+    """GET 요청을 AnalyzerService로 전달하고 JSON으로 응답"""
+
+    protocol_version = 'HTTP/1.1'  # keep-alive로 Node 클라이언트의 연결 재사용
+    server_version = 'DashboardAnalyzer/1.0'
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        parts = [part for part in url.path.split('/') if part]
+        service = self.server.service
+
+        try:
+            if parts == ['health']:
+                self._send(HTTPStatus.OK, service.health())
+                return
+
+            if len(parts) == 2 and parts[0] == 'history':
+                user_id = str(uuid.UUID(params['user_id'])) if params.get('user_id') else None
+                started = time.perf_counter()
+                result = service.browse(parts[1], page_size=int(params.get('page_size', 20)),
+                                        cursor=params.get('cursor') or None,
+                                        direction=params.get('direction', 'next'),
+                                        user_id=user_id, technology_field=params.get('field') or None)
+                result['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 2)
+                self._send(HTTPStatus.OK, result)
+                return
+
+            if len(parts) == 2 and parts[0] == 'market':
+                user_id, analysis = None, parts[1]
+            elif len(parts) == 3 and parts[0] == 'users':
+                user_id, analysis = str(uuid.UUID(parts[1])), parts[2]
+            else:
+                self._send(HTTPStatus.NOT_FOUND, {'error': f"알 수 없는 경로입니다: {url.path}"})
+                return
+
+            source = params.get('source', 'search')
+            if source not in ('search', 'report'):
+                raise ValueError(f"source는 search 또는 report여야 합니다: {source}")
+            limit = int(params['limit']) if 'limit' in params else None
+            started = time.perf_counter()
+            result = service.query(analysis, source=source, user_id=user_id, limit=limit)
+            result['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 2)
+            self._send(HTTPStatus.OK, result)
+        except ValueError as e:
+            self._send(HTTPStatus.BAD_REQUEST, {'error': str(e)})
+        except TimeoutError as e:
+            self._send(HTTPStatus.SERVICE_UNAVAILABLE, {'error': str(e)})
+        except Exception as e:
+            self._send(HTTPStatus.INTERNAL_SERVER_ERROR, {'error': str(e)})
+
+    def _send(self, status: HTTPStatus, payload: Dict):
+        body = json.dumps(payload, ensure_ascii=False, default=str).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Unix 소켓은 클라이언트 주소가 없으므로 address_string()을 쓰지 않음
+        if self.server.verbose:
+            print(f"🌐 {self.command} {self.path} - {format % args}")
+
+
+class AnalyzerHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, service: AnalyzerService, verbose: bool = False):
+        self.service = service
+        self.verbose = verbose
+        super().__init__(address, AnalyzerRequestHandler)
+
+
+class UnixAnalyzerHTTPServer(AnalyzerHTTPServer):
+    """Unix 도메인 소켓에서 HTTP 제공 (같은 호스트의 Node API 전용)"""
+
+    address_family = socket.AF_UNIX
+
+    def server_bind(self):
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+        # HTTPServer.server_bind는 (host, port)를 가정하므로 TCPServer 구현 사용
+        socketserver.TCPServer.server_bind(self)
+        os.chmod(self.server_address, 0o660)
+        self.server_name = 'localhost'
+        self.server_port = 0
+
+
+def create_server(service: AnalyzerService, host: str = '127.0.0.1', port: int = 8765,
+                  socket_path: Optional[str] = None, verbose: bool = False) -> AnalyzerHTTPServer:
+    if socket_path:
+        return UnixAnalyzerHTTPServer(socket_path, service, verbose)
+    return AnalyzerHTTPServer((host, port), service, verbose)
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="대시보드 분석기 상주 데몬")
+    parser.add_argument('--host', default='127.0.0.1', help="HTTP 바인딩 주소")
+    parser.add_argument('--port', type=int, default=8765, help="HTTP 포트")
+    parser.add_argument('--socket', help="지정하면 HTTP 대신 이 Unix 소켓에서 제공")
+    parser.add_argument('--pool-size', type=int, default=4, help="연결 풀 크기")
+    parser.add_argument('--cache-ttl', type=float, default=300.0, help="결과 캐시 유효 시간(초)")
+    parser.add_argument('--use-rollups', action='store_true', help="일별 롤업 테이블 사용")
+    parser.add_argument('--live', action='store_true', help="LISTEN/NOTIFY 실시간 카운터로 분포/최근/요약 응답")
+    parser.add_argument('--reconcile-interval', type=float, default=600.0, help="실시간 카운터 재조정 주기(초)")
+    parser.add_argument('--verbose', action='store_true', help="요청 로그 출력")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    """데몬 실행 함수"""
+    args = parse_args(argv)
+    started = time.perf_counter()
+
+    db_config = {
+        'host': os.getenv('SUPABASE_DB_HOST', 'db.afzzubvlotobcaiflmia.supabase.co'),
+        'port': os.getenv('SUPABASE_DB_PORT', '5432'),
+        'database': os.getenv('SUPABASE_DB_NAME', 'postgres'),
+        'user': os.getenv('SUPABASE_DB_USER', 'postgres'),
+        'password': os.getenv('SUPABASE_DB_PASSWORD', ''),
+    }
+    if not db_config['password']:
+        print("❌ 데이터베이스 연결 정보가 설정되지 않았습니다. SUPABASE_DB_* 환경변수를 설정해주세요.")
+        return 1
+
+    service = AnalyzerService(db_config, pool_size=args.pool_size, cache_ttl=args.cache_ttl,
+                              use_rollups=args.use_rollups, live=args.live,
+                              reconcile_interval=args.reconcile_interval)
+    server = create_server(service, args.host, args.port, args.socket, args.verbose)
+    threading.Thread(target=service.warm_up, name='analyzer-warmup', daemon=True).start()
+
+    def stop(signum, frame):
+        # serve_forever()가 도는 스레드에서 shutdown()을 부르면 교착되므로 별도 스레드에서 호출
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    endpoint = args.socket or f"http://{args.host}:{args.port}"
+    print(f"🚀 분석기 데몬 시작: {endpoint} ({time.perf_counter() - started:.3f}초, 워밍업 진행 중)")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        service.close()
+        if args.socket and os.path.exists(args.socket):
+            os.unlink(args.socket)
+        print("🔌 분석기 데몬 종료")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -14,23 +14,256 @@
 7. 최근 리포트 : 리포트추이 - 리포트전환율의 총 리포트수에서 가장 최근에 생성된 리포트 제목 10개 출력
 """
 
+import base64
+import builtins
+import copy
+import csv
+import hashlib
+import io
 import os
+import re
 import sys
+import threading
+import time
 import psycopg2
+import psycopg2.pool
 import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib.font_manager as fm
-from datetime import datetime, timedelta
-from collections import Counter
+from datetime import date, datetime, timedelta
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from itertools import groupby
 import json
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Iterator, List, Tuple, Optional
 import warnings
 warnings.filterwarnings('ignore')
 
-# 한글 폰트 설정
-plt.rcParams['font.family'] = ['Malgun Gothic', 'DejaVu Sans']
-plt.rcParams['axes.unicode_minus'] = False
+from dashboard_instrumentation import JsonLinesSink, QueryInstrumentation, traced_analyses
+from dashboard_keywords import KeywordIndex, scope_name
+from dashboard_sketches import DailySketch
 
+class _ThreadOutput(io.TextIOBase):
+    """
+    스레드별 print 출력 대상 (동시 실행 시 섹션 출력이 섞이지 않도록)
+    
+    capture() 중인 스레드는 자기 버퍼로, 그 외 스레드는 그 시점의 sys.stdout으로 쓴다.
+    sys.stdout 자체는 바꾸지 않으므로 동시 실행 호출이 겹치거나 무관한 스레드가 출력해도
+    서로의 출력을 가로채거나 원래 stdout 복원 순서가 꼬이지 않는다.
+    """
+    
+    def __init__(self):
+        self.local = threading.local()
+    
+    def write(self, text: str) -> int:
+        buffer = getattr(self.local, 'buffer', None)
+        return (buffer if buffer is not None else sys.stdout).write(text)
+    
+    def flush(self):
+        if getattr(self.local, 'buffer', None) is None:
+            sys.stdout.flush()
+    
+    @contextmanager
+    def capture(self) -> Iterator[io.StringIO]:
+        """현재 스레드의 출력을 새 버퍼로 모음 (중첩 가능)"""
+        previous = getattr(self.local, 'buffer', None)
+        self.local.buffer = buffer = io.StringIO()
+        try:
+            yield buffer
+        finally:
+            self.local.buffer = previous
+
+
+_thread_output = _ThreadOutput()
+
+
+def print(*args, **kwargs):
+    """이 모듈의 print - file을 지정하지 않으면 스레드별 출력 대상으로 보냄"""
+    kwargs.setdefault('file', _thread_output)
+    builtins.print(*args, **kwargs)
+
+
+class AnalysisResultCache:
+    """
+    대시보드 분석 결과 캐시 (TTL + LRU, 테이블 버전 기반 무효화)
+    
+    키는 (분석 이름, user_id, 보존 기간, 추가 파라미터)이며, 각 항목은 계산 당시의
+    테이블 버전(최신 created_at과 pg_stat_user_tables 변경 건수, DashboardDataAnalyzer._read_table_versions)과
+    함께 저장된다. 조회 시 버전이 달라졌으면 무효화하고 다시 계산한다.
+    
+    버전은 조회마다 읽지 않고 watermark_interval초에 한 번(또는 refresh_watermarks() 직후)
+    한 쿼리로 읽어 공유하므로, 다른 연결의 새 행은 최대 그 시간만큼, 수정/삭제는 통계 반영 지연만큼
+    더 늦게 반영된다.
+    값은 저장/반환 시 깊은 복사하므로 호출자가 결과를 수정해도 캐시에 영향이 없다.
+    """
+    
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 300.0, watermark_interval: float = 5.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.watermark_interval = watermark_interval
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._versions = None
+        self._versions_read_at = None
+        self._versions_lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'expirations': 0, 'invalidations': 0, 'evictions': 0,
+                       'watermark_reads': 0}
+    
+    def table_versions(self, read) -> Dict[str, Tuple]:
+        """
+        테이블 버전 조회 (watermark_interval 안에서는 마지막으로 읽은 값을 재사용)
+        
+        Args:
+            read: {테이블 이름: 버전}을 DB에서 읽는 함수
+        """
+        with self._versions_lock:
+            now = time.monotonic()
+            if self._versions_read_at is None or now - self._versions_read_at > self.watermark_interval:
+                self._versions = read()
+                self._versions_read_at = now
+                with self._lock:
+                    self._stats['watermark_reads'] += 1
+            return self._versions
+    
+    def refresh_watermarks(self):
+        """
+        저장된 항목을 비우고 다음 조회에서 테이블 버전을 다시 읽도록 표시
+        
+        분석기가 직접 데이터를 바꾼 뒤 호출한다. 통계는 커밋 직후 바로 반영되지 않을 수 있으므로
+        버전 비교에 맡기지 않고 항목을 비운다.
+        """
+        with self._versions_lock:
+            self._versions_read_at = None
+        self.clear()
+    
+    def get(self, key: Tuple, watermark: Tuple):
+        """워터마크가 같고 TTL이 지나지 않은 항목의 복사본을 반환 (없으면 None)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats['misses'] += 1
+                return None
+            
+            stored_at, stored_watermark, value = entry
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                reason = 'expirations'
+            elif stored_watermark != watermark:
+                reason = 'invalidations'
+            else:
+                self._entries.move_to_end(key)
+                self._stats['hits'] += 1
+                return copy.deepcopy(value)
+            
+            del self._entries[key]
+            self._stats[reason] += 1
+            self._stats['misses'] += 1
+            return None
+    
+    def put(self, key: Tuple, watermark: Tuple, value):
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = (time.monotonic(), watermark, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self) -> Dict[str, float]:
+        """적중/미스 통계"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['size'] = len(self._entries)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups * 100, 2) if lookups else 0.0
+        return stats
+
+
+class IPCPrefixTree:
+    """
+    IPC/CPC 코드 계층 접두사 트리
+    
+    코드 하나(예: H01M10/052)를 섹션(H) > 클래스(H01) > 서브클래스(H01M) >
+    메인그룹(H01M10/00) > 서브그룹(H01M10/052) 경로에 한 번씩 더해, 모든 계층의
+    개인/시장 집계를 동시에 유지한다. 드릴다운은 트리 탐색만으로 처리된다.
+    """
+    
+    LEVELS = ('section', 'class', 'subclass', 'main_group', 'subgroup')
+    LEVEL_NAMES = {
+        'section': '섹션',
+        'class': '클래스',
+        'subclass': '서브클래스',
+        'main_group': '메인그룹',
+        'subgroup': '서브그룹',
+    }
+    CODE_PATTERN = re.compile(r'^([A-H])([0-9]{2})([A-Z])([0-9]{1,3})/([0-9]{2,4})$')
+    
+    def __init__(self):
+        self.root = {'children': {}, 'counts': {'user': 0, 'market': 0}}
+        self._levels = {level: {} for level in self.LEVELS}
+    
+    @classmethod
+    def split_code(cls, code: str) -> Optional[List[str]]:
+        """IPC 코드를 계층별 접두사 목록으로 분해 (형식이 다르면 None)"""
+        match = cls.CODE_PATTERN.match(code.strip().upper())
+        if not match:
+            return None
+        section, class_no, subclass, group, subgroup = match.groups()
+        return [
+            section,
+            f"{section}{class_no}",
+            f"{section}{class_no}{subclass}",
+            f"{section}{class_no}{subclass}{group}/00",
+            f"{section}{class_no}{subclass}{group}/{subgroup}",
+        ]
+    
+    def add(self, code: str, user_count: int = 0, market_count: int = 0) -> bool:
+        prefixes = self.split_code(code)
+        if not prefixes:
+            return False
+        
+        node = self.root
+        node['counts']['user'] += user_count
+        node['counts']['market'] += market_count
+        for level, prefix in zip(self.LEVELS, prefixes):
+            child = node['children'].get(prefix)
+            if child is None:
+                child = {'children': {}, 'counts': {'user': 0, 'market': 0}}
+                node['children'][prefix] = child
+                self._levels[level][prefix] = child
+            child['counts']['user'] += user_count
+            child['counts']['market'] += market_count
+            node = child
+        return True
+    
+    def _frame(self, nodes: Dict[str, Dict], scope: str, k: int = None) -> pd.DataFrame:
+        total = self.root['counts'][scope]
+        rows = [(code, node['counts'][scope]) for code, node in nodes.items() if node['counts'][scope]]
+        rows.sort(key=lambda row: (-row[1], row[0]))
+        if k:
+            rows = rows[:k]
+        df = pd.DataFrame(rows, columns=['IPC코드', '건수'])
+        df['비율(%)'] = (df['건수'] * 100.0 / total).round(2) if total else 0.0
+        return df
+    
+    def top_k(self, level: str, scope: str = 'market', k: int = 10) -> pd.DataFrame:
+        """계층별 상위 K개 코드 (scope: 'user' 또는 'market')"""
+        return self._frame(self._levels[level], scope, k)
+    
+    def drill_down(self, prefix: str = None, scope: str = 'market', k: int = None) -> pd.DataFrame:
+        """접두사 바로 아래 계층의 코드 분포 (prefix가 None이면 섹션)"""
+        if prefix is None:
+            return self._frame(self.root['children'], scope, k)
+        for level in self.LEVELS:
+            node = self._levels[level].get(prefix.upper())
+            if node is not None:
+                return self._frame(node['children'], scope, k)
+        return self._frame({}, scope, k)
+
+
+@traced_analyses
 class DashboardDataAnalyzer:
     """대시보드 데이터 분석 클래스"""
     
@@ -44,27 +277,333 @@ class DashboardDataAnalyzer:
         self.db_config = db_config
         self.conn = None
         self.retention_days = 100  # 데이터 보존 기간
+        self.use_rollups = False  # True이면 analyze_* 메서드가 일별 롤업 테이블을 사용
+        self._pool = None
+        self._pool_slots = None
+        self._pool_lock = threading.Lock()  # 동시 호출이 풀을 두 번 만들지 않도록
+        self._local = threading.local()
+        self.cache = None  # enable_cache()로 설정하는 AnalysisResultCache
+        self._daily_sketches = {}  # source -> {날짜: DailySketch}
+        self._trend_daily = {}  # source -> {날짜: {(범위, 키): 건수}}
+        self.keyword_index = None  # refresh_keyword_index()로 만드는 KeywordIndex
+        self.instrumentation = None  # enable_instrumentation()으로 설정하는 QueryInstrumentation
+        self.snapshot = None  # use_snapshot()으로 여는 AnalyzerSnapshot (설정되면 DB 대신 스냅샷 조회)
+        self._checked_indexes = set()  # browse_history()가 확인한 (테이블, 인덱스 컬럼)
+        self.live = None  # start_live_counters()로 시작하는 LiveDashboardListener
+    
+    @property
+    def conn(self):
+        """현재 스레드가 풀에서 빌린 연결, 없으면 기본 연결"""
+        return getattr(self._local, 'conn', None) or self._conn
+    
+    @conn.setter
+    def conn(self, value):
+        self._conn = value
         
     def connect_database(self) -> bool:
         """데이터베이스 연결"""
         try:
-            self.conn = psycopg2.connect(**self.db_config)
+            self.conn = psycopg2.connect(**self.db_config, **self._connection_options())
             print("✅ 데이터베이스 연결 성공")
             return True
         except Exception as e:
             print(f"❌ 데이터베이스 연결 실패: {e}")
             return False
     
+    def open_pool(self, minconn: int = None, maxconn: int = 8) -> bool:
+        """
+        동시 분석용 스레드 안전 연결 풀 생성
+        
+        풀은 close_connection 전까지 유지되므로 장기 실행 워커에서 여러 번의
+        run_concurrent_analysis 호출이 같은 연결들을 재사용한다.
+        
+        Args:
+            minconn: 풀에 유지할 연결 수 (None이면 maxconn과 같음 - psycopg2 풀은
+                minconn을 넘는 연결을 반납 시 닫으므로 재사용하려면 같게 둔다)
+            maxconn: 최대 연결 수
+        """
+        if minconn is None:
+            minconn = maxconn
+        with self._pool_lock:
+            if self._pool:
+                return True
+            try:
+                pool = psycopg2.pool.ThreadedConnectionPool(minconn, maxconn, **self.db_config,
+                                                            **self._connection_options())
+                # 풀이 가득 찼을 때 PoolError 대신 반납을 기다리도록 슬롯 수를 제한
+                self._pool_slots = threading.BoundedSemaphore(maxconn)
+                self._pool = pool
+                print(f"✅ 연결 풀 생성 성공 (최대 {maxconn}개)")
+                return True
+            except Exception as e:
+                print(f"❌ 연결 풀 생성 실패: {e}")
+                return False
+    
+    @contextmanager
+    def pooled_connection(self):
+        """풀에서 연결을 빌려 현재 스레드의 self.conn으로 사용"""
+        self._pool_slots.acquire()
+        conn = self._pool.getconn()
+        self._local.conn = conn
+        try:
+            yield conn
+        finally:
+            self._local.conn = None
+            # 조회용 트랜잭션을 정리한 뒤 반납 (끊어진 연결은 풀에서 폐기)
+            broken = conn.closed != 0
+            if not broken:
+                try:
+                    conn.rollback()
+                except psycopg2.Error:
+                    broken = True
+            self._pool.putconn(conn, close=broken)
+            self._pool_slots.release()
+    
     def close_connection(self):
         """데이터베이스 연결 종료"""
-        if self.conn:
-            self.conn.close()
+        if self.live:
+            self.live.stop()
+            self.live = None
+        with self._pool_lock:
+            if self._pool:
+                self._pool.closeall()
+                self._pool = None
+                print("🔌 연결 풀 종료")
+        if self._conn:
+            self._conn.close()
             print("🔌 데이터베이스 연결 종료")
     
-    def cleanup_old_data(self) -> Dict[str, int]:
+    def _connection_options(self) -> Dict:
+        """계측이 켜져 있을 때만 계측 커서를 쓰도록 연결 옵션 구성"""
+        if self.instrumentation is None:
+            return {}
+        return {'cursor_factory': self.instrumentation.cursor_factory}
+    
+    def enable_instrumentation(self, sinks: List = None, explain_sample_rate: float = 0.0,
+                               log_path: str = None, max_records: int = 10000) -> QueryInstrumentation:
+        """
+        SQL 문 단위 계측 사용 설정
+        
+        이후 만드는 연결(연결 풀 포함)과 현재 열린 기본 연결의 커서가 실행 시간, 행 수,
+        바이트 수를 기록한다. 이미 만들어진 연결 풀에는 적용되지 않으므로 open_pool 전에 호출한다.
+        
+        Args:
+            sinks: 레코드(dict)를 받을 callable 목록 (메트릭 전송 등)
+            explain_sample_rate: EXPLAIN (ANALYZE, BUFFERS)를 수집할 SELECT 비율 (0~1)
+            log_path: 지정하면 레코드를 JSON Lines 파일로 기록
+            max_records: 메모리에 보관할 최근 레코드 수
+        """
+        sinks = list(sinks or [])
+        if log_path:
+            sinks.append(JsonLinesSink(log_path))
+        self.instrumentation = QueryInstrumentation(sinks, explain_sample_rate, max_records)
+        if self._conn is not None and not self._conn.closed:
+            self._conn.cursor_factory = self.instrumentation.cursor_factory
+        return self.instrumentation
+    
+    def print_query_summary(self, top: int = 15):
+        """SQL 계측 요약 표 출력"""
+        if self.instrumentation is None:
+            return
+        self.instrumentation.print_summary(top)
+    
+    def export_snapshot(self, path: str) -> Dict:
+        """
+        보존 기간의 search_history, ai_analysis_reports, users를 메모리 매핑 스냅샷으로 내보내기
+        
+        Args:
+            path: 스냅샷 디렉터리 (기존 스냅샷은 교체)
+            
+        Returns:
+            스냅샷 manifest (실패 시 빈 딕셔너리)
+        """
+        from dashboard_snapshot import export_snapshot
+        
+        self._print_section("💾 분석 스냅샷 내보내기")
+        started = time.perf_counter()
+        try:
+            self.conn.commit()
+            manifest = export_snapshot(self.conn, path, self.retention_days)
+        except Exception as e:
+            print(f"❌ 스냅샷 내보내기 실패: {e}")
+            self.conn.rollback()
+            return {}
+        
+        print(f"✅ 스냅샷 저장: {path} (검색 {manifest['rows']['search']:,}건, 리포트 {manifest['rows']['report']:,}건, "
+              f"사용자 {manifest['total_users']:,}명, {time.perf_counter() - started:.2f}초)")
+        return manifest
+    
+    def use_snapshot(self, path: str = None):
+        """
+        스냅샷 모드 설정 - analyze_*, get_recent_*, 요약, 컬럼형/JSON 분석이 DB 대신 스냅샷을 사용
+        
+        기준 시각은 스냅샷을 내보낸 시점이다. 트렌드/검색어/스케치/롤업/정리 작업은
+        계속 데이터베이스가 필요하다.
+        
+        Args:
+            path: 스냅샷 디렉터리 (None이면 스냅샷 모드 해제)
+        """
+        if path is None:
+            self.snapshot = None
+            return None
+        from dashboard_snapshot import AnalyzerSnapshot
+        
+        self.snapshot = AnalyzerSnapshot(path)
+        if self.retention_days > self.snapshot.retention_days:
+            print(f"⚠️ 스냅샷은 최근 {self.snapshot.retention_days}일만 포함합니다")
+        print(f"📂 스냅샷 사용: {path} (기준 시각 {self.snapshot.manifest['exported_at']})")
+        return self.snapshot
+    
+    def start_live_counters(self, reconcile_interval: float = 600.0, recent_limit: int = 10,
+                            wait: float = 30.0):
+        """
+        LISTEN/NOTIFY 실시간 카운터 시작 - analysis_json()의 distribution/recent/summary가
+        재조회 없이 메모리 카운터로 응답 (20261016_dashboard_live_notify.sql 트리거 필요)
+        
+        Args:
+            reconcile_interval: 데이터베이스 전체 집계와 재조정하는 주기(초)
+            recent_limit: 보관할 최근 검색/리포트 수 (더 많이 요청하면 데이터베이스 조회)
+            wait: 첫 재조정이 끝날 때까지 기다릴 최대 시간(초)
+            
+        Returns:
+            LiveDashboardListener
+            
+        Raises:
+            ValueError: retention_days가 트리거의 보존 기간(dashboard_live.NOTIFY_RETENTION_DAYS)과 다른 경우
+        """
+        from dashboard_live import LiveDashboardListener
+        
+        if self.live is None:
+            self.live = LiveDashboardListener(self.db_config, self.retention_days, reconcile_interval,
+                                              recent_limit).start(wait)
+            print(f"📡 실시간 카운터 {'준비 완료' if self.live.ready.is_set() else '준비 중'} "
+                  f"(재조정 주기 {reconcile_interval:.0f}초)")
+        return self.live
+    
+    def _live_json(self, analysis: str, source: str, user_id: str, limit: int):
+        """실시간 카운터로 만든 analysis_json() data (카운터로 답할 수 없으면 None)"""
+        if self.live is None or not self.live.ready.is_set() or self.snapshot is not None:
+            return None
+        counters = self.live.counters
+        if analysis == 'distribution':
+            return counters.distribution(source, user_id, limit or 20)
+        if analysis == 'recent':
+            return counters.recent(source, limit or 10)
+        if analysis == 'summary':
+            return counters.summary()
+        return None
+    
+    def _cursor(self):
+        """분석용 커서 (스냅샷 모드에서는 DB를 쓰지 않으므로 None)"""
+        return None if self.snapshot is not None else self.conn.cursor()
+    
+    def _rollback(self):
+        if self.snapshot is None:
+            self.conn.rollback()
+    
+    def enable_cache(self, max_entries: int = 256, ttl_seconds: float = 300.0,
+                     cache: AnalysisResultCache = None, watermark_interval: float = 5.0) -> AnalysisResultCache:
+        """
+        분석 결과 캐시 사용 설정
+        
+        Args:
+            max_entries: 최대 캐시 항목 수 (초과 시 가장 오래 사용하지 않은 항목 제거)
+            ttl_seconds: 항목 유효 시간(초). 100일 구간은 시간이 지나면 이동하므로 TTL로 상한을 둔다.
+            cache: 여러 분석기 인스턴스가 공유할 기존 캐시
+            watermark_interval: 테이블 버전을 다시 읽는 최소 간격(초)
+        """
+        self.cache = cache or AnalysisResultCache(max_entries, ttl_seconds, watermark_interval)
+        return self.cache
+    
+    def refresh_watermarks(self):
+        """캐시를 비우고 다음 조회에서 테이블 버전을 다시 읽도록 표시"""
+        if self.cache is not None:
+            self.cache.refresh_watermarks()
+    
+    # 캐시 워터마크 대상 테이블 -> created_at 인덱스로 최신 행 시각도 함께 읽는지 여부
+    WATERMARK_TABLES = {'users': False, 'search_history': True, 'ai_analysis_reports': True}
+    
+    def _read_table_versions(self, cursor) -> Dict[str, Tuple]:
+        """
+        WATERMARK_TABLES의 버전을 한 쿼리로 조회 (쓰기 경로에 트리거나 잠금을 추가하지 않음)
+        
+        버전은 (삽입, 수정, 삭제 누적 건수, relfilenode, 최신 created_at)이다.
+        - 최신 created_at: 인덱스 한 번 조회로 새 행을 커밋 즉시 반영
+        - pg_stat_user_tables 건수: 수정/삭제/과거 날짜 삽입 반영. 쓰기 연결이 통계를 내보낸 뒤에
+          보이므로 최대 10초 정도 늦을 수 있고, 롤백된 변경도 세어 불필요한 무효화가 생길 수 있다
+        - relfilenode: 건수를 올리지 않는 TRUNCATE 반영
+        
+        Returns:
+            {테이블 이름: 버전}
+        """
+        # 같은 트랜잭션 안에서는 통계 스냅샷이 고정되므로 매번 새로 읽도록 비움
+        cursor.execute("SELECT pg_stat_clear_snapshot()")
+        cursor.execute(" UNION ALL ".join(f"""
+            SELECT 
+                '{table}',
+                n_tup_ins,
+                n_tup_upd,
+                n_tup_del,
+                pg_relation_filenode(relid),
+                {f'(SELECT MAX(created_at) FROM {table})' if latest else 'NULL::timestamptz'}
+            FROM pg_stat_user_tables 
+            WHERE relid = to_regclass('{table}')
+        """ for table, latest in self.WATERMARK_TABLES.items()))
+        return {table: tuple(version) for table, *version in cursor.fetchall()}
+    
+    def _table_watermark(self, cursor, tables: Tuple[str, ...]) -> Tuple:
+        """
+        테이블별 버전 워터마크
+        
+        캐시가 watermark_interval마다 한 번만 읽으므로 조회마다 DB를 왕복하지 않는다.
+        """
+        versions = self.cache.table_versions(lambda: self._read_table_versions(cursor))
+        return tuple((table, versions.get(table)) for table in tables)
+    
+    def _cached_query(self, cursor, analysis: str, tables: Tuple[str, ...], fetch, user_id: str = None, *params):
+        """캐시가 설정되어 있으면 워터마크를 확인해 fetch() 결과를 재사용"""
+        if self.cache is None:
+            return fetch()
+        
+        key = (analysis, str(user_id) if user_id else None, self.retention_days, self.use_rollups) + params
+        if self.snapshot is not None:
+            watermark = ('snapshot', self.snapshot.snapshot_id)
+        else:
+            watermark = self._table_watermark(cursor, tables)
+        value = self.cache.get(key, watermark)
+        if value is None:
+            value = fetch()
+            self.cache.put(key, watermark, value)
+        return value
+    
+    def print_cache_stats(self):
+        """캐시 적중/미스 통계 출력"""
+        if self.cache is None:
+            return
+        stats = self.cache.stats()
+        print(f"🗄️  캐시: 적중 {stats['hits']:,}회 / 미스 {stats['misses']:,}회 (적중률 {stats['hit_rate']:.1f}%), "
+              f"무효화 {stats['invalidations']:,}회, 만료 {stats['expirations']:,}회, "
+              f"제거 {stats['evictions']:,}회, 항목 {stats['size']:,}개")
+    
+    # 보존 기간 정리 대상 테이블 (출력 순서 유지)
+    RETENTION_TABLES = ('search_history', 'ai_analysis_reports', 'user_activities')
+    
+    def cleanup_old_data(self, batch_size: int = None, sleep_seconds: float = 0.0,
+                         checkpoint_path: str = None) -> Dict[str, int]:
         """
         1. 100일 이상 된 데이터 자동 삭제
         
+        batch_size를 지정하면 (created_at, id) 키셋 순서로 batch_size개씩 나누어
+        삭제하고 배치마다 커밋한다. 잠금 시간과 WAL 폭증을 줄여 대시보드 조회와
+        동시에 실행할 수 있다.
+        
+        Args:
+            batch_size: 배치 크기 (None이면 테이블당 단일 DELETE)
+            sleep_seconds: 배치 사이 대기 시간(초)
+            checkpoint_path: 배치 모드 진행 위치를 저장할 JSON 파일 경로.
+                중단된 경우 다음 실행에서 마지막으로 커밋된 키 이후부터 재개한다.
+                키셋 탐색이 끝나면 처음부터 한 번 더 탐색해 그사이 과거 날짜로 삽입된 행도 지운다.
+            
         Returns:
             삭제된 레코드 수 정보
         """
@@ -73,6 +612,10 @@ class DashboardDataAnalyzer:
         print("="*60)
         
         cutoff_date = datetime.now() - timedelta(days=self.retention_days)
+        
+        if batch_size:
+            return self._cleanup_old_data_batched(cutoff_date, batch_size, sleep_seconds, checkpoint_path)
+        
         deleted_counts = {}
         
         try:
@@ -100,20 +643,134 @@ class DashboardDataAnalyzer:
             deleted_counts['user_activities'] = cursor.rowcount
             
             self.conn.commit()
+            self.refresh_watermarks()
+            
+            self._print_cleanup_result(cutoff_date, deleted_counts)
+            return deleted_counts
+            
+        except Exception as e:
+            print(f"❌ 데이터 정리 실패: {e}")
+            self.conn.rollback()
+            return {}
+    
+    def _cleanup_old_data_batched(self, cutoff_date: datetime, batch_size: int,
+                                  sleep_seconds: float, checkpoint_path: Optional[str]) -> Dict[str, int]:
+        """키셋 배치 단위 데이터 정리 (배치마다 커밋, 체크포인트로 재개 가능)"""
+        checkpoint = {}
+        if checkpoint_path and os.path.exists(checkpoint_path):
+            with open(checkpoint_path, 'r', encoding='utf-8') as f:
+                checkpoint = json.load(f)
+            print(f"♻️  체크포인트에서 재개: {checkpoint_path}")
+        
+        deleted_counts = {}
+        started = time.monotonic()
+        
+        try:
+            cursor = self.conn.cursor()
+            
+            for table in self.RETENTION_TABLES:
+                state = checkpoint.get(table, {})
+                last_key = (state['created_at'], state['id']) if state.get('id') else None
+                final_pass = state.get('final_pass', False)
+                keyset_used = False
+                deleted = state.get('deleted', 0)
+                table_started = time.monotonic()
+                batches = 0
+                
+                while True:
+                    # 삭제된 행은 다시 읽지 않도록 마지막 키 이후부터 탐색
+                    if last_key:
+                        keyset_used = True
+                        cursor.execute(f"""
+                            DELETE FROM {table}
+                            WHERE id IN (
+                                SELECT id FROM {table}
+                                WHERE created_at < %s
+                                    AND (created_at, id) > (%s, %s)
+                                ORDER BY created_at, id
+                                LIMIT %s
+                            )
+                            RETURNING created_at, id
+                        """, (cutoff_date, last_key[0], last_key[1], batch_size))
+                    else:
+                        cursor.execute(f"""
+                            DELETE FROM {table}
+                            WHERE id IN (
+                                SELECT id FROM {table}
+                                WHERE created_at < %s
+                                ORDER BY created_at, id
+                                LIMIT %s
+                            )
+                            RETURNING created_at, id
+                        """, (cutoff_date, batch_size))
+                    
+                    rows = cursor.fetchall()
+                    if rows:
+                        created_at, row_id = max(rows)
+                        last_key = (created_at.isoformat(), str(row_id))
+                        deleted += len(rows)
+                        checkpoint[table] = {'created_at': last_key[0], 'id': last_key[1], 'deleted': deleted,
+                                             'final_pass': final_pass}
+                    self.conn.commit()
+                    
+                    if rows:
+                        batches += 1
+                        if checkpoint_path:
+                            self._save_cleanup_checkpoint(checkpoint_path, checkpoint)
+                        if batches % 10 == 0:
+                            elapsed = time.monotonic() - table_started
+                            print(f"  ⏳ {table}: {deleted:,}개 삭제 ({deleted / elapsed if elapsed else 0:,.0f} rows/s)")
+                    
+                    if len(rows) < batch_size:
+                        # 키셋 위치보다 앞에 나중에 들어온 행(과거 날짜로 삽입된 행)은 키셋 탐색에서
+                        # 빠지므로, 마지막으로 처음부터 한 번 더 탐색한 뒤 끝낸다
+                        if final_pass or not keyset_used:
+                            break
+                        final_pass, last_key = True, None
+                        checkpoint[table] = {'deleted': deleted, 'final_pass': True}
+                        if checkpoint_path:
+                            self._save_cleanup_checkpoint(checkpoint_path, checkpoint)
+                        continue
+                    if sleep_seconds:
+                        time.sleep(sleep_seconds)
+                
+                deleted_counts[table] = deleted
+                elapsed = time.monotonic() - table_started
+                print(f"  ✔️  {table}: {deleted:,}개, {batches}배치, {elapsed:.1f}초 "
+                      f"({deleted / elapsed if elapsed else 0:,.0f} rows/s)")
+            
+            # 모든 테이블 정리가 끝나면 체크포인트 제거 (다음 실행은 처음부터)
+            if checkpoint_path and os.path.exists(checkpoint_path):
+                os.remove(checkpoint_path)
             
-            print(f"🗑️  기준 날짜: {cutoff_date.strftime('%Y-%m-%d %H:%M:%S')}")
-            print(f"📊 삭제된 검색 기록: {deleted_counts['search_history']:,}개")
-            print(f"📋 삭제된 AI 리포트: {deleted_counts['ai_analysis_reports']:,}개")
-            print(f"👤 삭제된 사용자 활동: {deleted_counts['user_activities']:,}개")
-            print(f"🔢 총 삭제된 레코드: {sum(deleted_counts.values()):,}개")
+            self.refresh_watermarks()
+            elapsed = time.monotonic() - started
+            self._print_cleanup_result(cutoff_date, deleted_counts)
+            print(f"⚡ 처리 속도: {sum(deleted_counts.values()) / elapsed if elapsed else 0:,.0f} rows/s ({elapsed:.1f}초)")
             
             return deleted_counts
             
         except Exception as e:
             print(f"❌ 데이터 정리 실패: {e}")
             self.conn.rollback()
+            if checkpoint_path:
+                print(f"♻️  마지막 커밋 위치가 저장되었습니다: {checkpoint_path}")
             return {}
     
+    def _save_cleanup_checkpoint(self, checkpoint_path: str, checkpoint: Dict):
+        # 임시 파일에 쓴 뒤 교체하여 중단 시에도 체크포인트가 손상되지 않도록 함
+        tmp_path = checkpoint_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(checkpoint, f, ensure_ascii=False)
+        os.replace(tmp_path, checkpoint_path)
+    
+    def _print_cleanup_result(self, cutoff_date: datetime, deleted_counts: Dict[str, int]):
+        print(f"🗑️  기준 날짜: {cutoff_date.strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"📊 삭제된 검색 기록: {deleted_counts['search_history']:,}개")
+        print(f"📋 삭제된 AI 리포트: {deleted_counts['ai_analysis_reports']:,}개")
+        print(f"👤 삭제된 사용자 활동: {deleted_counts['user_activities']:,}개")
+        print(f"🔢 총 삭제된 레코드: {sum(deleted_counts.values()):,}개")
+    
     def analyze_user_search_technology_fields(self, user_id: str = None) -> pd.DataFrame:
         """
         2. 검색 IPC/CPC 분석 - 개인 데이터 (검색 기술 분야별 분포)
@@ -129,55 +786,39 @@ class DashboardDataAnalyzer:
         print("="*60)
         
         try:
-            cursor = self.conn.cursor()
-            
-            if user_id:
-                query = """
-                    SELECT 
-                        COALESCE(technology_field, 'General') as field,
-                        COUNT(*) as search_count,
-                        ROUND(COUNT(*) * 100.0 / SUM(COUNT(*)) OVER(), 2) as percentage
-                    FROM search_history 
-                    WHERE user_id = %s 
-                        AND created_at >= NOW() - INTERVAL '%s days'
-                    GROUP BY technology_field
-                    ORDER BY search_count DESC
-                """
-                cursor.execute(query, (user_id, self.retention_days))
-            else:
-                # 첫 번째 사용자 ID 가져오기
-                cursor.execute("SELECT id FROM users LIMIT 1")
-                result = cursor.fetchone()
-                if not result:
-                    print("❌ 사용자 데이터가 없습니다.")
-                    return pd.DataFrame()
+            cursor = self._cursor()
+            
+            # user_id가 없으면 첫 번째 사용자 ID 사용
+            user_id = self._resolve_user_id(cursor, user_id)
+            if not user_id:
+                print("❌ 사용자 데이터가 없습니다.")
+                return pd.DataFrame()
+            
+            def fetch():
+                if self.snapshot is not None:
+                    return self.snapshot.field_distribution_rows('search', self.retention_days, user_id)
+                if self.use_rollups:
+                    self._execute_rollup_distribution(cursor, 'search', user_id)
+                else:
+                    query = """
+                        SELECT 
+                            COALESCE(technology_field, 'General') as field,
+                            COUNT(*) as search_count,
+                            ROUND(COUNT(*) * 100.0 / SUM(COUNT(*)) OVER(), 2) as percentage
+                        FROM search_history 
+                        WHERE user_id = %s 
+                            AND created_at >= NOW() - INTERVAL '%s days'
+                        GROUP BY technology_field
+                        ORDER BY search_count DESC
+                    """
+                    cursor.execute(query, (user_id, self.retention_days))
                 
-                user_id = result[0]
-                query = """
-                    SELECT 
-                        COALESCE(technology_field, 'General') as field,
-                        COUNT(*) as search_count,
-                        ROUND(COUNT(*) * 100.0 / SUM(COUNT(*)) OVER(), 2) as percentage
-                    FROM search_history 
-                    WHERE user_id = %s 
-                        AND created_at >= NOW() - INTERVAL '%s days'
-                    GROUP BY technology_field
-                    ORDER BY search_count DESC
-                """
-                cursor.execute(query, (user_id, self.retention_days))
-            
-            results = cursor.fetchall()
-            df = pd.DataFrame(results, columns=['기술분야', '검색수', '비율(%)'])
+                return cursor.fetchall()
             
-            print(f"👤 분석 대상 사용자: {user_id}")
-            print(f"📊 개인 검색 기술 분야 분포:")
-            print("-" * 50)
-            for _, row in df.iterrows():
-                print(f"  {row['기술분야']:<20} {row['검색수']:>5}회 ({row['비율(%)']:>5.1f}%)")
-            
-            if df.empty:
-                print("📝 검색 데이터가 없습니다.")
+            results = self._cached_query(cursor, 'user_search', ('search_history',), fetch, user_id)
+            df = pd.DataFrame(results, columns=['기술분야', '검색수', '비율(%)'])
             
+            self._print_user_search_distribution(user_id, df)
             return df
             
         except Exception as e:
@@ -196,32 +837,33 @@ class DashboardDataAnalyzer:
         print("="*60)
         
         try:
-            cursor = self.conn.cursor()
-            
-            query = """
-                SELECT 
-                    COALESCE(technology_field, 'General') as field,
-                    COUNT(*) as search_count,
-                    ROUND(COUNT(*) * 100.0 / SUM(COUNT(*)) OVER(), 2) as percentage
-                FROM search_history 
-                WHERE created_at >= NOW() - INTERVAL '%s days'
-                GROUP BY technology_field
-                ORDER BY search_count DESC
-                LIMIT 20
-            """
-            cursor.execute(query, (self.retention_days,))
+            cursor = self._cursor()
+            
+            def fetch():
+                if self.snapshot is not None:
+                    return self.snapshot.field_distribution_rows('search', self.retention_days, limit=20)
+                if self.use_rollups:
+                    self._execute_rollup_distribution(cursor, 'search', limit=20)
+                else:
+                    query = """
+                        SELECT 
+                            COALESCE(technology_field, 'General') as field,
+                            COUNT(*) as search_count,
+                            ROUND(COUNT(*) * 100.0 / SUM(COUNT(*)) OVER(), 2) as percentage
+                        FROM search_history 
+                        WHERE created_at >= NOW() - INTERVAL '%s days'
+                        GROUP BY technology_field
+                        ORDER BY search_count DESC
+                        LIMIT 20
+                    """
+                    cursor.execute(query, (self.retention_days,))
+                
+                return cursor.fetchall()
             
-            results = cursor.fetchall()
+            results = self._cached_query(cursor, 'market_search', ('search_history',), fetch)
             df = pd.DataFrame(results, columns=['기술분야', '검색수', '비율(%)'])
             
-            print(f"🏢 시장 전체 검색 기술 분야 분포 (상위 20개):")
-            print("-" * 50)
-            for _, row in df.iterrows():
-                print(f"  {row['기술분야']:<20} {row['검색수']:>6}회 ({row['비율(%)']:>5.1f}%)")
-            
-            if df.empty:
-                print("📝 시장 검색 데이터가 없습니다.")
-            
+            self._print_market_search_distribution(df)
             return df
             
         except Exception as e:
@@ -243,55 +885,39 @@ class DashboardDataAnalyzer:
         print("="*60)
         
         try:
-            cursor = self.conn.cursor()
-            
-            if user_id:
-                query = """
-                    SELECT 
-                        COALESCE(technology_field, 'General') as field,
-                        COUNT(*) as report_count,
-                        ROUND(COUNT(*) * 100.0 / SUM(COUNT(*)) OVER(), 2) as percentage
-                    FROM ai_analysis_reports 
-                    WHERE user_id = %s 
-                        AND created_at >= NOW() - INTERVAL '%s days'
-                    GROUP BY technology_field
-                    ORDER BY report_count DESC
-                """
-                cursor.execute(query, (user_id, self.retention_days))
-            else:
-                # 첫 번째 사용자 ID 가져오기
-                cursor.execute("SELECT id FROM users LIMIT 1")
-                result = cursor.fetchone()
-                if not result:
-                    print("❌ 사용자 데이터가 없습니다.")
-                    return pd.DataFrame()
+            cursor = self._cursor()
+            
+            # user_id가 없으면 첫 번째 사용자 ID 사용
+            user_id = self._resolve_user_id(cursor, user_id)
+            if not user_id:
+                print("❌ 사용자 데이터가 없습니다.")
+                return pd.DataFrame()
+            
+            def fetch():
+                if self.snapshot is not None:
+                    return self.snapshot.field_distribution_rows('report', self.retention_days, user_id)
+                if self.use_rollups:
+                    self._execute_rollup_distribution(cursor, 'report', user_id)
+                else:
+                    query = """
+                        SELECT 
+                            COALESCE(technology_field, 'General') as field,
+                            COUNT(*) as report_count,
+                            ROUND(COUNT(*) * 100.0 / SUM(COUNT(*)) OVER(), 2) as percentage
+                        FROM ai_analysis_reports 
+                        WHERE user_id = %s 
+                            AND created_at >= NOW() - INTERVAL '%s days'
+                        GROUP BY technology_field
+                        ORDER BY report_count DESC
+                    """
+                    cursor.execute(query, (user_id, self.retention_days))
                 
-                user_id = result[0]
-                query = """
-                    SELECT 
-                        COALESCE(technology_field, 'General') as field,
-                        COUNT(*) as report_count,
-                        ROUND(COUNT(*) * 100.0 / SUM(COUNT(*)) OVER(), 2) as percentage
-                    FROM ai_analysis_reports 
-                    WHERE user_id = %s 
-                        AND created_at >= NOW() - INTERVAL '%s days'
-                    GROUP BY technology_field
-                    ORDER BY report_count DESC
-                """
-                cursor.execute(query, (user_id, self.retention_days))
-            
-            results = cursor.fetchall()
-            df = pd.DataFrame(results, columns=['기술분야', '리포트수', '비율(%)'])
-            
-            print(f"👤 분석 대상 사용자: {user_id}")
-            print(f"📊 개인 리포트 기술 분야 분포:")
-            print("-" * 50)
-            for _, row in df.iterrows():
-                print(f"  {row['기술분야']:<20} {row['리포트수']:>5}개 ({row['비율(%)']:>5.1f}%)")
+                return cursor.fetchall()
             
-            if df.empty:
-                print("📝 리포트 데이터가 없습니다.")
+            results = self._cached_query(cursor, 'user_report', ('ai_analysis_reports',), fetch, user_id)
+            df = pd.DataFrame(results, columns=['기술분야', '리포트수', '비율(%)'])
             
+            self._print_user_report_distribution(user_id, df)
             return df
             
         except Exception as e:
@@ -310,165 +936,1550 @@ class DashboardDataAnalyzer:
         print("="*60)
         
         try:
-            cursor = self.conn.cursor()
-            
-            query = """
-                SELECT 
-                    COALESCE(technology_field, 'General') as field,
-                    COUNT(*) as report_count,
-                    ROUND(COUNT(*) * 100.0 / SUM(COUNT(*)) OVER(), 2) as percentage
-                FROM ai_analysis_reports 
-                WHERE created_at >= NOW() - INTERVAL '%s days'
-                GROUP BY technology_field
-                ORDER BY report_count DESC
-                LIMIT 20
-            """
-            cursor.execute(query, (self.retention_days,))
+            cursor = self._cursor()
+            
+            def fetch():
+                if self.snapshot is not None:
+                    return self.snapshot.field_distribution_rows('report', self.retention_days, limit=20)
+                if self.use_rollups:
+                    self._execute_rollup_distribution(cursor, 'report', limit=20)
+                else:
+                    query = """
+                        SELECT 
+                            COALESCE(technology_field, 'General') as field,
+                            COUNT(*) as report_count,
+                            ROUND(COUNT(*) * 100.0 / SUM(COUNT(*)) OVER(), 2) as percentage
+                        FROM ai_analysis_reports 
+                        WHERE created_at >= NOW() - INTERVAL '%s days'
+                        GROUP BY technology_field
+                        ORDER BY report_count DESC
+                        LIMIT 20
+                    """
+                    cursor.execute(query, (self.retention_days,))
+                
+                return cursor.fetchall()
             
-            results = cursor.fetchall()
+            results = self._cached_query(cursor, 'market_report', ('ai_analysis_reports',), fetch)
             df = pd.DataFrame(results, columns=['기술분야', '리포트수', '비율(%)'])
             
-            print(f"🏢 시장 전체 리포트 기술 분야 분포 (상위 20개):")
-            print("-" * 50)
-            for _, row in df.iterrows():
-                print(f"  {row['기술분야']:<20} {row['리포트수']:>6}개 ({row['비율(%)']:>5.1f}%)")
-            
-            if df.empty:
-                print("📝 시장 리포트 데이터가 없습니다.")
-            
+            self._print_market_report_distribution(df)
             return df
             
         except Exception as e:
             print(f"❌ 시장 리포트 분석 실패: {e}")
             return pd.DataFrame()
     
-    def get_recent_searches(self, limit: int = 10) -> List[Dict]:
+    def analyze_ipc_hierarchy(self, user_id: str = None, source: str = 'search',
+                              top_k: int = 10) -> Dict:
         """
-        6. 최근 검색어 10개 출력
+        IPC/CPC 코드 계층별 분석 - 개인/시장 데이터
+        
+        ipc_codes 배열을 보존 기간 내에서 한 번만 unnest하여 코드별 개인/시장 건수를
+        집계한 뒤 IPCPrefixTree에 넣어 모든 계층을 동시에 계산한다. 반환된 트리의
+        drill_down()으로 하위 계층을 조회해도 추가 DB 스캔이 없다.
         
         Args:
-            limit: 출력할 검색어 개수
+            user_id: 분석할 사용자 ID (None이면 첫 번째 사용자)
+            source: 'search'(검색 기록) 또는 'report'(AI 리포트)
+            top_k: 계층별 상위 코드 수
             
         Returns:
-            최근 검색어 목록
+            {'tree': IPCPrefixTree, 'levels': {계층: {'user': DataFrame, 'market': DataFrame}}}
         """
+        table, _ = self.FIELD_SOURCES[source]
+        
         print("\n" + "="*60)
-        print("🔍 6. 최근 검색어 목록")
+        print(f"🧬 {'검색' if source == 'search' else '리포트'} IPC/CPC 계층 분석")
         print("="*60)
         
         try:
-            cursor = self.conn.cursor()
-            
-            query = """
-                SELECT 
-                    keyword,
-                    technology_field,
-                    created_at,
-                    user_id
-                FROM search_history 
-                WHERE created_at >= NOW() - INTERVAL '%s days'
-                ORDER BY created_at DESC 
-                LIMIT %s
-            """
-            cursor.execute(query, (self.retention_days, limit))
-            
-            results = cursor.fetchall()
-            searches = []
-            
-            print(f"📝 최근 검색어 {limit}개:")
-            print("-" * 80)
-            print(f"{'순번':<4} {'검색어':<25} {'기술분야':<15} {'검색시간':<20}")
-            print("-" * 80)
-            
-            for i, (keyword, tech_field, created_at, user_id) in enumerate(results, 1):
-                search_data = {
-                    'rank': i,
-                    'keyword': keyword,
-                    'technology_field': tech_field or 'General',
-                    'created_at': created_at.strftime('%Y-%m-%d %H:%M:%S'),
-                    'user_id': str(user_id)
-                }
-                searches.append(search_data)
-                
-                print(f"{i:<4} {keyword:<25} {tech_field or 'General':<15} {created_at.strftime('%Y-%m-%d %H:%M'):<20}")
+            cursor = self._cursor()
+            user_id = self._resolve_user_id(cursor, user_id)
             
-            if not searches:
-                print("📝 최근 검색 데이터가 없습니다.")
-            
-            return searches
+            if self.snapshot is not None:
+                code_counts = self.snapshot.ipc_code_counts(source, self.retention_days, user_id)
+            else:
+                cursor.execute(f"""
+                    SELECT 
+                        UPPER(code) as code,
+                        COUNT(*) FILTER (WHERE user_id = %s) as user_count,
+                        COUNT(*) as market_count
+                    FROM {table}, unnest(ipc_codes) as code
+                    WHERE created_at >= NOW() - INTERVAL '%s days'
+                    GROUP BY UPPER(code)
+                """, (user_id, self.retention_days))
+                code_counts = cursor.fetchall()
+            
+            tree = IPCPrefixTree()
+            skipped = 0
+            for code, user_count, market_count in code_counts:
+                if not tree.add(code, user_count, market_count):
+                    skipped += 1
             
         except Exception as e:
-            print(f"❌ 최근 검색어 조회 실패: {e}")
-            return []
+            print(f"❌ IPC 계층 분석 실패: {e}")
+            self._rollback()
+            return {}
+        
+        levels = {
+            level: {'user': tree.top_k(level, 'user', top_k), 'market': tree.top_k(level, 'market', top_k)}
+            for level in IPCPrefixTree.LEVELS
+        }
+        
+        print(f"👤 분석 대상 사용자: {user_id}")
+        print(f"📊 IPC 코드 출현 수: 개인 {tree.root['counts']['user']:,}회 / 시장 {tree.root['counts']['market']:,}회")
+        if skipped:
+            print(f"⚠️  형식이 맞지 않아 제외된 코드: {skipped:,}개")
+        for level in IPCPrefixTree.LEVELS:
+            user_top = levels[level]['user']
+            market_top = levels[level]['market']
+            print(f"  [{IPCPrefixTree.LEVEL_NAMES[level]}] "
+                  f"개인: {', '.join(user_top['IPC코드'].head(3)) or '-'} | "
+                  f"시장: {', '.join(market_top['IPC코드'].head(3)) or '-'}")
+        
+        return {'tree': tree, 'levels': levels}
     
-    def get_recent_reports(self, limit: int = 10) -> List[Dict]:
+    def _incremental_start_day(self, cursor, days: List[date], drop) -> date:
         """
-        7. 최근 리포트 10개 출력 (특허명_특허번호_시장분석/비즈니스인사이트_날짜)
+        일별 증분 갱신에서 다시 읽을 첫 날짜(UTC)
+        
+        마지막으로 반영한 날짜는 당일 부분 데이터였을 수 있으므로 그 날짜부터 다시 읽는다.
+        보존 기간 시작일 이전 날짜와 다시 읽을 날짜는 drop(day)으로 먼저 제거하므로, 다시 읽은
+        뒤 행이 없는 날짜(모두 삭제됨)도 남지 않는다.
         
         Args:
-            limit: 출력할 리포트 개수
+            cursor: 데이터베이스 커서
+            days: 이미 반영한 날짜 목록
+            drop: 날짜 하나를 제거하는 함수
             
         Returns:
-            최근 리포트 목록
+            원본을 다시 읽을 첫 날짜
         """
-        print("\n" + "="*60)
-        print("📋 7. 최근 리포트 목록")
-        print("="*60)
+        cursor.execute("""
+            SELECT ((NOW() - INTERVAL '%s days') AT TIME ZONE 'UTC')::date
+        """, (self.retention_days,))
+        cutoff_day = cursor.fetchone()[0]
+        start_day = max(max(days), cutoff_day) if days else cutoff_day
+        for day in days:
+            if day < cutoff_day or day >= start_day:
+                drop(day)
+        return start_day
+    
+    def refresh_daily_sketches(self, source: str = 'search') -> int:
+        """
+        일별 스케치 증분 갱신
         
-        try:
-            cursor = self.conn.cursor()
-            
-            query = """
+        마지막으로 만든 날짜(당일은 부분 데이터이므로 다시 계산)부터 오늘까지만 원본을
+        GROUPING SETS로 한 번 스캔하여 (날짜, 사용자) / (날짜, 기술 분야) / (날짜, 검색어)별
+        건수를 받아 스케치에 넣는다. 보존 기간 이전 날짜의 스케치는 버린다.
+        
+        Returns:
+            새로 만든 일별 스케치 수
+        """
+        table, _ = self.FIELD_SOURCES[source]
+        sketches = self._daily_sketches.setdefault(source, {})
+        keyword_column = 'keyword' if source == 'search' else 'NULL::text'
+        
+        cursor = self.conn.cursor()
+        start_day = self._incremental_start_day(cursor, list(sketches), sketches.pop)
+        
+        cursor.execute(f"""
+            SELECT 
+                day,
+                GROUPING(user_id) = 0 as by_user,
+                GROUPING(field) = 0 as by_field,
+                GROUPING(keyword) = 0 as by_keyword,
+                user_id,
+                field,
+                keyword,
+                COUNT(*)
+            FROM (
                 SELECT 
-                    invention_title,
-                    application_number,
-                    analysis_type,
-                    technology_field,
-                    created_at,
-                    user_id
-                FROM ai_analysis_reports 
-                WHERE created_at >= NOW() - INTERVAL '%s days'
-                ORDER BY created_at DESC 
-                LIMIT %s
-            """
-            cursor.execute(query, (self.retention_days, limit))
-            
-            results = cursor.fetchall()
-            reports = []
-            
-            print(f"📄 최근 리포트 {limit}개:")
-            print("-" * 100)
-            print(f"{'순번':<4} {'리포트명':<50} {'기술분야':<15} {'생성시간':<20}")
-            print("-" * 100)
-            
-            for i, (title, app_num, analysis_type, tech_field, created_at, user_id) in enumerate(results, 1):
-                # 리포트명 형식: 특허명_특허번호_분석타입_날짜
-                report_name = f"{title or '특허분석'}_{app_num or 'N/A'}_{analysis_type or '시장분석'}_{created_at.strftime('%Y%m%d')}"
-                
-                report_data = {
-                    'rank': i,
-                    'report_name': report_name,
-                    'invention_title': title,
-                    'application_number': app_num,
-                    'analysis_type': analysis_type or '시장분석',
-                    'technology_field': tech_field or 'General',
-                    'created_at': created_at.strftime('%Y-%m-%d %H:%M:%S'),
-                    'user_id': str(user_id)
-                }
-                reports.append(report_data)
+                    (created_at AT TIME ZONE 'UTC')::date as day,
+                    user_id,
+                    COALESCE(technology_field, 'General') as field,
+                    {keyword_column} as keyword
+                FROM {table} 
+                WHERE created_at >= (%s::date::timestamp AT TIME ZONE 'UTC')
+            ) rows
+            GROUP BY GROUPING SETS ((day), (day, user_id), (day, field), (day, keyword))
+        """, (start_day,))
+        
+        created = 0
+        for day, by_user, by_field, by_keyword, user_id, field, keyword, count in cursor:
+            sketch = sketches.get(day)
+            if sketch is None:
+                sketch = sketches[day] = DailySketch()
+                created += 1
+            if by_user:
+                if user_id is not None:
+                    sketch.add_user(str(user_id))
+            elif by_field:
+                sketch.add_field(field, count)
+            elif by_keyword:
+                if keyword is not None:
+                    sketch.add_keyword(keyword, count)
+            else:
+                sketch.total += count
+        return created
+    
+    def approximate_summary(self, source: str = 'search', top_n: int = 10, field: str = None) -> Dict:
+        """
+        근사 분석 모드 - 일별 스케치를 병합한 보존 기간 통계 (오차 범위 포함)
+        
+        고유 사용자/기술 분야 수는 HyperLogLog, 상위 기술 분야/검색어는 Count-Min과
+        Space-Saving으로 추정한다. 전체 건수는 일별 정확한 합계이다.
+        구간은 보존 기간 시작일(UTC) 전체를 포함하는 일 단위이다.
+        
+        Args:
+            source: 'search'(검색 기록) 또는 'report'(AI 리포트)
+            top_n: 상위 항목 수
+            field: 지정하면 해당 기술 분야의 빈도 추정값도 반환
+            
+        Returns:
+            근사 통계 딕셔너리 (각 값에 error/lower_bound 포함)
+        """
+        self._print_section(f"📐 근사 요약 ({'검색' if source == 'search' else '리포트'}, 스케치 기반)")
+        
+        try:
+            created = self.refresh_daily_sketches(source)
+        except Exception as e:
+            print(f"❌ 스케치 갱신 실패: {e}")
+            self.conn.rollback()
+            return {}
+        
+        daily = self._daily_sketches[source]
+        merged = DailySketch()
+        for sketch in daily.values():
+            merged.merge(sketch)
+        summary = merged.summary(top_n, field)
+        summary['days'] = len(daily)
+        
+        users = summary['distinct_users']
+        fields = summary['distinct_fields']
+        print(f"🧮 일별 스케치: {len(daily)}일 병합 (새로 계산 {created}일)")
+        print(f"🔢 총 건수: {summary['total']:,}")
+        print(f"👥 고유 사용자 수: ~{users['estimate']:,}명 (±{users['error']:,}, 95%)")
+        print(f"🏷️  기술 분야 수: ~{fields['estimate']:,}개 (±{fields['error']:,}, 95%)")
+        print(f"📊 상위 기술 분야 (빈도 오차 ≤ {summary['field_count_error_bound']:,.0f}, "
+              f"신뢰도 {summary['confidence'] * 100:.0f}%):")
+        for item in summary['top_fields']:
+            print(f"  {item['value']:<20} {item['lower_bound']:>8,} ~ {item['count']:>8,}")
+        if summary['top_keywords']:
+            print(f"🔍 상위 검색어 (빈도 오차 ≤ {summary['keyword_count_error_bound']:,.0f}):")
+            for item in summary['top_keywords']:
+                print(f"  {item['value']:<25} {item['lower_bound']:>8,} ~ {item['count']:>8,}")
+        
+        return summary
+    
+    # 추이 집계 범위: market(시장 전체), user(사용자별), field(기술 분야별)
+    TREND_SCOPES = ('market', 'user', 'field')
+    
+    def refresh_trends(self, source: str = 'search') -> int:
+        """
+        일별 추이 건수 증분 갱신
+        
+        _incremental_start_day로 정한 마지막 날짜(부분 데이터)부터 오늘까지만
+        GROUPING SETS로 한 번 스캔하여 날짜별 시장 / 사용자별 / 기술 분야별 건수를 저장한다.
+        하루가 지나면 새 하루치만 읽고, 보존 기간을 벗어난 날짜는 버린다.
+        
+        Returns:
+            새로 계산한 일 수
+        """
+        table, _ = self.FIELD_SOURCES[source]
+        daily = self._trend_daily.setdefault(source, {})
+        
+        cursor = self.conn.cursor()
+        start_day = self._incremental_start_day(cursor, list(daily), daily.pop)
+        
+        cursor.execute(f"""
+            SELECT 
+                day,
+                GROUPING(user_id) = 0 as by_user,
+                GROUPING(field) = 0 as by_field,
+                user_id,
+                field,
+                COUNT(*)
+            FROM (
+                SELECT 
+                    (created_at AT TIME ZONE 'UTC')::date as day,
+                    user_id,
+                    COALESCE(technology_field, 'General') as field
+                FROM {table} 
+                WHERE created_at >= (%s::date::timestamp AT TIME ZONE 'UTC')
+            ) rows
+            GROUP BY GROUPING SETS ((day), (day, user_id), (day, field))
+        """, (start_day,))
+        
+        created = set()
+        for day, by_user, by_field, user_id, field, count in cursor:
+            counts = daily.setdefault(day, {})
+            created.add(day)
+            if by_user:
+                if user_id is not None:
+                    counts[('user', str(user_id))] = count
+            elif by_field:
+                counts[('field', field)] = count
+            else:
+                counts[('market', 'market')] = count
+        return len(created)
+    
+    def trend_frame(self, scope: str = 'market', freq: str = 'D', key: str = None,
+                    refresh: bool = True) -> pd.DataFrame:
+        """
+        검색/리포트 추이와 검색→리포트 전환율 시계열
+        
+        전환율은 같은 기간의 리포트 수 / 검색 수 * 100 이다 (검색이 없으면 NaN).
+        보존 기간의 모든 날짜(주)를 채우므로 건수가 없는 기간은 0으로 나온다.
+        
+        Args:
+            scope: 'market'(시장 전체), 'user'(사용자별), 'field'(기술 분야별)
+            freq: 'D'(일별) 또는 'W'(월요일 시작 주별)
+            key: 특정 사용자 ID 또는 기술 분야만 반환
+            refresh: True이면 먼저 refresh_trends()로 새 날짜를 반영
+            
+        Returns:
+            key, period, searches, reports, conversion_rate 컬럼 DataFrame
+        """
+        if scope not in self.TREND_SCOPES:
+            raise ValueError(f"지원하지 않는 추이 범위입니다: {scope}")
+        if refresh:
+            for source in self.FIELD_SOURCES:
+                self.refresh_trends(source)
+        
+        records = [
+            (source, day, item_key, count)
+            for source, daily in self._trend_daily.items()
+            for day, counts in daily.items()
+            for (item_scope, item_key), count in counts.items()
+            if item_scope == scope and (key is None or item_key == key)
+        ]
+        columns = ['key', 'period', 'searches', 'reports', 'conversion_rate']
+        days = sorted({day for daily in self._trend_daily.values() for day in daily})
+        if not records or not days:
+            return pd.DataFrame(columns=columns)
+        
+        df = pd.DataFrame(records, columns=['source', 'period', 'key', 'count'])
+        df['period'] = pd.to_datetime(df['period'])
+        counts = df.pivot_table(index=['key', 'period'], columns='source', values='count',
+                                aggfunc='sum', fill_value=0)
+        counts = counts.reindex(columns=['search', 'report'], fill_value=0)
+        counts.columns.name = None
+        
+        # 건수가 없는 날짜도 0으로 채운 전체 구간
+        periods = pd.date_range(days[0], days[-1], freq='D')
+        full_index = pd.MultiIndex.from_product([counts.index.levels[0], periods], names=['key', 'period'])
+        counts = counts.reindex(full_index, fill_value=0).reset_index()
+        if freq == 'W':
+            counts['period'] = counts['period'].dt.to_period('W-SUN').dt.start_time
+            counts = counts.groupby(['key', 'period'], as_index=False)[['search', 'report']].sum()
+        elif freq != 'D':
+            raise ValueError(f"지원하지 않는 주기입니다: {freq}")
+        
+        counts = counts.rename(columns={'search': 'searches', 'report': 'reports'})
+        searches = counts['searches'].where(counts['searches'] > 0)
+        counts['conversion_rate'] = (counts['reports'] * 100.0 / searches).round(2)
+        return counts[columns].sort_values(['key', 'period']).reset_index(drop=True)
+    
+    def analyze_trends(self, user_id: str = None, freq: str = 'W', top_fields: int = 5) -> Dict[str, pd.DataFrame]:
+        """
+        검색추이 - 검색전환율 / 리포트추이 - 리포트전환율 분석
+        
+        Args:
+            user_id: 분석할 사용자 ID (None이면 첫 번째 사용자)
+            freq: 'D'(일별) 또는 'W'(주별)
+            top_fields: 출력할 기술 분야 수 (검색 수 기준)
+            
+        Returns:
+            market, user, field 추이 DataFrame 딕셔너리
+        """
+        period_name = '주별' if freq == 'W' else '일별'
+        self._print_section(f"📈 검색/리포트 추이 및 전환율 ({period_name})")
+        
+        try:
+            user_id = self._resolve_user_id(self.conn.cursor(), user_id)
+            market = self.trend_frame('market', freq)
+            user = self.trend_frame('user', freq, key=user_id, refresh=False) if user_id else pd.DataFrame()
+            fields = self.trend_frame('field', freq, refresh=False)
+        except Exception as e:
+            print(f"❌ 추이 분석 실패: {e}")
+            self.conn.rollback()
+            return {}
+        
+        def print_series(title: str, df: pd.DataFrame):
+            print(f"\n{title}")
+            print(f"{'기간':<12} {'검색수':>8} {'리포트수':>8} {'전환율':>8}")
+            print("-" * 40)
+            for _, row in df.iterrows():
+                rate = '-' if pd.isna(row['conversion_rate']) else f"{row['conversion_rate']:.1f}%"
+                print(f"{row['period'].strftime('%Y-%m-%d'):<12} {row['searches']:>8,} {row['reports']:>8,} {rate:>8}")
+        
+        print_series("🌐 시장 전체", market)
+        if not user.empty:
+            print_series(f"👤 사용자 {user_id}", user)
+        
+        if not fields.empty:
+            totals = fields.groupby('key')[['searches', 'reports']].sum()
+            totals = totals.sort_values('searches', ascending=False).head(top_fields)
+            print(f"\n🏷️  기술 분야별 전환율 (상위 {len(totals)}개, 전체 기간)")
+            for field, row in totals.iterrows():
+                rate = row['reports'] * 100.0 / row['searches'] if row['searches'] else 0.0
+                print(f"  {field:<20} 검색 {row['searches']:>8,} / 리포트 {row['reports']:>7,} → {rate:.1f}%")
+        
+        return {'market': market, 'user': user, 'field': fields}
+    
+    def refresh_keyword_index(self, path: str = None) -> int:
+        """
+        검색어 인덱스 증분 갱신
+        
+        마지막 날짜(부분 데이터)부터 오늘까지만 (날짜, 사용자, 기술 분야, 검색어)별 건수를
+        읽어 정규화한 뒤 인덱스에 반영하고, 보존 기간 이전 날짜는 제거한다.
+        
+        Args:
+            path: 지정하면 인덱스를 이 JSON 파일에서 불러오고 갱신 후 다시 저장
+            
+        Returns:
+            새로 반영한 일 수
+        """
+        if self.keyword_index is None:
+            self.keyword_index = KeywordIndex.load(path) if path and os.path.exists(path) else KeywordIndex()
+        index = self.keyword_index
+        
+        cursor = self.conn.cursor()
+        start_day = self._incremental_start_day(cursor, index.days, index.drop_day)
+        
+        cursor.execute("""
+            SELECT 
+                (created_at AT TIME ZONE 'UTC')::date as day,
+                user_id,
+                technology_field,
+                keyword,
+                COUNT(*)
+            FROM search_history 
+            WHERE created_at >= (%s::date::timestamp AT TIME ZONE 'UTC')
+                AND keyword IS NOT NULL
+            GROUP BY 1, 2, 3, 4
+            ORDER BY 1
+        """, (start_day,))
+        
+        refreshed = 0
+        for day, rows in groupby(cursor, key=lambda row: row[0]):
+            index.replace_day(day, (row[1:] for row in rows))
+            refreshed += 1
+        
+        if path:
+            index.save(path)
+        return refreshed
+    
+    def keyword_insights(self, user_id: str = None, field: str = None, n: int = 10,
+                         period_days: int = 7) -> Dict[str, List[Dict]]:
+        """
+        인덱스에서 상위/급상승 검색어 조회 (원본 테이블 스캔 없음)
+        
+        Args:
+            user_id: 사용자 ID (user_id와 field가 모두 None이면 시장 전체)
+            field: 기술 분야
+            n: 검색어 수
+            period_days: 급상승 비교 기간(일)
+            
+        Returns:
+            top, rising 검색어 목록 딕셔너리
+        """
+        if self.keyword_index is None:
+            self.refresh_keyword_index()
+        if user_id:
+            scope = scope_name('user', str(user_id))
+        elif field:
+            scope = scope_name('field', field)
+        else:
+            scope = 'market'
+        return {
+            'scope': scope,
+            'top': self.keyword_index.top(scope, n),
+            'rising': self.keyword_index.rising(scope, period_days, n),
+        }
+    
+    def analyze_keywords(self, user_id: str = None, n: int = 10, period_days: int = 7,
+                         index_path: str = None) -> Dict:
+        """
+        인기 검색어 / 급상승 검색어 / 기술 분야별 검색어 분석
+        
+        Args:
+            user_id: 분석할 사용자 ID (None이면 첫 번째 사용자)
+            n: 출력할 검색어 수
+            period_days: 급상승 비교 기간(일)
+            index_path: 인덱스 저장 파일 (지정하면 불러와서 증분 갱신 후 저장)
+            
+        Returns:
+            market, user, fields 분석 결과 딕셔너리
+        """
+        self._print_section("🔑 검색어 분석 (정규화 인덱스)")
+        
+        try:
+            refreshed = self.refresh_keyword_index(index_path)
+            user_id = self._resolve_user_id(self.conn.cursor(), user_id)
+        except Exception as e:
+            print(f"❌ 검색어 인덱스 갱신 실패: {e}")
+            self.conn.rollback()
+            return {}
+        
+        market = self.keyword_insights(n=n, period_days=period_days)
+        user = self.keyword_insights(user_id, n=n, period_days=period_days) if user_id else {}
+        fields = self.keyword_index.field_keywords(n=3)
+        print(f"🗂️  인덱스: {len(self.keyword_index.days)}일 (새로 반영 {refreshed}일)")
+        
+        def print_top(title: str, items: List[Dict]):
+            print(f"\n{title}")
+            for rank, item in enumerate(items, 1):
+                print(f"{rank:>3}. {item['keyword']:<30} {item['count']:>8,}회")
+        
+        print_top("🔥 시장 인기 검색어", market['top'])
+        if user:
+            print_top(f"👤 사용자 {user_id} 인기 검색어", user['top'])
+        
+        print(f"\n📈 급상승 검색어 (최근 {period_days}일 vs 이전 {period_days}일)")
+        for rank, item in enumerate(market['rising'], 1):
+            print(f"{rank:>3}. {item['keyword']:<30} {item['previous_count']:>6,} → {item['count']:>6,}회 "
+                  f"(+{item['growth'] * 100:.0f}%)")
+        
+        print("\n🏷️  기술 분야별 검색어")
+        for field, items in fields.items():
+            print(f"  {field:<20} {', '.join(item['keyword'] for item in items)}")
+        
+        return {'market': market, 'user': user, 'fields': fields}
+    
+    # 기술 분야 분석 대상: source -> (테이블, 건수 컬럼명)
+    FIELD_SOURCES = {
+        'search': ('search_history', '검색수'),
+        'report': ('ai_analysis_reports', '리포트수'),
+    }
+    
+    @staticmethod
+    def hash_shards(count: int) -> List[Tuple[int, int]]:
+        """hashtext(user_id::text)의 int4 공간을 count개의 연속 구간(양 끝 포함)으로 분할"""
+        low, span = -2 ** 31, 2 ** 32
+        edges = [low + span * i // count for i in range(count + 1)]
+        return [(edges[i], edges[i + 1] - 1) for i in range(count)]
+    
+    def iter_user_technology_fields(self, source: str = 'search', user_ids: List[str] = None,
+                                    itersize: int = 10000,
+                                    shard: Tuple[int, int] = None) -> Iterator[Tuple[str, pd.DataFrame]]:
+        """
+        여러 사용자의 기술 분야별 분포를 단일 GROUP BY user_id, technology_field 쿼리로 계산
+        
+        서버 사이드 커서로 user_id 순서대로 읽으면서 사용자 단위로 DataFrame을 만들어
+        바로 반환하므로, 전체 사용자를 처리해도 한 번의 쿼리와 사용자 1명분 메모리만 사용한다.
+        
+        Args:
+            source: 'search'(검색 기록) 또는 'report'(AI 리포트)
+            user_ids: 분석할 사용자 ID 목록 (None이면 보존 기간 내 활동한 전체 사용자)
+            itersize: 서버 사이드 커서에서 한 번에 가져올 행 수
+            shard: hash_shards()의 (하한, 상한) - 지정하면 hashtext(user_id)가 이 구간인 사용자만
+            
+        Yields:
+            (user_id, 기술분야별 분포 DataFrame) - analyze_user_*_technology_fields와 같은 형식
+        """
+        table, count_column = self.FIELD_SOURCES[source]
+        if self.snapshot is not None:
+            if shard is not None:
+                raise ValueError("스냅샷 모드는 해시 샤드 조회를 지원하지 않습니다")
+            for user_id, df in self.snapshot.iter_user_distributions(source, self.retention_days, user_ids):
+                df.columns = ['기술분야', count_column, '비율(%)']
+                yield user_id, df
+            return
+        
+        user_filter = "AND user_id = ANY(%s::uuid[])" if user_ids is not None else ""
+        params = [self.retention_days] + ([list(user_ids)] if user_ids is not None else [])
+        if shard is not None:
+            user_filter += " AND hashtext(user_id::text) BETWEEN %s AND %s"
+            params += list(shard)
+        
+        cursor = self.conn.cursor(name=f"bulk_{source}_fields_{id(self)}")
+        cursor.itersize = itersize
+        try:
+            cursor.execute(f"""
+                SELECT 
+                    user_id,
+                    COALESCE(technology_field, 'General') as field,
+                    COUNT(*) as field_count,
+                    ROUND(COUNT(*) * 100.0 / SUM(COUNT(*)) OVER(PARTITION BY user_id), 2) as percentage
+                FROM {table} 
+                WHERE created_at >= NOW() - INTERVAL '%s days'
+                    {user_filter}
+                GROUP BY user_id, technology_field
+                ORDER BY user_id, field_count DESC
+            """, params)
+            
+            for user_id, rows in groupby(cursor, key=lambda row: row[0]):
+                df = pd.DataFrame([row[1:] for row in rows], columns=['기술분야', count_column, '비율(%)'])
+                yield str(user_id), df
+        finally:
+            cursor.close()
+            self.conn.commit()
+    
+    def analyze_users_technology_fields(self, source: str = 'search',
+                                        user_ids: List[str] = None) -> Dict[str, pd.DataFrame]:
+        """
+        여러 사용자의 기술 분야별 분포를 한 번에 분석 (야간 대시보드 사전 계산용)
+        
+        Args:
+            source: 'search'(검색 기록) 또는 'report'(AI 리포트)
+            user_ids: 분석할 사용자 ID 목록 (None이면 보존 기간 내 활동한 전체 사용자)
+            
+        Returns:
+            user_id -> 기술분야별 분포 DataFrame (데이터가 없는 요청 사용자는 빈 DataFrame)
+        """
+        print("\n" + "="*60)
+        print(f"👥 다중 사용자 {'검색' if source == 'search' else '리포트'} 기술 분야 분석")
+        print("="*60)
+        
+        distributions = {}
+        try:
+            for user_id, df in self.iter_user_technology_fields(source, user_ids):
+                distributions[user_id] = df
+        except Exception as e:
+            print(f"❌ 다중 사용자 분석 실패: {e}")
+            self._rollback()
+            return {}
+        
+        if user_ids is not None:
+            count_column = self.FIELD_SOURCES[source][1]
+            for user_id in user_ids:
+                distributions.setdefault(str(user_id), pd.DataFrame(columns=['기술분야', count_column, '비율(%)']))
+        
+        print(f"📊 분석된 사용자 수: {len(distributions):,}명")
+        return distributions
+    
+    def user_field_matrix(self, source: str = 'search', user_ids: List[str] = None):
+        """
+        users_field_distribution_frame() 집계 한 번으로 사용자 × 기술 분야 희소 행렬 생성
+        
+        Returns:
+            dashboard_similarity.FieldMatrix
+        """
+        from dashboard_similarity import FieldMatrix
+        
+        count_column = self.FIELD_SOURCES[source][1]
+        return FieldMatrix.from_frame(self.users_field_distribution_frame(source, user_ids), count_column)
+    
+    def analyze_user_similarity(self, source: str = 'search', user_id: str = None, top_n: int = 10,
+                                min_activity: int = 1) -> Dict:
+        """
+        사용자 대 시장 기술 분야 발산(KL/JS, 코사인)과 특화 점수, 비슷한 사용자 분석
+        
+        전체 사용자 점수는 희소 행렬 벡터 연산으로 한 번에 계산하고, 비슷한 사용자는
+        user_id 한 명에 대해서만 찾는다.
+        
+        Args:
+            source: 'search'(검색 기록) 또는 'report'(AI 리포트)
+            user_id: 비슷한 사용자를 찾을 사용자 ID (None이면 첫 번째 사용자)
+            top_n: 출력할 특화 사용자/비슷한 사용자 수
+            min_activity: 점수 목록에 포함할 최소 활동 수 (활동이 적으면 특화점수가 부풀려짐)
+            
+        Returns:
+            {'scores': 사용자별 점수 DataFrame, 'similar': 비슷한 사용자 DataFrame,
+             'user': user_id 점수 딕셔너리 또는 None, 'summary': 특화점수 분포 요약}
+        """
+        from dashboard_similarity import divergence_scores, score_summary, similar_users
+        
+        print("\n" + "="*60)
+        print(f"🧭 사용자-시장 {'검색' if source == 'search' else '리포트'} 기술 분야 유사도 분석")
+        print("="*60)
+        
+        try:
+            matrix = self.user_field_matrix(source)
+            scores = divergence_scores(matrix)
+            user_id = self._resolve_user_id(self._cursor(), user_id)
+        except Exception as e:
+            print(f"❌ 유사도 분석 실패: {e}")
+            self._rollback()
+            return {}
+        
+        user_row = scores[scores['user_id'] == str(user_id)]
+        similar = similar_users(matrix, [user_id] if user_id else [], top_n)
+        scores = scores[scores['활동수'] >= min_activity].reset_index(drop=True)
+        summary = score_summary(scores)
+        
+        print(f"📊 사용자 {matrix.n_users:,}명 × 기술 분야 {matrix.n_fields}개 "
+              f"(0이 아닌 칸 {matrix.data.size:,}개)")
+        print(f"📈 특화점수 평균 {summary['mean']} / 중앙값 {summary['median']} / 상위 10% {summary['p90']}")
+        print(f"\n🏅 특화 사용자 상위 {top_n}명 (활동 {min_activity}건 이상):")
+        for row in self._frame_records(scores.head(top_n)):
+            print(f"  {row['user_id'][:8]}  특화 {row['특화점수']:5.1f}  활동 {row['활동수']:>5,}  "
+                  f"주력 {row['주력분야']} ({row['주력분야비율(%)']}%, x{row['리프트']})")
+        
+        user = None
+        if not user_row.empty:
+            user = self._frame_records(user_row)[0]
+            print(f"\n👤 사용자 {user_id}: 특화점수 {user['특화점수']}, JS {user['JS']}, "
+                  f"KL {user['KL']}, 시장 코사인 {user['시장코사인']}")
+            for row in similar.itertuples(index=False):
+                print(f"  {row.순위:>2}. {row.유사사용자}  유사도 {row.유사도:.4f}")
+        
+        return {'scores': scores, 'similar': similar, 'user': user, 'summary': summary}
+    
+    def run_sharded_user_analysis(self, workers: int = None, shards: int = None, retries: int = 2,
+                                  sources: Tuple[str, ...] = ('search', 'report'),
+                                  allow_partial: bool = False) -> Dict:
+        """
+        전체 사용자 분석을 사용자 해시 구간 샤드로 나눠 여러 프로세스에서 실행
+        
+        각 작업자는 자기 연결과 분석기를 사용하므로 이 인스턴스의 연결은 쓰지 않는다.
+        
+        Args:
+            workers: 작업자 프로세스 수 (None이면 CPU 코어 수)
+            shards: 샤드 수 (None이면 작업자 수 x 4)
+            retries: 샤드별 재시도 횟수
+            sources: 분석 대상 ('search', 'report')
+            allow_partial: True이면 실패한 샤드가 있어도 complete=False 결과를 반환
+            
+        Returns:
+            ShardedUserAnalysisRunner.run() 결과
+            
+        Raises:
+            dashboard_sharding.ShardFailure: 재시도 후에도 실패한 샤드가 있는 경우 (allow_partial=False)
+        """
+        from dashboard_sharding import ShardedUserAnalysisRunner
+        
+        runner = ShardedUserAnalysisRunner(self.db_config, workers, shards, retries, self.retention_days)
+        return runner.run(sources, allow_partial)
+    
+    def ingest_kipris_responses(self, paths: List[str], user_id: str = None, keyword: str = None,
+                                batch_size: int = 5000) -> Dict[str, int]:
+        """
+        KIPRIS 검색 응답 파일을 스트리밍으로 읽어 kipris_patents(와 search_history)에 적재
+        
+        IPC 코드와 기술 분야는 파이썬에서 미리 계산하고 COPY로 일괄 적재하므로
+        행 단위 INSERT와 트리거 분류를 거치지 않는다.
+        
+        Args:
+            paths: 응답 JSON 파일 경로 목록
+            user_id: search_history에 기록할 사용자 ID
+            keyword: 지정하면 응답마다 search_history 행 추가
+            batch_size: COPY 배치 크기(특허 행 수)
+            
+        Returns:
+            적재 건수 통계 (실패 시 빈 딕셔너리)
+        """
+        from dashboard_ingest import ingest_files
+        
+        self._print_section("📥 KIPRIS 응답 적재")
+        return ingest_files(self.conn, paths, user_id=user_id, keyword=keyword, batch_size=batch_size)
+    
+    def refresh_rollups(self, rebuild: bool = False) -> Dict[str, int]:
+        """
+        일별 기술 분야 롤업 테이블 증분 갱신
+        
+        source별 high-water mark(마지막으로 집계한 날짜) 이후의 완료된 날짜(UTC 기준,
+        오늘 제외)만 원본 테이블에서 집계해 dashboard_field_daily_rollup에 추가하고,
+        보존 기간 이전의 버킷은 삭제한다.
+        
+        이미 집계한 날짜의 행이 수정/삭제되거나 과거 날짜로 삽입되면 트리거가 그 날짜를
+        dashboard_rollup_dirty_days에 기록하며(20261017_dashboard_rollup_dirty_days.sql),
+        여기서 해당 날짜의 버킷만 원본에서 다시 집계한다.
+        
+        Args:
+            rebuild: True이면 롤업을 비우고 보존 기간 전체를 다시 집계
+            
+        Returns:
+            source별 새로 집계한 버킷 수
+        """
+        print("\n" + "="*60)
+        print("🧮 일별 롤업 테이블 갱신")
+        print("="*60)
+        
+        refreshed = {}
+        try:
+            cursor = self.conn.cursor()
+            
+            cursor.execute("SELECT to_regclass('dashboard_rollup_dirty_days') IS NOT NULL")
+            track_dirty = cursor.fetchone()[0]
+            if not track_dirty:
+                print("⚠️  dashboard_rollup_dirty_days 테이블이 없어 이미 집계한 날짜의 수정/삭제는 반영되지 않습니다 "
+                      "(20261017_dashboard_rollup_dirty_days.sql 마이그레이션 필요)")
+            
+            if rebuild:
+                cursor.execute("DELETE FROM dashboard_field_daily_rollup")
+                cursor.execute("DELETE FROM dashboard_rollup_watermarks")
+                if track_dirty:
+                    cursor.execute("DELETE FROM dashboard_rollup_dirty_days")
+            
+            for source, (table, _) in self.FIELD_SOURCES.items():
+                # 동시에 실행되는 갱신 작업이 같은 구간을 중복 집계하지 않도록 잠금
+                cursor.execute("""
+                    INSERT INTO dashboard_rollup_watermarks (source, high_water_date)
+                    VALUES (%s, ((NOW() - INTERVAL '%s days') AT TIME ZONE 'UTC')::date)
+                    ON CONFLICT (source) DO NOTHING
+                """, (source, self.retention_days))
+                cursor.execute("""
+                    SELECT 
+                        high_water_date, 
+                        (NOW() AT TIME ZONE 'UTC')::date,
+                        ((NOW() - INTERVAL '%s days') AT TIME ZONE 'UTC')::date
+                    FROM dashboard_rollup_watermarks 
+                    WHERE source = %s
+                    FOR UPDATE
+                """, (self.retention_days, source))
+                high_water, today, cutoff_day = cursor.fetchone()
+                
+                if track_dirty:
+                    self._recompute_dirty_rollup_days(cursor, source, table, cutoff_day, high_water)
                 
-                # 리포트명이 너무 길면 줄임
-                display_name = report_name[:47] + "..." if len(report_name) > 50 else report_name
-                print(f"{i:<4} {display_name:<50} {tech_field or 'General':<15} {created_at.strftime('%Y-%m-%d %H:%M'):<20}")
+                cursor.execute(f"""
+                    INSERT INTO dashboard_field_daily_rollup 
+                        (source, bucket_date, user_id, technology_field, record_count)
+                    SELECT 
+                        %s,
+                        (created_at AT TIME ZONE 'UTC')::date,
+                        user_id,
+                        technology_field,
+                        COUNT(*)
+                    FROM {table} 
+                    WHERE created_at >= (%s::date::timestamp AT TIME ZONE 'UTC')
+                        AND created_at < (%s::date::timestamp AT TIME ZONE 'UTC')
+                    GROUP BY 2, 3, 4
+                    ON CONFLICT (source, bucket_date, user_id, technology_field)
+                    DO UPDATE SET record_count = dashboard_field_daily_rollup.record_count + EXCLUDED.record_count
+                """, (source, high_water, today))
+                refreshed[source] = cursor.rowcount
+                
+                cursor.execute("""
+                    UPDATE dashboard_rollup_watermarks 
+                    SET high_water_date = GREATEST(high_water_date, %s), updated_at = NOW()
+                    WHERE source = %s
+                """, (today, source))
+                
+                print(f"  ✔️  {source}: {high_water} ~ {today} 구간 {refreshed[source]:,}개 버킷 집계")
             
-            if not reports:
-                print("📝 최근 리포트 데이터가 없습니다.")
+            # 보존 기간이 지난 버킷 삭제
+            cursor.execute("""
+                DELETE FROM dashboard_field_daily_rollup 
+                WHERE bucket_date < ((NOW() - INTERVAL '%s days') AT TIME ZONE 'UTC')::date
+            """, (self.retention_days,))
+            print(f"🗑️  삭제된 오래된 버킷: {cursor.rowcount:,}개")
             
+            self.conn.commit()
+            return refreshed
+            
+        except Exception as e:
+            print(f"❌ 롤업 갱신 실패: {e}")
+            self.conn.rollback()
+            return {}
+    
+    def _recompute_dirty_rollup_days(self, cursor, source: str, table: str, cutoff_day: date, high_water: date) -> int:
+        """
+        트리거가 기록한 변경 날짜 중 이미 집계한 날짜의 버킷을 원본에서 다시 집계
+        
+        기록은 읽으면서 지우며, 보존 기간 이전 날짜(정리 작업의 삭제)와 아직 집계하지 않은
+        high-water mark 이후 날짜는 건너뛴다. 이 트랜잭션이 읽은 뒤 커밋된 변경의 기록은 남아
+        다음 갱신에서 처리된다.
+        
+        Returns:
+            다시 집계한 날짜 수
+        """
+        cursor.execute("""
+            DELETE FROM dashboard_rollup_dirty_days 
+            WHERE source = %s 
+            RETURNING bucket_date
+        """, (source,))
+        dirty_days = sorted(day for (day,) in cursor.fetchall() if cutoff_day <= day < high_water)
+        if not dirty_days:
+            return 0
+        
+        cursor.execute("""
+            DELETE FROM dashboard_field_daily_rollup 
+            WHERE source = %s AND bucket_date = ANY(%s::date[])
+        """, (source, dirty_days))
+        cursor.execute(f"""
+            INSERT INTO dashboard_field_daily_rollup 
+                (source, bucket_date, user_id, technology_field, record_count)
+            SELECT 
+                %s,
+                d.day,
+                t.user_id,
+                t.technology_field,
+                COUNT(*)
+            FROM unnest(%s::date[]) as d(day)
+            JOIN {table} t 
+                ON t.created_at >= (d.day::timestamp AT TIME ZONE 'UTC')
+                AND t.created_at < ((d.day + 1)::timestamp AT TIME ZONE 'UTC')
+            GROUP BY 2, 3, 4
+        """, (source, dirty_days))
+        print(f"  ♻️  {source}: 변경된 날짜 {len(dirty_days):,}일 재집계 ({dirty_days[0]} ~ {dirty_days[-1]})")
+        return len(dirty_days)
+    
+    def _execute_rollup_distribution(self, cursor, source: str, user_id: str = None, limit: int = None):
+        """
+        롤업 테이블 기반 기술 분야 분포 쿼리 실행 (원본 쿼리와 같은 컬럼/값)
+        
+        보존 기간 시작일 다음 날부터 high-water mark 이전까지는 완료된 일별 버킷을 합산하고,
+        보존 기간 시작일의 나머지 시간과 high-water mark 이후 행만 원본 테이블에서 읽는다.
+        원본 구간은 항상 하루 남짓이므로 전체 이력이 늘어나도 조회 비용이 일정하다.
+        """
+        table, _ = self.FIELD_SOURCES[source]
+        user_filter = "AND user_id = %(user_id)s" if user_id else ""
+        limit_clause = "LIMIT %(limit)s" if limit else ""
+        
+        cursor.execute(f"""
+            WITH bounds AS (
+                SELECT 
+                    cutoff,
+                    cutoff_day,
+                    GREATEST(
+                        COALESCE(
+                            (SELECT high_water_date FROM dashboard_rollup_watermarks WHERE source = %(source)s),
+                            cutoff_day + 1
+                        ),
+                        cutoff_day + 1
+                    ) as high_water_day
+                FROM (
+                    SELECT 
+                        NOW() - INTERVAL '%(retention_days)s days' as cutoff,
+                        ((NOW() - INTERVAL '%(retention_days)s days') AT TIME ZONE 'UTC')::date as cutoff_day
+                ) c
+            ),
+            counts AS (
+                SELECT technology_field, record_count as cnt
+                FROM dashboard_field_daily_rollup, bounds
+                WHERE source = %(source)s
+                    AND bucket_date > bounds.cutoff_day
+                    AND bucket_date < bounds.high_water_day
+                    {user_filter}
+                UNION ALL
+                SELECT technology_field, 1
+                FROM {table}, bounds
+                WHERE created_at >= bounds.cutoff
+                    AND created_at < ((bounds.cutoff_day + 1)::timestamp AT TIME ZONE 'UTC')
+                    {user_filter}
+                UNION ALL
+                SELECT technology_field, 1
+                FROM {table}, bounds
+                WHERE created_at >= (bounds.high_water_day::timestamp AT TIME ZONE 'UTC')
+                    {user_filter}
+            )
+            SELECT 
+                COALESCE(technology_field, 'General') as field,
+                SUM(cnt)::bigint as field_count,
+                ROUND(SUM(cnt)::bigint * 100.0 / SUM(SUM(cnt)) OVER(), 2) as percentage
+            FROM counts
+            GROUP BY technology_field
+            ORDER BY field_count DESC
+            {limit_clause}
+        """, {'source': source, 'user_id': user_id, 'limit': limit, 'retention_days': self.retention_days})
+    
+    # 내보내기 컬럼: source -> 컬럼 목록
+    EXPORT_COLUMNS = {
+        'search': ['id', 'user_id', 'keyword', 'technology_field', 'ipc_codes', 'created_at'],
+        'report': ['id', 'user_id', 'invention_title', 'application_number', 'analysis_type',
+                   'technology_field', 'ipc_codes', 'created_at'],
+    }
+    
+    def iter_history(self, source: str = 'search', user_id: str = None, itersize: int = 5000,
+                     batch_size: int = None) -> Iterator:
+        """
+        보존 기간 내 검색 기록/리포트를 서버 사이드 커서로 스트리밍 조회
+        
+        named cursor가 itersize행씩 가져오므로 전체 구간을 내보내도 메모리 사용량이 일정하다.
+        
+        Args:
+            source: 'search'(검색 기록) 또는 'report'(AI 리포트)
+            user_id: 특정 사용자만 조회 (None이면 전체)
+            itersize: 서버에서 한 번에 가져올 행 수
+            batch_size: 지정하면 행 딕셔너리 목록을 batch_size개씩 묶어서 반환
+            
+        Yields:
+            컬럼명 -> 값 딕셔너리 (batch_size 지정 시 딕셔너리 목록), 최신순
+        """
+        table, _ = self.FIELD_SOURCES[source]
+        columns = self.EXPORT_COLUMNS[source]
+        user_filter = "AND user_id = %s" if user_id else ""
+        params = [self.retention_days] + ([user_id] if user_id else [])
+        
+        cursor = self.conn.cursor(name=f"export_{source}_{id(self)}_{threading.get_ident()}")
+        cursor.itersize = itersize
+        try:
+            cursor.execute(f"""
+                SELECT {', '.join(columns)}
+                FROM {table} 
+                WHERE created_at >= NOW() - INTERVAL '%s days'
+                    {user_filter}
+                ORDER BY created_at DESC, id DESC
+            """, params)
+            
+            if not batch_size:
+                for row in cursor:
+                    yield dict(zip(columns, row))
+                return
+            
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield [dict(zip(columns, row)) for row in rows]
+        finally:
+            cursor.close()
+            self.conn.commit()
+    
+    def export_history(self, path: str, source: str = 'search', fmt: str = None,
+                       user_id: str = None, itersize: int = 5000) -> int:
+        """
+        보존 기간 내 검색 기록/리포트를 CSV 또는 JSONL 파일로 스트리밍 내보내기
+        
+        Args:
+            path: 출력 파일 경로
+            source: 'search'(검색 기록) 또는 'report'(AI 리포트)
+            fmt: 'csv' 또는 'jsonl' (None이면 확장자로 판단)
+            user_id: 특정 사용자만 내보내기 (None이면 전체)
+            itersize: 서버에서 한 번에 가져올 행 수
+            
+        Returns:
+            내보낸 행 수
+        """
+        fmt = fmt or ('jsonl' if path.endswith(('.jsonl', '.json')) else 'csv')
+        columns = self.EXPORT_COLUMNS[source]
+        
+        print(f"📤 {source} 내보내기 시작: {path} ({fmt})")
+        started = time.monotonic()
+        count = 0
+        
+        try:
+            with open(path, 'w', encoding='utf-8', newline='') as f:
+                if fmt == 'csv':
+                    writer = csv.writer(f)
+                    writer.writerow(columns)
+                
+                for batch in self.iter_history(source, user_id, itersize, batch_size=itersize):
+                    if fmt == 'csv':
+                        writer.writerows(
+                            [self._export_value(row[column], fmt) for column in columns] for row in batch
+                        )
+                    else:
+                        f.writelines(
+                            json.dumps({column: self._export_value(value, fmt) for column, value in row.items()},
+                                       ensure_ascii=False) + '\n'
+                            for row in batch
+                        )
+                    count += len(batch)
+            
+            elapsed = time.monotonic() - started
+            print(f"✅ {count:,}행 내보내기 완료 ({elapsed:.1f}초, {count / elapsed if elapsed else 0:,.0f} rows/s)")
+            return count
+            
+        except Exception as e:
+            print(f"❌ 내보내기 실패: {e}")
+            self.conn.rollback()
+            return count
+    
+    def _export_value(self, value, fmt: str):
+        """내보내기용 값 변환 (날짜는 ISO 문자열, CSV의 배열은 JSON 문자열)"""
+        if isinstance(value, datetime):
+            return value.isoformat()
+        if value is not None and not isinstance(value, (str, int, float, list)):
+            return str(value)
+        if fmt == 'csv' and isinstance(value, list):
+            return json.dumps(value, ensure_ascii=False)
+        return value
+    
+    def get_recent_searches(self, limit: int = 10) -> List[Dict]:
+        """
+        6. 최근 검색어 10개 출력
+        
+        Args:
+            limit: 출력할 검색어 개수
+            
+        Returns:
+            최근 검색어 목록
+        """
+        print("\n" + "="*60)
+        print("🔍 6. 최근 검색어 목록")
+        print("="*60)
+        
+        try:
+            cursor = self._cursor()
+            
+            query = """
+                SELECT 
+                    keyword,
+                    technology_field,
+                    created_at,
+                    user_id
+                FROM search_history 
+                WHERE created_at >= NOW() - INTERVAL '%s days'
+                ORDER BY created_at DESC 
+                LIMIT %s
+            """
+            def fetch():
+                if self.snapshot is not None:
+                    return self.snapshot.recent_rows('search', self.retention_days, limit)
+                cursor.execute(query, (self.retention_days, limit))
+                return cursor.fetchall()
+            
+            rows = self._cached_query(cursor, 'recent_searches', ('search_history',), fetch, None, limit)
+            searches = self._build_search_items(rows)
+            self._print_recent_searches(searches, limit)
+            return searches
+            
+        except Exception as e:
+            print(f"❌ 최근 검색어 조회 실패: {e}")
+            return []
+    
+    def get_recent_reports(self, limit: int = 10) -> List[Dict]:
+        """
+        7. 최근 리포트 10개 출력 (특허명_특허번호_시장분석/비즈니스인사이트_날짜)
+        
+        Args:
+            limit: 출력할 리포트 개수
+            
+        Returns:
+            최근 리포트 목록
+        """
+        print("\n" + "="*60)
+        print("📋 7. 최근 리포트 목록")
+        print("="*60)
+        
+        try:
+            cursor = self._cursor()
+            
+            query = """
+                SELECT 
+                    invention_title,
+                    application_number,
+                    analysis_type,
+                    technology_field,
+                    created_at,
+                    user_id
+                FROM ai_analysis_reports 
+                WHERE created_at >= NOW() - INTERVAL '%s days'
+                ORDER BY created_at DESC 
+                LIMIT %s
+            """
+            def fetch():
+                if self.snapshot is not None:
+                    return self.snapshot.recent_rows('report', self.retention_days, limit)
+                cursor.execute(query, (self.retention_days, limit))
+                return cursor.fetchall()
+            
+            rows = self._cached_query(cursor, 'recent_reports', ('ai_analysis_reports',), fetch, None, limit)
+            reports = self._build_report_items(rows)
+            self._print_recent_reports(reports, limit)
             return reports
             
         except Exception as e:
-            print(f"❌ 최근 리포트 조회 실패: {e}")
-            return []
+            print(f"❌ 최근 리포트 조회 실패: {e}")
+            return []
+    
+    # 이력 페이지 조회 컬럼: source -> 컬럼 목록 (id 뒤는 _build_*_items 입력 순서)
+    HISTORY_PAGE_COLUMNS = {
+        'search': ['id', 'keyword', 'technology_field', 'created_at', 'user_id'],
+        'report': ['id', 'invention_title', 'application_number', 'analysis_type',
+                   'technology_field', 'created_at', 'user_id'],
+    }
+    
+    def browse_history(self, source: str = 'search', page_size: int = 20, cursor: str = None,
+                       direction: str = 'next', user_id: str = None,
+                       technology_field: str = None) -> Dict:
+        """
+        검색/리포트 이력 키셋 페이지 조회 (최신순)
+        
+        OFFSET 대신 (created_at, id) 행 비교로 페이지 경계를 찾으므로 뒤쪽 페이지도
+        인덱스 범위 스캔 한 번으로 읽고, 페이지 사이에 행이 추가/삭제되어도 중복이나
+        누락이 없다. 커서는 마지막으로 본 행의 (created_at, id)와 필터를 담은 불투명한
+        문자열이며, 다른 필터로 재사용하면 ValueError가 발생한다.
+        
+        Args:
+            source: 'search' 또는 'report'
+            page_size: 페이지당 항목 수 (1~500)
+            cursor: 이전 응답의 next_cursor/prev_cursor (None이면 첫 페이지)
+            direction: 'next'(더 오래된 항목) 또는 'prev'(더 최근 항목)
+            user_id: 특정 사용자만 조회
+            technology_field: 기술 분야 필터 (정확히 일치하는 값만)
+            
+        Returns:
+            {'items', 'next_cursor', 'prev_cursor', 'has_next', 'has_prev'}
+            
+        Raises:
+            ValueError: 잘못된 인자나 커서
+            psycopg2.Error: 조회 실패 (트랜잭션은 롤백됨)
+        """
+        if source not in self.FIELD_SOURCES:
+            raise ValueError(f"source는 search 또는 report여야 합니다: {source}")
+        if direction not in ('next', 'prev'):
+            raise ValueError(f"direction은 next 또는 prev여야 합니다: {direction}")
+        if not 1 <= page_size <= 500:
+            raise ValueError(f"page_size는 1~500이어야 합니다: {page_size}")
+        filters = self._history_filter_key(source, user_id, technology_field)
+        position = self._decode_history_cursor(cursor, filters) if cursor else None
+        if position is None and direction == 'prev':
+            raise ValueError("direction=prev에는 커서가 필요합니다")
+        
+        table, _ = self.FIELD_SOURCES[source]
+        conditions = ["created_at >= NOW() - INTERVAL '%s days'"]
+        params = [self.retention_days]
+        if user_id:
+            conditions.append("user_id = %s")
+            params.append(user_id)
+        if technology_field:
+            conditions.append("technology_field = %s")
+            params.append(technology_field)
+        backward = direction == 'prev'
+        if position is not None:
+            conditions.append(f"(created_at, id) {'>' if backward else '<'} (%s, %s)")
+            params.extend(position)
+        order = 'ASC' if backward else 'DESC'
+        query = f"""
+            SELECT {', '.join(self.HISTORY_PAGE_COLUMNS[source])}
+            FROM {table}
+            WHERE {' AND '.join(conditions)}
+            ORDER BY created_at {order}, id {order}
+            LIMIT %s
+        """
+        params.append(page_size + 1)
+        
+        try:
+            db_cursor = self.conn.cursor()
+            self._check_history_index(db_cursor, table, user_id, technology_field)
+            db_cursor.execute(query, params)
+            rows = db_cursor.fetchall()
+        except Exception as e:
+            # 빈 페이지를 돌려주면 '더 이상 항목 없음'과 구분되지 않으므로 호출자에게 전달
+            print(f"❌ 이력 페이지 조회 실패: {e}")
+            self.conn.rollback()
+            raise
+        
+        more = len(rows) > page_size
+        rows = rows[:page_size]
+        if backward:
+            rows.reverse()
+            has_next, has_prev = True, more
+        else:
+            has_next, has_prev = more, position is not None
+        
+        build = self._build_search_items if source == 'search' else self._build_report_items
+        items = build([row[1:] for row in rows])
+        for item, row in zip(items, rows):
+            item['id'] = str(row[0])
+        # created_at은 행 튜플에서 id 다음 끝에서 두 번째 컬럼
+        return {
+            'items': items,
+            'next_cursor': self._encode_history_cursor(rows[-1][-2], rows[-1][0], filters) if rows and has_next else None,
+            'prev_cursor': self._encode_history_cursor(rows[0][-2], rows[0][0], filters) if rows and has_prev else None,
+            'has_next': has_next,
+            'has_prev': has_prev,
+        }
+    
+    def _history_filter_key(self, source: str, user_id: Optional[str], technology_field: Optional[str]) -> str:
+        """커서를 발급한 조회 조건의 지문"""
+        key = json.dumps([source, user_id or None, technology_field or None], ensure_ascii=False)
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()[:16]
+    
+    def _encode_history_cursor(self, created_at: datetime, row_id, filters: str) -> str:
+        payload = json.dumps({'v': 1, 't': created_at.isoformat(), 'i': str(row_id), 'f': filters},
+                             separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+    
+    def _decode_history_cursor(self, cursor: str, filters: str) -> Tuple[datetime, str]:
+        """커서를 (created_at, id)로 복원 (형식이 잘못되었거나 필터가 다르면 ValueError)"""
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+            if payload.get('v') != 1:
+                raise ValueError
+            created_at, row_id = datetime.fromisoformat(payload['t']), str(payload['i'])
+        except Exception:
+            raise ValueError("잘못된 커서입니다") from None
+        if payload.get('f') != filters:
+            raise ValueError("커서가 현재 조회 조건(source/user_id/technology_field)과 맞지 않습니다")
+        return created_at, row_id
+    
+    def _check_history_index(self, cursor, table: str, user_id: Optional[str], technology_field: Optional[str]):
+        """
+        키셋 조회에 맞는 복합 인덱스가 있는지 테이블/필터 조합별로 한 번만 확인
+        
+        필터 컬럼 뒤에 (created_at, id)가 오는 인덱스가 없으면 페이지마다 정렬이
+        필요하므로 경고만 출력한다 (조회는 계속 진행).
+        """
+        leading = ['user_id'] if user_id else (['technology_field'] if technology_field else [])
+        expected = leading + ['created_at', 'id']
+        key = (table, tuple(expected))
+        if key in self._checked_indexes:
+            return
+        cursor.execute("""
+            SELECT array_agg(a.attname::text ORDER BY k.ord)
+            FROM pg_index i
+            CROSS JOIN LATERAL unnest(i.indkey::int2[]) WITH ORDINALITY AS k(attnum, ord)
+            LEFT JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = k.attnum
+            WHERE i.indrelid = to_regclass(%s) AND i.indpred IS NULL
+            GROUP BY i.indexrelid
+        """, (table,))
+        if not any(columns[:len(expected)] == expected for (columns,) in cursor.fetchall()):
+            migration = 'history_page_indexes' if leading else 'keyset_indexes'
+            print(f"⚠️ {table}({', '.join(expected)}) 인덱스가 없습니다 - "
+                  f"20261016_dashboard_{migration}.sql 마이그레이션을 적용하세요")
+        self._checked_indexes.add(key)
+    
+    def _print_section(self, title: str):
+        print("\n" + "="*60)
+        print(title)
+        print("="*60)
+    
+    def _resolve_user_id(self, cursor, user_id: Optional[str]) -> Optional[str]:
+        """user_id가 없으면 첫 번째 사용자 ID로 대체"""
+        if user_id:
+            return user_id
+        if self.snapshot is not None:
+            return self.snapshot.first_user_id()
+        cursor.execute("SELECT id FROM users LIMIT 1")
+        result = cursor.fetchone()
+        return result[0] if result else None
+    
+    def _build_search_items(self, rows: List[Tuple]) -> List[Dict]:
+        """(keyword, technology_field, created_at, user_id) 행을 최근 검색어 목록으로 변환"""
+        searches = []
+        for i, (keyword, tech_field, created_at, user_id) in enumerate(rows, 1):
+            searches.append({
+                'rank': i,
+                'keyword': keyword,
+                'technology_field': tech_field or 'General',
+                'created_at': created_at.strftime('%Y-%m-%d %H:%M:%S'),
+                'user_id': str(user_id)
+            })
+        return searches
+    
+    def _build_report_items(self, rows: List[Tuple]) -> List[Dict]:
+        """(invention_title, application_number, analysis_type, technology_field, created_at, user_id) 행을 최근 리포트 목록으로 변환"""
+        reports = []
+        for i, (title, app_num, analysis_type, tech_field, created_at, user_id) in enumerate(rows, 1):
+            # 리포트명 형식: 특허명_특허번호_분석타입_날짜
+            report_name = f"{title or '특허분석'}_{app_num or 'N/A'}_{analysis_type or '시장분석'}_{created_at.strftime('%Y%m%d')}"
+            reports.append({
+                'rank': i,
+                'report_name': report_name,
+                'invention_title': title,
+                'application_number': app_num,
+                'analysis_type': analysis_type or '시장분석',
+                'technology_field': tech_field or 'General',
+                'created_at': created_at.strftime('%Y-%m-%d %H:%M:%S'),
+                'user_id': str(user_id)
+            })
+        return reports
+    
+    def _print_user_search_distribution(self, user_id: str, df: pd.DataFrame):
+        print(f"👤 분석 대상 사용자: {user_id}")
+        print(f"📊 개인 검색 기술 분야 분포:")
+        print("-" * 50)
+        for _, row in df.iterrows():
+            print(f"  {row['기술분야']:<20} {row['검색수']:>5}회 ({row['비율(%)']:>5.1f}%)")
+        
+        if df.empty:
+            print("📝 검색 데이터가 없습니다.")
+    
+    def _print_market_search_distribution(self, df: pd.DataFrame):
+        print(f"🏢 시장 전체 검색 기술 분야 분포 (상위 20개):")
+        print("-" * 50)
+        for _, row in df.iterrows():
+            print(f"  {row['기술분야']:<20} {row['검색수']:>6}회 ({row['비율(%)']:>5.1f}%)")
+        
+        if df.empty:
+            print("📝 시장 검색 데이터가 없습니다.")
+    
+    def _print_user_report_distribution(self, user_id: str, df: pd.DataFrame):
+        print(f"👤 분석 대상 사용자: {user_id}")
+        print(f"📊 개인 리포트 기술 분야 분포:")
+        print("-" * 50)
+        for _, row in df.iterrows():
+            print(f"  {row['기술분야']:<20} {row['리포트수']:>5}개 ({row['비율(%)']:>5.1f}%)")
+        
+        if df.empty:
+            print("📝 리포트 데이터가 없습니다.")
+    
+    def _print_market_report_distribution(self, df: pd.DataFrame):
+        print(f"🏢 시장 전체 리포트 기술 분야 분포 (상위 20개):")
+        print("-" * 50)
+        for _, row in df.iterrows():
+            print(f"  {row['기술분야']:<20} {row['리포트수']:>6}개 ({row['비율(%)']:>5.1f}%)")
+        
+        if df.empty:
+            print("📝 시장 리포트 데이터가 없습니다.")
+    
+    def _print_recent_searches(self, searches: List[Dict], limit: int):
+        print(f"📝 최근 검색어 {limit}개:")
+        print("-" * 80)
+        print(f"{'순번':<4} {'검색어':<25} {'기술분야':<15} {'검색시간':<20}")
+        print("-" * 80)
+        for item in searches:
+            print(f"{item['rank']:<4} {item['keyword']:<25} {item['technology_field']:<15} {item['created_at'][:16]:<20}")
+        
+        if not searches:
+            print("📝 최근 검색 데이터가 없습니다.")
+    
+    def _print_recent_reports(self, reports: List[Dict], limit: int):
+        print(f"📄 최근 리포트 {limit}개:")
+        print("-" * 100)
+        print(f"{'순번':<4} {'리포트명':<50} {'기술분야':<15} {'생성시간':<20}")
+        print("-" * 100)
+        for item in reports:
+            # 리포트명이 너무 길면 줄임
+            report_name = item['report_name']
+            display_name = report_name[:47] + "..." if len(report_name) > 50 else report_name
+            print(f"{item['rank']:<4} {display_name:<50} {item['technology_field']:<15} {item['created_at'][:16]:<20}")
+        
+        if not reports:
+            print("📝 최근 리포트 데이터가 없습니다.")
+    
+    def _print_summary_stats(self, total_users: int, total_searches: int, total_reports: int,
+                             unique_search_fields: int, unique_report_fields: int):
+        print(f"👥 총 사용자 수: {total_users:,}명")
+        print(f"🔍 총 검색 수 ({self.retention_days}일): {total_searches:,}회")
+        print(f"📋 총 리포트 수 ({self.retention_days}일): {total_reports:,}개")
+        print(f"🏷️  검색 기술 분야 수: {unique_search_fields:,}개")
+        print(f"🏷️  리포트 기술 분야 수: {unique_report_fields:,}개")
+    
+    def _print_summary_coverage(self, search_coverage, report_coverage):
+        print(f"📈 검색 기술분야 커버리지: {search_coverage or 0:.1f}%")
+        print(f"📈 리포트 기술분야 커버리지: {report_coverage or 0:.1f}%")
+    
+    def _query_field_coverage(self, cursor, source: str, user_id: str = None,
+                              per_user: bool = False, by_day: bool = False) -> pd.DataFrame:
+        """
+        기술 분야 커버리지 원시 집계 (테이블 1회 선형 스캔)
+        
+        GROUPING SETS로 시장 전체, 일별, 사용자별, 사용자x일별 (전체 건수, technology_field가
+        있는 건수)를 한 번에 계산한다. user_id를 지정하면 해당 사용자만 사용자 집계에 포함한다.
+        
+        Returns:
+            by_day, by_user, day, user_id, total, covered 컬럼 DataFrame
+        """
+        table, _ = self.FIELD_SOURCES[source]
+        
+        if user_id:
+            user_key = "CASE WHEN user_id = %(user_id)s THEN user_id END"
+        else:
+            user_key = "user_id"
+        
+        with_users = per_user or bool(user_id)
+        grouping_sets = ["()"]
+        if by_day:
+            grouping_sets.append("(day)")
+        if with_users:
+            grouping_sets.append("(user_key)")
+            if by_day:
+                grouping_sets.append("(day, user_key)")
+        
+        # GROUPING()은 집계 키에 포함된 컬럼에만 쓸 수 있음
+        day_columns = "GROUPING(day) = 0 as by_day, day" if by_day else "FALSE as by_day, NULL::date as day"
+        user_columns = ("GROUPING(user_key) = 0 as by_user, user_key" if with_users
+                        else "FALSE as by_user, NULL::uuid as user_key")
+        
+        cursor.execute(f"""
+            SELECT 
+                {day_columns},
+                {user_columns},
+                COUNT(*) as total,
+                COUNT(technology_field) as covered
+            FROM (
+                SELECT 
+                    (created_at AT TIME ZONE 'UTC')::date as day,
+                    {user_key} as user_key,
+                    technology_field
+                FROM {table} 
+                WHERE created_at >= NOW() - INTERVAL '%(retention_days)s days'
+            ) rows
+            GROUP BY GROUPING SETS ({', '.join(grouping_sets)})
+        """, {'user_id': user_id, 'retention_days': self.retention_days})
+        
+        df = pd.DataFrame(cursor.fetchall(), columns=['by_day', 'day', 'by_user', 'user_id', 'total', 'covered'])
+        if user_id:
+            # 단일 사용자 모드에서는 다른 사용자가 묶인 NULL 그룹을 제외
+            df = df[~df['by_user'] | df['user_id'].notna()]
+        df['user_id'] = df['user_id'].map(lambda value: str(value) if value is not None else None)
+        return df
+    
+    def _coverage_percentage(self, total: int, covered: int) -> float:
+        return round(covered * 100.0 / total, 2) if total else 0.0
+    
+    def compute_field_coverage(self, user_id: str = None, per_user: bool = True, by_day: bool = True) -> Dict:
+        """
+        기술 분야 커버리지 지표 (technology_field가 채워진 비율)
+        
+        검색 기록과 리포트를 각각 한 번씩 선형 스캔하므로 사용자별 검색 수 x 리포트 수로
+        늘어나는 조인이 없다.
+        
+        Args:
+            user_id: 지정하면 해당 사용자만 사용자별 지표에 포함 (None이면 전체 사용자)
+            per_user: 사용자별 지표 계산 여부
+            by_day: 일별(UTC) 지표 계산 여부
+            
+        Returns:
+            {'search'|'report': {
+                'market': {'total', 'covered', 'coverage'},
+                'market_daily': DataFrame(day, total, covered, coverage),
+                'users': DataFrame(user_id, total, covered, coverage),
+                'users_daily': DataFrame(day, user_id, total, covered, coverage)}}
+        """
+        print("\n" + "="*60)
+        print("📈 기술 분야 커버리지 분석")
+        print("="*60)
+        
+        metrics = {}
+        try:
+            cursor = self.conn.cursor()
+            for source in self.FIELD_SOURCES:
+                df = self._query_field_coverage(cursor, source, user_id, per_user, by_day)
+                df['coverage'] = (df['covered'] * 100.0 / df['total']).round(2)
+                
+                market = df[~df['by_day'] & ~df['by_user']]
+                total = int(market['total'].sum())
+                covered = int(market['covered'].sum())
+                metrics[source] = {
+                    'market': {'total': total, 'covered': covered, 'coverage': self._coverage_percentage(total, covered)},
+                    'market_daily': df[df['by_day'] & ~df['by_user']][['day', 'total', 'covered', 'coverage']]
+                        .sort_values('day').reset_index(drop=True),
+                    'users': df[~df['by_day'] & df['by_user']][['user_id', 'total', 'covered', 'coverage']]
+                        .sort_values('total', ascending=False).reset_index(drop=True),
+                    'users_daily': df[df['by_day'] & df['by_user']][['day', 'user_id', 'total', 'covered', 'coverage']]
+                        .sort_values(['day', 'user_id']).reset_index(drop=True),
+                }
+        except Exception as e:
+            print(f"❌ 커버리지 분석 실패: {e}")
+            self.conn.rollback()
+            return {}
+        
+        for source, label in (('search', '검색'), ('report', '리포트')):
+            market = metrics[source]['market']
+            print(f"📈 {label} 기술분야 커버리지: {market['coverage']:.1f}% ({market['covered']:,}/{market['total']:,})")
+            users = metrics[source]['users']
+            if user_id and not users.empty:
+                print(f"  👤 사용자 {user_id}: {users['coverage'].iloc[0]:.1f}%")
+            elif not users.empty:
+                print(f"  👥 사용자별 평균: {users['coverage'].mean():.1f}% ({len(users):,}명)")
+            if by_day:
+                print(f"  📅 일별 데이터: {len(metrics[source]['market_daily']):,}일")
+        
+        return metrics
+    
+    def _query_summary_stats(self, cursor) -> Tuple:
+        """(사용자 수, 검색 수, 리포트 수, 검색 분야 수, 리포트 분야 수)"""
+        if self.snapshot is not None:
+            return self.snapshot.summary_stats(self.retention_days)
+        cursor.execute("""
+            SELECT 
+                (SELECT COUNT(*) FROM users) as total_users,
+                (SELECT COUNT(*) FROM search_history WHERE created_at >= NOW() - INTERVAL '%s days') as total_searches,
+                (SELECT COUNT(*) FROM ai_analysis_reports WHERE created_at >= NOW() - INTERVAL '%s days') as total_reports,
+                (SELECT COUNT(DISTINCT technology_field) FROM search_history WHERE technology_field IS NOT NULL) as unique_search_fields,
+                (SELECT COUNT(DISTINCT technology_field) FROM ai_analysis_reports WHERE technology_field IS NOT NULL) as unique_report_fields
+        """, (self.retention_days, self.retention_days))
+        return cursor.fetchone()
+    
+    def _query_summary_coverage(self, cursor) -> Tuple[float, float]:
+        """(검색 커버리지, 리포트 커버리지) 백분율"""
+        if self.snapshot is not None:
+            return tuple(self._coverage_percentage(*self.snapshot.field_coverage(source, self.retention_days))
+                         for source in ('search', 'report'))
+        return tuple(
+            self._coverage_percentage(*self._query_field_coverage(cursor, source).iloc[0][['total', 'covered']])
+            for source in ('search', 'report')
+        )
     
     def generate_summary_report(self):
         """전체 분석 결과 요약 리포트 생성"""
@@ -477,87 +2488,727 @@ class DashboardDataAnalyzer:
         print("="*60)
         
         try:
-            cursor = self.conn.cursor()
+            cursor = self._cursor()
             
             # 전체 통계 조회
-            cursor.execute("""
+            stats = self._cached_query(
+                cursor, 'summary_stats', ('users', 'search_history', 'ai_analysis_reports'),
+                lambda: self._query_summary_stats(cursor)
+            )
+            self._print_summary_stats(*stats)
+            
+            # 데이터 품질 체크 (테이블별 단일 선형 스캔)
+            coverage = self._cached_query(
+                cursor, 'summary_coverage', ('search_history', 'ai_analysis_reports'),
+                lambda: self._query_summary_coverage(cursor)
+            )
+            self._print_summary_coverage(*coverage)
+            
+        except Exception as e:
+            print(f"❌ 요약 리포트 생성 실패: {e}")
+            self._rollback()
+    
+    def _copy_frame(self, cursor, query: str, params, dtype: Dict = None,
+                    parse_dates: List[str] = None) -> pd.DataFrame:
+        """
+        COPY (query) TO STDOUT 결과를 pandas가 컬럼 단위로 직접 파싱
+        
+        psycopg2가 행마다 Python 튜플/객체를 만드는 fetchall() 경로를 거치지 않는다.
+        """
+        buffer = io.BytesIO()
+        bound_query = cursor.mogrify(query, params).decode('utf-8')
+        cursor.copy_expert(f"COPY ({bound_query}) TO STDOUT WITH (FORMAT csv, HEADER true)", buffer)
+        buffer.seek(0)
+        df = pd.read_csv(buffer, dtype=dtype, parse_dates=parse_dates)
+        if df.empty:
+            # 행이 없으면 read_csv가 날짜 컬럼을 object로 두므로 .dt 접근이 가능하도록 변환
+            for column in parse_dates or []:
+                df[column] = pd.to_datetime(df[column])
+        return df
+    
+    def field_distribution_frame(self, source: str = 'search', user_id: str = None,
+                                 limit: int = None) -> pd.DataFrame:
+        """
+        기술 분야별 분포를 컬럼형으로 계산 (출력 없음)
+        
+        비율은 전체 분야 합계 기준으로 pandas에서 벡터 연산으로 계산한 뒤 상위 limit개를
+        자른다 (analyze_market_*의 LIMIT 20과 같은 기준). 값은 float64이다.
+        
+        Args:
+            source: 'search'(검색 기록) 또는 'report'(AI 리포트)
+            user_id: 특정 사용자 분포 (None이면 시장 전체)
+            limit: 상위 N개만 반환
+        """
+        table, count_column = self.FIELD_SOURCES[source]
+        user_filter = "AND user_id = %s" if user_id else ""
+        params = [self.retention_days] + ([user_id] if user_id else [])
+        
+        if self.snapshot is not None:
+            df = self.snapshot.field_distribution_frame(source, self.retention_days, user_id)
+        else:
+            cursor = self.conn.cursor()
+            df = self._copy_frame(cursor, f"""
                 SELECT 
-                    (SELECT COUNT(*) FROM users) as total_users,
-                    (SELECT COUNT(*) FROM search_history WHERE created_at >= NOW() - INTERVAL '%s days') as total_searches,
-                    (SELECT COUNT(*) FROM ai_analysis_reports WHERE created_at >= NOW() - INTERVAL '%s days') as total_reports,
-                    (SELECT COUNT(DISTINCT technology_field) FROM search_history WHERE technology_field IS NOT NULL) as unique_search_fields,
-                    (SELECT COUNT(DISTINCT technology_field) FROM ai_analysis_reports WHERE technology_field IS NOT NULL) as unique_report_fields
-            """, (self.retention_days, self.retention_days))
-            
-            stats = cursor.fetchone()
-            
-            print(f"👥 총 사용자 수: {stats[0]:,}명")
-            print(f"🔍 총 검색 수 ({self.retention_days}일): {stats[1]:,}회")
-            print(f"📋 총 리포트 수 ({self.retention_days}일): {stats[2]:,}개")
-            print(f"🏷️  검색 기술 분야 수: {stats[3]:,}개")
-            print(f"🏷️  리포트 기술 분야 수: {stats[4]:,}개")
-            
-            # 데이터 품질 체크
-            cursor.execute("""
+                    COALESCE(technology_field, 'General') as field,
+                    COUNT(*) as field_count
+                FROM {table} 
+                WHERE created_at >= NOW() - INTERVAL '%s days'
+                    {user_filter}
+                GROUP BY technology_field
+                ORDER BY field_count DESC
+            """, params, dtype={'field': 'string', 'field_count': 'int64'})
+        
+        total = df['field_count'].sum()
+        df['percentage'] = (df['field_count'] * 100.0 / total).round(2) if total else 0.0
+        if limit:
+            df = df.head(limit)
+        return df.rename(columns={'field': '기술분야', 'field_count': count_column, 'percentage': '비율(%)'})
+    
+    def users_field_distribution_frame(self, source: str = 'search', user_ids: List[str] = None,
+                                       shard: Tuple[int, int] = None) -> pd.DataFrame:
+        """
+        전체(또는 지정) 사용자의 기술 분야별 분포를 하나의 긴 DataFrame으로 계산
+        
+        사용자별 비율은 groupby().transform('sum')으로 한 번에 계산하므로 배치 작업에서
+        사용자 수만큼의 Python 루프가 없다.
+        
+        Args:
+            source: 'search'(검색 기록) 또는 'report'(AI 리포트)
+            user_ids: 분석할 사용자 ID 목록 (None이면 전체 사용자)
+            shard: hash_shards()의 (하한, 상한) - 지정하면 hashtext(user_id)가 이 구간인 사용자만
+            
+        Returns:
+            user_id, 기술분야, 건수, 비율(%) 컬럼 DataFrame (user_id, 건수 내림차순)
+        """
+        table, count_column = self.FIELD_SOURCES[source]
+        user_filter = "AND user_id = ANY(%s::uuid[])" if user_ids is not None else ""
+        params = [self.retention_days] + ([list(user_ids)] if user_ids is not None else [])
+        if shard is not None:
+            user_filter += " AND hashtext(user_id::text) BETWEEN %s AND %s"
+            params += list(shard)
+        
+        if self.snapshot is not None:
+            if shard is not None:
+                raise ValueError("스냅샷 모드는 해시 샤드 조회를 지원하지 않습니다")
+            df = self.snapshot.users_field_frame(source, self.retention_days, user_ids)
+        else:
+            cursor = self.conn.cursor()
+            df = self._copy_frame(cursor, f"""
                 SELECT 
-                    ROUND(AVG(CASE WHEN technology_field IS NOT NULL THEN 1.0 ELSE 0.0 END) * 100, 2) as search_field_coverage,
-                    ROUND(AVG(CASE WHEN technology_field IS NOT NULL THEN 1.0 ELSE 0.0 END) * 100, 2) as report_field_coverage
-                FROM search_history s
-                FULL OUTER JOIN ai_analysis_reports r ON s.user_id = r.user_id
-                WHERE s.created_at >= NOW() - INTERVAL '%s days' 
-                   OR r.created_at >= NOW() - INTERVAL '%s days'
-            """, (self.retention_days, self.retention_days))
+                    user_id,
+                    COALESCE(technology_field, 'General') as field,
+                    COUNT(*) as field_count
+                FROM {table} 
+                WHERE created_at >= NOW() - INTERVAL '%s days'
+                    {user_filter}
+                GROUP BY user_id, technology_field
+                ORDER BY user_id, field_count DESC
+            """, params, dtype={'user_id': 'string', 'field': 'string', 'field_count': 'int64'})
+        
+        totals = df.groupby('user_id', sort=False)['field_count'].transform('sum')
+        df['percentage'] = (df['field_count'] * 100.0 / totals).round(2)
+        return df.rename(columns={'field': '기술분야', 'field_count': count_column, 'percentage': '비율(%)'})
+    
+    def recent_searches_frame(self, limit: int = 10) -> pd.DataFrame:
+        """최근 검색어를 컬럼형으로 조회 (created_at은 세션 시간대 기준 datetime64)"""
+        if self.snapshot is not None:
+            df = self.snapshot.recent_frame('search', self.retention_days, limit)
+        else:
+            cursor = self.conn.cursor()
+            df = self._copy_frame(cursor, """
+                SELECT 
+                    keyword,
+                    COALESCE(technology_field, 'General') as technology_field,
+                    created_at AT TIME ZONE current_setting('TimeZone') as created_at,
+                    user_id
+                FROM search_history 
+                WHERE created_at >= NOW() - INTERVAL '%s days'
+                ORDER BY search_history.created_at DESC 
+                LIMIT %s
+            """, (self.retention_days, limit),
+                dtype={'keyword': 'string', 'technology_field': 'string', 'user_id': 'string'},
+                parse_dates=['created_at'])
+        df.insert(0, 'rank', pd.RangeIndex(1, len(df) + 1))
+        return df
+    
+    def recent_reports_frame(self, limit: int = 10) -> pd.DataFrame:
+        """최근 리포트를 컬럼형으로 조회하고 리포트명(특허명_특허번호_분석타입_날짜)을 벡터 연산으로 생성"""
+        if self.snapshot is not None:
+            df = self.snapshot.recent_frame('report', self.retention_days, limit)
+        else:
+            cursor = self.conn.cursor()
+            df = self._copy_frame(cursor, """
+                SELECT 
+                    invention_title,
+                    application_number,
+                    analysis_type,
+                    technology_field,
+                    created_at AT TIME ZONE current_setting('TimeZone') as created_at,
+                    user_id
+                FROM ai_analysis_reports 
+                WHERE created_at >= NOW() - INTERVAL '%s days'
+                ORDER BY ai_analysis_reports.created_at DESC 
+                LIMIT %s
+            """, (self.retention_days, limit),
+                dtype={'invention_title': 'string', 'application_number': 'string', 'analysis_type': 'string',
+                       'technology_field': 'string', 'user_id': 'string'},
+                parse_dates=['created_at'])
+        
+        df['analysis_type'] = df['analysis_type'].fillna('시장분석')
+        df['technology_field'] = df['technology_field'].fillna('General')
+        df.insert(0, 'report_name', (
+            df['invention_title'].fillna('특허분석') + '_' +
+            df['application_number'].fillna('N/A') + '_' +
+            df['analysis_type'] + '_' +
+            df['created_at'].dt.strftime('%Y%m%d')
+        ))
+        df.insert(0, 'rank', pd.RangeIndex(1, len(df) + 1))
+        return df
+    
+    # analysis_json()이 지원하는 분석 (데몬/API 응답용)
+    JSON_ANALYSES = ('distribution', 'recent', 'summary', 'specialization')
+    
+    def _frame_records(self, df: pd.DataFrame) -> List[Dict]:
+        """DataFrame을 JSON 직렬화 가능한 레코드 목록으로 변환 (datetime은 ISO 문자열)"""
+        return json.loads(df.to_json(orient='records', force_ascii=False, date_format='iso'))
+    
+    def analysis_json(self, analysis: str, source: str = 'search', user_id: str = None,
+                      limit: int = None) -> Dict:
+        """
+        분석 결과를 콘솔 출력 없이 JSON 직렬화 가능한 딕셔너리로 반환 (결과 캐시 사용)
+        
+        Args:
+            analysis: 'distribution'(기술 분야 분포), 'recent'(최근 검색/리포트), 'summary'(전체 요약),
+                'specialization'(시장 대비 특화 점수 - user_id가 있으면 해당 사용자 점수와 비슷한 사용자)
+            source: 'search'(검색 기록) 또는 'report'(AI 리포트)
+            user_id: 사용자 분포 조회 시 사용자 ID (None이면 시장 전체)
+            limit: 반환할 최대 행 수
+            
+        Returns:
+            analysis, source, user_id, retention_days, data 키를 가진 딕셔너리
+        """
+        if analysis not in self.JSON_ANALYSES:
+            raise ValueError(f"지원하지 않는 분석입니다: {analysis}")
+        table, _ = self.FIELD_SOURCES[source]
+        live_data = self._live_json(analysis, source, user_id, limit)
+        if live_data is not None:
+            return {
+                'analysis': analysis,
+                'source': source,
+                'user_id': user_id,
+                'retention_days': self.retention_days,
+                'data': live_data,
+                'live': True,
+            }
+        cursor = self._cursor()
+        
+        if analysis == 'distribution':
+            limit = limit or 20
+            tables = (table,)
+            
+            def fetch():
+                return self._frame_records(self.field_distribution_frame(source, user_id, limit))
+        elif analysis == 'recent':
+            limit = limit or 10
+            tables = (table,)
+            frame_method = self.recent_searches_frame if source == 'search' else self.recent_reports_frame
+            
+            def fetch():
+                return self._frame_records(frame_method(limit))
+        elif analysis == 'specialization':
+            limit = limit or 10
+            tables = (table,)
+            
+            def fetch():
+                from dashboard_similarity import divergence_scores, score_summary, similar_users
+                
+                matrix = self.user_field_matrix(source)
+                scores = divergence_scores(matrix)
+                if user_id:
+                    return {
+                        'user': self._frame_records(scores[scores['user_id'] == str(user_id)]),
+                        'similar': self._frame_records(similar_users(matrix, [user_id], limit)),
+                    }
+                return {'summary': score_summary(scores), 'top': self._frame_records(scores.head(limit))}
+        else:
+            tables = ('users', 'search_history', 'ai_analysis_reports')
+            
+            def fetch():
+                stats = self._query_summary_stats(cursor)
+                coverage = self._query_summary_coverage(cursor)
+                return dict(zip(
+                    ('total_users', 'total_searches', 'total_reports', 'unique_search_fields',
+                     'unique_report_fields', 'search_coverage', 'report_coverage'),
+                    tuple(int(value) for value in stats) + coverage
+                ))
+        
+        data = self._cached_query(cursor, f'json_{analysis}_{source}', tables, fetch, user_id, limit)
+        return {
+            'analysis': analysis,
+            'source': source,
+            'user_id': user_id,
+            'retention_days': self.retention_days,
+            'data': data,
+        }
+    
+    def run_columnar_analysis(self, user_id: str = None, limit: int = 10, render: bool = False) -> Dict[str, pd.DataFrame]:
+        """
+        2~7단계 분석을 컬럼형 경로로 실행 (모든 결과가 DataFrame)
+        
+        콘솔 출력은 render=True일 때만 render_console()로 수행한다.
+        결과는 export_frames()로 Parquet/Arrow/JSON/CSV 파일로 저장할 수 있다.
+        """
+        try:
+            user_id = self._resolve_user_id(self._cursor(), user_id)
+            results = {
+                'user_search': self.field_distribution_frame('search', user_id) if user_id else pd.DataFrame(),
+                'market_search': self.field_distribution_frame('search', limit=20),
+                'user_report': self.field_distribution_frame('report', user_id) if user_id else pd.DataFrame(),
+                'market_report': self.field_distribution_frame('report', limit=20),
+                'recent_searches': self.recent_searches_frame(limit),
+                'recent_reports': self.recent_reports_frame(limit),
+            }
+        except Exception as e:
+            print(f"❌ 컬럼형 분석 실패: {e}")
+            self._rollback()
+            return {}
+        
+        if render:
+            self.render_console(results, user_id, limit)
+        return results
+    
+    def render_console(self, results: Dict[str, pd.DataFrame], user_id: str = None, limit: int = 10):
+        """run_columnar_analysis 결과를 기존 콘솔 형식으로 출력"""
+        def records(frame: pd.DataFrame) -> List[Dict]:
+            if frame.empty:
+                return []
+            return frame.assign(created_at=frame['created_at'].dt.strftime('%Y-%m-%d %H:%M:%S')).to_dict('records')
+        
+        self._print_section("🔍 2. 개인 검색 기술 분야 분석")
+        self._print_user_search_distribution(user_id, results['user_search'])
+        self._print_section("🌐 3. 시장 검색 기술 분야 분석")
+        self._print_market_search_distribution(results['market_search'])
+        self._print_section("📋 4. 개인 리포트 기술 분야 분석")
+        self._print_user_report_distribution(user_id, results['user_report'])
+        self._print_section("🌐 5. 시장 리포트 기술 분야 분석")
+        self._print_market_report_distribution(results['market_report'])
+        self._print_section("🔍 6. 최근 검색어 목록")
+        self._print_recent_searches(records(results['recent_searches']), limit)
+        self._print_section("📋 7. 최근 리포트 목록")
+        self._print_recent_reports(records(results['recent_reports']), limit)
+    
+    def export_frames(self, results: Dict[str, pd.DataFrame], output_dir: str, fmt: str = 'parquet') -> List[str]:
+        """
+        분석 결과 DataFrame들을 파일로 저장
+        
+        Args:
+            results: 이름 -> DataFrame
+            output_dir: 출력 디렉터리
+            fmt: 'parquet', 'arrow'(Feather), 'json'(records), 'csv' - parquet/arrow는 pyarrow 필요
             
-            coverage = cursor.fetchone()
+        Returns:
+            저장된 파일 경로 목록
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        extensions = {'parquet': 'parquet', 'arrow': 'arrow', 'json': 'json', 'csv': 'csv'}
+        paths = []
+        
+        try:
+            for name, frame in results.items():
+                path = os.path.join(output_dir, f"{name}.{extensions[fmt]}")
+                # Arrow/Parquet은 RangeIndex가 아닌 인덱스를 저장하지 않도록 초기화
+                frame = frame.reset_index(drop=True)
+                if fmt == 'parquet':
+                    frame.to_parquet(path, index=False)
+                elif fmt == 'arrow':
+                    frame.to_feather(path)
+                elif fmt == 'json':
+                    frame.to_json(path, orient='records', force_ascii=False, date_format='iso')
+                else:
+                    frame.to_csv(path, index=False)
+                paths.append(path)
+        except ImportError as e:
+            print(f"❌ {fmt} 저장에는 pyarrow가 필요합니다: {e}")
+        
+        print(f"💾 {len(paths)}개 결과 파일 저장: {output_dir} ({fmt})")
+        return paths
+    
+    def render_distribution_charts(self, results: Dict, user_id: str = None, output_dir: str = 'charts',
+                                   fmt: str = 'png', top_n: int = 10) -> List[str]:
+        """
+        분석 결과의 사용자/시장 분포를 차트로 저장
+        
+        matplotlib은 차트를 그릴 때만 필요하므로 dashboard_charts를 여기서 불러온다.
+        
+        Args:
+            results: run_full_analysis/run_consolidated_analysis 결과
+                (user_search, market_search, user_report, market_report DataFrame)
+            user_id: 파일 이름에 쓸 사용자 ID
+            output_dir: 차트 출력 디렉터리 (콘텐츠 해시 캐시는 output_dir/.cache)
+            fmt: 'png' 또는 'svg'
+            top_n: 표시할 상위 분야 수
             
-            print(f"📈 검색 기술분야 커버리지: {coverage[0] or 0:.1f}%")
-            print(f"📈 리포트 기술분야 커버리지: {coverage[1] or 0:.1f}%")
+        Returns:
+            저장된 차트 경로 목록
+        """
+        from dashboard_charts import ChartRenderer, distribution_payload
+        
+        renderer = ChartRenderer(os.path.join(output_dir, '.cache'), fmt=fmt)
+        payloads = {}
+        for source, label in (('search', '검색'), ('report', '리포트')):
+            user_df, market_df = results.get(f'user_{source}'), results.get(f'market_{source}')
+            if market_df is None or market_df.empty:
+                continue
+            payloads[source] = distribution_payload(f"{label} 기술 분야 분포", user_df, market_df, top_n)
+        
+        paths = {key: renderer.render(payload) for key, payload in payloads.items()}
+        published = renderer.publish(paths, output_dir, prefix=f"{user_id or 'dashboard'}_")
+        stats = renderer.stats()
+        print(f"🖼️ 차트 {len(published)}개 저장: {output_dir} (렌더링 {stats['rendered']}개, 캐시 {stats['cached']}개)")
+        return published
+    
+    def render_user_charts(self, source: str = 'search', user_ids: List[str] = None, output_dir: str = 'charts',
+                           fmt: str = 'png', max_workers: int = None, top_n: int = 10) -> Dict[str, str]:
+        """
+        사용자별 분포 차트를 프로세스 풀에서 일괄 렌더링 (야간 배치용)
+        
+        분포는 테이블 1회 스캔(users_field_distribution_frame)으로 계산하고, 입력 데이터의
+        콘텐츠 해시가 캐시에 있는 사용자는 다시 그리지 않는다.
+        
+        Args:
+            source: 'search'(검색 기록) 또는 'report'(AI 리포트)
+            user_ids: 대상 사용자 ID 목록 (None이면 보존 기간 내 활동한 전체 사용자)
+            output_dir: 차트 출력 디렉터리 (콘텐츠 해시 캐시는 output_dir/.cache)
+            fmt: 'png' 또는 'svg'
+            max_workers: 렌더링 프로세스 수 (None이면 CPU 코어 수)
+            top_n: 표시할 상위 분야 수
             
+        Returns:
+            사용자 ID -> 차트 경로
+        """
+        from dashboard_charts import ChartRenderer, distribution_payload
+        
+        self._print_section(f"🖼️ 사용자별 {source} 기술 분야 차트 렌더링")
+        
+        try:
+            market_df = self.field_distribution_frame(source)
+            users_df = self.users_field_distribution_frame(source, user_ids)
         except Exception as e:
-            print(f"❌ 요약 리포트 생성 실패: {e}")
+            print(f"❌ 차트 데이터 조회 실패: {e}")
+            self._rollback()
+            return {}
+        
+        label = '검색' if source == 'search' else '리포트'
+        payloads = {
+            str(user_id): distribution_payload(f"{user_id} {label} 기술 분야 분포", user_df, market_df, top_n)
+            for user_id, user_df in users_df.groupby('user_id', sort=False)
+        }
+        
+        started = time.perf_counter()
+        renderer = ChartRenderer(os.path.join(output_dir, '.cache'), fmt=fmt, max_workers=max_workers)
+        paths = renderer.render_batch(payloads)
+        renderer.publish(paths, output_dir, prefix=f"{source}_")
+        stats = renderer.stats()
+        print(f"🖼️ 사용자 {len(paths):,}명 차트 저장: {output_dir} "
+              f"(렌더링 {stats['rendered']:,}개, 캐시 재사용 {stats['cached']:,}개, 오래된 캐시 삭제 {stats['evicted']:,}개, "
+              f"{time.perf_counter() - started:.1f}초, 프로세스 {renderer.max_workers}개)")
+        return paths
     
-    def run_full_analysis(self, user_id: str = None):
-        """전체 분석 실행"""
-        print("🚀 대시보드 데이터 분석 시스템 테스트 시작")
-        print(f"📅 분석 기간: 최근 {self.retention_days}일")
-        print(f"⏰ 실행 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    def _scan_field_distribution(self, cursor, table: str, user_id: str) -> pd.DataFrame:
+        """
+        테이블을 한 번만 스캔하여 기술 분야별 개인/시장 건수와 비율을 함께 집계
         
-        if not self.connect_database():
-            return
+        개인/시장 건수는 보존 기간 FILTER 절로 같은 스캔에서 계산하며, 비율은 기존 개별 쿼리와
+        동일한 ROUND(... * 100.0 / SUM(...) OVER(), 2) 식으로 계산한다. 기간 조건을 WHERE가 아닌
+        FILTER에 두어 보존 기간 밖에만 있는 기술 분야도 행으로 남기므로 (건수 0), 요약의 기술 분야
+        수는 기존 개별 쿼리처럼 테이블 전체 기준으로 셀 수 있다.
+        """
+        cursor.execute(f"""
+            SELECT 
+                field,
+                is_null,
+                user_count,
+                market_count,
+                ROUND(user_count * 100.0 / NULLIF(SUM(user_count) OVER(), 0), 2) as user_percentage,
+                ROUND(market_count * 100.0 / NULLIF(SUM(market_count) OVER(), 0), 2) as market_percentage
+            FROM (
+                SELECT 
+                    COALESCE(technology_field, 'General') as field,
+                    technology_field IS NULL as is_null,
+                    COUNT(*) FILTER (WHERE in_window AND user_id = %s) as user_count,
+                    COUNT(*) FILTER (WHERE in_window) as market_count
+                FROM (
+                    SELECT technology_field, user_id, created_at >= NOW() - INTERVAL '%s days' as in_window
+                    FROM {table}
+                ) rows
+                GROUP BY technology_field
+            ) grouped
+        """, (user_id, self.retention_days))
+        
+        return pd.DataFrame(cursor.fetchall(), columns=[
+            'field', 'is_null', 'user_count', 'market_count', 'user_percentage', 'market_percentage'
+        ])
+    
+    def run_consolidated_analysis(self, user_id: str = None, limit: int = 10) -> Dict:
+        """
+        통합 분석 모드 - 2~8단계 결과를 테이블당 1회 스캔으로 생성
+        
+        search_history, ai_analysis_reports를 각각 한 번씩 GROUP BY 스캔하여 개인 분포,
+        시장 분포, 요약 카운터를 메모리에서 분배한다. 최근 N개 목록은 created_at 인덱스로
+        N행만 읽는다. 반환하는 DataFrame/목록은 개별 메서드와 동일한 형식이다.
         
+        요약 값은 generate_summary_report와 같은 정의이다: 검색/리포트 수와 커버리지는 보존 기간
+        기준, 기술 분야 수는 테이블 전체의 NULL이 아닌 technology_field 종류 수.
+        
+        Args:
+            user_id: 분석할 사용자 ID (None이면 첫 번째 사용자)
+            limit: 최근 검색어/리포트 개수
+            
+        Returns:
+            분석 결과 딕셔너리
+        """
         try:
-            # 1. 데이터 정리
-            self.cleanup_old_data()
+            cursor = self.conn.cursor()
             
-            # 2. 개인 검색 분석
-            user_search_df = self.analyze_user_search_technology_fields(user_id)
+            user_id = self._resolve_user_id(cursor, user_id)
             
-            # 3. 시장 검색 분석
-            market_search_df = self.analyze_market_search_technology_fields()
+            search_dist = self._scan_field_distribution(cursor, 'search_history', user_id)
+            report_dist = self._scan_field_distribution(cursor, 'ai_analysis_reports', user_id)
             
-            # 4. 개인 리포트 분석
-            user_report_df = self.analyze_user_report_technology_fields(user_id)
+            cursor.execute("""
+                SELECT keyword, technology_field, created_at, user_id
+                FROM search_history 
+                WHERE created_at >= NOW() - INTERVAL '%s days'
+                ORDER BY created_at DESC 
+                LIMIT %s
+            """, (self.retention_days, limit))
+            recent_searches = self._build_search_items(cursor.fetchall())
+            
+            cursor.execute("""
+                SELECT invention_title, application_number, analysis_type, technology_field, created_at, user_id
+                FROM ai_analysis_reports 
+                WHERE created_at >= NOW() - INTERVAL '%s days'
+                ORDER BY created_at DESC 
+                LIMIT %s
+            """, (self.retention_days, limit))
+            recent_reports = self._build_report_items(cursor.fetchall())
+            
+            cursor.execute("SELECT COUNT(*) FROM users")
+            total_users = cursor.fetchone()[0]
             
-            # 5. 시장 리포트 분석
-            market_report_df = self.analyze_market_report_technology_fields()
+        except Exception as e:
+            print(f"❌ 통합 분석 실패: {e}")
+            self.conn.rollback()
+            return {}
+        
+        def user_frame(dist: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+            if not user_id:
+                return pd.DataFrame()
+            rows = dist[dist['user_count'] > 0].sort_values('user_count', ascending=False, kind='stable')
+            return pd.DataFrame(rows[['field', 'user_count', 'user_percentage']].values.tolist(), columns=columns)
+        
+        def market_frame(dist: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+            rows = dist[dist['market_count'] > 0].sort_values('market_count', ascending=False, kind='stable').head(20)
+            return pd.DataFrame(rows[['field', 'market_count', 'market_percentage']].values.tolist(), columns=columns)
+        
+        def coverage(dist: pd.DataFrame) -> float:
+            total = dist['market_count'].sum()
+            if not total:
+                return 0.0
+            return round(float(dist.loc[~dist['is_null'], 'market_count'].sum()) * 100.0 / float(total), 2)
+        
+        results = {
+            'user_search': user_frame(search_dist, ['기술분야', '검색수', '비율(%)']),
+            'market_search': market_frame(search_dist, ['기술분야', '검색수', '비율(%)']),
+            'user_report': user_frame(report_dist, ['기술분야', '리포트수', '비율(%)']),
+            'market_report': market_frame(report_dist, ['기술분야', '리포트수', '비율(%)']),
+            'recent_searches': recent_searches,
+            'recent_reports': recent_reports,
+            'summary': {
+                'total_users': int(total_users),
+                'total_searches': int(search_dist['market_count'].sum()),
+                'total_reports': int(report_dist['market_count'].sum()),
+                'unique_search_fields': int((~search_dist['is_null']).sum()),
+                'unique_report_fields': int((~report_dist['is_null']).sum()),
+                'search_field_coverage': coverage(search_dist),
+                'report_field_coverage': coverage(report_dist),
+            },
+        }
+        
+        self._print_section("🔍 2. 개인 검색 기술 분야 분석")
+        if user_id:
+            self._print_user_search_distribution(user_id, results['user_search'])
+        else:
+            print("❌ 사용자 데이터가 없습니다.")
+        
+        self._print_section("🌐 3. 시장 검색 기술 분야 분석")
+        self._print_market_search_distribution(results['market_search'])
+        
+        self._print_section("📋 4. 개인 리포트 기술 분야 분석")
+        if user_id:
+            self._print_user_report_distribution(user_id, results['user_report'])
+        else:
+            print("❌ 사용자 데이터가 없습니다.")
+        
+        self._print_section("🌐 5. 시장 리포트 기술 분야 분석")
+        self._print_market_report_distribution(results['market_report'])
+        
+        self._print_section("🔍 6. 최근 검색어 목록")
+        self._print_recent_searches(recent_searches, limit)
+        
+        self._print_section("📋 7. 최근 리포트 목록")
+        self._print_recent_reports(recent_reports, limit)
+        
+        self._print_section("📊 전체 분석 결과 요약")
+        summary = results['summary']
+        self._print_summary_stats(
+            summary['total_users'], summary['total_searches'], summary['total_reports'],
+            summary['unique_search_fields'], summary['unique_report_fields']
+        )
+        self._print_summary_coverage(summary['search_field_coverage'], summary['report_field_coverage'])
+        
+        return results
+    
+    def run_concurrent_analysis(self, user_id: str = None, max_workers: int = 7) -> Dict:
+        """
+        2~8단계 분석을 연결 풀과 스레드 풀로 동시에 실행
+        
+        각 분석은 풀에서 빌린 별도 연결로 실행되며, 콘솔 출력은 분석별로 모아서
+        기존 순서대로 출력한다. 풀은 닫지 않으므로 장기 실행 워커에서 반복 호출하면
+        연결을 재사용한다 (종료 시 close_connection 호출).
+        
+        Args:
+            user_id: 분석할 사용자 ID (None이면 첫 번째 사용자)
+            max_workers: 동시에 실행할 분석 수 (연결 풀 최대 크기)
             
-            # 6. 최근 검색어
-            recent_searches = self.get_recent_searches()
+        Returns:
+            분석 결과 딕셔너리
+        """
+        if not self.open_pool(maxconn=max_workers):
+            return {}
+        
+        # 개인 분석 두 개가 같은 사용자를 보도록 미리 결정
+        if not user_id:
+            with self.pooled_connection() as conn:
+                user_id = self._resolve_user_id(conn.cursor(), user_id)
+        
+        tasks = [
+            ('user_search', self.analyze_user_search_technology_fields, (user_id,)),
+            ('market_search', self.analyze_market_search_technology_fields, ()),
+            ('user_report', self.analyze_user_report_technology_fields, (user_id,)),
+            ('market_report', self.analyze_market_report_technology_fields, ()),
+            ('recent_searches', self.get_recent_searches, ()),
+            ('recent_reports', self.get_recent_reports, ()),
+            ('summary', self.generate_summary_report, ()),
+        ]
+        
+        def run_task(method, args):
+            # 분석별 출력 버퍼 (스레드 로컬이므로 다른 호출/스레드의 출력과 섞이지 않음)
+            with _thread_output.capture() as output, self.pooled_connection():
+                result = method(*args)
+            return result, output.getvalue()
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [(name, executor.submit(run_task, method, args)) for name, method, args in tasks]
+            outcomes = [(name, future.result()) for name, future in futures]
+        
+        results = {}
+        for name, (result, output) in outcomes:
+            print(output, end='')
+            results[name] = result
+        results.pop('summary')
+        return results
+    
+    def run_full_analysis(self, user_id: str = None, consolidated: bool = False,
+                          concurrent: bool = False, charts_dir: str = None, snapshot_path: str = None) -> Dict:
+        """
+        전체 분석 실행
+        
+        Args:
+            user_id: 분석할 사용자 ID (None이면 첫 번째 사용자)
+            consolidated: True이면 테이블당 1회 스캔하는 통합 분석 모드 사용
+            concurrent: True이면 연결 풀로 각 분석을 동시에 실행
+            charts_dir: 지정하면 사용자/시장 분포 차트를 이 디렉터리에 저장
+            snapshot_path: 지정하면 데이터베이스에 연결하지 않고 이 스냅샷으로 2~8단계 실행
+                (consolidated/concurrent는 DB 접근 방식이므로 무시)
             
-            # 7. 최근 리포트
-            recent_reports = self.get_recent_reports()
+        Returns:
+            분석 결과 딕셔너리
+        """
+        print("🚀 대시보드 데이터 분석 시스템 테스트 시작")
+        print(f"📅 분석 기간: 최근 {self.retention_days}일")
+        print(f"⏰ 실행 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        
+        if snapshot_path:
+            try:
+                self.use_snapshot(snapshot_path)
+            except Exception as e:
+                print(f"❌ 스냅샷 열기 실패: {e}")
+                return {}
+            consolidated = concurrent = False
+        elif not self.connect_database():
+            return {}
+        
+        results = {}
+        try:
+            # 1. 데이터 정리 (스냅샷은 이미 보존 기간만 포함)
+            if self.snapshot is None:
+                self.cleanup_old_data()
+            if self.use_rollups and self.snapshot is None:
+                self.refresh_rollups()
+            
+            if consolidated:
+                # 2~8. 통합 분석 (테이블당 1회 스캔)
+                results = self.run_consolidated_analysis(user_id)
+            elif concurrent:
+                # 2~8. 동시 분석 (연결 풀)
+                results = self.run_concurrent_analysis(user_id)
+            else:
+                # 2. 개인 검색 분석
+                user_search_df = self.analyze_user_search_technology_fields(user_id)
+                
+                # 3. 시장 검색 분석
+                market_search_df = self.analyze_market_search_technology_fields()
+                
+                # 4. 개인 리포트 분석
+                user_report_df = self.analyze_user_report_technology_fields(user_id)
+                
+                # 5. 시장 리포트 분석
+                market_report_df = self.analyze_market_report_technology_fields()
+                
+                # 6. 최근 검색어
+                recent_searches = self.get_recent_searches()
+                
+                # 7. 최근 리포트
+                recent_reports = self.get_recent_reports()
+                
+                # 8. 요약 리포트
+                self.generate_summary_report()
+                
+                results = {
+                    'user_search': user_search_df,
+                    'market_search': market_search_df,
+                    'user_report': user_report_df,
+                    'market_report': market_report_df,
+                    'recent_searches': recent_searches,
+                    'recent_reports': recent_reports,
+                }
             
-            # 8. 요약 리포트
-            self.generate_summary_report()
+            if charts_dir:
+                self.render_distribution_charts(results, user_id, charts_dir)
             
             print("\n" + "="*60)
             print("✅ 모든 분석이 완료되었습니다!")
             print("="*60)
+            self.print_cache_stats()
+            self.print_query_summary()
             
         except Exception as e:
             print(f"❌ 분석 실행 중 오류 발생: {e}")
         finally:
             self.close_connection()
+        
+        return results
 
 
 def main():
@@ -589,7 +3240,10 @@ def main():
     # user_id = "276975db-635b-4c77-87a0-548f91b14231"  # 예시
     user_id = None  # 첫 번째 사용자로 자동 설정
     
-    analyzer.run_full_analysis(user_id)
+    # True로 설정하면 테이블당 1회 스캔하는 통합 분석 모드로 실행
+    consolidated = False
+    
+    analyzer.run_full_analysis(user_id, consolidated=consolidated)
 
 
 if __name__ == "__main__":
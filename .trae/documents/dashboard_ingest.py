@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+KIPRIS 검색 응답 스트리밍 적재
+
+KIPRIS XML을 JSON으로 바꾼 응답(kipris_response_debug.json)은 모든 값이 한 원소 리스트로
+감싸져 있다 (applicationNumber: ["..."]). 이 모듈은
+
+- 응답 문서를 통째로 읽지 않고 청크 단위로 읽으며 item 배열의 원소를 하나씩 디코딩하고
+- 한 원소 리스트를 평탄화한 뒤 IPC 코드와 기술 분야를 파이썬에서 미리 계산해
+- kipris_patents(와 선택적으로 search_history)에 COPY로 일괄 적재한다.
+
+사용 예:
+    python dashboard_ingest.py responses/*.json
+    python dashboard_ingest.py response.json --user-id <uuid> --keyword "인공지능 학습"
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import re
+import sys
+import time
+from collections import Counter
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import psycopg2
+
+from dashboard_data_analysis_test import IPCPrefixTree
+
+
+ITEM_ARRAY = re.compile(r'"item"\s*:\s*\[')
+_ARRAY_SEPARATORS = ' \t\r\n,'
+_IPC_SEPARATORS = re.compile(r'[|,;]')
+_SPACES = re.compile(r'\s+')
+_IPC_VERSION = re.compile(r'\(.*?\)')  # 'G06N 3/08(2006.01)'의 버전 표기
+
+# IPC 코드 접두사 -> 기술 분야 (classify_technology_field와 같은 분야 이름, 가장 긴 접두사 우선)
+IPC_FIELD_PREFIXES = {
+    'G06N': 'AI/머신러닝', 'G06V': 'AI/머신러닝', 'G10L': 'AI/머신러닝',
+    'G16Y': 'IoT/스마트기기', 'H04W4/': 'IoT/스마트기기',
+    'H04B': '통신/네트워크', 'H04J': '통신/네트워크', 'H04L': '통신/네트워크', 'H04M': '통신/네트워크',
+    'H04W': '통신/네트워크', 'H01Q': '통신/네트워크',
+    'H01L': '반도체/전자', 'H10B': '반도체/전자', 'H10K': '반도체/전자', 'H10N': '반도체/전자',
+    'G11C': '반도체/전자', 'H03K': '반도체/전자', 'H05K': '반도체/전자',
+    'A61': '바이오/의료', 'C07K': '바이오/의료', 'C12N': '바이오/의료', 'C12Q': '바이오/의료', 'G16H': '바이오/의료',
+    'B60': '교통/자동차', 'B61': '교통/자동차', 'B62D': '교통/자동차', 'G08G': '교통/자동차',
+    'G06Q20/': '블록체인/핀테크', 'G06Q40/': '블록체인/핀테크', 'H04L9/': '블록체인/핀테크',
+    'H01M': '에너지/환경', 'H02J': '에너지/환경', 'H02S': '에너지/환경', 'F03D': '에너지/환경',
+    'F24S': '에너지/환경', 'C25B': '에너지/환경', 'Y02': '에너지/환경',
+    'B23': '제조/산업', 'B25J': '제조/산업', 'B29C': '제조/산업', 'B33Y': '제조/산업', 'G05B': '제조/산업',
+    'G06F': '소프트웨어/앱', 'G06Q': '소프트웨어/앱', 'G06T': '소프트웨어/앱',
+}
+_PREFIXES_BY_LENGTH = sorted(IPC_FIELD_PREFIXES, key=len, reverse=True)
+DEFAULT_FIELD = '기타'
+
+PATENT_COLUMNS = ('application_number', 'invention_title', 'applicant_name', 'abstract', 'ipc_codes', 'main_ipc',
+                  'technology_field', 'field_confidence', 'application_date', 'open_date', 'register_date',
+                  'register_status')
+SEARCH_COLUMNS = ('user_id', 'keyword', 'technology_field', 'field_confidence', 'ipc_codes', 'created_at')
+
+
+def iter_kipris_items(stream, chunk_size: int = 64 * 1024) -> Iterator[Dict]:
+    """
+    응답 스트림에서 item 배열 원소를 하나씩 디코딩
+
+    청크를 읽어 버퍼에 붙이고 "item": [ 이후의 객체를 raw_decode로 잘라낸다. 이미 넘긴
+    원소는 버퍼에서 버리므로 메모리는 청크 + 가장 큰 item 하나 크기로 유지된다.
+    여러 응답을 이어 붙인 파일(JSON Lines 등)도 순서대로 처리한다.
+
+    Args:
+        stream: 텍스트 모드 파일 객체
+        chunk_size: 한 번에 읽을 문자 수
+    """
+    decoder = json.JSONDecoder()
+    buffer, pos = '', 0
+    in_array = False
+    eof = False
+
+    while True:
+        if pos >= chunk_size:
+            buffer, pos = buffer[pos:], 0
+        if not in_array:
+            match = ITEM_ARRAY.search(buffer, pos)
+            if match:
+                pos, in_array = match.end(), True
+                continue
+            if eof:
+                return
+            # 청크 경계에 걸친 "item" 키를 다시 찾을 수 있도록 꼬리만 남김
+            pos = max(pos, len(buffer) - 64)
+        else:
+            while pos < len(buffer) and buffer[pos] in _ARRAY_SEPARATORS:
+                pos += 1
+            if pos < len(buffer) and buffer[pos] == ']':
+                pos, in_array = pos + 1, False
+                continue
+            if pos < len(buffer):
+                try:
+                    item, pos = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                else:
+                    yield item
+                    continue
+            elif eof:
+                raise ValueError("item 배열이 끝나지 않은 채 응답이 끝났습니다")
+
+        chunk = stream.read(chunk_size)
+        eof = not chunk
+        buffer, pos = buffer[pos:] + chunk, 0
+
+
+def flatten_value(value):
+    """XML 변환으로 생긴 한 원소 리스트를 값으로 펼침 (빈 문자열/빈 리스트는 None)"""
+    if isinstance(value, list):
+        if not value:
+            return None
+        if len(value) == 1:
+            return flatten_value(value[0])
+        return [flatten_value(element) for element in value]
+    if isinstance(value, dict):
+        return {key: flatten_value(element) for key, element in value.items()}
+    if isinstance(value, str):
+        value = value.strip()
+        return value or None
+    return value
+
+
+def extract_ipc_codes(value) -> List[str]:
+    """
+    ipcNumber 값('G06N 3/08|G06N 3/045' 또는 목록)에서 IPC 코드 추출
+
+    공백/버전 표기를 지워 analyze_ipc_hierarchy와 같은 형식(G06N3/08)으로 맞추고,
+    형식이 맞지 않는 값은 버린다. 순서는 유지한다 (첫 코드가 대표 IPC).
+    """
+    if value is None:
+        return []
+    parts = value if isinstance(value, list) else [value]
+    codes = dict.fromkeys(_normalize_ipc(raw) for part in parts for raw in _IPC_SEPARATORS.split(str(part)))
+    codes.pop(None, None)
+    return list(codes)
+
+
+@lru_cache(maxsize=100_000)
+def _normalize_ipc(raw: str) -> Optional[str]:
+    code = _SPACES.sub('', _IPC_VERSION.sub('', raw)).upper()
+    return code if IPCPrefixTree.split_code(code) else None
+
+
+@lru_cache(maxsize=10_000)
+def ipc_field(code: str) -> Optional[str]:
+    for prefix in _PREFIXES_BY_LENGTH:
+        if code.startswith(prefix):
+            return IPC_FIELD_PREFIXES[prefix]
+    return None
+
+
+def classify_ipc_codes(codes: List[str]) -> Tuple[str, Optional[float]]:
+    """
+    IPC 코드 목록의 기술 분야와 신뢰도
+
+    대표 IPC(첫 코드)부터 보며 처음 분류되는 분야를 고르고, 신뢰도는 전체 코드 중
+    그 분야로 분류되는 비율이다. 분류되는 코드가 없으면 ('기타', None).
+    """
+    fields = [ipc_field(code) for code in codes]
+    field = next((field for field in fields if field), None)
+    if field is None:
+        return DEFAULT_FIELD, None
+    return field, round(fields.count(field) / len(fields), 2)
+
+
+def _parse_date(value) -> Optional[date]:
+    # KIPRIS 날짜는 YYYYMMDD 문자열 (strptime보다 슬라이스가 훨씬 빠름)
+    value = str(value) if value else ''
+    if len(value) != 8 or not value.isdigit():
+        return None
+    try:
+        return date(int(value[:4]), int(value[4:6]), int(value[6:]))
+    except ValueError:
+        return None
+
+
+def _text(value) -> Optional[str]:
+    """여러 값이 남은 필드(공동 출원인 등)는 쉼표로 이어 한 문자열로"""
+    if isinstance(value, list):
+        value = ', '.join(str(element) for element in value if element is not None)
+    return str(value) if value else None
+
+
+def patent_record(item: Dict) -> Optional[Dict]:
+    """평탄화한 item을 kipris_patents 행으로 변환 (출원번호가 없으면 None)"""
+    item = flatten_value(item)
+    application_number = _text(item.get('applicationNumber'))
+    if not application_number:
+        return None
+    codes = extract_ipc_codes(item.get('ipcNumber'))
+    field, confidence = classify_ipc_codes(codes)
+    return {
+        'application_number': application_number,
+        'invention_title': _text(item.get('inventionTitle')),
+        'applicant_name': _text(item.get('applicantName')),
+        'abstract': _text(item.get('astrtCont')),
+        'ipc_codes': codes,
+        'main_ipc': codes[0] if codes else None,
+        'technology_field': field,
+        'field_confidence': confidence,
+        'application_date': _parse_date(item.get('applicationDate')),
+        'open_date': _parse_date(item.get('openDate')),
+        'register_date': _parse_date(item.get('registerDate')),
+        'register_status': _text(item.get('registerStatus')),
+    }
+
+
+def _copy_value(value):
+    if isinstance(value, list):
+        # 코드는 IPC 형식 검증을 거쳤으므로 따옴표/쉼표가 없음
+        return '{' + ','.join(value) + '}'
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+class KiprisIngestor:
+    """KIPRIS 응답을 스트리밍으로 읽어 COPY 배치로 적재"""
+
+    def __init__(self, conn, batch_size: int = 5000):
+        """
+        Args:
+            conn: psycopg2 연결 (커밋은 호출자가 결정)
+            batch_size: 한 번의 COPY로 보낼 특허 행 수
+        """
+        self.conn = conn
+        self.batch_size = batch_size
+        self._patents: Dict[str, Dict] = {}  # 출원번호 -> 행 (배치 안 중복은 마지막 응답 기준)
+        self._searches: List[Dict] = []
+        self.stats = Counter()
+
+    def ingest(self, stream, user_id: str = None, keyword: str = None,
+               searched_at: datetime = None) -> Dict[str, int]:
+        """
+        응답 하나(또는 이어 붙인 여러 응답) 적재
+
+        keyword를 주면 응답 전체를 검색 1건으로 보고 search_history 행도 만든다
+        (IPC 코드 합집합, 가장 많은 특허의 기술 분야).
+
+        Args:
+            stream: 텍스트 모드 파일 객체
+            user_id: 검색한 사용자 ID
+            keyword: 검색어
+            searched_at: 검색 시각 (None이면 현재 시각)
+
+        Returns:
+            items, patents, skipped 건수
+        """
+        counts = Counter()
+        fields = Counter()
+        codes: Dict[str, None] = {}  # 순서를 유지하는 중복 제거 (첫 코드가 대표 IPC)
+        for item in iter_kipris_items(stream):
+            counts['items'] += 1
+            record = patent_record(item) if isinstance(item, dict) else None
+            if record is None:
+                counts['skipped'] += 1
+                continue
+            counts['patents'] += 1
+            fields[record['technology_field']] += 1
+            codes.update(dict.fromkeys(record['ipc_codes']))
+            self._patents[record['application_number']] = record
+            if len(self._patents) >= self.batch_size:
+                self.flush()
+
+        if keyword:
+            field, top_count = fields.most_common(1)[0] if fields else (DEFAULT_FIELD, 0)
+            self._searches.append({
+                'user_id': user_id,
+                'keyword': keyword,
+                'technology_field': field,
+                'field_confidence': round(top_count / counts['patents'], 2) if counts['patents'] else None,
+                'ipc_codes': list(codes),
+                'created_at': searched_at or datetime.now().astimezone(),
+            })
+            counts['searches'] += 1
+        self.stats.update(counts)
+        return dict(counts)
+
+    def _copy_rows(self, cursor, table: str, columns: Tuple[str, ...], rows: List[Dict]):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow([_copy_value(row[column]) for column in columns])
+        buffer.seek(0)
+        cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+    def flush(self):
+        """버퍼의 특허/검색 행을 COPY로 적재 (특허는 임시 테이블을 거쳐 출원번호 기준 upsert)"""
+        if not self._patents and not self._searches:
+            return
+        cursor = self.conn.cursor()
+        try:
+            if self._patents:
+                cursor.execute("""
+                    CREATE TEMP TABLE IF NOT EXISTS kipris_patents_staging
+                    (LIKE kipris_patents INCLUDING DEFAULTS) ON COMMIT DELETE ROWS
+                """)
+                self._copy_rows(cursor, 'kipris_patents_staging', PATENT_COLUMNS, list(self._patents.values()))
+                updates = ', '.join(f"{column} = EXCLUDED.{column}" for column in PATENT_COLUMNS[1:])
+                cursor.execute(f"""
+                    INSERT INTO kipris_patents ({', '.join(PATENT_COLUMNS)})
+                    SELECT {', '.join(PATENT_COLUMNS)} FROM kipris_patents_staging
+                    ON CONFLICT (application_number) DO UPDATE SET {updates}, updated_at = NOW()
+                """)
+                cursor.execute("TRUNCATE kipris_patents_staging")
+                self.stats['copied_patents'] += len(self._patents)
+                self._patents.clear()
+            if self._searches:
+                self._copy_rows(cursor, 'search_history', SEARCH_COLUMNS, self._searches)
+                self.stats['copied_searches'] += len(self._searches)
+                self._searches.clear()
+        finally:
+            cursor.close()
+
+
+def ingest_files(conn, paths: List[str], user_id: str = None, keyword: str = None,
+                 batch_size: int = 5000) -> Dict[str, int]:
+    """여러 응답 파일을 한 트랜잭션으로 적재"""
+    ingestor = KiprisIngestor(conn, batch_size=batch_size)
+    started = time.perf_counter()
+    try:
+        for index, path in enumerate(paths, 1):
+            with open(path, encoding='utf-8') as f:
+                counts = ingestor.ingest(f, user_id=user_id, keyword=keyword)
+            print(f"⏳ [{index}/{len(paths)}] {os.path.basename(path)}: 특허 {counts.get('patents', 0):,}건")
+        ingestor.flush()
+        conn.commit()
+    except Exception as e:
+        print(f"❌ KIPRIS 응답 적재 실패: {e}")
+        conn.rollback()
+        return {}
+
+    elapsed = time.perf_counter() - started
+    stats = dict(ingestor.stats)
+    rate = stats.get('patents', 0) / elapsed if elapsed > 0 else 0.0
+    print(f"✅ KIPRIS 응답 적재 완료: 특허 {stats.get('copied_patents', 0):,}건, "
+          f"검색 {stats.get('copied_searches', 0):,}건, {elapsed:.2f}초 ({rate:,.0f}건/초)")
+    return stats
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="KIPRIS 검색 응답 스트리밍 적재")
+    parser.add_argument('paths', nargs='+', help="KIPRIS 응답 JSON 파일")
+    parser.add_argument('--user-id', help="search_history에 기록할 사용자 ID")
+    parser.add_argument('--keyword', help="지정하면 응답마다 search_history 행 추가")
+    parser.add_argument('--batch-size', type=int, default=5000, help="COPY 배치 크기(특허 행 수)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    """적재 실행 함수"""
+    args = parse_args(argv)
+    db_config = {
+        'host': os.getenv('SUPABASE_DB_HOST', 'db.afzzubvlotobcaiflmia.supabase.co'),
+        'port': os.getenv('SUPABASE_DB_PORT', '5432'),
+        'database': os.getenv('SUPABASE_DB_NAME', 'postgres'),
+        'user': os.getenv('SUPABASE_DB_USER', 'postgres'),
+        'password': os.getenv('SUPABASE_DB_PASSWORD', ''),
+    }
+    if not db_config['password']:
+        print("❌ 데이터베이스 연결 정보가 설정되지 않았습니다. SUPABASE_DB_* 환경변수를 설정해주세요.")
+        return 1
+
+    conn = psycopg2.connect(**db_config)
+    try:
+        stats = ingest_files(conn, args.paths, user_id=args.user_id, keyword=args.keyword,
+                             batch_size=args.batch_size)
+    finally:
+        conn.close()
+    return 0 if stats else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
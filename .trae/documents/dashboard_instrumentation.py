@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+대시보드 분석기 SQL 계측
+
+DashboardDataAnalyzer.enable_instrumentation()을 호출하면 연결의 cursor_factory가
+InstrumentedCursor로 바뀌어 모든 SQL 문에 대해 다음을 기록한다.
+
+- 실행 시간 (execute + fetch), 반환 행 수, 가져온 바이트 수(텍스트 표현 기준 추정)
+- 호출한 분석 메서드 이름 (traced_analyses가 분석 시작 시 설정하는 컨텍스트 변수)
+- 표본 추출된 일반 SELECT 문의 EXPLAIN (ANALYZE, BUFFERS) 실행 계획
+
+기록은 등록된 sink(레코드 dict를 받는 callable)로 전달되고, 문장별 집계는
+summary()/print_summary()로 확인한다. 계측을 켜지 않으면 기본 psycopg2 커서가
+그대로 쓰이므로 추가 비용이 없다.
+"""
+
+import functools
+import inspect
+import json
+import random
+import re
+import sys
+import threading
+import time
+import weakref
+from collections import deque
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+import psycopg2.extensions
+
+
+# EXPLAIN ANALYZE는 문장을 실제로 실행하므로 데이터를 바꾸거나 행 잠금을 잡지 않는 조회만 표본 추출
+_READ_ONLY_PATTERN = re.compile(r'^\s*(SELECT|WITH)\b', re.IGNORECASE)
+_WRITE_PATTERN = re.compile(r'\b(INSERT|UPDATE|DELETE|MERGE|TRUNCATE|INTO)\b', re.IGNORECASE)
+_LOCKING_PATTERN = re.compile(r'\bFOR\s+(UPDATE|NO\s+KEY\s+UPDATE|SHARE|KEY\s+SHARE)\b', re.IGNORECASE)
+_COPY_QUERY_PATTERN = re.compile(r'^\s*COPY\s*\((.*)\)\s*TO\s+STDOUT', re.IGNORECASE | re.DOTALL)
+_WHITESPACE = re.compile(r'\s+')
+
+# 현재 실행 중인 가장 안쪽 분석 메서드 이름 (스레드마다 독립)
+current_analysis: ContextVar[Optional[str]] = ContextVar('dashboard_current_analysis', default=None)
+
+
+def _is_plain_select(statement: str) -> bool:
+    """데이터 변경, SELECT INTO, FOR UPDATE/SHARE 잠금이 없는 조회 문인지 확인"""
+    return (_READ_ONLY_PATTERN.match(statement) is not None
+            and not _WRITE_PATTERN.search(statement)
+            and not _LOCKING_PATTERN.search(statement))
+
+
+def _traced(name: str, func):
+    if inspect.isgeneratorfunction(func):
+        # 제너레이터 본문은 next() 때 실행되므로 재개할 때마다 이름을 설정하고 양보 전에 되돌림
+        @functools.wraps(func)
+        def generator_wrapper(*args, **kwargs):
+            generator = func(*args, **kwargs)
+            try:
+                while True:
+                    token = current_analysis.set(name)
+                    try:
+                        item = next(generator)
+                    except StopIteration:
+                        return
+                    finally:
+                        current_analysis.reset(token)
+                    yield item
+            finally:
+                generator.close()
+        return generator_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        token = current_analysis.set(name)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            current_analysis.reset(token)
+    return wrapper
+
+
+def traced_analyses(cls):
+    """
+    클래스 데코레이터 - 공개 메서드가 실행되는 동안 current_analysis를 메서드 이름으로 설정
+
+    계측 레코드의 analysis 값은 이 컨텍스트 변수에서 읽으므로 SQL 문마다 호출 스택을
+    뒤지지 않는다. 공개 메서드가 다른 공개 메서드를 부르면 안쪽 이름이 쓰인다.
+    """
+    for name, attr in list(vars(cls).items()):
+        if not name.startswith('_') and inspect.isfunction(attr):
+            setattr(cls, name, _traced(name, attr))
+    return cls
+
+
+def _value_size(value) -> int:
+    if value is None:
+        return 0
+    if isinstance(value, (bytes, memoryview)):
+        return len(value)
+    return len(str(value).encode('utf-8'))
+
+
+def _rows_size(rows) -> int:
+    return sum(_value_size(value) for row in rows for value in row)
+
+
+class JsonLinesSink:
+    """레코드를 한 줄에 하나씩 JSON으로 기록하는 sink (파일 경로 또는 쓰기 가능한 스트림)"""
+
+    def __init__(self, target=sys.stdout):
+        self._owns_stream = isinstance(target, str)
+        self.stream = open(target, 'a', encoding='utf-8') if self._owns_stream else target
+        self._lock = threading.Lock()
+
+    def __call__(self, record: Dict):
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with self._lock:
+            self.stream.write(line + "\n")
+            self.stream.flush()
+
+    def close(self):
+        if self._owns_stream:
+            self.stream.close()
+
+
+class _CountingWriter:
+    """copy_expert 대상 파일에 쓰인 바이트 수 집계"""
+
+    def __init__(self, target):
+        self.target = target
+        self.bytes = 0
+
+    def write(self, data):
+        self.bytes += len(data)
+        return self.target.write(data)
+
+
+class InstrumentedCursor(psycopg2.extensions.cursor):
+    """실행/페치 시간을 측정해 QueryInstrumentation에 보고하는 커서"""
+
+    instrumentation = None  # QueryInstrumentation.cursor_factory가 바인딩
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._record = None
+        self.instrumentation.track(self)
+
+    def execute(self, query, vars=None):
+        self.finish_record()
+        statement = query.decode('utf-8') if isinstance(query, bytes) else str(query)
+        record = self.instrumentation.start_record(statement, named=self.name is not None)
+        plan_query = statement if _is_plain_select(statement) else None
+        self._sample_plan(record, plan_query, vars)
+        started = time.perf_counter()
+        try:
+            return super().execute(query, vars)
+        except Exception as e:
+            record['error'] = str(e)
+            raise
+        finally:
+            record['duration_ms'] += (time.perf_counter() - started) * 1000
+            if self.name is None and self.rowcount > 0:
+                record['rows'] = self.rowcount
+            self._record = record
+
+    def copy_expert(self, sql, file, size=8192):
+        self.finish_record()
+        record = self.instrumentation.start_record(sql, named=False)
+        match = _COPY_QUERY_PATTERN.match(sql)
+        self._sample_plan(record, match.group(1) if match else None, None)
+        writer = _CountingWriter(file) if hasattr(file, 'write') else file
+        started = time.perf_counter()
+        try:
+            return super().copy_expert(sql, writer, size)
+        except Exception as e:
+            record['error'] = str(e)
+            raise
+        finally:
+            record['duration_ms'] += (time.perf_counter() - started) * 1000
+            record['rows'] = max(self.rowcount, 0)
+            record['bytes'] = getattr(writer, 'bytes', 0)
+            self._record = record
+            self.finish_record()
+
+    def _sample_plan(self, record: Dict, query: Optional[str], vars):
+        if query is None or not _is_plain_select(query) or not self.instrumentation.should_explain():
+            return
+        record['plan'] = self.instrumentation.explain(self.connection, query, vars)
+
+    def _add_fetch(self, elapsed: float, rows: List):
+        record = self._record
+        if record is None:
+            return
+        record['duration_ms'] += elapsed * 1000
+        record['bytes'] += _rows_size(rows)
+        if self.name is not None:
+            record['rows'] += len(rows)
+
+    def fetchone(self):
+        started = time.perf_counter()
+        row = super().fetchone()
+        self._add_fetch(time.perf_counter() - started, [row] if row is not None else [])
+        return row
+
+    def fetchmany(self, size=None):
+        started = time.perf_counter()
+        rows = super().fetchmany(size) if size is not None else super().fetchmany()
+        self._add_fetch(time.perf_counter() - started, rows)
+        return rows
+
+    def fetchall(self):
+        started = time.perf_counter()
+        rows = super().fetchall()
+        self._add_fetch(time.perf_counter() - started, rows)
+        return rows
+
+    def __iter__(self):
+        rows = super().__iter__()
+        while True:
+            started = time.perf_counter()
+            try:
+                row = next(rows)
+            except StopIteration:
+                self._add_fetch(time.perf_counter() - started, [])
+                return
+            self._add_fetch(time.perf_counter() - started, [row])
+            yield row
+
+    def finish_record(self):
+        """진행 중인 레코드를 확정해 보고 (다음 execute, close, summary 시 호출)"""
+        record, self._record = self._record, None
+        if record is not None:
+            self.instrumentation.emit(record)
+
+    def close(self):
+        self.finish_record()
+        super().close()
+
+    def __del__(self):
+        try:
+            self.finish_record()
+        except Exception:
+            pass
+
+
+class QueryInstrumentation:
+    """SQL 문 단위 계측 기록과 집계"""
+
+    def __init__(self, sinks: List[Callable[[Dict], None]] = None, explain_sample_rate: float = 0.0,
+                 max_records: int = 10000, statement_chars: int = 500, analysis_resolver: Callable = None):
+        """
+        Args:
+            sinks: 확정된 레코드를 받을 callable 목록 (JsonLinesSink, 메트릭 전송 함수 등)
+            explain_sample_rate: EXPLAIN (ANALYZE, BUFFERS)를 함께 수집할 일반 SELECT 비율 (0~1)
+            max_records: 메모리에 보관할 최근 레코드 수 (집계는 전체 기준)
+            statement_chars: 레코드에 남길 SQL 문 최대 길이
+            analysis_resolver: 분석 메서드 이름을 돌려주는 함수 (기본값은 current_analysis 조회)
+        """
+        self.sinks = list(sinks or [])
+        self.explain_sample_rate = explain_sample_rate
+        self.statement_chars = statement_chars
+        self.analysis_resolver = analysis_resolver or current_analysis.get
+        self.records = deque(maxlen=max_records)
+        self._totals = {}  # (analysis, statement) -> 집계
+        # 커서 __del__에서 emit될 수 있으므로 재진입 가능한 잠금 사용
+        self._lock = threading.RLock()
+        self._cursors = weakref.WeakSet()
+        self.cursor_factory = type('BoundInstrumentedCursor', (InstrumentedCursor,), {'instrumentation': self})
+
+    def track(self, cursor: InstrumentedCursor):
+        with self._lock:
+            self._cursors.add(cursor)
+
+    def should_explain(self) -> bool:
+        return self.explain_sample_rate > 0 and random.random() < self.explain_sample_rate
+
+    def start_record(self, statement: str, named: bool) -> Dict:
+        return {
+            'timestamp': datetime.now().isoformat(timespec='milliseconds'),
+            'analysis': self.analysis_resolver(),
+            'statement': _WHITESPACE.sub(' ', statement).strip()[:self.statement_chars],
+            'named_cursor': named,
+            'duration_ms': 0.0,
+            'rows': 0,
+            'bytes': 0,
+            'plan': None,
+            'error': None,
+        }
+
+    def explain(self, conn, query: str, vars) -> Optional[Dict]:
+        """
+        같은 트랜잭션에서 EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) 실행
+
+        실패해도 분석 트랜잭션이 중단되지 않도록 세이브포인트 안에서 실행한다.
+        """
+        cursor = conn.cursor(cursor_factory=psycopg2.extensions.cursor)
+        savepoint = not conn.autocommit
+        try:
+            if savepoint:
+                cursor.execute("SAVEPOINT instrumentation_explain")
+            cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {query}", vars)
+            plan = cursor.fetchone()[0]
+            if savepoint:
+                cursor.execute("RELEASE SAVEPOINT instrumentation_explain")
+            return plan[0] if isinstance(plan, list) else plan
+        except Exception as e:
+            if savepoint:
+                cursor.execute("ROLLBACK TO SAVEPOINT instrumentation_explain")
+            return {'error': str(e)}
+        finally:
+            cursor.close()
+
+    def emit(self, record: Dict):
+        record['duration_ms'] = round(record['duration_ms'], 3)
+        key = (record['analysis'], record['statement'])
+        with self._lock:
+            self.records.append(record)
+            totals = self._totals.setdefault(key, {'calls': 0, 'errors': 0, 'total_ms': 0.0, 'max_ms': 0.0,
+                                                   'rows': 0, 'bytes': 0, 'plans': 0})
+            totals['calls'] += 1
+            totals['errors'] += record['error'] is not None
+            totals['total_ms'] += record['duration_ms']
+            totals['max_ms'] = max(totals['max_ms'], record['duration_ms'])
+            totals['rows'] += record['rows']
+            totals['bytes'] += record['bytes']
+            totals['plans'] += record['plan'] is not None
+        for sink in self.sinks:
+            try:
+                sink(record)
+            except Exception as e:
+                print(f"⚠️ 계측 sink 오류: {e}")
+
+    def flush(self):
+        """아직 열려 있는 커서의 마지막 레코드 확정"""
+        with self._lock:
+            cursors = list(self._cursors)
+        for cursor in cursors:
+            cursor.finish_record()
+
+    def reset(self):
+        with self._lock:
+            self.records.clear()
+            self._totals.clear()
+
+    def summary(self) -> pd.DataFrame:
+        """분석 메서드/SQL 문별 집계 (총 실행 시간 내림차순)"""
+        self.flush()
+        with self._lock:
+            rows = [{'analysis': analysis, 'statement': statement, **totals}
+                    for (analysis, statement), totals in self._totals.items()]
+        columns = ['analysis', 'statement', 'calls', 'errors', 'total_ms', 'mean_ms', 'max_ms', 'rows', 'bytes', 'plans']
+        if not rows:
+            return pd.DataFrame(columns=columns)
+        df = pd.DataFrame(rows)
+        df['mean_ms'] = (df['total_ms'] / df['calls']).round(3)
+        df['total_ms'] = df['total_ms'].round(3)
+        return df[columns].sort_values('total_ms', ascending=False).reset_index(drop=True)
+
+    def print_summary(self, top: int = 15):
+        """SQL 문별 요약 표 출력"""
+        df = self.summary()
+        print("\n" + "="*60)
+        print("🔬 SQL 계측 요약")
+        print("="*60)
+        if df.empty:
+            print("기록된 SQL 문이 없습니다.")
+            return
+        print(f"총 {int(df['calls'].sum()):,}회 실행, {df['total_ms'].sum():,.1f}ms, "
+              f"{int(df['rows'].sum()):,}행, {int(df['bytes'].sum()):,}바이트, 실행 계획 {int(df['plans'].sum()):,}건")
+        for _, row in df.head(top).iterrows():
+            statement = row['statement'][:70] + ('…' if len(row['statement']) > 70 else '')
+            print(f"  {row['total_ms']:>10.1f}ms  {row['calls']:>4}회  평균 {row['mean_ms']:>8.1f}ms  "
+                  f"{row['rows']:>9,}행  {row['analysis'] or '-'}")
+            print(f"      {statement}")
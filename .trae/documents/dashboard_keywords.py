@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+검색어 정규화와 인기/급상승 검색어 인덱스
+
+- normalize_keyword: 유니코드 정규화(NFKC), 대소문자 통일, 기호 제거, 조사 제거
+- 띄어쓰기가 다른 검색어('인공지능 학습' / '인공지능학습')는 공백을 뺀 같은 키로 묶고,
+  화면에는 가장 많이 쓰인 표기를 보여준다
+- KeywordIndex: 날짜별 검색어 건수를 시장 / 사용자별 / 기술 분야별로 보관하고
+  보존 기간 합계를 증분으로 유지하므로 상위 검색어 조회에 원본 GROUP BY가 필요 없다
+"""
+
+import json
+import re
+import unicodedata
+from collections import Counter
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# 명사 끝 글자와 겹치는 경우가 많은 조사(이/가/로/과/도 등)는 제외한 보수적 목록
+_PARTICLES = ('에서의', '으로의', '에서', '으로', '에게', '까지', '부터', '보다', '처럼', '이나',
+              '에는', '과의', '와의', '은', '는', '을', '를', '의')
+# 여러 단어 검색어의 마지막 단어에서는 한 글자 명사 뒤에서도 떼는 목적격/보조사 ('배터리 셀을')
+_OBJECT_PARTICLES = ('은', '는', '을', '를')
+_HANGUL_END = re.compile(r'[가-힣]$')
+_SYMBOLS = re.compile(r'[^\w\s/+#.-]')
+_SPACES = re.compile(r'\s+')
+
+
+def _strip_particle(token: str, last_of_phrase: bool = False) -> str:
+    """
+    한글로 끝나는 토큰의 조사 제거
+
+    '정의', '회의'처럼 조사와 같은 글자로 끝나는 두 글자 명사를 지키기 위해
+    조사를 뗀 나머지가 2글자 이상일 때만 제거한다.
+    """
+    if not _HANGUL_END.search(token):
+        return token
+    for particle in _PARTICLES:
+        if not token.endswith(particle):
+            continue
+        min_remaining = 1 if last_of_phrase and particle in _OBJECT_PARTICLES else 2
+        if len(token) - len(particle) >= min_remaining:
+            return token[:-len(particle)]
+    return token
+
+
+@lru_cache(maxsize=100_000)
+def normalize_keyword(keyword: str) -> Tuple[str, str]:
+    """
+    검색어 정규화
+
+    Returns:
+        (인덱스 키, 표시용 표기) - 키는 공백을 제거해 띄어쓰기 차이를 무시한다.
+        정규화 결과가 비어 있으면 ('', '')
+    """
+    text = unicodedata.normalize('NFKC', keyword or '').casefold()
+    text = _SYMBOLS.sub(' ', text)
+    tokens = [token for token in _SPACES.split(text.strip()) if token]
+    tokens = [_strip_particle(token, last_of_phrase=len(tokens) > 1 and i == len(tokens) - 1)
+              for i, token in enumerate(tokens)]
+    surface = ' '.join(tokens)
+    return surface.replace(' ', ''), surface
+
+
+def scope_name(kind: str, value: str = None) -> str:
+    """인덱스 범위 이름: 'market', 'user:<id>', 'field:<기술 분야>'"""
+    return kind if value is None else f"{kind}:{value}"
+
+
+def _add_counts(total: Counter, counts: Counter, sign: int):
+    """total에 counts를 더하거나 빼고, 0 이하가 된 키는 제거"""
+    if sign > 0:
+        total.update(counts)
+        return
+    total.subtract(counts)
+    for key in [key for key in counts if total[key] <= 0]:
+        del total[key]
+
+
+class KeywordIndex:
+    """
+    날짜별 정규화 검색어 건수와 보존 기간 합계
+
+    표기 건수도 날짜별로 보관하고 합계는 증분으로 유지하므로, 당일 부분 데이터를 다시
+    계산하거나 만료된 날짜를 제거하면 해당 날짜의 표기 건수도 함께 빠진다. 급상승 비교용
+    (범위, 기간)별 최근/이전 기간 합계도 날짜 교체와 기간 이동 시 차이만 반영한다.
+    """
+
+    def __init__(self):
+        self.daily: Dict[date, Dict[str, Counter]] = {}  # 날짜 -> 범위 -> 키 -> 건수
+        self.daily_surfaces: Dict[date, Dict[str, Counter]] = {}  # 날짜 -> 키 -> 표기 -> 건수
+        self.totals: Dict[str, Counter] = {}  # 범위 -> 키 -> 보존 기간 건수
+        self.surfaces: Dict[str, Counter] = {}  # 키 -> 표기 -> 보존 기간 건수 (표시 표기 선택용)
+        self._windows: Dict[Tuple[str, int], Dict] = {}  # (범위, 기간) -> {'end', 'current', 'previous'}
+        self._answers = {}  # 질의 결과 메모 (인덱스가 바뀌면 비움)
+
+    @property
+    def days(self) -> List[date]:
+        return sorted(self.daily)
+
+    def _apply(self, day: date, counters: Dict[str, Counter], surfaces: Dict[str, Counter], sign: int):
+        for scope, counts in counters.items():
+            total = self.totals.setdefault(scope, Counter())
+            _add_counts(total, counts, sign)
+            if not total:
+                del self.totals[scope]
+        for key, counts in surfaces.items():
+            total = self.surfaces.setdefault(key, Counter())
+            _add_counts(total, counts, sign)
+            if not total:
+                del self.surfaces[key]
+        for (scope, period_days), window in self._windows.items():
+            if scope not in counters:
+                continue
+            end = window['end']
+            if end - timedelta(days=period_days) <= day < end:
+                _add_counts(window['current'], counters[scope], sign)
+            elif end - timedelta(days=2 * period_days) <= day < end:
+                _add_counts(window['previous'], counters[scope], sign)
+        self._answers.clear()
+
+    def replace_day(self, day: date, rows: Iterable[Tuple[Optional[str], Optional[str], str, int]]) -> int:
+        """
+        하루치 건수 교체 (당일처럼 다시 계산한 날짜는 기존 값을 빼고 새 값을 더함)
+
+        Args:
+            day: 날짜
+            rows: (user_id, 기술 분야, 원본 검색어, 건수)
+
+        Returns:
+            반영한 행 수
+        """
+        counters: Dict[str, Counter] = {}
+        surfaces: Dict[str, Counter] = {}
+        applied = 0
+        for user_id, field, keyword, count in rows:
+            key, surface = normalize_keyword(keyword)
+            if not key:
+                continue
+            scopes = ['market', scope_name('field', field or 'General')]
+            if user_id is not None:
+                scopes.append(scope_name('user', str(user_id)))
+            for scope in scopes:
+                counters.setdefault(scope, Counter())[key] += count
+            surfaces.setdefault(key, Counter())[surface] += count
+            applied += 1
+
+        self.drop_day(day)
+        self.daily[day] = counters
+        self.daily_surfaces[day] = surfaces
+        self._apply(day, counters, surfaces, +1)
+        return applied
+
+    def drop_day(self, day: date):
+        counters = self.daily.pop(day, None)
+        surfaces = self.daily_surfaces.pop(day, {})
+        if counters is not None:
+            self._apply(day, counters, surfaces, -1)
+
+    def expire_before(self, cutoff_day: date) -> int:
+        """보존 기간 이전 날짜 제거 (건수와 표기 모두)"""
+        expired = [day for day in self.daily if day < cutoff_day]
+        for day in expired:
+            self.drop_day(day)
+        return len(expired)
+
+    def display(self, key: str) -> str:
+        """가장 많이 쓰인 표기 (건수가 같으면 사전순으로 앞선 표기)"""
+        surfaces = self.surfaces.get(key)
+        return min(surfaces.items(), key=lambda item: (-item[1], item[0]))[0] if surfaces else key
+
+    def top(self, scope: str = 'market', n: int = 10) -> List[Dict]:
+        """범위의 보존 기간 상위 검색어 (같은 질의는 인덱스가 바뀔 때까지 메모된 결과 반환)"""
+        memo_key = ('top', scope, n)
+        answer = self._answers.get(memo_key)
+        if answer is None:
+            answer = [{'keyword': self.display(key), 'key': key, 'count': count}
+                      for key, count in self.totals.get(scope, Counter()).most_common(n)]
+            self._answers[memo_key] = answer
+        return answer
+
+    def _period_counts(self, scope: str, start: date, end: date) -> Counter:
+        counts = Counter()
+        for day, counters in self.daily.items():
+            if start <= day < end and scope in counters:
+                counts.update(counters[scope])
+        return counts
+
+    def _window(self, scope: str, period_days: int, end: date) -> Dict:
+        """
+        end 직전 period_days일(current)과 그 이전 period_days일(previous) 합계
+
+        마지막 날짜가 며칠 앞으로 가면 들어오고 나가는 날짜만 더하고 빼며, 처음 조회하거나
+        기간 전체를 넘어 이동했으면 날짜별 건수에서 다시 합산한다.
+        """
+        period = timedelta(days=period_days)
+        window = self._windows.get((scope, period_days))
+        if window is None or not window['end'] <= end < window['end'] + 2 * period:
+            window = {
+                'end': end,
+                'current': self._period_counts(scope, end - period, end),
+                'previous': self._period_counts(scope, end - 2 * period, end - period),
+            }
+            self._windows[(scope, period_days)] = window
+            return window
+
+        empty = Counter()
+        day = window['end']
+        while day < end:
+            # day가 최근 기간에 들어오면 day - period는 이전 기간으로, day - 2 * period는 밖으로
+            moved = self.daily.get(day - period, {}).get(scope, empty)
+            _add_counts(window['current'], self.daily.get(day, {}).get(scope, empty), +1)
+            _add_counts(window['current'], moved, -1)
+            _add_counts(window['previous'], moved, +1)
+            _add_counts(window['previous'], self.daily.get(day - 2 * period, {}).get(scope, empty), -1)
+            day += timedelta(days=1)
+        window['end'] = end
+        return window
+
+    def rising(self, scope: str = 'market', period_days: int = 7, n: int = 10, min_count: int = 3) -> List[Dict]:
+        """
+        급상승 검색어 - 최근 period_days일과 그 이전 period_days일 비교
+
+        증가율은 (현재 - 이전) / (이전 + 1)로 계산해 새로 등장한 검색어의 값이 무한대가 되지 않게 한다.
+
+        Args:
+            scope: 범위 이름
+            period_days: 비교 기간(일)
+            n: 반환할 검색어 수
+            min_count: 최근 기간 최소 건수 (우연히 1~2번 나온 검색어 제외)
+        """
+        memo_key = ('rising', scope, period_days, n, min_count)
+        answer = self._answers.get(memo_key)
+        if answer is not None:
+            return answer
+        if not self.daily:
+            return []
+
+        window = self._window(scope, period_days, max(self.daily) + timedelta(days=1))
+        current, previous = window['current'], window['previous']
+        ranked = sorted(
+            ((key, count, previous.get(key, 0)) for key, count in current.items() if count >= min_count),
+            key=lambda item: (-(item[1] - item[2]) / (item[2] + 1), -item[1], item[0])
+        )
+        answer = [
+            {'keyword': self.display(key), 'key': key, 'count': count, 'previous_count': before,
+             'growth': round((count - before) / (before + 1), 3)}
+            for key, count, before in ranked[:n]
+            if count > before
+        ]
+        self._answers[memo_key] = answer
+        return answer
+
+    def field_keywords(self, n: int = 5) -> Dict[str, List[Dict]]:
+        """기술 분야별 상위 검색어"""
+        prefix = scope_name('field', '')
+        return {scope[len(prefix):]: self.top(scope, n) for scope in sorted(self.totals) if scope.startswith(prefix)}
+
+    def save(self, path: str):
+        """JSON 파일로 저장 (날짜별 건수와 표기)"""
+        payload = {
+            'daily': {day.isoformat(): {scope: dict(counts) for scope, counts in counters.items()}
+                      for day, counters in self.daily.items()},
+            'daily_surfaces': {day.isoformat(): {key: dict(surfaces) for key, surfaces in keys.items()}
+                               for day, keys in self.daily_surfaces.items()},
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path: str) -> 'KeywordIndex':
+        """
+        JSON 파일에서 불러오기
+
+        save()가 쓴 형식(날짜별 건수와 표기)만 읽는다. 날짜별 표기(daily_surfaces)가 없는
+        파일은 ValueError를 내므로, 파일을 지우고 인덱스를 다시 만들어야 한다.
+        """
+        with open(path, encoding='utf-8') as f:
+            payload = json.load(f)
+        if 'daily_surfaces' not in payload:
+            raise ValueError(f"날짜별 표기가 없는 검색어 인덱스 파일입니다 (삭제 후 다시 생성): {path}")
+        index = cls()
+        daily_surfaces = payload['daily_surfaces']
+        for day, counters in payload['daily'].items():
+            counters = {scope: Counter(counts) for scope, counts in counters.items()}
+            surfaces = {key: Counter(counts) for key, counts in daily_surfaces[day].items()}
+            day = date.fromisoformat(day)
+            index.daily[day] = counters
+            index.daily_surfaces[day] = surfaces
+            index._apply(day, counters, surfaces, +1)
+        return index
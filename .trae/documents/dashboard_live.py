@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+LISTEN/NOTIFY 기반 대시보드 실시간 카운터
+
+20261016_dashboard_live_notify.sql 트리거는 search_history/ai_analysis_reports의 INSERT/DELETE를
+문장마다 (user_id, technology_field)별 건수로 묶어 dashboard_changes 채널로 알린다.
+LiveDashboardListener는 전용 연결로 이 채널을 LISTEN하면서 알림을 메모리 카운터(시장/사용자별
+기술 분야 건수, 전체 건수)에 증감으로 반영한다. 최근 N개 목록은 알림이 온 source만
+(created_at) 인덱스로 상위 N행을 다시 읽는다. 전체 스캔은 주기적 재조정에서만 한다.
+
+재조정은 REPEATABLE READ 트랜잭션 하나에서 두 테이블을 집계하고 그 스냅샷
+(pg_current_snapshot)을 기억한다. 이후 도착한 알림 중 트랜잭션이 이미 스냅샷에 보이는 것은
+집계에 포함되어 있으므로 건너뛴다. 트리거가 다루지 않는 변화(UPDATE, TRUNCATE, 보존 기간을
+지났지만 아직 정리되지 않은 행, users 테이블 사용자 수)는 재조정 때 맞춰진다.
+
+트리거는 보존 기간(NOTIFY_RETENTION_DAYS일, 트리거 세 번째 인자) 안의 행 변경만 알리므로 리스너의
+보존 기간도 같은 값이어야 한다. 다른 값을 쓰려면 마이그레이션의 트리거 인자와 이 상수를 함께 바꾼다.
+
+    listener = LiveDashboardListener(db_config, reconcile_interval=600)
+    listener.start()
+    listener.counters.distribution('search')
+"""
+
+import json
+import select
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Set, Tuple
+
+import psycopg2
+import psycopg2.extensions
+
+from dashboard_data_analysis_test import DashboardDataAnalyzer
+
+
+NOTIFY_CHANNEL = 'dashboard_changes'
+NOTIFY_RETENTION_DAYS = 100  # 20261016_dashboard_live_notify.sql 트리거의 보존 기간 인자
+SOURCES = DashboardDataAnalyzer.FIELD_SOURCES
+
+
+def parse_txid_snapshot(text: str) -> Tuple[int, int, Set[int]]:
+    """pg_current_snapshot() 문자열 'xmin:xmax:xip,...'을 (xmin, xmax, 진행 중 txid 집합)으로 변환"""
+    xmin, xmax, xip = text.split(':')
+    return int(xmin), int(xmax), {int(txid) for txid in xip.split(',') if txid}
+
+
+def visible_in_snapshot(txid: int, snapshot: Tuple[int, int, Set[int]]) -> bool:
+    """txid가 커밋되었다면 그 결과가 스냅샷에 보이는지 (pg_visible_in_snapshot과 같은 규칙)"""
+    xmin, xmax, xip = snapshot
+    return txid < xmin or (txid < xmax and txid not in xip)
+
+
+def user_key(user_id) -> Optional[str]:
+    """사용자 카운터 키 (재조정 행의 UUID와 알림 JSON의 문자열을 같은 키로, NULL은 None으로 유지)"""
+    return None if user_id is None else str(user_id)
+
+
+class LiveCounters:
+    """
+    source별 시장/사용자 기술 분야 건수와 최근 목록 (스레드 안전)
+
+    기술 분야 키는 원래 값(NULL은 None)으로 저장해 커버리지를 계산하고, 분포 출력에서만
+    'General'로 합친다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._market = {source: Counter() for source in SOURCES}
+        self._users = {source: {} for source in SOURCES}
+        self._recent = {source: [] for source in SOURCES}
+        self._total_users = 0
+        self._snapshot = None
+        self.stats = {'applied': 0, 'skipped': 0, 'reconciles': 0, 'drift_corrected': 0,
+                      'last_change_at': None, 'last_reconcile_at': None}
+
+    def replace(self, source: str, rows: List[Tuple[str, Optional[str], int]]):
+        """재조정 집계 (user_id, technology_field, 건수) 행으로 source 카운터 교체"""
+        market, users = Counter(), {}
+        for user_id, field, count in rows:
+            market[field] += count
+            users.setdefault(user_key(user_id), Counter())[field] += count
+        with self._lock:
+            if self.stats['reconciles']:
+                previous = self._market[source]
+                self.stats['drift_corrected'] += sum(abs(market[key] - previous[key])
+                                                     for key in set(market) | set(previous))
+            self._market[source] = market
+            self._users[source] = users
+
+    def finish_reconcile(self, total_users: int, snapshot: Tuple[int, int, Set[int]]):
+        with self._lock:
+            self._total_users = total_users
+            self._snapshot = snapshot
+            self.stats['reconciles'] += 1
+            self.stats['last_reconcile_at'] = time.time()
+
+    def apply(self, payload: Dict) -> bool:
+        """
+        트리거 알림 한 건을 카운터에 반영
+
+        Returns:
+            반영했으면 True, 재조정 스냅샷에 이미 포함된 트랜잭션이라 건너뛰었으면 False
+        """
+        source, sign = payload['s'], int(payload['o'])
+        with self._lock:
+            if self._snapshot is not None and visible_in_snapshot(int(payload['x']), self._snapshot):
+                self.stats['skipped'] += 1
+                return False
+            market, users = self._market[source], self._users[source]
+            for user_id, field, count in payload['d']:
+                delta = sign * count
+                market[field] += delta
+                key = user_key(user_id)
+                user = users.setdefault(key, Counter())
+                user[field] += delta
+                if user[field] <= 0:
+                    del user[field]
+                    if not user:
+                        del users[key]
+                if market[field] <= 0:
+                    del market[field]
+            self.stats['applied'] += 1
+            self.stats['last_change_at'] = time.time()
+        return True
+
+    def set_recent(self, source: str, records: List[Dict]):
+        with self._lock:
+            self._recent[source] = records
+
+    def distribution(self, source: str, user_id: str = None, limit: int = None) -> List[Dict]:
+        """analysis_json('distribution')과 같은 형식의 기술 분야 분포 레코드"""
+        count_column = SOURCES[source][1]
+        with self._lock:
+            counts = self._users[source].get(user_key(user_id), Counter()) if user_id else self._market[source]
+            merged = Counter()
+            for field, count in counts.items():
+                merged[field or 'General'] += count
+        total = sum(merged.values())
+        return [
+            {'기술분야': field, count_column: count, '비율(%)': round(count * 100.0 / total, 2)}
+            for field, count in merged.most_common(limit)
+        ]
+
+    def recent(self, source: str, limit: int) -> Optional[List[Dict]]:
+        """최근 목록 레코드 (보관 개수보다 많이 요청하면 None)"""
+        with self._lock:
+            records = self._recent[source]
+        return records[:limit] if limit <= len(records) else None
+
+    def summary(self) -> Dict:
+        """analysis_json('summary')와 같은 키의 요약 통계"""
+        with self._lock:
+            totals = {source: sum(self._market[source].values()) for source in SOURCES}
+            covered = {source: sum(count for field, count in self._market[source].items() if field is not None)
+                       for source in SOURCES}
+            fields = {source: sum(1 for field in self._market[source] if field is not None) for source in SOURCES}
+            total_users = self._total_users
+
+        def coverage(source: str) -> float:
+            return round(covered[source] * 100.0 / totals[source], 2) if totals[source] else 0.0
+
+        return {
+            'total_users': total_users,
+            'total_searches': totals['search'],
+            'total_reports': totals['report'],
+            'unique_search_fields': fields['search'],
+            'unique_report_fields': fields['report'],
+            'search_coverage': coverage('search'),
+            'report_coverage': coverage('report'),
+        }
+
+
+class LiveDashboardListener:
+    """dashboard_changes 알림을 LiveCounters에 반영하고 주기적으로 데이터베이스와 재조정하는 상주 리스너"""
+
+    def __init__(self, db_config: Dict[str, str], retention_days: int = NOTIFY_RETENTION_DAYS,
+                 reconcile_interval: float = 600.0, recent_limit: int = 10, poll_timeout: float = 1.0):
+        """
+        Args:
+            db_config: 데이터베이스 연결 설정
+            retention_days: 카운터가 나타내는 보존 기간(일) - 트리거 인자와 같은 NOTIFY_RETENTION_DAYS만 가능
+            reconcile_interval: 재조정 주기(초)
+            recent_limit: 보관할 최근 검색/리포트 수
+            poll_timeout: 알림 대기 최대 시간(초) - 재조정/종료 확인 주기
+            
+        Raises:
+            ValueError: retention_days가 트리거의 보존 기간과 다른 경우 (재조정 사이의 증감이 어긋남)
+        """
+        if retention_days != NOTIFY_RETENTION_DAYS:
+            raise ValueError(f"실시간 카운터 보존 기간은 트리거와 같은 {NOTIFY_RETENTION_DAYS}일이어야 합니다: "
+                             f"{retention_days}")
+        self.db_config = db_config
+        self.retention_days = retention_days
+        self.reconcile_interval = reconcile_interval
+        self.recent_limit = recent_limit
+        self.poll_timeout = poll_timeout
+        self.counters = LiveCounters()
+        self.conn = None
+        self.ready = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._analyzer = None
+        self._last_reconcile = 0.0
+
+    def connect(self):
+        """전용 autocommit 연결을 열고 LISTEN 후 재조정 (LISTEN이 먼저여야 사이의 변경을 놓치지 않음)"""
+        self.conn = psycopg2.connect(**self.db_config)
+        self.conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+        self.conn.cursor().execute(f"LISTEN {NOTIFY_CHANNEL}")
+        # 최근 목록은 분석기의 컬럼형 조회를 그대로 사용 (같은 연결)
+        self._analyzer = DashboardDataAnalyzer(self.db_config)
+        self._analyzer.conn = self.conn
+        self._analyzer.retention_days = self.retention_days
+        self.reconcile()
+        for source in SOURCES:
+            self.refresh_recent(source)
+        self.ready.set()
+
+    def reconcile(self):
+        """보존 기간 집계로 카운터를 교체하고 그 스냅샷을 기록 (유일한 전체 스캔)"""
+        started = time.perf_counter()
+        cursor = self.conn.cursor()
+        cursor.execute("BEGIN ISOLATION LEVEL REPEATABLE READ")
+        try:
+            cursor.execute("SELECT pg_current_snapshot()::text, (SELECT COUNT(*) FROM users)")
+            snapshot_text, total_users = cursor.fetchone()
+            for source, (table, _) in SOURCES.items():
+                cursor.execute(f"""
+                    SELECT user_id, technology_field, COUNT(*)
+                    FROM {table}
+                    WHERE created_at >= NOW() - INTERVAL '%s days'
+                    GROUP BY user_id, technology_field
+                """, (self.retention_days,))
+                self.counters.replace(source, cursor.fetchall())
+            cursor.execute("COMMIT")
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+        self.counters.finish_reconcile(total_users, parse_txid_snapshot(snapshot_text))
+        self._last_reconcile = time.monotonic()
+        print(f"🔄 실시간 카운터 재조정 완료 ({time.perf_counter() - started:.2f}초, "
+              f"누적 보정 {self.counters.stats['drift_corrected']:,}건)")
+
+    def refresh_recent(self, source: str):
+        """최근 목록을 (created_at) 인덱스 상위 N행으로 다시 읽음"""
+        analyzer = self._analyzer
+        frame = (analyzer.recent_searches_frame if source == 'search' else analyzer.recent_reports_frame)(self.recent_limit)
+        self.counters.set_recent(source, analyzer._frame_records(frame))
+
+    def poll_once(self, timeout: float = None) -> int:
+        """
+        알림을 기다렸다가 도착한 알림을 모두 반영
+
+        Returns:
+            반영한 알림 수
+        """
+        timeout = self.poll_timeout if timeout is None else timeout
+        # 같은 연결의 최근 목록/재조정 쿼리 중에 libpq가 받아 둔 알림은 소켓에 남아 있지 않으므로 먼저 수집
+        self.conn.poll()
+        if not self.conn.notifies:
+            if select.select([self.conn], [], [], timeout) == ([], [], []):
+                return 0
+            self.conn.poll()
+        applied, changed = 0, set()
+        while self.conn.notifies:
+            notify = self.conn.notifies.pop(0)
+            try:
+                payload = json.loads(notify.payload)
+            except ValueError:
+                print(f"⚠️ 알 수 없는 알림 페이로드: {notify.payload[:80]}")
+                continue
+            if self.counters.apply(payload):
+                applied += 1
+                changed.add(payload['s'])
+        for source in changed:
+            self.refresh_recent(source)
+        return applied
+
+    def run(self):
+        """종료 요청까지 알림 반영과 주기적 재조정 반복 (연결이 끊어지면 다시 연결하고 재조정)"""
+        while not self._stop.is_set():
+            try:
+                if self.conn is None or self.conn.closed:
+                    self.connect()
+                self.poll_once()
+                if time.monotonic() - self._last_reconcile >= self.reconcile_interval:
+                    self.reconcile()
+            except psycopg2.Error as e:
+                print(f"❌ 실시간 카운터 연결 오류, 재연결합니다: {e}")
+                self._close_connection()
+                self._stop.wait(min(self.poll_timeout * 5, 30))
+        self._close_connection()
+
+    def start(self, wait: float = None) -> 'LiveDashboardListener':
+        """
+        백그라운드 스레드에서 run() 시작
+
+        Args:
+            wait: 지정하면 첫 재조정이 끝날 때까지 최대 이 시간(초) 대기
+        """
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, name='dashboard-live-listener', daemon=True)
+        self._thread.start()
+        if wait:
+            self.ready.wait(wait)
+        return self
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _close_connection(self):
+        if self.conn is not None and not self.conn.closed:
+            self.conn.close()
+        self.conn = None
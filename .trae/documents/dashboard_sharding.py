@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+사용자별 분석 샤드 병렬 실행
+
+사용자를 hashtext(user_id) 구간으로 나눠 프로세스 풀에서 처리한다. 각 작업자 프로세스는
+자기 연결과 DashboardDataAnalyzer 인스턴스를 유지하고, 맡은 샤드의 사용자 분포(긴 형식
+DataFrame, users_field_distribution_frame 쿼리 한 번)/요약과 샤드 시장 합계(기술 분야별
+건수 Series)를 돌려준다. 실행기는 완료 순서와 관계없이 같은 결과가 나오도록
+샤드 번호와 user_id 순서로 병합한다.
+
+샤드 쿼리는 20261016_dashboard_user_hash_indexes.sql의 (hashtext(user_id), created_at)
+인덱스로 자기 구간만 읽으므로 데이터베이스 작업량도 샤드 수만큼 나뉜다.
+"""
+
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
+from typing import Dict, List, Tuple
+
+import pandas as pd
+
+from dashboard_data_analysis_test import DashboardDataAnalyzer
+
+
+_worker_analyzer = None  # 작업자 프로세스별 분석기 (연결 유지)
+SUMMARY_COLUMNS = ['searches', 'reports', 'conversion_rate', 'top_search_field', 'top_report_field']
+
+
+def _init_worker(db_config: Dict[str, str], retention_days: int):
+    global _worker_analyzer
+    _worker_analyzer = DashboardDataAnalyzer(db_config)
+    _worker_analyzer.retention_days = retention_days
+
+
+def _worker_connection() -> DashboardDataAnalyzer:
+    """작업자 분석기의 연결 확인 (끊어졌으면 다시 연결)"""
+    analyzer = _worker_analyzer
+    if analyzer.conn is None or analyzer.conn.closed:
+        with redirect_stdout(io.StringIO()):
+            connected = analyzer.connect_database()
+        if not connected:
+            raise ConnectionError("작업자 데이터베이스 연결 실패")
+    return analyzer
+
+
+def _unassigned_field_counts(analyzer: DashboardDataAnalyzer, source: str) -> pd.Series:
+    """user_id가 없는 행의 기술 분야별 건수 (어느 해시 구간에도 속하지 않으므로 첫 샤드가 집계)"""
+    table, _ = analyzer.FIELD_SOURCES[source]
+    cursor = analyzer.conn.cursor()
+    cursor.execute(f"""
+        SELECT COALESCE(technology_field, 'General') as field, COUNT(*)
+        FROM {table}
+        WHERE created_at >= NOW() - INTERVAL '%s days'
+            AND user_id IS NULL
+        GROUP BY 1
+    """, (analyzer.retention_days,))
+    rows = cursor.fetchall()
+    return pd.Series([count for _, count in rows], index=[field for field, _ in rows], dtype='int64')
+
+
+def _user_summaries(distributions: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """
+    사용자별 검색/리포트 수, 전환율, 최다 기술 분야 (user_id 인덱스)
+
+    distributions는 source별 긴 형식 분포(user_id, 기술분야, 건수, 비율)이며 사용자 안에서
+    건수 내림차순이므로 사용자별 첫 행이 최다 기술 분야이다.
+    """
+    columns = {}
+    for source, label in (('search', 'searches'), ('report', 'reports')):
+        df = distributions.get(source)
+        if df is None or df.empty:
+            continue
+        count_column = DashboardDataAnalyzer.FIELD_SOURCES[source][1]
+        grouped = df.groupby('user_id', sort=False)
+        columns[label] = grouped[count_column].sum()
+        columns[f'top_{source}_field'] = grouped['기술분야'].first()
+    summary = pd.DataFrame(columns, columns=SUMMARY_COLUMNS)
+    summary.index.name = 'user_id'
+    for label in ('searches', 'reports'):
+        summary[label] = summary[label].fillna(0).astype('int64')
+    searches = summary['searches'].where(summary['searches'] > 0)
+    summary['conversion_rate'] = (summary['reports'] * 100.0 / searches).round(2)
+    return summary
+
+
+def _analyze_shard(index: int, shard: Tuple[int, int], sources: Tuple[str, ...]) -> Dict:
+    """
+    작업자 프로세스에서 샤드 1개 처리
+
+    사용자별 DataFrame 대신 source별 긴 형식 분포 DataFrame 하나와 사용자 요약 DataFrame
+    하나만 돌려주므로 부모 프로세스로 보내는 피클 크기와 객체 수가 사용자 수와 무관하게 작다.
+    분포는 샤드 조건을 붙인 GROUP BY 쿼리 한 번으로 읽고, 시장 합계는 groupby로 계산한다.
+    """
+    analyzer = _worker_connection()
+    started = time.perf_counter()
+    distributions: Dict[str, pd.DataFrame] = {}
+    market: Dict[str, pd.Series] = {}
+    try:
+        for source in sources:
+            count_column = analyzer.FIELD_SOURCES[source][1]
+            long = analyzer.users_field_distribution_frame(source, shard=shard)
+            distributions[source] = long
+            # 원본 NULL과 'General'은 둘 다 'General' 행으로 나오므로 분야별로 합산
+            totals = long.groupby('기술분야')[count_column].sum()
+            if index == 0:
+                totals = totals.add(_unassigned_field_counts(analyzer, source), fill_value=0)
+            market[source] = totals.astype('int64')
+        analyzer.conn.commit()
+    except Exception:
+        if not analyzer.conn.closed:
+            analyzer.conn.rollback()
+        raise
+
+    summaries = _user_summaries(distributions)
+    return {
+        'index': index,
+        'distributions': distributions,
+        'summaries': summaries,
+        'user_count': len(summaries),
+        'market': market,
+        'seconds': round(time.perf_counter() - started, 3),
+        'pid': os.getpid(),
+    }
+
+
+class ShardFailure(RuntimeError):
+    """재시도 후에도 실패한 샤드가 있어 전체 결과를 만들 수 없음"""
+
+    def __init__(self, failed: Dict[int, str]):
+        self.failed = failed
+        details = ', '.join(f"{index}: {error}" for index, error in sorted(failed.items()))
+        super().__init__(f"샤드 {len(failed)}개 실패 ({details})")
+
+
+class ShardedUserAnalysisRunner:
+    """사용자 해시 구간 샤드를 프로세스 풀에서 실행하고 결과를 병합"""
+
+    def __init__(self, db_config: Dict[str, str], workers: int = None, shards: int = None,
+                 retries: int = 2, retention_days: int = 100):
+        """
+        Args:
+            db_config: 데이터베이스 연결 설정
+            workers: 작업자 프로세스 수 (None이면 CPU 코어 수)
+            shards: 샤드 수 (None이면 작업자 수 x 4 - 작게 나눌수록 부하 분산과 재시도 비용이 좋아짐)
+            retries: 샤드별 재시도 횟수
+            retention_days: 분석 기간(일)
+        """
+        self.db_config = db_config
+        self.workers = workers or os.cpu_count() or 1
+        self.shards = DashboardDataAnalyzer.hash_shards(shards or self.workers * 4)
+        self.retries = retries
+        self.retention_days = retention_days
+
+    def run(self, sources: Tuple[str, ...] = ('search', 'report'), allow_partial: bool = False) -> Dict:
+        """
+        전체 사용자 샤드 분석 실행
+
+        실패한 샤드는 새 프로세스 풀에서 최대 retries회 다시 실행한다. 그래도 실패한 샤드가
+        있으면 일부 사용자가 빠진 결과가 되므로 ShardFailure를 발생시킨다.
+
+        Args:
+            sources: 분석 대상 ('search', 'report')
+            allow_partial: True이면 실패한 샤드가 있어도 complete=False로 표시한 결과를 반환
+
+        Returns:
+            summaries(user_id 인덱스 사용자 요약 DataFrame), distributions(source -> user_id,
+            기술분야, 건수, 비율 긴 형식 DataFrame), market(source -> 기술 분야 분포 DataFrame),
+            shards(샤드별 실행 정보), complete, failed(끝내 실패한 샤드 번호 -> 오류) 딕셔너리
+
+        Raises:
+            ShardFailure: 실패한 샤드가 있고 allow_partial이 False인 경우
+        """
+        print("\n" + "="*60)
+        print(f"🧩 샤드 병렬 사용자 분석 (샤드 {len(self.shards)}개, 프로세스 {self.workers}개)")
+        print("="*60)
+
+        started = time.perf_counter()
+        pending = {index: 0 for index in range(len(self.shards))}  # 샤드 -> 시도 횟수
+        completed: Dict[int, Dict] = {}
+        failed: Dict[int, str] = {}
+
+        while pending:
+            retry = {}
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(pending)), initializer=_init_worker,
+                                     initargs=(self.db_config, self.retention_days)) as executor:
+                futures = {
+                    executor.submit(_analyze_shard, index, self.shards[index], tuple(sources)): index
+                    for index in sorted(pending)
+                }
+                for future in as_completed(futures):
+                    index = futures[future]
+                    attempts = pending[index] + 1
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        if attempts <= self.retries:
+                            print(f"⚠️ 샤드 {index} 실패 ({attempts}회차): {e} - 재시도 예정")
+                            retry[index] = attempts
+                        else:
+                            print(f"❌ 샤드 {index} 실패 ({attempts}회차): {e}")
+                            failed[index] = str(e)
+                        continue
+                    result['attempts'] = attempts
+                    completed[index] = result
+                    print(f"⏳ [{len(completed)}/{len(self.shards)}] 샤드 {index} 완료: "
+                          f"사용자 {result['user_count']:,}명, {result['seconds']:.1f}초 (pid {result['pid']})")
+            pending = retry
+
+        if failed and not allow_partial:
+            raise ShardFailure(failed)
+
+        merged = self.merge([completed[index] for index in sorted(completed)], sources)
+        merged['complete'] = not failed
+        merged['failed'] = failed
+        elapsed = time.perf_counter() - started
+        status = "✅" if not failed else "⚠️ (일부 샤드 누락)"
+        print(f"{status} 샤드 {len(completed)}/{len(self.shards)}개 완료: 사용자 {len(merged['summaries']):,}명, "
+              f"{elapsed:.1f}초")
+        return merged
+
+    def merge(self, results: List[Dict], sources: Tuple[str, ...]) -> Dict:
+        """샤드 결과 병합 (user_id 정렬, 시장 분포는 건수 내림차순/분야 이름순)"""
+        summaries = (pd.concat([result['summaries'] for result in results]) if results
+                     else pd.DataFrame(columns=SUMMARY_COLUMNS))
+        distributions = {}
+        for source in sources:
+            frames = [result['distributions'][source] for result in results]
+            distributions[source] = (pd.concat(frames, ignore_index=True).sort_values('user_id', kind='stable')
+                                     .reset_index(drop=True) if frames else pd.DataFrame())
+
+        market = {}
+        for source in sources:
+            count_column = DashboardDataAnalyzer.FIELD_SOURCES[source][1]
+            counts = [result['market'][source] for result in results]
+            totals = (pd.concat(counts).groupby(level=0).sum() if counts
+                      else pd.Series(dtype='int64'))
+            df = totals.rename_axis('기술분야').reset_index(name=count_column)
+            df = df.sort_values([count_column, '기술분야'], ascending=[False, True], ignore_index=True)
+            total = df[count_column].sum()
+            df['비율(%)'] = (df[count_column] * 100.0 / total).round(2) if total else 0.0
+            market[source] = df
+
+        shards = [
+            {'index': result['index'], 'range': self.shards[result['index']], 'users': result['user_count'],
+             'seconds': result['seconds'], 'attempts': result['attempts'], 'pid': result['pid']}
+            for result in results
+        ]
+        return {'summaries': summaries.sort_index(kind='stable'), 'distributions': distributions,
+                'market': market, 'shards': shards}
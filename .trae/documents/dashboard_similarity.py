@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+사용자 대 시장 기술 분야 유사도/발산 점수
+
+users_field_distribution_frame()의 (user_id, 기술분야, 건수) 집계 한 번으로
+사용자 × 기술 분야 희소 건수 행렬(CSR: indptr, indices, data)을 만든다. 시장 분포는
+같은 행렬의 열 합계이므로 추가 쿼리가 없다.
+
+- divergence_scores(): 사용자별 KL(사용자 || 시장), Jensen-Shannon 발산, 시장과의 코사인
+  유사도, 특화 점수를 0이 아닌 칸에서만 np.bincount로 계산한다. 사용자 수만큼의
+  Python 루프가 없다.
+- similar_users(): 행 정규화한 행렬끼리의 코사인 유사도로 상위 N명의 비슷한 사용자를
+  찾는다. 질의 사용자를 메모리 상한에 맞춘 블록으로 나눠 행렬 곱과 argpartition으로
+  처리한다.
+
+scipy는 의존성에 없으므로 CSR 배열을 NumPy로 직접 다룬다. 기술 분야 수는 수십 개
+수준이라 유사도 계산용 밀집 행렬(사용자 수 × 분야 수, float32)도 수십만 명에서 수십 MB이다.
+"""
+
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+
+SCORE_COLUMNS = ['user_id', '활동수', '분야수', 'KL', 'JS', '시장코사인', '특화점수',
+                 '주력분야', '주력분야비율(%)', '리프트']
+SIMILAR_COLUMNS = ['user_id', '순위', '유사사용자', '유사도']
+
+
+class FieldMatrix:
+    """사용자 × 기술 분야 희소 건수 행렬 (CSR, 행은 user_id 순서)"""
+
+    def __init__(self, user_ids: np.ndarray, fields: np.ndarray, indptr: np.ndarray,
+                 indices: np.ndarray, data: np.ndarray):
+        self.user_ids = user_ids
+        self.fields = fields
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, count_column: str) -> 'FieldMatrix':
+        """
+        (user_id, 기술분야, 건수) 긴 DataFrame으로 행렬 생성
+
+        COALESCE(technology_field, 'General')로 NULL과 'General'이 별도 행으로 올 수 있으므로
+        같은 (사용자, 분야) 칸은 합산한다.
+        """
+        user_codes, user_ids = pd.factorize(df['user_id'], sort=True)
+        field_codes, fields = pd.factorize(df['기술분야'], sort=True)
+        n_fields = max(len(fields), 1)
+        cells, inverse = np.unique(user_codes.astype(np.int64) * n_fields + field_codes, return_inverse=True)
+        data = np.bincount(inverse, weights=df[count_column].to_numpy(dtype=np.float64))
+        rows = cells // n_fields
+        indptr = np.zeros(len(user_ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=len(user_ids)), out=indptr[1:])
+        return cls(np.asarray(user_ids, dtype=object), np.asarray(fields, dtype=object),
+                   indptr, (cells % n_fields).astype(np.int32), data)
+
+    @property
+    def n_users(self) -> int:
+        return len(self.user_ids)
+
+    @property
+    def n_fields(self) -> int:
+        return len(self.fields)
+
+    def row_ids(self) -> np.ndarray:
+        """0이 아닌 칸별 행 번호"""
+        return np.repeat(np.arange(self.n_users), np.diff(self.indptr))
+
+    def row_totals(self) -> np.ndarray:
+        return np.add.reduceat(self.data, self.indptr[:-1]) if self.data.size else np.zeros(self.n_users)
+
+    def market(self) -> np.ndarray:
+        """시장 분포 (열 합계를 확률로 정규화)"""
+        totals = np.bincount(self.indices, weights=self.data, minlength=self.n_fields)
+        return totals / totals.sum() if totals.sum() else totals
+
+    def normalized_rows(self, dtype=np.float32) -> np.ndarray:
+        """행 단위 L2 정규화한 밀집 행렬 (코사인 유사도용)"""
+        dense = np.zeros((self.n_users, self.n_fields), dtype=dtype)
+        dense[self.row_ids(), self.indices] = self.data
+        norms = np.linalg.norm(dense, axis=1, keepdims=True)
+        np.divide(dense, norms, out=dense, where=norms > 0)
+        return dense
+
+    def user_index(self, user_ids: List[str]) -> np.ndarray:
+        """user_id 목록의 행 번호 (행렬에 없는 사용자는 -1)"""
+        positions = {user_id: i for i, user_id in enumerate(self.user_ids)}
+        return np.array([positions.get(str(user_id), -1) for user_id in user_ids], dtype=np.int64)
+
+
+def divergence_scores(matrix: FieldMatrix, market: np.ndarray = None) -> pd.DataFrame:
+    """
+    사용자별 시장 대비 발산/유사도 점수 (0이 아닌 칸만 사용)
+
+    - KL: KL(사용자 || 시장), 비트 단위. 시장은 모든 사용자 칸의 합이므로 항상 유한하다.
+    - JS: Jensen-Shannon 발산, 비트 단위(0~1). 사용자 분포가 0인 분야의 시장 쪽 항은
+      q·log2(q / (q/2)) = q이므로 0이 아닌 칸 밖은 (1 - 해당 칸 시장 비율 합)으로 한 번에 더한다.
+    - 시장코사인: 사용자 분포와 시장 분포의 코사인 유사도
+    - 특화점수: JS × 100 (0이면 시장과 같은 분포, 100이면 시장과 겹치는 분야가 없음)
+    - 주력분야/리프트: 사용자 비율이 가장 높은 분야와 그 분야의 (사용자 비율 / 시장 비율)
+
+    Args:
+        matrix: 사용자 × 기술 분야 건수 행렬
+        market: 비교할 시장 분포 (None이면 행렬의 열 합계)
+
+    Returns:
+        SCORE_COLUMNS 컬럼 DataFrame (특화점수 내림차순)
+    """
+    if matrix.n_users == 0:
+        return pd.DataFrame(columns=SCORE_COLUMNS)
+    q = matrix.market() if market is None else np.asarray(market, dtype=np.float64)
+    rows = matrix.row_ids()
+    totals = matrix.row_totals()
+    p = matrix.data / totals[rows]
+    q_nz = q[matrix.indices]
+
+    def row_sum(values: np.ndarray) -> np.ndarray:
+        return np.bincount(rows, weights=values, minlength=matrix.n_users)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        kl = row_sum(p * np.log2(p / q_nz))
+        m = (p + q_nz) / 2
+        js = 0.5 * row_sum(p * np.log2(p / m)) + 0.5 * (
+            row_sum(np.where(q_nz > 0, q_nz * np.log2(q_nz / m), 0.0)) + (1.0 - row_sum(q_nz)))
+        cosine = row_sum(p * q_nz) / (np.sqrt(row_sum(p * p)) * np.linalg.norm(q))
+    js = np.clip(js, 0.0, 1.0)
+
+    # 행별 최대 비율 칸: (행, -비율) 정렬 후 각 행의 첫 칸
+    order = np.lexsort((-p, rows))
+    top = order[matrix.indptr[:-1]]
+
+    df = pd.DataFrame({
+        'user_id': matrix.user_ids,
+        '활동수': totals.astype(np.int64),
+        '분야수': np.diff(matrix.indptr),
+        'KL': np.round(kl, 4),
+        'JS': np.round(js, 4),
+        '시장코사인': np.round(np.nan_to_num(cosine), 4),
+        '특화점수': np.round(js * 100, 1),
+        '주력분야': matrix.fields[matrix.indices[top]],
+        '주력분야비율(%)': np.round(p[top] * 100, 2),
+        '리프트': np.round(p[top] / q_nz[top], 2),
+    })
+    return df.sort_values(['특화점수', '활동수'], ascending=[False, False], kind='stable').reset_index(drop=True)
+
+
+def similar_users(matrix: FieldMatrix, user_ids: List[str] = None, n: int = 10,
+                  memory_limit: int = 64 * 1024 * 1024) -> pd.DataFrame:
+    """
+    사용자별 기술 분야 분포가 가장 비슷한 사용자 상위 N명 (코사인 유사도)
+
+    질의 사용자 블록 × 전체 사용자 유사도 행렬을 memory_limit 안에서 만들고
+    argpartition으로 상위 N개만 정렬한다. 전체 사용자를 질의하면 작업량은 사용자 수의
+    제곱에 비례하므로 야간 배치용이며, 대시보드 요청에는 user_ids를 지정한다.
+
+    Args:
+        matrix: 사용자 × 기술 분야 건수 행렬
+        user_ids: 질의 사용자 목록 (None이면 전체 사용자, 행렬에 없는 사용자는 제외)
+        n: 사용자별 반환할 유사 사용자 수
+        memory_limit: 블록 유사도 행렬의 최대 바이트 수
+
+    Returns:
+        SIMILAR_COLUMNS 컬럼 DataFrame (질의 사용자, 순위 순서)
+    """
+    if user_ids is None:
+        queries = np.arange(matrix.n_users)
+    else:
+        queries = matrix.user_index(user_ids)
+        queries = queries[queries >= 0]
+    n = min(n, matrix.n_users - 1)
+    if n <= 0 or queries.size == 0:
+        return pd.DataFrame(columns=SIMILAR_COLUMNS)
+
+    vectors = matrix.normalized_rows()
+    block_size = max(1, memory_limit // (matrix.n_users * vectors.itemsize))
+    query_rows, neighbor_rows, scores = [], [], []
+    for start in range(0, queries.size, block_size):
+        block = queries[start:start + block_size]
+        sims = vectors[block] @ vectors.T
+        sims[np.arange(block.size), block] = -np.inf  # 자기 자신 제외
+        candidates = np.argpartition(-sims, n - 1, axis=1)[:, :n]
+        candidate_sims = np.take_along_axis(sims, candidates, axis=1)
+        ranked = np.argsort(-candidate_sims, axis=1, kind='stable')
+        query_rows.append(np.repeat(block, n))
+        neighbor_rows.append(np.take_along_axis(candidates, ranked, axis=1).ravel())
+        scores.append(np.take_along_axis(candidate_sims, ranked, axis=1).ravel())
+
+    query_rows = np.concatenate(query_rows)
+    return pd.DataFrame({
+        'user_id': matrix.user_ids[query_rows],
+        '순위': np.tile(np.arange(1, n + 1), query_rows.size // n),
+        '유사사용자': matrix.user_ids[np.concatenate(neighbor_rows)],
+        '유사도': np.round(np.concatenate(scores).astype(np.float64), 4),
+    })
+
+
+def score_summary(scores: pd.DataFrame) -> Dict:
+    """특화점수 분포 요약 (평균, 중앙값, 상위 10% 경계)"""
+    if scores.empty:
+        return {'users': 0, 'mean': 0.0, 'median': 0.0, 'p90': 0.0}
+    values = scores['특화점수'].to_numpy(dtype=np.float64)
+    return {
+        'users': int(values.size),
+        'mean': round(float(values.mean()), 1),
+        'median': round(float(np.median(values)), 1),
+        'p90': round(float(np.percentile(values, 90)), 1),
+    }
@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+분석기 오프라인 스냅샷 (메모리 매핑 NumPy 컬럼 파일)
+
+export_snapshot()은 보존 기간의 search_history, ai_analysis_reports와 users를 한 번만
+COPY로 읽어 디렉터리에 컬럼별 .npy 파일로 저장한다.
+
+- 텍스트 컬럼(user_id, technology_field, keyword, 리포트 제목 등)은 사전 인코딩한다.
+  .npy에는 int32 코드(-1은 NULL)만 저장하고 사전은 dictionaries.json에 둔다.
+- ipc_codes 배열은 CSR 형식(행별 시작 위치 offsets + 코드)으로 저장한다.
+- 행은 created_at 순서로 정렬되어 있어 보존 기간 필터가 searchsorted 한 번으로 끝나는
+  꼬리 구간 슬라이스가 된다.
+
+AnalyzerSnapshot은 파일을 np.load(mmap_mode='r')로 열어 bincount/unique 기반 벡터 연산으로
+분포, 최근 목록, 요약을 계산한다. DashboardDataAnalyzer.use_snapshot()으로 연결하면
+analyze_*, get_recent_*, 요약 메서드가 데이터베이스 대신 스냅샷을 사용한다.
+기준 시각은 내보낸 시점의 NOW()이므로 같은 스냅샷에서는 결과가 항상 같다.
+"""
+
+import io
+import json
+import os
+import shutil
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pandas as pd
+import psycopg2.extensions
+
+
+SNAPSHOT_VERSION = 1
+MICROSECONDS_PER_DAY = 86_400 * 1_000_000
+_NULL = r'\N'
+_IPC_SEPARATOR = '\x1f'
+
+# source -> (테이블, 사전 인코딩할 텍스트 컬럼)
+SNAPSHOT_SOURCES = {
+    'search': ('search_history', ('keyword',)),
+    'report': ('ai_analysis_reports', ('invention_title', 'application_number', 'analysis_type')),
+}
+
+
+def _copy_csv(cursor, query: str, params, dtype: Dict) -> pd.DataFrame:
+    """COPY 결과를 NULL과 빈 문자열을 구분해 읽음 (NULL은 \\N)"""
+    buffer = io.BytesIO()
+    bound_query = cursor.mogrify(query, params).decode('utf-8')
+    cursor.copy_expert(f"COPY ({bound_query}) TO STDOUT WITH (FORMAT csv, HEADER true, NULL '{_NULL}')", buffer)
+    buffer.seek(0)
+    return pd.read_csv(buffer, dtype=dtype, na_values=[_NULL], keep_default_na=False)
+
+
+def _encode(values: pd.Series) -> Tuple[np.ndarray, List[str]]:
+    """사전 인코딩 (코드 int32, NULL은 -1)"""
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    return codes.astype(np.int32), [str(value) for value in uniques]
+
+
+def _encode_ipc(values: pd.Series) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+    """구분자로 이은 ipc_codes를 CSR(offsets, codes)로 인코딩"""
+    exploded = values.fillna('').str.split(_IPC_SEPARATOR).explode()
+    present = exploded != ''
+    lengths = present.groupby(level=0).sum().reindex(values.index, fill_value=0).to_numpy()
+    offsets = np.zeros(len(values) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    codes, dictionary = _encode(exploded[present])
+    return offsets, codes, dictionary
+
+
+def _percentages(counts: np.ndarray, total: int) -> np.ndarray:
+    """ROUND(count * 100.0 / total, 2)와 같은 반올림(0.5는 올림)을 정수 연산으로 계산"""
+    if not total:
+        return np.zeros(len(counts))
+    return ((counts.astype(np.int64) * 20000 + total) // (2 * total)) / 100.0
+
+
+def export_snapshot(conn, path: str, retention_days: int = 100) -> Dict:
+    """
+    보존 기간 데이터를 스냅샷 디렉터리로 내보내기
+
+    임시 디렉터리에 모두 쓴 뒤 교체하므로 중간에 실패해도 기존 스냅샷은 그대로 남는다.
+    연결에 진행 중인 트랜잭션이 없으면 REPEATABLE READ로 읽어 테이블 간 시점을 맞춘다.
+
+    Args:
+        conn: psycopg2 연결
+        path: 스냅샷 디렉터리
+        retention_days: 내보낼 기간(일) - 스냅샷에서 조회할 수 있는 최대 기간
+
+    Returns:
+        manifest 딕셔너리
+    """
+    cursor = conn.cursor()
+    if conn.info.transaction_status == psycopg2.extensions.TRANSACTION_STATUS_IDLE and not conn.autocommit:
+        cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+    cursor.execute("SELECT NOW(), current_setting('TimeZone')")
+    exported_at, session_timezone = cursor.fetchone()
+
+    users = _copy_csv(cursor, "SELECT id::text AS id FROM users", None, {'id': 'str'})
+    user_index = pd.Index(users['id'])
+
+    arrays: Dict[str, np.ndarray] = {}
+    dictionaries: Dict[str, List[str]] = {}
+    rows = {}
+    for source, (table, text_columns) in SNAPSHOT_SOURCES.items():
+        df = _copy_csv(cursor, f"""
+            SELECT
+                (EXTRACT(EPOCH FROM created_at) * 1000000)::bigint as created_us,
+                user_id::text as user_id,
+                technology_field,
+                UPPER(array_to_string(ipc_codes, chr(31))) as ipc_codes,
+                {', '.join(text_columns)}
+            FROM {table}
+            WHERE created_at >= %s::timestamptz - INTERVAL '%s days'
+            ORDER BY created_at
+        """, (exported_at, retention_days),
+            dtype={'created_us': 'int64', 'user_id': 'str', 'technology_field': 'str', 'ipc_codes': 'str',
+                   **{column: 'str' for column in text_columns}})
+
+        # 이력에만 있는 사용자 ID(삭제된 사용자 등)도 사전 뒤쪽에 추가
+        extra = pd.Index(df['user_id'].dropna().unique()).difference(user_index)
+        user_index = user_index.append(extra)
+
+        arrays[f'{source}.created_at'] = df['created_us'].to_numpy(np.int64)
+        arrays[f'{source}.field'], dictionaries[f'{source}.field'] = _encode(df['technology_field'])
+        offsets, codes, dictionaries[f'{source}.ipc'] = _encode_ipc(df['ipc_codes'])
+        arrays[f'{source}.ipc_offsets'], arrays[f'{source}.ipc_codes'] = offsets, codes
+        for column in text_columns:
+            arrays[f'{source}.{column}'], dictionaries[f'{source}.{column}'] = _encode(df[column])
+        rows[source] = df
+        for column in ['technology_field', 'ipc_codes'] + list(text_columns):
+            del df[column]
+
+    # 사용자 사전은 두 테이블을 모두 본 뒤 확정
+    for source, df in rows.items():
+        arrays[f'{source}.user'] = user_index.get_indexer(df['user_id']).astype(np.int32)
+    dictionaries['users'] = [str(user_id) for user_id in user_index]
+    conn.commit()
+
+    manifest = {
+        'version': SNAPSHOT_VERSION,
+        'snapshot_id': uuid.uuid4().hex,
+        'exported_at': exported_at.isoformat(),
+        'exported_at_us': (exported_at - datetime(1970, 1, 1, tzinfo=timezone.utc)) // timedelta(microseconds=1),
+        'timezone': session_timezone,
+        'retention_days': retention_days,
+        'total_users': len(users),
+        'rows': {source: int(len(df)) for source, df in rows.items()},
+    }
+
+    tmp_path = f"{path.rstrip(os.sep)}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+    for name, array in arrays.items():
+        np.save(os.path.join(tmp_path, f"{name}.npy"), array)
+    with open(os.path.join(tmp_path, 'dictionaries.json'), 'w', encoding='utf-8') as f:
+        json.dump(dictionaries, f, ensure_ascii=False)
+    with open(os.path.join(tmp_path, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    if os.path.exists(path):
+        shutil.rmtree(path)
+    os.replace(tmp_path, path)
+    return manifest
+
+
+class AnalyzerSnapshot:
+    """메모리 매핑한 스냅샷 컬럼과 벡터 연산 분석 커널"""
+
+    def __init__(self, path: str):
+        with open(os.path.join(path, 'manifest.json'), encoding='utf-8') as f:
+            self.manifest = json.load(f)
+        if self.manifest['version'] != SNAPSHOT_VERSION:
+            raise ValueError(f"지원하지 않는 스냅샷 버전입니다: {self.manifest['version']}")
+        with open(os.path.join(path, 'dictionaries.json'), encoding='utf-8') as f:
+            self.dictionaries = json.load(f)
+        self.path = path
+        self.snapshot_id = self.manifest['snapshot_id']
+        self.retention_days = self.manifest['retention_days']
+        self.timezone = ZoneInfo(self.manifest['timezone'])
+        self.columns = {
+            name[:-len('.npy')]: np.load(os.path.join(path, name), mmap_mode='r')
+            for name in os.listdir(path) if name.endswith('.npy')
+        }
+        self._labels: Dict[str, np.ndarray] = {}
+        self._user_codes = {user_id: code for code, user_id in enumerate(self.dictionaries['users'])}
+
+    def _labels_for(self, name: str) -> np.ndarray:
+        """사전 -> object 배열 (마지막 원소 None이 코드 -1에 대응)"""
+        labels = self._labels.get(name)
+        if labels is None:
+            labels = np.array(self.dictionaries[name] + [None], dtype=object)
+            self._labels[name] = labels
+        return labels
+
+    def decode(self, name: str, codes: np.ndarray) -> np.ndarray:
+        return self._labels_for(name)[codes]
+
+    def window(self, source: str, retention_days: int) -> slice:
+        """보존 기간 행 구간 (created_at 정렬이므로 꼬리 슬라이스)"""
+        if retention_days > self.retention_days:
+            raise ValueError(f"스냅샷은 최근 {self.retention_days}일만 포함합니다 (요청 {retention_days}일)")
+        cutoff = self.manifest['exported_at_us'] - retention_days * MICROSECONDS_PER_DAY
+        created_at = self.columns[f'{source}.created_at']
+        return slice(int(np.searchsorted(created_at, cutoff, side='left')), len(created_at))
+
+    def user_code(self, user_id: str) -> Optional[int]:
+        return self._user_codes.get(str(user_id))
+
+    def first_user_id(self) -> Optional[str]:
+        """_resolve_user_id의 SELECT id FROM users LIMIT 1에 해당 (내보낸 시점의 첫 사용자)"""
+        return self.dictionaries['users'][0] if self.manifest['total_users'] else None
+
+    def _field_counts(self, source: str, rows: slice, user_id: str = None) -> np.ndarray:
+        """기술 분야 코드별 건수 (0번은 NULL)"""
+        fields = self.columns[f'{source}.field'][rows]
+        if user_id is not None:
+            code = self.user_code(user_id)
+            if code is None:
+                return np.zeros(len(self.dictionaries[f'{source}.field']) + 1, dtype=np.int64)
+            fields = fields[self.columns[f'{source}.user'][rows] == code]
+        return np.bincount(fields + 1, minlength=len(self.dictionaries[f'{source}.field']) + 1)
+
+    def _field_label(self, source: str, index: int) -> str:
+        return self.dictionaries[f'{source}.field'][index - 1] if index else 'General'
+
+    def field_distribution_rows(self, source: str, retention_days: int, user_id: str = None,
+                                limit: int = None) -> List[Tuple]:
+        """
+        analyze_*_technology_fields 쿼리와 같은 (기술분야, 건수, 비율) 행
+
+        NULL과 'General' 값은 SQL의 GROUP BY technology_field처럼 별도 행으로 남는다.
+        """
+        counts = self._field_counts(source, self.window(source, retention_days), user_id)
+        present = np.flatnonzero(counts)
+        order = present[np.argsort(-counts[present], kind='stable')][:limit]
+        percentages = _percentages(counts[order], int(counts.sum()))
+        return [(self._field_label(source, index), int(counts[index]), float(percentage))
+                for index, percentage in zip(order, percentages)]
+
+    def field_distribution_frame(self, source: str, retention_days: int, user_id: str = None) -> pd.DataFrame:
+        """field_distribution_frame의 COPY 결과와 같은 field, field_count 컬럼"""
+        rows = self.field_distribution_rows(source, retention_days, user_id)
+        return pd.DataFrame({
+            'field': pd.array([row[0] for row in rows], dtype='string'),
+            'field_count': np.array([row[1] for row in rows], dtype=np.int64),
+        })
+
+    def users_field_frame(self, source: str, retention_days: int, user_ids: List[str] = None) -> pd.DataFrame:
+        """
+        사용자x기술 분야 건수 (user_id, field, field_count, user_id 오름차순 + 건수 내림차순)
+
+        (사용자 코드, 분야 코드)를 정수 키 하나로 합쳐 np.unique 한 번으로 집계한다.
+        """
+        rows = self.window(source, retention_days)
+        users = self.columns[f'{source}.user'][rows]
+        fields = self.columns[f'{source}.field'][rows]
+        if user_ids is not None:
+            codes = [code for code in (self.user_code(user_id) for user_id in user_ids) if code is not None]
+            selected = np.isin(users, np.array(codes, dtype=np.int32))
+            users, fields = users[selected], fields[selected]
+
+        width = len(self.dictionaries[f'{source}.field']) + 1
+        keys, counts = np.unique((users.astype(np.int64) + 1) * width + (fields + 1), return_counts=True)
+        user_codes, field_codes = keys // width - 1, keys % width
+        df = pd.DataFrame({
+            'user_id': pd.array(self.decode('users', user_codes), dtype='string'),
+            'field': [self._field_label(source, index) for index in field_codes],
+            'field_count': counts.astype(np.int64),
+        })
+        df['field'] = df['field'].astype('string')
+        # PostgreSQL uuid 정렬은 16진 문자열 정렬과 같고 NULL은 마지막
+        return df.sort_values(['user_id', 'field_count'], ascending=[True, False], kind='stable',
+                              na_position='last').reset_index(drop=True)
+
+    def iter_user_distributions(self, source: str, retention_days: int,
+                                user_ids: List[str] = None) -> Iterator[Tuple[str, pd.DataFrame]]:
+        """iter_user_technology_fields와 같은 (user_id, 분포 DataFrame)"""
+        df = self.users_field_frame(source, retention_days, user_ids)
+        totals = df.groupby('user_id', sort=False, dropna=False)['field_count'].transform('sum').to_numpy()
+        df['percentage'] = ((df['field_count'].to_numpy() * 20000 + totals) // (2 * totals)) / 100.0
+        for user_id, group in df.groupby('user_id', sort=False, dropna=False):
+            yield (str(user_id) if not pd.isna(user_id) else 'None',
+                   group[['field', 'field_count', 'percentage']].reset_index(drop=True))
+
+    def ipc_code_counts(self, source: str, retention_days: int, user_id: str = None) -> List[Tuple[str, int, int]]:
+        """analyze_ipc_hierarchy 쿼리와 같은 (코드, 개인 건수, 시장 건수) 행"""
+        rows = self.window(source, retention_days)
+        offsets = self.columns[f'{source}.ipc_offsets']
+        start, end = int(offsets[rows.start]), int(offsets[rows.stop])
+        codes = self.columns[f'{source}.ipc_codes'][start:end]
+        size = len(self.dictionaries[f'{source}.ipc'])
+        market = np.bincount(codes, minlength=size)
+
+        user = np.zeros(size, dtype=np.int64)
+        code = self.user_code(user_id) if user_id is not None else None
+        if code is not None:
+            per_row = np.diff(offsets[rows.start:rows.stop + 1])
+            code_users = np.repeat(self.columns[f'{source}.user'][rows], per_row)
+            user = np.bincount(codes[code_users == code], minlength=size)
+
+        labels = self.dictionaries[f'{source}.ipc']
+        return [(labels[index], int(user[index]), int(market[index])) for index in np.flatnonzero(market)]
+
+    def _recent_indices(self, source: str, retention_days: int, limit: int) -> np.ndarray:
+        rows = self.window(source, retention_days)
+        return np.arange(rows.stop - 1, max(rows.start, rows.stop - limit) - 1, -1)
+
+    def _timestamps(self, source: str, indices: np.ndarray) -> List[datetime]:
+        return [datetime.fromtimestamp(int(value) / 1_000_000, tz=timezone.utc).astimezone(self.timezone)
+                for value in self.columns[f'{source}.created_at'][indices]]
+
+    def recent_rows(self, source: str, retention_days: int, limit: int) -> List[Tuple]:
+        """get_recent_* 쿼리와 같은 행 (created_at 내림차순)"""
+        indices = self._recent_indices(source, retention_days, limit)
+        _, text_columns = SNAPSHOT_SOURCES[source]
+        columns = [self.decode(f'{source}.{column}', self.columns[f'{source}.{column}'][indices])
+                   for column in text_columns]
+        columns.append(self.decode(f'{source}.field', self.columns[f'{source}.field'][indices]))
+        columns.append(self._timestamps(source, indices))
+        columns.append(self.decode('users', self.columns[f'{source}.user'][indices]))
+        return list(zip(*columns))
+
+    def recent_frame(self, source: str, retention_days: int, limit: int) -> pd.DataFrame:
+        """recent_*_frame의 COPY 결과와 같은 컬럼 (created_at은 세션 시간대 기준 naive datetime64)"""
+        indices = self._recent_indices(source, retention_days, limit)
+        _, text_columns = SNAPSHOT_SOURCES[source]
+        df = pd.DataFrame({
+            column: pd.array(self.decode(f'{source}.{column}', self.columns[f'{source}.{column}'][indices]),
+                             dtype='string')
+            for column in text_columns
+        })
+        df['technology_field'] = pd.array(self.decode(f'{source}.field', self.columns[f'{source}.field'][indices]),
+                                          dtype='string')
+        if source == 'search':
+            df['technology_field'] = df['technology_field'].fillna('General')
+        created_at = pd.to_datetime(self.columns[f'{source}.created_at'][indices], unit='us', utc=True)
+        df['created_at'] = created_at.tz_convert(self.timezone).tz_localize(None)
+        df['user_id'] = pd.array(self.decode('users', self.columns[f'{source}.user'][indices]), dtype='string')
+        return df
+
+    def summary_stats(self, retention_days: int) -> Tuple[int, int, int, int, int]:
+        """
+        _query_summary_stats와 같은 (사용자 수, 검색 수, 리포트 수, 검색 분야 수, 리포트 분야 수)
+
+        분야 수는 스냅샷에 포함된 행(내보낸 보존 기간) 기준이다.
+        """
+        search, report = (self.window(source, retention_days) for source in SNAPSHOT_SOURCES)
+        # 사전에는 스냅샷에 나온 NULL이 아닌 값만 들어 있음
+        return (self.manifest['total_users'], search.stop - search.start, report.stop - report.start,
+                len(self.dictionaries['search.field']), len(self.dictionaries['report.field']))
+
+    def field_coverage(self, source: str, retention_days: int) -> Tuple[int, int]:
+        """(전체 건수, technology_field가 있는 건수)"""
+        fields = self.columns[f'{source}.field'][self.window(source, retention_days)]
+        return len(fields), int(np.count_nonzero(fields >= 0))
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""
+대시보드 분석 모듈 단위 테스트 공통 설정
+
+대부분의 테스트는 데이터베이스 없이 실행된다. SQL 동작을 확인하는 테스트는
+DASHBOARD_TEST_DATABASE_URL (PostgreSQL 15 이상) 이 설정된 경우에만 실행되며,
+테스트마다 임시 스키마를 만들고 끝나면 삭제한다.
+"""
+
+import os
+import sys
+import uuid
+
+import pytest
+
+DOCUMENTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(DOCUMENTS_DIR)), 'supabase', 'migrations')
+
+sys.path.insert(0, DOCUMENTS_DIR)
+
+DATABASE_URL = os.environ.get('DASHBOARD_TEST_DATABASE_URL')
+
+# 분석기가 읽고 쓰는 컬럼만 가진 최소 스키마
+SCHEMA_SQL = """
+    CREATE TABLE users (
+        id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+        email TEXT,
+        name TEXT,
+        created_at TIMESTAMPTZ DEFAULT NOW()
+    );
+    CREATE TABLE search_history (
+        id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+        user_id UUID REFERENCES users(id) ON DELETE CASCADE,
+        keyword VARCHAR(500) NOT NULL,
+        applicant TEXT,
+        technology_field TEXT,
+        field_confidence NUMERIC(3,2),
+        ipc_codes TEXT[],
+        created_at TIMESTAMPTZ DEFAULT NOW()
+    );
+    CREATE TABLE ai_analysis_reports (
+        id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+        user_id UUID REFERENCES users(id),
+        application_number VARCHAR NOT NULL,
+        invention_title TEXT NOT NULL,
+        analysis_type TEXT,
+        technology_field TEXT,
+        ipc_codes TEXT[],
+        created_at TIMESTAMPTZ DEFAULT NOW()
+    );
+    CREATE TABLE user_activities (
+        id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+        user_id UUID,
+        activity_type TEXT,
+        created_at TIMESTAMPTZ DEFAULT NOW()
+    );
+"""
+
+
+class FakeCursor:
+    """미리 정한 행을 돌려주는 psycopg2 커서 대체 (실행한 쿼리를 기록)"""
+
+    def __init__(self, rows, error=None):
+        self.rows = list(rows)
+        self.error = error
+        self.executed = []
+        self.closed = False
+        self.position = 0
+
+    def execute(self, query, params=None):
+        self.executed.append((query, params))
+        self.position = 0
+        if self.error:
+            raise self.error
+
+    def fetchall(self):
+        return self.fetchmany(len(self.rows))
+
+    def fetchone(self):
+        rows = self.fetchmany(1)
+        return rows[0] if rows else None
+
+    def fetchmany(self, size):
+        rows = self.rows[self.position:self.position + size]
+        self.position += len(rows)
+        return rows
+
+    def __iter__(self):
+        rows, self.position = self.rows[self.position:], len(self.rows)
+        return iter(rows)
+
+    def close(self):
+        self.closed = True
+
+
+class FakeConnection:
+    """cursor()마다 같은 행을 돌려주는 FakeCursor를 만드는 연결 대체"""
+
+    def __init__(self, rows, error=None):
+        self.cursors = []
+        self.rows = rows
+        self.error = error
+        self.commits = self.rollbacks = 0
+
+    def cursor(self, name=None):
+        cursor = FakeCursor(self.rows, self.error)
+        cursor.name = name
+        self.cursors.append(cursor)
+        return cursor
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+def apply_migration(conn, name: str):
+    """supabase/migrations의 마이그레이션 파일을 현재 스키마에 적용"""
+    with open(os.path.join(MIGRATIONS_DIR, name), 'r', encoding='utf-8') as f:
+        conn.cursor().execute(f.read())
+    conn.commit()
+
+
+@pytest.fixture
+def pg_analyzer():
+    """임시 스키마에 연결된 DashboardDataAnalyzer (DASHBOARD_TEST_DATABASE_URL이 없으면 건너뜀)"""
+    if not DATABASE_URL:
+        pytest.skip('DASHBOARD_TEST_DATABASE_URL이 설정되지 않음')
+    psycopg2 = pytest.importorskip('psycopg2')
+    from dashboard_data_analysis_test import DashboardDataAnalyzer
+
+    schema = f"dashboard_test_{uuid.uuid4().hex[:12]}"
+    admin = psycopg2.connect(DATABASE_URL)
+    admin.autocommit = True
+    admin.cursor().execute(f"CREATE SCHEMA {schema}")
+
+    analyzer = DashboardDataAnalyzer({'dsn': DATABASE_URL, 'options': f'-c search_path={schema}'})
+    try:
+        assert analyzer.connect_database()
+        analyzer.conn.cursor().execute(SCHEMA_SQL)
+        analyzer.conn.commit()
+        yield analyzer
+    finally:
+        analyzer.close_connection()
+        admin.cursor().execute(f"DROP SCHEMA {schema} CASCADE")
+        admin.close()
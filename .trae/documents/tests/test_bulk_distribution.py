@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""다중 사용자 기술 분야 분포 API의 사용자별 분할과 빈 결과 처리 (가짜 연결 사용)"""
+
+from decimal import Decimal
+
+import pandas as pd
+
+from conftest import FakeConnection
+from dashboard_data_analysis_test import DashboardDataAnalyzer
+
+
+# GROUP BY user_id, technology_field ORDER BY user_id, field_count DESC 결과 형식
+ROWS = [
+    ('u1', 'AI/머신러닝', 3, Decimal('75.00')),
+    ('u1', 'General', 1, Decimal('25.00')),
+    ('u2', '반도체/전자', 2, Decimal('100.00')),
+]
+
+
+def analyzer_with(rows, error=None) -> DashboardDataAnalyzer:
+    analyzer = DashboardDataAnalyzer({})
+    analyzer.conn = FakeConnection(rows, error)
+    return analyzer
+
+
+def test_rows_are_split_per_user_in_per_user_format():
+    analyzer = analyzer_with(ROWS)
+    result = dict(analyzer.iter_user_technology_fields('report'))
+
+    assert list(result) == ['u1', 'u2']
+    pd.testing.assert_frame_equal(result['u1'], pd.DataFrame(
+        [('AI/머신러닝', 3, Decimal('75.00')), ('General', 1, Decimal('25.00'))],
+        columns=['기술분야', '리포트수', '비율(%)']))
+    assert result['u2']['리포트수'].tolist() == [2]
+
+    cursor = analyzer.conn.cursors[0]
+    assert cursor.name is not None  # 서버 사이드 커서
+    assert cursor.closed and analyzer.conn.commits == 1
+    query, params = cursor.executed[0]
+    assert 'FROM ai_analysis_reports' in query and 'ANY' not in query
+    assert params == [analyzer.retention_days]
+
+
+def test_user_ids_and_shard_are_passed_as_parameters():
+    analyzer = analyzer_with([])
+    list(analyzer.iter_user_technology_fields('search', ['u1', 'u3'], shard=(-10, 10)))
+
+    query, params = analyzer.conn.cursors[0].executed[0]
+    assert 'user_id = ANY(%s::uuid[])' in query and 'hashtext(user_id::text) BETWEEN' in query
+    assert params == [analyzer.retention_days, ['u1', 'u3'], -10, 10]
+
+
+def test_requested_users_without_rows_get_empty_frames():
+    analyzer = analyzer_with(ROWS[:2])
+    distributions = analyzer.analyze_users_technology_fields('search', ['u1', 'u3'])
+
+    assert list(distributions) == ['u1', 'u3']
+    assert distributions['u1']['검색수'].tolist() == [3, 1]
+    assert distributions['u3'].empty
+    assert list(distributions['u3'].columns) == ['기술분야', '검색수', '비율(%)']
+
+
+def test_query_failure_rolls_back_and_returns_empty():
+    analyzer = analyzer_with([], error=RuntimeError('connection lost'))
+    assert analyzer.analyze_users_technology_fields('search') == {}
+    assert analyzer.conn.rollbacks == 1
+    assert analyzer.conn.cursors[0].closed
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""분포 차트 페이로드, 콘텐츠 해시 캐시와 LRU 크기 제한"""
+
+import os
+
+import pandas as pd
+import pytest
+
+pytest.importorskip('matplotlib')
+
+import dashboard_charts
+from dashboard_charts import ChartRenderer, content_hash, distribution_payload
+
+
+def frame(rows) -> pd.DataFrame:
+    return pd.DataFrame(rows, columns=['기술분야', '비율(%)'])
+
+
+def payload(title: str) -> dict:
+    return distribution_payload(title, None, frame([('AI/머신러닝', 100.0)]))
+
+
+@pytest.fixture
+def fake_render(monkeypatch):
+    """matplotlib 대신 제목만 쓴 파일을 만드는 렌더링 (호출된 제목 기록)"""
+    titles = []
+
+    def render_chart(payload, path, fmt='png', dpi=100):
+        titles.append(payload['title'])
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(payload['title'])
+        return path
+
+    monkeypatch.setattr(dashboard_charts, 'render_chart', render_chart)
+    return titles
+
+
+def test_payload_ranks_by_market_then_user_share():
+    user = frame([('반도체/전자', 60.0), ('바이오', 40.0)])
+    market = frame([('AI/머신러닝', 50.0), ('반도체/전자', 30.0), ('교통/자동차', 20.0)])
+    result = distribution_payload('분포', user, market, top_n=3)
+    assert result == {
+        'title': '분포',
+        'fields': ['AI/머신러닝', '반도체/전자', '교통/자동차'],
+        'user': [0.0, 60.0, 0.0],
+        'market': [50.0, 30.0, 20.0],
+    }
+    assert distribution_payload('시장', None, market)['user'] is None
+
+
+def test_content_hash_depends_on_data_and_settings():
+    base = payload('a')
+    assert content_hash(base, 'png', 100) == content_hash(dict(base), 'png', 100)
+    assert len({content_hash(base, 'png', 100), content_hash(base, 'svg', 100),
+                content_hash(base, 'png', 150), content_hash(payload('b'), 'png', 100)}) == 4
+
+
+def test_unsupported_format_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        ChartRenderer(str(tmp_path), fmt='jpg')
+
+
+def test_render_reuses_cached_file(tmp_path, fake_render):
+    renderer = ChartRenderer(str(tmp_path))
+    first = renderer.render(payload('a'))
+    assert renderer.render(payload('a')) == first
+    assert fake_render == ['a']
+    assert renderer.stats() == {'rendered': 1, 'cached': 1, 'evicted': 0}
+
+
+def test_cache_is_bounded_and_evicts_least_recently_used(tmp_path, fake_render):
+    renderer = ChartRenderer(str(tmp_path), max_entries=2)
+    path_a = renderer.render(payload('a'))
+    path_b = renderer.render(payload('b'))
+    renderer.render(payload('a'))  # a를 최근 사용으로
+    path_c = renderer.render(payload('c'))
+
+    assert list(renderer.cache) == [path_a, path_c]
+    assert os.path.exists(path_a) and os.path.exists(path_c)
+    assert not os.path.exists(path_b)
+    assert renderer.stats()['evicted'] == 1
+
+
+def test_new_renderer_continues_usage_order_from_disk(tmp_path, fake_render):
+    renderer = ChartRenderer(str(tmp_path))
+    paths = [renderer.render(payload(title)) for title in 'abc']
+    for mtime, path in zip([3, 1, 2], paths):
+        os.utime(path, ns=(mtime * 10 ** 9, mtime * 10 ** 9))
+    (tmp_path / 'other.txt').write_text('x')
+
+    reopened = ChartRenderer(str(tmp_path), max_entries=2)
+    assert list(reopened.cache) == [paths[1], paths[2], paths[0]]
+    path_d = reopened.render(payload('d'))
+    assert list(reopened.cache) == [paths[0], path_d]
+    assert not os.path.exists(paths[1]) and not os.path.exists(paths[2])
+    assert (tmp_path / 'other.txt').exists()
+
+
+def test_batch_dedups_and_keeps_its_own_charts(tmp_path, fake_render):
+    renderer = ChartRenderer(str(tmp_path), max_workers=1, max_entries=2)
+    old = renderer.render(payload('old'))
+    paths = renderer.render_batch({'u1': payload('a'), 'u2': payload('b'), 'u3': payload('a'), 'u4': payload('c')})
+
+    assert sorted(fake_render) == ['a', 'b', 'c', 'old']
+    assert paths['u1'] == paths['u3']
+    assert all(os.path.exists(path) for path in paths.values())  # 배치 크기가 한도보다 커도 유지
+    assert not os.path.exists(old)
+
+    published = renderer.publish(paths, str(tmp_path / 'out'), prefix='search_')
+    assert sorted(os.path.basename(path) for path in published) == [
+        'search_u1.png', 'search_u2.png', 'search_u3.png', 'search_u4.png',
+    ]
+
+
+def test_render_chart_writes_png(tmp_path):
+    user = frame([('반도체/전자', 60.0), ('바이오', 40.0)])
+    market = frame([('반도체/전자', 30.0), ('AI/머신러닝', 70.0)])
+    path = ChartRenderer(str(tmp_path)).render(distribution_payload('분포', user, market))
+    with open(path, 'rb') as f:
+        assert f.read(8) == b'\x89PNG\r\n\x1a\n'
+    assert not [name for name in os.listdir(tmp_path) if name.endswith('.tmp')]
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""배치 키셋 보존 기간 정리의 체크포인트 재개와 마지막 전체 탐색 (PostgreSQL 필요)"""
+
+import json
+
+import pytest
+
+
+class Interrupted(Exception):
+    pass
+
+
+def count(analyzer, table: str, old: bool) -> int:
+    cursor = analyzer.conn.cursor()
+    cursor.execute(f"SELECT COUNT(*) FROM {table} WHERE created_at {'<' if old else '>='} NOW() - INTERVAL '100 days'")
+    return cursor.fetchone()[0]
+
+
+@pytest.fixture
+def seeded(pg_analyzer):
+    cursor = pg_analyzer.conn.cursor()
+    cursor.execute("""
+        INSERT INTO search_history (keyword, created_at)
+        SELECT '검색어' || g, NOW() - make_interval(days => 200 - g)
+        FROM generate_series(1, 25) g
+    """)
+    cursor.execute("""
+        INSERT INTO search_history (keyword, created_at)
+        SELECT '최근' || g, NOW() - make_interval(days => g)
+        FROM generate_series(1, 5) g
+    """)
+    cursor.execute("""
+        INSERT INTO ai_analysis_reports (application_number, invention_title, created_at)
+        SELECT '10202' || g, '발명' || g, NOW() - make_interval(days => 150 + g)
+        FROM generate_series(1, 7) g
+    """)
+    cursor.execute("""
+        INSERT INTO user_activities (activity_type, created_at)
+        SELECT 'login', NOW() - make_interval(days => 120 + g)
+        FROM generate_series(1, 3) g
+    """)
+    pg_analyzer.conn.commit()
+    return pg_analyzer
+
+
+def test_batched_purge_matches_single_delete(seeded):
+    assert seeded.cleanup_old_data(batch_size=4) == {
+        'search_history': 25, 'ai_analysis_reports': 7, 'user_activities': 3,
+    }
+    assert count(seeded, 'search_history', old=True) == 0
+    assert count(seeded, 'search_history', old=False) == 5
+
+
+def test_resume_from_checkpoint_and_final_pass_catches_backdated_rows(seeded, tmp_path, monkeypatch):
+    checkpoint_path = str(tmp_path / 'cleanup.json')
+    save = type(seeded)._save_cleanup_checkpoint
+    saves = []
+
+    def save_then_interrupt(self, path, checkpoint):
+        save(self, path, checkpoint)
+        saves.append(checkpoint)
+        if len(saves) == 2:
+            raise Interrupted()
+
+    # 두 번째 배치 커밋 직후 중단 (search_history 8행 삭제, 체크포인트 저장)
+    monkeypatch.setattr(type(seeded), '_save_cleanup_checkpoint', save_then_interrupt)
+    assert seeded.cleanup_old_data(batch_size=4, checkpoint_path=checkpoint_path) == {}
+    monkeypatch.undo()
+
+    with open(checkpoint_path, 'r', encoding='utf-8') as f:
+        checkpoint = json.load(f)
+    assert checkpoint['search_history']['deleted'] == 8
+    assert not checkpoint['search_history']['final_pass']
+    assert count(seeded, 'search_history', old=True) == 17
+
+    # 키셋 위치보다 앞(더 오래된 날짜)으로 삽입된 행은 재개된 키셋 탐색에서 보이지 않는다
+    cursor = seeded.conn.cursor()
+    cursor.execute("""
+        INSERT INTO search_history (keyword, created_at)
+        VALUES ('과거 날짜로 삽입', NOW() - INTERVAL '300 days')
+    """)
+    seeded.conn.commit()
+
+    deleted = seeded.cleanup_old_data(batch_size=4, checkpoint_path=checkpoint_path)
+
+    # 체크포인트의 8행 + 재개 후 17행 + 마지막 전체 탐색의 1행
+    assert deleted == {'search_history': 26, 'ai_analysis_reports': 7, 'user_activities': 3}
+    assert count(seeded, 'search_history', old=True) == 0
+    assert count(seeded, 'search_history', old=False) == 5
+    assert not (tmp_path / 'cleanup.json').exists()
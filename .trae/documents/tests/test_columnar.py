@@ -0,0 +1,14 @@
+# -*- coding: utf-8 -*-
+"""컬럼형 조회(COPY TO STDOUT -> pandas)의 빈 결과 처리"""
+
+import pandas as pd
+
+
+def test_recent_frames_without_rows(pg_analyzer):
+    reports = pg_analyzer.recent_reports_frame(5)
+    searches = pg_analyzer.recent_searches_frame(5)
+
+    assert reports.empty and searches.empty
+    assert pd.api.types.is_datetime64_any_dtype(reports['created_at'])
+    assert pd.api.types.is_datetime64_any_dtype(searches['created_at'])
+    assert 'report_name' in reports.columns and list(searches.columns)[0] == 'rank'
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""통합 분석 모드(테이블당 1회 스캔)와 개별 쿼리 메서드 결과 비교 (PostgreSQL 필요)"""
+
+import pandas as pd
+import pytest
+
+# (사용자, 기술 분야, 건수, 며칠 전) - 보존 기간(100일) 밖의 행은 분야 수에만 반영되어야 한다
+SEARCHES = [
+    ('u1', 'AI/머신러닝', 5, 1), ('u1', '반도체/전자', 3, 2), ('u1', None, 2, 3),
+    ('u2', 'AI/머신러닝', 4, 4), ('u2', '교통/자동차', 1, 5),
+    ('u2', '블록체인/핀테크', 2, 150), ('u1', 'AI/머신러닝', 1, 160),
+]
+REPORTS = [
+    ('u1', '반도체/전자', 2, 1), ('u1', 'AI/머신러닝', 1, 2),
+    ('u2', '반도체/전자', 2, 3), ('u2', None, 3, 4),
+    ('u2', 'IoT', 1, 130),
+]
+
+
+@pytest.fixture
+def seeded(pg_analyzer):
+    cursor = pg_analyzer.conn.cursor()
+    users = {}
+    for name in ('u1', 'u2'):
+        cursor.execute("INSERT INTO users (email, name) VALUES (%s, %s) RETURNING id", (f'{name}@example.com', name))
+        users[name] = str(cursor.fetchone()[0])
+    for i, (user, field, count, days_ago) in enumerate(SEARCHES):
+        cursor.execute("""
+            INSERT INTO search_history (user_id, keyword, technology_field, created_at)
+            SELECT %s, '검색어' || g, %s, NOW() - make_interval(days => %s, mins => %s * 10 + g)
+            FROM generate_series(1, %s) g
+        """, (users[user], field, days_ago, i, count))
+    for i, (user, field, count, days_ago) in enumerate(REPORTS):
+        cursor.execute("""
+            INSERT INTO ai_analysis_reports (user_id, application_number, invention_title, technology_field, created_at)
+            SELECT %s, '10202' || %s || g, '발명' || g, %s, NOW() - make_interval(days => %s, mins => %s * 10 + g)
+            FROM generate_series(1, %s) g
+        """, (users[user], i, field, days_ago, i, count))
+    pg_analyzer.conn.commit()
+    return pg_analyzer, users
+
+
+def test_distributions_match_per_query_methods(seeded):
+    analyzer, users = seeded
+    results = analyzer.run_consolidated_analysis(users['u1'], limit=5)
+
+    pd.testing.assert_frame_equal(results['user_search'], analyzer.analyze_user_search_technology_fields(users['u1']))
+    pd.testing.assert_frame_equal(results['market_search'], analyzer.analyze_market_search_technology_fields())
+    pd.testing.assert_frame_equal(results['user_report'], analyzer.analyze_user_report_technology_fields(users['u1']))
+    pd.testing.assert_frame_equal(results['market_report'], analyzer.analyze_market_report_technology_fields())
+    assert results['recent_searches'] == analyzer.get_recent_searches(5)
+    assert results['recent_reports'] == analyzer.get_recent_reports(5)
+
+
+def test_summary_matches_filtered_subqueries(seeded):
+    analyzer, users = seeded
+    summary = analyzer.run_consolidated_analysis(users['u1'])['summary']
+
+    cursor = analyzer.conn.cursor()
+    total_users, total_searches, total_reports, search_fields, report_fields = analyzer._query_summary_stats(cursor)
+    search_coverage, report_coverage = analyzer._query_summary_coverage(cursor)
+    assert summary == {
+        'total_users': total_users,
+        'total_searches': total_searches,
+        'total_reports': total_reports,
+        'unique_search_fields': search_fields,
+        'unique_report_fields': report_fields,
+        'search_field_coverage': search_coverage,
+        'report_field_coverage': report_coverage,
+    }
+    # 보존 기간 밖에만 있는 분야(블록체인/핀테크, IoT)도 분야 수에는 포함
+    assert (summary['total_searches'], summary['unique_search_fields']) == (15, 4)
+    assert (summary['total_reports'], summary['unique_report_fields']) == (8, 3)
+
+
+def test_scan_keeps_fields_outside_window_with_zero_counts(seeded):
+    analyzer, users = seeded
+    dist = analyzer._scan_field_distribution(analyzer.conn.cursor(), 'search_history', users['u1'])
+    counts = {row.field: (row.user_count, row.market_count) for row in dist.itertuples()}
+    assert counts == {
+        'AI/머신러닝': (5, 9),
+        '반도체/전자': (3, 3),
+        'General': (2, 2),
+        '교통/자동차': (0, 1),
+        '블록체인/핀테크': (0, 0),
+    }
+    assert dist.loc[dist['field'] == 'General', 'is_null'].item()
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""분석기 데몬의 경로 해석, 오류 응답과 워밍업 상태 (DB 대신 가짜 서비스 사용)"""
+
+import http.client
+import json
+import socket
+import threading
+import uuid
+
+import pytest
+
+from dashboard_daemon import AnalyzerService, create_server, parse_args
+
+USER_ID = uuid.UUID(int=42)
+
+
+class FakeService:
+    """AnalyzerService의 query/browse/health만 흉내 내고 호출을 기록"""
+
+    def __init__(self):
+        self.calls = []
+        self.error = None
+
+    def query(self, analysis, **kwargs):
+        self.calls.append(('query', analysis, kwargs))
+        if self.error:
+            raise self.error
+        return {'analysis': analysis, 'rows': []}
+
+    def browse(self, source, **kwargs):
+        self.calls.append(('browse', source, kwargs))
+        return {'items': [], 'next_cursor': None}
+
+    def health(self):
+        return {'status': 'ok'}
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path):
+        super().__init__('localhost')
+        self.socket_path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self.socket_path)
+
+
+def serve(server):
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return thread
+
+
+@pytest.fixture
+def client():
+    service = FakeService()
+    server = create_server(service, port=0)
+    serve(server)
+    connection = http.client.HTTPConnection('127.0.0.1', server.server_address[1], timeout=5)
+
+    def get(path):
+        connection.request('GET', path)
+        response = connection.getresponse()
+        return response.status, json.loads(response.read().decode('utf-8'))
+
+    yield service, get
+    connection.close()
+    server.shutdown()
+    server.server_close()
+
+
+def test_market_and_user_routes(client):
+    service, get = client
+    status, body = get('/market/distribution?source=report&limit=5')
+    assert status == 200 and body['analysis'] == 'distribution' and 'elapsed_ms' in body
+
+    # 같은 연결(keep-alive)로 두 번째 요청, user_id는 UUID 표준 형식으로 정규화
+    status, _ = get(f'/users/{USER_ID.hex.upper()}/specialization')
+    assert status == 200
+    assert service.calls == [
+        ('query', 'distribution', {'source': 'report', 'user_id': None, 'limit': 5}),
+        ('query', 'specialization', {'source': 'search', 'user_id': str(USER_ID), 'limit': None}),
+    ]
+
+
+def test_history_route(client):
+    service, get = client
+    status, body = get(f'/history/report?page_size=5&cursor=abc&direction=prev&user_id={USER_ID}&field=AI')
+    assert status == 200 and body['next_cursor'] is None
+    assert service.calls == [('browse', 'report', {
+        'page_size': 5, 'cursor': 'abc', 'direction': 'prev', 'user_id': str(USER_ID), 'technology_field': 'AI',
+    })]
+
+
+@pytest.mark.parametrize('path, status', [
+    ('/health', 200),
+    ('/unknown', 404),
+    ('/market/distribution/extra', 404),
+    ('/users/not-a-uuid/distribution', 400),
+    ('/market/distribution?source=payments', 400),
+    ('/market/recent?limit=ten', 400),
+])
+def test_status_codes(client, path, status):
+    assert client[1](path)[0] == status
+
+
+@pytest.mark.parametrize('error, status', [
+    (TimeoutError('warming up'), 503),
+    (RuntimeError('pool closed'), 500),
+    (ValueError('bad analysis'), 400),
+])
+def test_service_errors_map_to_status(client, error, status):
+    service, get = client
+    service.error = error
+    code, body = get('/market/summary')
+    assert code == status and body == {'error': str(error)}
+
+
+def test_unix_socket_server(tmp_path):
+    path = str(tmp_path / 'analyzer.sock')
+    server = create_server(FakeService(), socket_path=path)
+    serve(server)
+    try:
+        connection = UnixHTTPConnection(path)
+        connection.request('GET', '/health')
+        response = connection.getresponse()
+        assert response.status == 200 and json.loads(response.read()) == {'status': 'ok'}
+        connection.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_service_before_and_after_failed_warmup():
+    service = AnalyzerService({}, warmup_timeout=0)
+    assert service.health()['status'] == 'warming_up'
+    with pytest.raises(TimeoutError):
+        service.query('distribution')
+
+    service.error = '연결 실패'
+    service.ready.set()
+    assert service.health()['status'] == 'error'
+    with pytest.raises(RuntimeError):
+        service.browse('search')
+
+
+def test_parse_args_defaults():
+    args = parse_args([])
+    assert (args.host, args.port, args.socket, args.pool_size, args.live) == ('127.0.0.1', 8765, None, 4, False)
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""서버 사이드 커서 이력 스트리밍과 CSV/JSONL 내보내기 (가짜 연결 사용)"""
+
+import csv
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+
+from conftest import FakeConnection
+from dashboard_data_analysis_test import DashboardDataAnalyzer
+
+KST = timezone(timedelta(hours=9))
+ROWS = [
+    (uuid.UUID(int=3), 'u1', '전고체 배터리', '교통/자동차', ['H01M10/052', 'B60L'], datetime(2026, 10, 16, 9, 30, tzinfo=KST)),
+    (uuid.UUID(int=2), 'u2', '쉼표, "따옴표"', None, [], datetime(2026, 10, 15, 8, 0, tzinfo=KST)),
+    (uuid.UUID(int=1), None, '반도체', '반도체/전자', None, datetime(2026, 10, 14, 7, 0, tzinfo=KST)),
+]
+
+
+def analyzer_with(rows, error=None) -> DashboardDataAnalyzer:
+    analyzer = DashboardDataAnalyzer({})
+    analyzer.conn = FakeConnection(rows, error)
+    return analyzer
+
+
+def test_iter_history_yields_dicts_and_closes_cursor():
+    analyzer = analyzer_with(ROWS)
+    rows = list(analyzer.iter_history('search', user_id='u1', itersize=2))
+
+    assert [row['keyword'] for row in rows] == ['전고체 배터리', '쉼표, "따옴표"', '반도체']
+    assert list(rows[0]) == DashboardDataAnalyzer.EXPORT_COLUMNS['search']
+
+    cursor = analyzer.conn.cursors[0]
+    assert cursor.name and cursor.itersize == 2 and cursor.closed
+    query, params = cursor.executed[0]
+    assert 'ORDER BY created_at DESC, id DESC' in query
+    assert params == [analyzer.retention_days, 'u1']
+
+
+def test_iter_history_batches():
+    analyzer = analyzer_with(ROWS)
+    batches = list(analyzer.iter_history('search', batch_size=2))
+    assert [len(batch) for batch in batches] == [2, 1]
+
+
+def test_stopping_early_still_closes_cursor():
+    analyzer = analyzer_with(ROWS)
+    rows = analyzer.iter_history('search')
+    next(rows)
+    rows.close()
+    assert analyzer.conn.cursors[0].closed
+    assert analyzer.conn.commits == 1
+
+
+def test_export_csv(tmp_path):
+    analyzer = analyzer_with(ROWS)
+    path = str(tmp_path / 'searches.csv')
+    assert analyzer.export_history(path, itersize=2) == 3
+
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == DashboardDataAnalyzer.EXPORT_COLUMNS['search']
+    assert rows[1] == [str(uuid.UUID(int=3)), 'u1', '전고체 배터리', '교통/자동차',
+                       '["H01M10/052", "B60L"]', '2026-10-16T09:30:00+09:00']
+    assert rows[2][2:5] == ['쉼표, "따옴표"', '', '[]']
+    assert rows[3][1] == '' and rows[3][4] == ''
+
+
+def test_export_jsonl_keeps_arrays_and_nulls(tmp_path):
+    analyzer = analyzer_with(ROWS)
+    path = str(tmp_path / 'searches.jsonl')
+    assert analyzer.export_history(path) == 3
+
+    with open(path, 'r', encoding='utf-8') as f:
+        rows = [json.loads(line) for line in f]
+    assert rows[0]['ipc_codes'] == ['H01M10/052', 'B60L']
+    assert rows[0]['created_at'] == '2026-10-16T09:30:00+09:00'
+    assert rows[2]['user_id'] is None and rows[2]['ipc_codes'] is None
+
+
+@pytest.mark.parametrize('value, fmt, expected', [
+    (Decimal('0.85'), 'csv', '0.85'),
+    (uuid.UUID(int=7), 'jsonl', str(uuid.UUID(int=7))),
+    (['G06N'], 'jsonl', ['G06N']),
+    (['G06N'], 'csv', '["G06N"]'),
+    (None, 'csv', None),
+    (3, 'jsonl', 3),
+])
+def test_export_value(value, fmt, expected):
+    assert DashboardDataAnalyzer({})._export_value(value, fmt) == expected
+
+
+def test_export_failure_rolls_back_and_reports_rows_written(tmp_path):
+    analyzer = analyzer_with([], error=RuntimeError('connection lost'))
+    assert analyzer.export_history(str(tmp_path / 'out.csv')) == 0
+    assert analyzer.conn.rollbacks == 1
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""GROUPING SETS 기술 분야 커버리지 집계의 그룹 구성과 지표 분배 (가짜 연결 사용)"""
+
+import uuid
+from datetime import date
+
+import pytest
+
+from conftest import FakeConnection
+from dashboard_data_analysis_test import DashboardDataAnalyzer
+
+U1, U2 = uuid.UUID(int=1), uuid.UUID(int=2)
+D1, D2 = date(2026, 10, 15), date(2026, 10, 16)
+
+# (by_day, day, by_user, user_key, total, covered) - GROUPING SETS ((), (day), (user_key), (day, user_key))
+ROWS = [
+    (False, None, False, None, 10, 8),
+    (True, D1, False, None, 4, 4),
+    (True, D2, False, None, 6, 4),
+    (False, None, True, U1, 7, 6),
+    (False, None, True, U2, 2, 1),
+    (False, None, True, None, 1, 1),
+    (True, D1, True, U1, 4, 4),
+    (True, D2, True, U1, 3, 2),
+    (True, D2, True, U2, 2, 1),
+    (True, D2, True, None, 1, 1),
+]
+
+
+def analyzer_with(rows) -> DashboardDataAnalyzer:
+    analyzer = DashboardDataAnalyzer({})
+    analyzer.conn = FakeConnection(rows)
+    return analyzer
+
+
+@pytest.mark.parametrize('per_user, by_day, user_id, expected', [
+    (False, False, None, '()'),
+    (False, True, None, '(), (day)'),
+    (True, False, None, '(), (user_key)'),
+    (True, True, None, '(), (day), (user_key), (day, user_key)'),
+    (False, False, 'u1', '(), (user_key)'),
+])
+def test_grouping_sets_follow_options(per_user, by_day, user_id, expected):
+    analyzer = analyzer_with([])
+    cursor = analyzer.conn.cursor()
+    analyzer._query_field_coverage(cursor, 'search', user_id, per_user, by_day)
+
+    query, params = cursor.executed[0]
+    assert f"GROUP BY GROUPING SETS ({expected})" in query
+    assert query.count('FROM search_history') == 1
+    assert params == {'user_id': user_id, 'retention_days': analyzer.retention_days}
+    assert ('GROUPING(day)' in query) == by_day
+
+
+def test_single_user_mode_drops_grouped_other_users():
+    analyzer = analyzer_with(ROWS)
+    df = analyzer._query_field_coverage(analyzer.conn.cursor(), 'report', str(U1), per_user=True, by_day=True)
+    assert not (df['by_user'] & df['user_id'].isna()).any()
+    assert set(df.loc[df['by_user'], 'user_id']) == {str(U1), str(U2)}
+
+
+def test_metrics_are_split_by_grouping_level():
+    analyzer = analyzer_with(ROWS)
+    metrics = analyzer.compute_field_coverage()
+
+    assert set(metrics) == {'search', 'report'}
+    search = metrics['search']
+    assert search['market'] == {'total': 10, 'covered': 8, 'coverage': 80.0}
+    assert search['market_daily'][['day', 'coverage']].values.tolist() == [[D1, 100.0], [D2, 66.67]]
+    assert search['users']['user_id'].tolist()[:2] == [str(U1), str(U2)]
+    assert search['users']['coverage'].tolist()[:2] == [85.71, 50.0]
+    assert search['users_daily'][['day', 'user_id']].values.tolist()[:3] == [
+        [D1, str(U1)], [D2, str(U1)], [D2, str(U2)],
+    ]
+
+
+def test_empty_tables_give_zero_coverage():
+    analyzer = analyzer_with([(False, None, False, None, 0, 0)])
+    metrics = analyzer.compute_field_coverage(per_user=False, by_day=False)
+    assert metrics['report']['market'] == {'total': 0, 'covered': 0, 'coverage': 0.0}
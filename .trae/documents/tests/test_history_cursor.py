@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""이력 페이지 키셋 커서 인코딩/디코딩 (연결 없이 분석기 생성)"""
+
+import base64
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from dashboard_data_analysis_test import DashboardDataAnalyzer
+
+
+@pytest.fixture
+def analyzer():
+    return DashboardDataAnalyzer({})
+
+
+def test_cursor_round_trip(analyzer):
+    filters = analyzer._history_filter_key('search', 'user-1', None)
+    created_at = datetime(2026, 10, 16, 23, 59, 59, 123456, tzinfo=timezone(timedelta(hours=9)))
+    cursor = analyzer._encode_history_cursor(created_at, 42, filters)
+    assert '=' not in cursor
+    assert analyzer._decode_history_cursor(cursor, filters) == (created_at, '42')
+
+
+def test_cursor_is_bound_to_filters(analyzer):
+    filters = analyzer._history_filter_key('search', None, None)
+    cursor = analyzer._encode_history_cursor(datetime(2026, 1, 1), 'a', filters)
+    for other in [analyzer._history_filter_key('report', None, None),
+                  analyzer._history_filter_key('search', 'user-1', None),
+                  analyzer._history_filter_key('search', None, '반도체/전자')]:
+        with pytest.raises(ValueError):
+            analyzer._decode_history_cursor(cursor, other)
+
+
+def test_filter_key_treats_empty_as_none(analyzer):
+    assert analyzer._history_filter_key('search', '', '') == analyzer._history_filter_key('search', None, None)
+
+
+def encode_payload(payload) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode('utf-8')).decode('ascii').rstrip('=')
+
+
+@pytest.mark.parametrize('cursor', [
+    'not base64!',
+    encode_payload(['list']),
+    encode_payload({'v': 2, 't': '2026-01-01T00:00:00', 'i': '1', 'f': 'x'}),
+    encode_payload({'v': 1, 't': 'yesterday', 'i': '1', 'f': 'x'}),
+    encode_payload({'v': 1, 'i': '1', 'f': 'x'}),
+])
+def test_malformed_cursor_raises_value_error(analyzer, cursor):
+    with pytest.raises(ValueError):
+        analyzer._decode_history_cursor(cursor, 'x')
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""KIPRIS 응답 스트림 파서, IPC 추출/분류와 검색 기록 자동 분류 트리거 조건"""
+
+import io
+import json
+from datetime import date
+
+import pytest
+
+from conftest import apply_migration
+from dashboard_ingest import (DEFAULT_FIELD, classify_ipc_codes, extract_ipc_codes, flatten_value,
+                              iter_kipris_items, patent_record)
+
+
+def kipris_response(items) -> str:
+    """KIPRIS XML을 JSON으로 바꾼 응답 형식 (모든 값이 한 원소 리스트)"""
+    return json.dumps({'response': {'header': [{'resultCode': ['00']}],
+                                    'body': [{'items': [{'item': items}]}]}}, ensure_ascii=False)
+
+
+def make_item(number: int, ipc: str = 'G06N 3/08(2006.01)|G06F 16/00') -> dict:
+    return {
+        'applicationNumber': [f'10202600{number:05d}'],
+        'inventionTitle': [f'발명 {number} {"긴 제목 " * 30}'],
+        'applicantName': ['주식회사 테스트'],
+        'ipcNumber': [ipc],
+        'applicationDate': ['20260115'],
+        'openDate': [''],
+        'registerStatus': ['공개'],
+    }
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 64, 64 * 1024])
+def test_stream_yields_every_item_across_chunk_boundaries(chunk_size):
+    items = [make_item(i) for i in range(25)]
+    parsed = list(iter_kipris_items(io.StringIO(kipris_response(items)), chunk_size=chunk_size))
+    assert parsed == items
+
+
+def test_stream_handles_concatenated_responses_and_empty_arrays():
+    text = '\n'.join([kipris_response([make_item(1)]), kipris_response([]),
+                      kipris_response([make_item(2), make_item(3)])])
+    numbers = [item['applicationNumber'][0] for item in iter_kipris_items(io.StringIO(text), chunk_size=16)]
+    assert numbers == ['1020260000001', '1020260000002', '1020260000003']
+
+
+def test_stream_without_items():
+    assert list(iter_kipris_items(io.StringIO('{"response": {"header": {}}}'))) == []
+
+
+def test_item_key_inside_strings_is_not_an_array_start():
+    text = json.dumps({'note': 'no "item" here', 'item': [{'applicationNumber': ['1']}]})
+    assert list(iter_kipris_items(io.StringIO(text), chunk_size=5)) == [{'applicationNumber': ['1']}]
+
+
+@pytest.mark.parametrize('text', [
+    # item 중간에서 끊김
+    '{"item": [' + json.dumps(make_item(1)) + ', ' + json.dumps(make_item(2))[:-20],
+    # 마지막 item 뒤에 배열 끝(])이 없음
+    '{"item": [' + json.dumps(make_item(1)) + ', ' + json.dumps(make_item(2)),
+])
+def test_truncated_stream_raises(text):
+    with pytest.raises(ValueError):
+        list(iter_kipris_items(io.StringIO(text), chunk_size=32))
+
+
+def test_flatten_value():
+    assert flatten_value({'a': ['x'], 'b': [], 'c': ['  '], 'd': [['1'], ['2']], 'e': [{'f': [' g ']}]}) == {
+        'a': 'x', 'b': None, 'c': None, 'd': ['1', '2'], 'e': {'f': 'g'},
+    }
+
+
+def test_extract_ipc_codes_normalizes_and_deduplicates():
+    codes = extract_ipc_codes('G06N 3/08(2006.01)|g06n 3/045; G06N 3/08, invalid|H01M  10/052 (2010.01)')
+    assert codes == ['G06N3/08', 'G06N3/045', 'H01M10/052']
+    assert extract_ipc_codes(['G06F 16/00', 'G06F16/00|G06Q 50/10']) == ['G06F16/00', 'G06Q50/10']
+    assert extract_ipc_codes(None) == []
+    assert extract_ipc_codes('') == []
+
+
+def test_classify_prefers_longest_prefix_of_main_ipc():
+    assert classify_ipc_codes(['G06Q20/40', 'G06F3/01']) == ('블록체인/핀테크', 0.5)
+    assert classify_ipc_codes(['H04L9/32', 'H04L67/10', 'H04L9/08']) == ('블록체인/핀테크', 0.67)
+    # 대표 IPC가 분류되지 않으면 다음 코드의 분야
+    assert classify_ipc_codes(['C01B3/00', 'H01M10/052']) == ('에너지/환경', 0.5)
+    assert classify_ipc_codes(['C01B3/00']) == (DEFAULT_FIELD, None)
+    assert classify_ipc_codes([]) == (DEFAULT_FIELD, None)
+
+
+def test_patent_record():
+    item = make_item(7)
+    item['applicantName'] = ['출원인 A', '출원인 B']
+    record = patent_record(item)
+    assert record['application_number'] == '1020260000007'
+    assert record['applicant_name'] == '출원인 A, 출원인 B'
+    assert record['ipc_codes'] == ['G06N3/08', 'G06F16/00']
+    assert record['main_ipc'] == 'G06N3/08'
+    assert (record['technology_field'], record['field_confidence']) == ('AI/머신러닝', 0.5)
+    assert record['application_date'] == date(2026, 1, 15)
+    assert record['open_date'] is None
+    assert record['register_date'] is None
+    assert record['abstract'] is None
+
+
+def test_patent_record_rejects_missing_number_and_bad_dates():
+    assert patent_record({'inventionTitle': ['제목']}) is None
+    item = make_item(1, ipc='')
+    item['applicationDate'] = ['20261345']
+    record = patent_record(item)
+    assert record['application_date'] is None
+    assert record['ipc_codes'] == [] and record['main_ipc'] is None
+    assert record['technology_field'] == DEFAULT_FIELD
+
+
+def test_classify_trigger_runs_only_when_a_value_is_missing(pg_analyzer):
+    conn = pg_analyzer.conn
+    apply_migration(conn, '20250130_final_ipc_analysis.sql')
+    apply_migration(conn, '20261017_dashboard_classify_search_skip.sql')
+
+    cursor = conn.cursor()
+    cursor.execute("""
+        INSERT INTO search_history (keyword, technology_field, ipc_codes) VALUES
+            ('G06N3/08 신경망', '기타', '{}'),          -- 앱 저장: 빈 ipc_codes는 검색어에서 추출
+            ('G06N3/08 신경망', '반도체/전자', '{H01L21/02}'),  -- 적재: 값이 모두 있으면 그대로
+            ('G06N3/08 신경망', NULL, '{H01L21/02}')
+        RETURNING technology_field, ipc_codes
+    """)
+    rows = cursor.fetchall()
+    conn.commit()
+    assert rows[0] == ('기타', ['G06N3/08'])
+    assert rows[1] == ('반도체/전자', ['H01L21/02'])
+    assert rows[2][0] is not None and rows[2][1] == ['H01L21/02']
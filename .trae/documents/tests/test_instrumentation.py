@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""SQL 계측의 EXPLAIN 대상 판별과 분석 이름 컨텍스트 변수"""
+
+import threading
+
+import pytest
+
+from dashboard_instrumentation import QueryInstrumentation, _is_plain_select, current_analysis, traced_analyses
+
+
+@pytest.mark.parametrize('statement', [
+    'SELECT 1',
+    '  select id from users where id = %s',
+    'WITH recent AS (SELECT * FROM search_history) SELECT COUNT(*) FROM recent',
+])
+def test_plain_select_is_explained(statement):
+    assert _is_plain_select(statement)
+
+
+@pytest.mark.parametrize('statement', [
+    'SELECT id FROM dashboard_rollup_watermarks WHERE source = %s FOR UPDATE',
+    'SELECT id FROM users FOR NO KEY UPDATE',
+    'SELECT id FROM users FOR SHARE SKIP LOCKED',
+    'SELECT id FROM users FOR KEY SHARE',
+    'SELECT * INTO backup FROM users',
+    'WITH gone AS (DELETE FROM search_history RETURNING id) SELECT COUNT(*) FROM gone',
+    'INSERT INTO users (id) VALUES (1)',
+    'UPDATE users SET name = NULL',
+    'VACUUM search_history',
+])
+def test_other_statements_are_not_explained(statement):
+    assert not _is_plain_select(statement)
+
+
+@traced_analyses
+class Analyzer:
+    def outer(self):
+        return current_analysis.get(), self.inner(), current_analysis.get()
+
+    def inner(self):
+        return current_analysis.get()
+
+    def _helper(self):
+        return current_analysis.get()
+
+    def rows(self):
+        for _ in range(2):
+            yield current_analysis.get()
+
+    @staticmethod
+    def static():
+        return current_analysis.get()
+
+
+def test_traced_analyses_sets_innermost_public_name():
+    analyzer = Analyzer()
+    assert analyzer.outer() == ('outer', 'inner', 'outer')
+    assert analyzer._helper() is None
+    assert Analyzer.static() is None
+    assert current_analysis.get() is None
+
+
+def test_generator_methods_do_not_leak_name_between_items():
+    iterator = Analyzer().rows()
+    assert next(iterator) == 'rows'
+    assert current_analysis.get() is None
+    assert list(iterator) == ['rows']
+
+
+def test_name_is_per_thread():
+    seen = {}
+
+    def worker():
+        seen['thread'] = current_analysis.get()
+
+    token = current_analysis.set('main-analysis')
+    try:
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+    finally:
+        current_analysis.reset(token)
+    assert seen['thread'] is None
+
+
+def test_records_take_analysis_from_context():
+    instrumentation = QueryInstrumentation()
+    token = current_analysis.set('analyze_ipc_hierarchy')
+    try:
+        record = instrumentation.start_record('SELECT  1\n', named=False)
+    finally:
+        current_analysis.reset(token)
+    assert record['analysis'] == 'analyze_ipc_hierarchy'
+    assert record['statement'] == 'SELECT 1'
+    assert instrumentation.start_record('SELECT 1', named=False)['analysis'] is None
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""IPC 코드 계층 접두사 트리"""
+
+import pytest
+
+from dashboard_data_analysis_test import IPCPrefixTree
+
+
+def build_tree() -> IPCPrefixTree:
+    tree = IPCPrefixTree()
+    tree.add('H01M10/052', user_count=2, market_count=5)
+    tree.add('H01M10/0525', user_count=1, market_count=3)
+    tree.add('H01M4/13', market_count=2)
+    tree.add('G06N3/08', user_count=1, market_count=10)
+    return tree
+
+
+@pytest.mark.parametrize('code, expected', [
+    ('H01M10/052', ['H', 'H01', 'H01M', 'H01M10/00', 'H01M10/052']),
+    (' g06n3/08 ', ['G', 'G06', 'G06N', 'G06N3/00', 'G06N3/08']),
+    ('A61B5/0002', ['A', 'A61', 'A61B', 'A61B5/00', 'A61B5/0002']),
+])
+def test_split_code(code, expected):
+    assert IPCPrefixTree.split_code(code) == expected
+
+
+@pytest.mark.parametrize('code', ['', 'H01M', 'H01M 10/052', 'Z01M10/052', 'H01M10/5', 'H01M1000/052'])
+def test_split_code_rejects_malformed(code):
+    assert IPCPrefixTree.split_code(code) is None
+
+
+def test_add_rejects_malformed_without_counting():
+    tree = IPCPrefixTree()
+    assert tree.add('not-a-code', user_count=1, market_count=1) is False
+    assert tree.root['counts'] == {'user': 0, 'market': 0}
+
+
+def test_counts_roll_up_every_level():
+    tree = build_tree()
+    assert tree.root['counts'] == {'user': 4, 'market': 20}
+    sections = tree.top_k('section')
+    # 건수가 같으면 코드 오름차순
+    assert list(sections['IPC코드']) == ['G', 'H']
+    assert list(sections['건수']) == [10, 10]
+    main_groups = tree.top_k('main_group', scope='market')
+    assert dict(zip(main_groups['IPC코드'], main_groups['건수'])) == {
+        'G06N3/00': 10, 'H01M10/00': 8, 'H01M4/00': 2,
+    }
+    assert list(main_groups['비율(%)']) == [50.0, 40.0, 10.0]
+
+
+def test_top_k_orders_by_count_then_code_and_limits():
+    tree = build_tree()
+    subclasses = tree.top_k('subclass', scope='market', k=1)
+    assert list(subclasses['IPC코드']) == ['G06N']
+    assert len(tree.top_k('subgroup', k=2)) == 2
+
+
+def test_user_scope_skips_codes_without_user_counts():
+    tree = build_tree()
+    user_groups = tree.top_k('main_group', scope='user')
+    assert list(user_groups['IPC코드']) == ['H01M10/00', 'G06N3/00']
+    assert list(user_groups['비율(%)']) == [75.0, 25.0]
+
+
+def test_drill_down():
+    tree = build_tree()
+    assert list(tree.drill_down()['IPC코드']) == ['G', 'H']
+    below = tree.drill_down('h01m')
+    assert dict(zip(below['IPC코드'], below['건수'])) == {'H01M10/00': 8, 'H01M4/00': 2}
+    leaves = tree.drill_down('H01M10/00', scope='user')
+    assert dict(zip(leaves['IPC코드'], leaves['건수'])) == {'H01M10/052': 2, 'H01M10/0525': 1}
+    assert tree.drill_down('X99').empty
+    assert tree.drill_down('H01M10/052').empty
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""검색어 정규화와 KeywordIndex 증분 합계 (매번 새로 만든 인덱스와 비교)"""
+
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from dashboard_keywords import KeywordIndex, normalize_keyword, scope_name
+
+
+WORDS = ['인공지능 학습', '인공지능학습', '배터리 셀을', '배터리셀', '자율주행', '반도체', '회의', '!!!']
+
+
+@pytest.mark.parametrize('keyword, expected', [
+    ('인공지능 학습', ('인공지능학습', '인공지능 학습')),
+    ('  배터리   셀을 ', ('배터리셀', '배터리 셀')),
+    ('반도체에서의', ('반도체', '반도체')),
+    ('회의', ('회의', '회의')),
+    ('ＡＩ 칩', ('ai칩', 'ai 칩')),
+    ('!!!', ('', '')),
+    (None, ('', '')),
+])
+def test_normalize_keyword(keyword, expected):
+    assert normalize_keyword(keyword) == expected
+
+
+def random_rows(rng: random.Random):
+    return [(rng.choice(['u1', 'u2', None]), rng.choice(['A', 'B', None]), rng.choice(WORDS), rng.randint(1, 5))
+            for _ in range(rng.randint(0, 30))]
+
+
+def rebuilt(data) -> KeywordIndex:
+    index = KeywordIndex()
+    for day, rows in data.items():
+        index.replace_day(day, rows)
+    return index
+
+
+def test_incremental_totals_and_windows_match_rebuild():
+    rng = random.Random(1)
+    index, data, base = KeywordIndex(), {}, date(2026, 1, 1)
+    for step in range(300):
+        if rng.random() < 0.8:
+            # 당일 재계산과 며칠 전 날짜 교체가 섞이도록
+            day = base + timedelta(days=step // 3 - rng.randint(0, 2))
+            data[day] = random_rows(rng)
+            index.replace_day(day, data[day])
+        else:
+            cutoff = base + timedelta(days=step // 3 - 20)
+            index.expire_before(cutoff)
+            data = {day: rows for day, rows in data.items() if day >= cutoff}
+
+        reference = rebuilt(data)
+        assert index.totals == reference.totals
+        assert index.surfaces == reference.surfaces
+        for scope in ('market', scope_name('user', 'u1'), scope_name('field', 'B')):
+            for period_days in (3, 7):
+                assert index.rising(scope, period_days, 50, 1) == reference.rising(scope, period_days, 50, 1)
+
+
+def test_rising_growth_and_min_count():
+    index = KeywordIndex()
+    end = date(2026, 3, 10)
+    index.replace_day(end - timedelta(days=8), [(None, None, '반도체', 2)])
+    index.replace_day(end, [(None, None, '반도체', 8), (None, None, '자율주행', 2)])
+    assert index.rising('market', period_days=7, min_count=3) == [
+        {'keyword': '반도체', 'key': '반도체', 'count': 8, 'previous_count': 2, 'growth': 2.0},
+    ]
+    assert [item['key'] for item in index.rising('market', period_days=7, min_count=1)] == ['반도체', '자율주행']
+
+
+def test_display_prefers_most_common_surface():
+    index = KeywordIndex()
+    index.replace_day(date(2026, 1, 1), [(None, None, '인공지능학습', 1), (None, None, '인공지능 학습', 1)])
+    # 건수가 같으면 사전순
+    assert index.display('인공지능학습') == '인공지능 학습'
+    index.replace_day(date(2026, 1, 2), [(None, None, '인공지능학습', 1)])
+    assert index.top()[0] == {'keyword': '인공지능학습', 'key': '인공지능학습', 'count': 3}
+    index.drop_day(date(2026, 1, 2))
+    assert index.top()[0]['count'] == 2
+
+
+def test_field_keywords_and_user_scopes():
+    index = KeywordIndex()
+    index.replace_day(date(2026, 1, 1), [('u1', 'A', '반도체', 3), ('u2', None, '자율주행', 1)])
+    assert set(index.field_keywords()) == {'A', 'General'}
+    assert index.top(scope_name('user', 'u1')) == [{'keyword': '반도체', 'key': '반도체', 'count': 3}]
+
+
+def test_save_and_load_round_trip(tmp_path):
+    rng = random.Random(4)
+    index = rebuilt({date(2026, 1, 1) + timedelta(days=i): random_rows(rng) for i in range(20)})
+    path = str(tmp_path / 'keywords.json')
+    index.save(path)
+    loaded = KeywordIndex.load(path)
+    assert loaded.totals == index.totals
+    assert loaded.surfaces == index.surfaces
+    assert loaded.rising('market', 7, 50, 1) == index.rising('market', 7, 50, 1)
+
+
+def test_load_requires_daily_surfaces(tmp_path):
+    path = tmp_path / 'keywords.json'
+    path.write_text('{"daily": {"2026-01-01": {"market": {"반도체": 1}}}}', encoding='utf-8')
+    with pytest.raises(ValueError):
+        KeywordIndex.load(str(path))
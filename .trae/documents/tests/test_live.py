@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""실시간 카운터의 알림 반영, 재조정 교체와 스냅샷 가시성 (알림 흐름은 DB 필요)"""
+
+import uuid
+
+import pytest
+
+pytest.importorskip('psycopg2')
+
+from conftest import apply_migration
+from dashboard_live import (NOTIFY_RETENTION_DAYS, LiveCounters, LiveDashboardListener, parse_txid_snapshot,
+                            visible_in_snapshot)
+
+U1, U2 = str(uuid.UUID(int=1)), str(uuid.UUID(int=2))
+
+
+def notification(txid, sign, rows, source='search'):
+    return {'s': source, 'o': sign, 'x': txid, 'q': 1, 'd': rows}
+
+
+def test_parse_txid_snapshot():
+    assert parse_txid_snapshot('100:105:101,103') == (100, 105, {101, 103})
+    assert parse_txid_snapshot('100:100:') == (100, 100, set())
+
+
+@pytest.mark.parametrize('txid, visible', [
+    (99, True),    # xmin 이전에 끝남
+    (101, False),  # 스냅샷 시점에 진행 중
+    (102, True),   # xmin과 xmax 사이에 커밋됨
+    (105, False),  # 스냅샷 이후 시작
+])
+def test_visible_in_snapshot(txid, visible):
+    assert visible_in_snapshot(txid, (100, 105, {101, 103})) is visible
+
+
+def test_replace_then_apply_inserts_and_deletes():
+    counters = LiveCounters()
+    counters.replace('search', [(uuid.UUID(U1), 'AI', 3), (uuid.UUID(U1), None, 1), (None, 'AI', 2)])
+    counters.finish_reconcile(total_users=2, snapshot=(100, 100, set()))
+
+    assert counters.apply(notification(100, 1, [[U2, '바이오', 2], [U1, 'AI', 1]]))
+    assert counters.apply(notification(101, -1, [[U1, None, 1]]))
+
+    assert counters.distribution('search') == [
+        {'기술분야': 'AI', '검색수': 6, '비율(%)': 75.0},
+        {'기술분야': '바이오', '검색수': 2, '비율(%)': 25.0},
+    ]
+    # 재조정 행의 UUID와 알림의 문자열이 같은 사용자 키
+    assert counters.distribution('search', U1) == [{'기술분야': 'AI', '검색수': 4, '비율(%)': 100.0}]
+    assert counters.distribution('search', U2, limit=1)[0]['검색수'] == 2
+    assert counters.stats['applied'] == 2
+
+
+def test_deleting_last_rows_removes_keys():
+    counters = LiveCounters()
+    counters.apply(notification(1, 1, [[U1, 'AI', 2]]))
+    counters.apply(notification(2, -1, [[U1, 'AI', 2]]))
+    assert counters.distribution('search') == [] and counters.distribution('search', U1) == []
+    assert counters.summary()['total_searches'] == 0
+
+
+def test_notifications_already_in_reconcile_snapshot_are_skipped():
+    counters = LiveCounters()
+    counters.replace('report', [(U1, 'AI', 5)])
+    counters.finish_reconcile(1, parse_txid_snapshot('200:210:205'))
+
+    assert not counters.apply(notification(199, 1, [[U1, 'AI', 1]], 'report'))
+    assert not counters.apply(notification(207, 1, [[U1, 'AI', 1]], 'report'))
+    assert counters.apply(notification(205, 1, [[U1, 'AI', 1]], 'report'))  # 재조정 때 진행 중이었음
+    assert counters.apply(notification(210, 1, [[U1, 'AI', 1]], 'report'))
+    assert counters.distribution('report')[0]['리포트수'] == 7
+    assert (counters.stats['applied'], counters.stats['skipped']) == (2, 2)
+
+
+def test_replace_counts_drift_after_first_reconcile():
+    counters = LiveCounters()
+    counters.replace('search', [(U1, 'AI', 5)])
+    counters.finish_reconcile(1, (1, 1, set()))
+    assert counters.stats['drift_corrected'] == 0
+
+    counters.apply(notification(1, 1, [[U1, 'AI', 1]]))
+    counters.replace('search', [(U1, 'AI', 4), (U1, '바이오', 1)])  # 알림이 빠진 변경 2건
+    assert counters.stats['drift_corrected'] == 3
+    assert counters.distribution('search', U1)[0] == {'기술분야': 'AI', '검색수': 4, '비율(%)': 80.0}
+
+
+def test_summary_and_recent():
+    counters = LiveCounters()
+    counters.replace('search', [(U1, 'AI', 3), (U2, None, 1)])
+    counters.replace('report', [(U1, 'AI', 1)])
+    counters.finish_reconcile(2, (1, 1, set()))
+    assert counters.summary() == {
+        'total_users': 2, 'total_searches': 4, 'total_reports': 1, 'unique_search_fields': 1,
+        'unique_report_fields': 1, 'search_coverage': 75.0, 'report_coverage': 100.0,
+    }
+
+    counters.set_recent('search', [{'rank': 1}, {'rank': 2}])
+    assert counters.recent('search', 1) == [{'rank': 1}]
+    assert counters.recent('search', 3) is None  # 보관 개수보다 많으면 데이터베이스 조회
+
+
+def test_listener_rejects_retention_other_than_trigger_argument():
+    with pytest.raises(ValueError):
+        LiveDashboardListener({}, retention_days=30)
+    assert LiveDashboardListener({}).retention_days == NOTIFY_RETENTION_DAYS
+
+
+def test_listener_applies_trigger_notifications(pg_analyzer):
+    conn = pg_analyzer.conn
+    apply_migration(conn, '20261016_dashboard_live_notify.sql')
+    cursor = conn.cursor()
+    cursor.execute("INSERT INTO users (id) VALUES (%s), (%s)", (U1, U2))
+    cursor.execute("INSERT INTO search_history (user_id, keyword, technology_field) VALUES (%s, 'a', 'AI')", (U1,))
+    conn.commit()
+
+    listener = LiveDashboardListener(pg_analyzer.db_config, poll_timeout=0.5)
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr('builtins.print', lambda *args, **kwargs: None)
+        listener.connect()
+        try:
+            cursor.execute("""
+                INSERT INTO search_history (user_id, keyword, technology_field, created_at) VALUES
+                    (%s, 'b', 'AI', NOW()), (%s, 'c', NULL, NOW()),
+                    (%s, 'old', 'AI', NOW() - INTERVAL '200 days')
+            """, (U1, U2, U2))
+            cursor.execute("DELETE FROM search_history WHERE keyword = 'a'")
+            conn.commit()
+            applied = listener.poll_once(timeout=2)
+        finally:
+            listener._close_connection()
+
+    assert applied == 2  # INSERT/DELETE 문장마다 한 건 (보존 기간 밖의 행은 알리지 않음)
+    counters = listener.counters
+    assert counters.distribution('search', U1) == [{'기술분야': 'AI', '검색수': 1, '비율(%)': 100.0}]
+    assert counters.summary()['total_searches'] == 2 and counters.summary()['total_users'] == 2
+    # 알림이 온 source의 최근 목록은 다시 읽음 (보존 기간 안의 행만)
+    assert {row['keyword'] for row in counters.recent('search', 2)} == {'b', 'c'}
@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+"""분석 결과 캐시의 워터마크 무효화, 버전 재조회 간격, 키 분리"""
+
+import time
+import types
+
+import psycopg2
+import pytest
+
+import dashboard_data_analysis_test
+from dashboard_data_analysis_test import AnalysisResultCache, DashboardDataAnalyzer
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(dashboard_data_analysis_test, 'time', types.SimpleNamespace(monotonic=clock.monotonic))
+    return clock
+
+
+@pytest.fixture
+def analyzer(clock):
+    """버전 조회를 DB 대신 self.versions로 대체한 분석기"""
+    analyzer = DashboardDataAnalyzer({})
+    analyzer.enable_cache(ttl_seconds=300, watermark_interval=5)
+    analyzer.versions = {'users': (1, 0, 0, 10), 'search_history': (5, 0, 0, 11), 'ai_analysis_reports': (2, 0, 0, 12)}
+    analyzer.version_reads = 0
+
+    def read_versions(cursor):
+        analyzer.version_reads += 1
+        return dict(analyzer.versions)
+
+    analyzer._read_table_versions = read_versions
+    return analyzer
+
+
+def cached(analyzer, calls, analysis='market_search', tables=('search_history',), user_id=None, *params):
+    def fetch():
+        calls.append((analysis, user_id) + params)
+        return [('AI/머신러닝', len(calls))]
+    return analyzer._cached_query(None, analysis, tables, fetch, user_id, *params)
+
+
+def test_hit_while_versions_unchanged(analyzer):
+    calls = []
+    first = cached(analyzer, calls)
+    first.append('caller mutation')
+    assert cached(analyzer, calls) == [('AI/머신러닝', 1)]
+    assert len(calls) == 1
+    assert analyzer.cache.stats()['hits'] == 1
+
+
+def test_miss_after_version_bump_of_dependent_table_only(analyzer, clock):
+    calls = []
+    cached(analyzer, calls)
+    analyzer.versions['ai_analysis_reports'] = (3, 0, 0, 12)
+    clock.now += 6
+    cached(analyzer, calls)
+    assert len(calls) == 1  # 다른 테이블 변경은 무효화하지 않음
+
+    analyzer.versions['search_history'] = (5, 1, 0, 11)
+    clock.now += 6
+    assert cached(analyzer, calls) == [('AI/머신러닝', 2)]
+    assert analyzer.cache.stats()['invalidations'] == 1
+
+
+def test_versions_are_reread_only_after_interval(analyzer, clock):
+    calls = []
+    cached(analyzer, calls)
+    analyzer.versions['search_history'] = (6, 0, 0, 11)
+
+    clock.now += 4
+    cached(analyzer, calls)
+    assert (len(calls), analyzer.version_reads) == (1, 1)  # 간격 안에서는 이전 버전 재사용
+
+    clock.now += 2
+    cached(analyzer, calls)
+    assert (len(calls), analyzer.version_reads) == (2, 2)
+
+
+def test_refresh_watermarks_drops_entries_and_rereads(analyzer):
+    calls = []
+    cached(analyzer, calls)
+    analyzer.refresh_watermarks()
+    cached(analyzer, calls)
+    assert (len(calls), analyzer.version_reads) == (2, 2)
+
+
+def test_ttl_expires_entries(analyzer, clock):
+    calls = []
+    cached(analyzer, calls)
+    clock.now += 301
+    cached(analyzer, calls)
+    assert len(calls) == 2
+    assert analyzer.cache.stats()['expirations'] == 1
+
+
+def test_keys_are_isolated_per_user_and_limit(analyzer):
+    calls = []
+    for user_id in ['u1', 'u2', 'u1']:
+        for limit in [10, 20, 10]:
+            cached(analyzer, calls, 'recent_searches', ('search_history',), user_id, limit)
+    assert calls == [
+        ('recent_searches', 'u1', 10), ('recent_searches', 'u1', 20),
+        ('recent_searches', 'u2', 10), ('recent_searches', 'u2', 20),
+    ]
+
+
+def test_retention_and_rollup_mode_are_part_of_the_key(analyzer):
+    calls = []
+    cached(analyzer, calls)
+    analyzer.retention_days = 30
+    cached(analyzer, calls)
+    analyzer.use_rollups = True
+    cached(analyzer, calls)
+    assert len(calls) == 3
+
+
+def test_lru_eviction(clock):
+    cache = AnalysisResultCache(max_entries=2)
+    for key in ['a', 'b']:
+        cache.put((key,), (), key)
+    cache.get(('a',), ())
+    cache.put(('c',), (), 'c')
+    assert cache.get(('b',), ()) is None
+    assert cache.get(('a',), ()) == 'a'
+    assert cache.stats()['evictions'] == 1
+
+
+def read_versions(analyzer):
+    versions = analyzer._read_table_versions(analyzer.conn.cursor())
+    analyzer.conn.commit()  # 다음 TRUNCATE가 기다리지 않도록 읽기 트랜잭션 종료
+    return versions
+
+
+def read_until_changed(analyzer, table: str, before, timeout: float = 15.0):
+    """다른 연결의 통계가 반영될 때까지 버전을 다시 읽음"""
+    deadline = time.monotonic() + timeout
+    while True:
+        versions = read_versions(analyzer)
+        if versions[table] != before or time.monotonic() > deadline:
+            return versions
+        time.sleep(0.1)
+
+
+def test_versions_follow_other_connections_without_locking(pg_analyzer):
+    versions = read_versions(pg_analyzer)
+    assert set(versions) == set(DashboardDataAnalyzer.WATERMARK_TABLES)
+
+    writer = psycopg2.connect(**pg_analyzer.db_config)
+    try:
+        cursor = writer.cursor()
+        # 새 행은 최신 created_at으로 커밋 즉시 반영
+        cursor.execute("INSERT INTO search_history (keyword) VALUES ('인공지능')")
+        writer.commit()
+        after_insert = read_versions(pg_analyzer)
+        assert after_insert['search_history'][4] != versions['search_history'][4]
+        assert after_insert['users'] == versions['users']
+
+        # 수정은 통계로 반영 (테스트에서는 쓰기 연결이 통계를 바로 내보내도록 함)
+        cursor.execute("UPDATE search_history SET technology_field = 'AI/머신러닝'")
+        cursor.execute("SELECT pg_stat_force_next_flush()")
+        writer.commit()
+        after_update = read_until_changed(pg_analyzer, 'search_history', after_insert['search_history'])
+        assert after_update['search_history'][1] == after_insert['search_history'][1] + 1
+
+        cursor.execute("TRUNCATE search_history")
+        writer.commit()
+        assert read_versions(pg_analyzer)['search_history'][3] != after_update['search_history'][3]
+    finally:
+        writer.close()
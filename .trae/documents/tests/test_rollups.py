@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""롤업 기반 분포가 수정/삭제/과거 날짜 삽입 뒤에도 원본 쿼리와 같은지 확인 (PostgreSQL 15 이상 필요)"""
+
+import pytest
+
+from conftest import apply_migration
+
+FIELDS = ['AI/머신러닝', '반도체/전자', '교통/자동차', None]
+
+
+def distributions(analyzer, user_id: str, use_rollups: bool):
+    """analyze_* 4개 결과를 순서와 무관하게 비교할 수 있는 형태로 반환"""
+    analyzer.use_rollups = use_rollups
+    frames = [
+        analyzer.analyze_user_search_technology_fields(user_id),
+        analyzer.analyze_market_search_technology_fields(),
+        analyzer.analyze_user_report_technology_fields(user_id),
+        analyzer.analyze_market_report_technology_fields(),
+    ]
+    return [sorted(map(tuple, df.values.tolist())) for df in frames]
+
+
+def assert_rollups_match_raw(analyzer, user_id: str):
+    raw = distributions(analyzer, user_id, use_rollups=False)
+    assert all(raw)
+    assert distributions(analyzer, user_id, use_rollups=True) == raw
+
+
+@pytest.fixture
+def seeded(pg_analyzer):
+    conn = pg_analyzer.conn
+    apply_migration(conn, '20261016_dashboard_field_daily_rollup.sql')
+    apply_migration(conn, '20261017_dashboard_rollup_dirty_days.sql')
+
+    cursor = conn.cursor()
+    users = []
+    for name in ('u1', 'u2', 'u3'):
+        cursor.execute("INSERT INTO users (email, name) VALUES (%s, %s) RETURNING id", (f'{name}@example.com', name))
+        users.append(str(cursor.fetchone()[0]))
+    # 오늘(원본 구간)을 포함한 최근 30일에 사용자/분야를 돌려가며 배치
+    cursor.execute("""
+        INSERT INTO search_history (user_id, keyword, technology_field, created_at)
+        SELECT
+            (%(users)s::uuid[])[1 + g %% 3],
+            '검색어' || g,
+            (%(fields)s::text[])[1 + g %% 4],
+            NOW() - make_interval(days => g %% 30, hours => g %% 7)
+        FROM generate_series(1, 300) g
+    """, {'users': users, 'fields': FIELDS})
+    cursor.execute("""
+        INSERT INTO ai_analysis_reports (user_id, application_number, invention_title, technology_field, created_at)
+        SELECT
+            (%(users)s::uuid[])[1 + g %% 2],
+            '10202' || g,
+            '발명' || g,
+            (%(fields)s::text[])[1 + g %% 3],
+            NOW() - make_interval(days => g %% 20, hours => g %% 5)
+        FROM generate_series(1, 120) g
+    """, {'users': users, 'fields': FIELDS})
+    conn.commit()
+
+    assert set(pg_analyzer.refresh_rollups()) == {'search', 'report'}
+    return pg_analyzer, users[0]
+
+
+def test_rollups_match_raw_queries_after_initial_build(seeded):
+    analyzer, user_id = seeded
+    assert_rollups_match_raw(analyzer, user_id)
+
+
+def test_rollups_follow_updates_deletes_and_backdated_inserts(seeded):
+    analyzer, user_id = seeded
+    cursor = analyzer.conn.cursor()
+    # 이미 집계된 날짜의 행 분류 변경, 일부 삭제, 과거 날짜로 새 행 삽입
+    cursor.execute("""
+        UPDATE search_history SET technology_field = '블록체인/핀테크'
+        WHERE created_at < NOW() - INTERVAL '10 days' AND technology_field = 'AI/머신러닝'
+    """)
+    cursor.execute("DELETE FROM search_history WHERE created_at < NOW() - INTERVAL '25 days'")
+    cursor.execute("DELETE FROM ai_analysis_reports WHERE technology_field IS NULL AND user_id = %s", (user_id,))
+    cursor.execute("""
+        INSERT INTO search_history (user_id, keyword, technology_field, created_at)
+        SELECT %s, '과거 날짜로 삽입' || g, '반도체/전자', NOW() - INTERVAL '12 days'
+        FROM generate_series(1, 5) g
+    """, (user_id,))
+    cursor.execute("""
+        INSERT INTO ai_analysis_reports (user_id, application_number, invention_title, technology_field, created_at)
+        VALUES (%s, '1020999', '과거 날짜 리포트', 'IoT', NOW() - INTERVAL '3 days')
+    """, (user_id,))
+    analyzer.conn.commit()
+
+    cursor.execute("SELECT COUNT(*) FROM dashboard_rollup_dirty_days")
+    assert cursor.fetchone()[0] > 0
+    assert distributions(analyzer, user_id, use_rollups=True) != distributions(analyzer, user_id, use_rollups=False)
+
+    analyzer.refresh_rollups()
+
+    cursor.execute("SELECT COUNT(*) FROM dashboard_rollup_dirty_days")
+    assert cursor.fetchone()[0] == 0
+    assert_rollups_match_raw(analyzer, user_id)
+
+
+def test_rebuild_matches_raw_queries(seeded):
+    analyzer, user_id = seeded
+    analyzer.conn.cursor().execute("UPDATE search_history SET technology_field = NULL WHERE keyword LIKE '검색어1%'")
+    analyzer.conn.commit()
+    analyzer.refresh_rollups(rebuild=True)
+    assert_rollups_match_raw(analyzer, user_id)
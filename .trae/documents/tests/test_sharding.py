@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+"""샤드 결과 병합, 사용자 요약과 샤드 실패 처리 (합성 샤드 결과 사용, 샤드 쿼리는 DB 필요)"""
+
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+import dashboard_sharding
+from dashboard_sharding import ShardedUserAnalysisRunner, ShardFailure, _user_summaries
+
+SOURCES = ('search', 'report')
+
+
+def distribution(rows, count_column):
+    return pd.DataFrame(rows, columns=['user_id', '기술분야', count_column, '비율(%)'])
+
+
+def shard_result(index, searches, reports, market):
+    """_analyze_shard와 같은 형식의 샤드 결과"""
+    distributions = {'search': distribution(searches, '검색수'), 'report': distribution(reports, '리포트수')}
+    summaries = _user_summaries(distributions)
+    return {
+        'index': index,
+        'distributions': distributions,
+        'summaries': summaries,
+        'user_count': len(summaries),
+        'market': {source: pd.Series(counts, dtype='int64') for source, counts in market.items()},
+        'seconds': 0.1,
+        'pid': 1,
+        'attempts': 1,
+    }
+
+
+SHARD_0 = shard_result(
+    0,
+    [('u3', 'AI', 3, 75.0), ('u3', 'General', 1, 25.0)],
+    [('u3', 'AI', 1, 100.0)],
+    {'search': {'AI': 3, 'General': 2}, 'report': {'AI': 1}},  # General 1건은 user_id 없는 행
+)
+SHARD_1 = shard_result(
+    1,
+    [('u1', '바이오', 2, 100.0), ('u2', 'AI', 1, 100.0)],
+    [],
+    {'search': {'바이오': 2, 'AI': 1}, 'report': {}},
+)
+
+
+def test_user_summaries():
+    summary = _user_summaries({
+        'search': distribution([('u1', 'AI', 3, 75.0), ('u1', '바이오', 1, 25.0), ('u2', '바이오', 2, 100.0)],
+                               '검색수'),
+        'report': distribution([('u1', '바이오', 1, 100.0), ('u3', 'AI', 2, 100.0)], '리포트수'),
+    })
+    assert list(summary.columns) == dashboard_sharding.SUMMARY_COLUMNS
+    assert summary.loc['u1'].tolist() == [4, 1, 25.0, 'AI', '바이오']
+    assert summary.loc['u2', 'reports'] == 0 and pd.isna(summary.loc['u2', 'top_report_field'])
+    # 검색 없이 리포트만 있는 사용자는 전환율 NaN
+    assert summary.loc['u3', 'searches'] == 0 and pd.isna(summary.loc['u3', 'conversion_rate'])
+
+
+def test_user_summaries_without_rows():
+    summary = _user_summaries({'search': distribution([], '검색수')})
+    assert summary.empty and list(summary.columns) == dashboard_sharding.SUMMARY_COLUMNS
+
+
+def test_merge_is_independent_of_completion_order():
+    runner = ShardedUserAnalysisRunner({}, workers=1, shards=2)
+    merged = runner.merge([SHARD_0, SHARD_1], SOURCES)
+    reversed_merge = runner.merge([SHARD_1, SHARD_0], SOURCES)
+
+    assert list(merged['summaries'].index) == ['u1', 'u2', 'u3']
+    pd.testing.assert_frame_equal(merged['summaries'], reversed_merge['summaries'])
+    assert merged['distributions']['search']['user_id'].tolist() == ['u1', 'u2', 'u3', 'u3']
+
+    search = merged['market']['search']
+    assert search.values.tolist() == [['AI', 4, 50.0], ['General', 2, 25.0], ['바이오', 2, 25.0]]
+    assert merged['market']['report'].values.tolist() == [['AI', 1, 100.0]]
+    assert [shard['index'] for shard in merged['shards']] == [0, 1]
+
+
+def test_merge_without_results():
+    merged = ShardedUserAnalysisRunner({}, workers=1, shards=2).merge([], SOURCES)
+    market = merged['market']['search']
+    assert merged['summaries'].empty
+    assert market.empty and list(market.columns) == ['기술분야', '검색수', '비율(%)']
+
+
+@pytest.fixture
+def fake_shards(monkeypatch):
+    """프로세스 풀 대신 스레드 풀, _analyze_shard 대신 합성 결과 (shard -> 남은 실패 횟수)"""
+    failures = {}
+    calls = []
+
+    def analyze(index, shard, sources):
+        calls.append(index)
+        if failures.get(index, 0):
+            failures[index] -= 1
+            raise ConnectionError(f"shard {index} down")
+        result = dict([SHARD_0, SHARD_1][index])
+        del result['attempts']
+        return result
+
+    monkeypatch.setattr(dashboard_sharding, 'ProcessPoolExecutor', ThreadPoolExecutor)
+    monkeypatch.setattr(dashboard_sharding, '_analyze_shard', analyze)
+    return failures, calls
+
+
+def test_failed_shard_is_retried(fake_shards):
+    failures, calls = fake_shards
+    failures[1] = 2
+    merged = ShardedUserAnalysisRunner({}, workers=2, shards=2, retries=2).run(SOURCES)
+
+    assert merged['complete'] and merged['failed'] == {}
+    assert sorted(calls) == [0, 1, 1, 1]
+    assert [shard['attempts'] for shard in merged['shards']] == [1, 3]
+    assert list(merged['summaries'].index) == ['u1', 'u2', 'u3']
+
+
+def test_shard_failure_after_retries(fake_shards):
+    failures, _ = fake_shards
+    failures[1] = 5
+    runner = ShardedUserAnalysisRunner({}, workers=2, shards=2, retries=1)
+    with pytest.raises(ShardFailure) as excinfo:
+        runner.run(SOURCES)
+    assert list(excinfo.value.failed) == [1]
+
+    failures[1] = 5
+    partial = runner.run(SOURCES, allow_partial=True)
+    assert not partial['complete'] and list(partial['failed']) == [1]
+    assert list(partial['summaries'].index) == ['u3']
+    assert partial['market']['search']['검색수'].tolist() == [3, 2]
+
+
+def test_analyze_shard_matches_unsharded_query(pg_analyzer, monkeypatch):
+    cursor = pg_analyzer.conn.cursor()
+    users = [str(uuid.UUID(int=i)) for i in range(1, 13)]
+    cursor.execute("INSERT INTO users (id) SELECT unnest(%s::uuid[])", (users,))
+    for i, user_id in enumerate(users):
+        cursor.execute("""
+            INSERT INTO search_history (user_id, keyword, technology_field)
+            SELECT %s, 'k', (ARRAY['AI', '바이오', NULL, 'General'])[1 + (n + %s) %% 4]
+            FROM generate_series(1, %s) n
+        """, (user_id, i, i + 1))
+        cursor.execute("INSERT INTO ai_analysis_reports (user_id, application_number, invention_title, "
+                       "technology_field) VALUES (%s, '1', 't', 'AI')", (user_id,))
+    cursor.execute("INSERT INTO search_history (user_id, keyword, technology_field) "
+                   "VALUES (NULL, 'k', NULL), (NULL, 'k', '바이오')")
+    pg_analyzer.conn.commit()
+    monkeypatch.setattr(dashboard_sharding, '_worker_analyzer', pg_analyzer)
+
+    runner = ShardedUserAnalysisRunner({}, workers=1, shards=3)
+    results = []
+    for index, shard in enumerate(runner.shards):
+        result = dashboard_sharding._analyze_shard(index, shard, SOURCES)
+        result['attempts'] = 1
+        results.append(result)
+    merged = runner.merge(results, SOURCES)
+
+    expected = pg_analyzer.users_field_distribution_frame('search').dropna(subset=['user_id'])
+    actual = merged['distributions']['search']
+    assert sorted(map(tuple, actual.values.tolist())) == sorted(map(tuple, expected.values.tolist()))
+    assert list(merged['summaries'].index) == sorted(users)
+
+    market = pg_analyzer.field_distribution_frame('search')
+    expected_market = market.groupby('기술분야')['검색수'].sum().sort_index()
+    actual_market = merged['market']['search'].set_index('기술분야')['검색수'].sort_index()
+    assert actual_market.to_dict() == expected_market.to_dict()
+    assert actual_market.sum() == sum(range(1, 13)) + 2
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""사용자 대 시장 발산 점수와 유사 사용자 (희소 행렬 계산을 밀집 계산과 비교)"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard_similarity import FieldMatrix, divergence_scores, score_summary, similar_users
+
+
+def long_frame(counts: dict) -> pd.DataFrame:
+    return pd.DataFrame([(user_id, field, count) for user_id, fields in counts.items()
+                         for field, count in fields.items()], columns=['user_id', '기술분야', '건수'])
+
+
+def random_matrix(seed: int = 0, n_users: int = 40, n_fields: int = 8) -> FieldMatrix:
+    rng = np.random.default_rng(seed)
+    counts = {}
+    for user in range(n_users):
+        fields = rng.choice(n_fields, size=rng.integers(1, n_fields + 1), replace=False)
+        counts[f'user-{user:03d}'] = {f'field-{field}': int(rng.integers(1, 50)) for field in fields}
+    return FieldMatrix.from_frame(long_frame(counts), '건수')
+
+
+def dense(matrix: FieldMatrix) -> np.ndarray:
+    values = np.zeros((matrix.n_users, matrix.n_fields))
+    values[matrix.row_ids(), matrix.indices] = matrix.data
+    return values
+
+
+def kl_bits(p: np.ndarray, q: np.ndarray) -> float:
+    mask = p > 0
+    return float(np.sum(p[mask] * np.log2(p[mask] / q[mask])))
+
+
+def test_from_frame_merges_duplicate_cells():
+    df = pd.DataFrame({'user_id': ['b', 'a', 'a', 'a'], '기술분야': ['X', 'General', 'General', 'Y'],
+                       '건수': [1, 2, 3, 4]})
+    matrix = FieldMatrix.from_frame(df, '건수')
+    assert list(matrix.user_ids) == ['a', 'b']
+    assert list(matrix.fields) == ['General', 'X', 'Y']
+    assert dense(matrix).tolist() == [[5, 0, 4], [0, 1, 0]]
+    assert matrix.row_totals().tolist() == [9, 1]
+    assert matrix.market().tolist() == pytest.approx([0.5, 0.1, 0.4])
+
+
+def test_divergence_scores_match_dense_formulas():
+    matrix = random_matrix()
+    scores = divergence_scores(matrix).set_index('user_id')
+    counts = dense(matrix)
+    q = counts.sum(axis=0) / counts.sum()
+    for row, user_id in enumerate(matrix.user_ids):
+        p = counts[row] / counts[row].sum()
+        m = (p + q) / 2
+        js = 0.5 * kl_bits(p, m) + 0.5 * kl_bits(q, m)
+        cosine = p @ q / (np.linalg.norm(p) * np.linalg.norm(q))
+        top = int(np.argmax(p))
+        score = scores.loc[user_id]
+        assert score['KL'] == pytest.approx(kl_bits(p, q), abs=1e-4)
+        assert score['JS'] == pytest.approx(js, abs=1e-4)
+        assert score['시장코사인'] == pytest.approx(cosine, abs=1e-4)
+        assert score['특화점수'] == pytest.approx(js * 100, abs=0.05)
+        assert score['활동수'] == counts[row].sum()
+        assert score['분야수'] == np.count_nonzero(counts[row])
+        assert score['주력분야비율(%)'] == pytest.approx(p[top] * 100, abs=0.005)
+        assert score['리프트'] == pytest.approx(p[top] / q[top], abs=0.005)
+
+
+def test_divergence_matches_market_for_identical_distributions():
+    matrix = FieldMatrix.from_frame(long_frame({'same': {'A': 2, 'B': 2}, 'twin': {'A': 1, 'B': 1}}), '건수')
+    scores = divergence_scores(matrix)
+    assert scores['JS'].tolist() == [0.0, 0.0]
+    assert scores['KL'].tolist() == [0.0, 0.0]
+    assert scores['시장코사인'].tolist() == [1.0, 1.0]
+
+
+@pytest.mark.filterwarnings('ignore:divide by zero:RuntimeWarning')
+def test_divergence_against_disjoint_market():
+    # 시장과 겹치는 분야가 없으면 JS = 1 (특화점수 100), 시장 비율이 0인 주력분야의 리프트는 무한대
+    matrix = FieldMatrix.from_frame(long_frame({'u': {'A': 3}, 'v': {'B': 1}}), '건수')
+    scores = divergence_scores(matrix, market=[0.0, 1.0]).set_index('user_id')
+    assert scores.loc['u', 'JS'] == 1.0
+    assert scores.loc['u', '특화점수'] == 100.0
+    assert scores.loc['u', '리프트'] == np.inf
+    assert scores.loc['v', 'JS'] == 0.0
+
+
+def test_divergence_sorted_by_specialization():
+    scores = divergence_scores(random_matrix(seed=5))
+    values = scores['특화점수'].tolist()
+    assert values == sorted(values, reverse=True)
+
+
+def test_empty_matrix():
+    matrix = FieldMatrix.from_frame(long_frame({}).astype({'건수': 'int64'}), '건수')
+    assert divergence_scores(matrix).empty
+    assert similar_users(matrix).empty
+    assert score_summary(divergence_scores(matrix)) == {'users': 0, 'mean': 0.0, 'median': 0.0, 'p90': 0.0}
+
+
+def test_similar_users_ranks_by_cosine():
+    matrix = FieldMatrix.from_frame(long_frame({
+        'a': {'X': 1}, 'b': {'X': 2}, 'c': {'Y': 1}, 'd': {'X': 1, 'Y': 1},
+    }), '건수')
+    result = similar_users(matrix, ['a', 'missing'], n=2)
+    assert result['유사사용자'].tolist() == ['b', 'd']
+    assert result['유사도'].tolist() == [1.0, pytest.approx(0.7071, abs=1e-4)]
+    assert result['순위'].tolist() == [1, 2]
+
+
+def test_similar_users_blocks_match_single_block():
+    matrix = random_matrix(seed=9, n_users=60)
+    whole = similar_users(matrix, n=5)
+    blocked = similar_users(matrix, n=5, memory_limit=60 * 4 * 7)  # 질의 7명씩
+    pd.testing.assert_frame_equal(whole, blocked)
+
+    counts = dense(matrix)
+    unit = counts / np.linalg.norm(counts, axis=1, keepdims=True)
+    sims = unit @ unit.T
+    np.fill_diagonal(sims, -np.inf)
+    expected = np.sort(sims, axis=1)[:, ::-1][:, :5].ravel()
+    assert whole['유사도'].to_numpy() == pytest.approx(expected, abs=1e-4)
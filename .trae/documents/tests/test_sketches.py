@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""근사 분석 스케치 (HyperLogLog, CountMinSketch, SpaceSaving, DailySketch)"""
+
+import random
+from collections import Counter
+from datetime import date
+
+import numpy as np
+import pytest
+
+from conftest import FakeCursor
+from dashboard_data_analysis_test import DashboardDataAnalyzer
+from dashboard_sketches import CountMinSketch, DailySketch, HyperLogLog, SpaceSaving, hash64
+
+
+def zipf_stream(n_items: int, n_events: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(n_items)]
+    return rng.choices([f"kw{i}" for i in range(n_items)], weights=weights, k=n_events)
+
+
+def test_hash64_is_stable_and_seeded():
+    assert hash64('인공지능') == hash64('인공지능')
+    assert hash64('인공지능', seed=1) != hash64('인공지능', seed=2)
+    assert 0 <= hash64('x') < 2 ** 64
+
+
+@pytest.mark.parametrize('distinct', [50, 2000, 50000])
+def test_hyperloglog_estimate_within_error(distinct):
+    hll = HyperLogLog(precision=12)
+    for i in range(distinct):
+        hll.add(f"user-{i}")
+    # 표준 오차의 3배 안
+    assert abs(hll.estimate() - distinct) <= 3 * hll.relative_error * distinct + 1
+
+
+def test_hyperloglog_merge_equals_union():
+    left, right, union = HyperLogLog(10), HyperLogLog(10), HyperLogLog(10)
+    for i in range(3000):
+        (left if i % 2 else right).add(str(i))
+        union.add(str(i))
+    left.merge(right)
+    assert np.array_equal(left.registers, union.registers)
+    assert left.estimate() == union.estimate()
+
+
+def test_hyperloglog_rejects_different_precision():
+    with pytest.raises(ValueError):
+        HyperLogLog(10).merge(HyperLogLog(12))
+
+
+def test_count_min_never_underestimates():
+    stream = zipf_stream(500, 20000)
+    truth = Counter(stream)
+    sketch = CountMinSketch(epsilon=0.01, delta=0.01)
+    for value in stream:
+        sketch.add(value)
+    assert sketch.total == len(stream)
+    over = [sketch.estimate(value) - count for value, count in truth.items()]
+    assert min(over) >= 0
+    # 1 - delta 확률 보장이므로 대부분의 항목이 오차 범위 안
+    assert sum(error <= sketch.error_bound for error in over) >= 0.95 * len(over)
+
+
+def test_count_min_merge_adds_tables():
+    left, right = CountMinSketch(0.01, 0.05), CountMinSketch(0.01, 0.05)
+    left.add('a', 3)
+    right.add('a', 4)
+    right.add('b', 2)
+    left.merge(right)
+    assert left.total == 9
+    assert left.estimate('a') >= 7 and left.estimate('b') >= 2
+
+
+def test_count_min_upcasts_on_int32_overflow():
+    sketch = CountMinSketch(0.1, 0.1)
+    assert sketch.table.dtype == np.int32
+    sketch.add('big', 2 ** 31)
+    sketch.add('big', 5)
+    assert sketch.table.dtype == np.int64
+    assert sketch.estimate('big') == 2 ** 31 + 5
+
+    merged = CountMinSketch(0.1, 0.1)
+    merged.add('big', 2 ** 31 - 1)
+    other = CountMinSketch(0.1, 0.1)
+    other.add('big', 1)
+    merged.merge(other)
+    assert merged.estimate('big') == 2 ** 31
+
+
+def test_count_min_rejects_different_shape():
+    with pytest.raises(ValueError):
+        CountMinSketch(0.01).merge(CountMinSketch(0.02))
+
+
+def check_space_saving_bounds(sketch: SpaceSaving, truth: Counter):
+    for value, (count, error) in sketch.counters.items():
+        assert count - error <= truth[value] <= count
+    # 전체의 1/capacity보다 많이 나온 항목은 반드시 추적됨
+    threshold = sum(truth.values()) / sketch.capacity
+    for value, count in truth.items():
+        if count > threshold:
+            assert value in sketch.counters
+
+
+def test_space_saving_bounds_and_heavy_hitters():
+    stream = zipf_stream(2000, 30000)
+    truth = Counter(stream)
+    sketch = SpaceSaving(capacity=50)
+    for value in stream:
+        sketch.add(value)
+    assert len(sketch.counters) == 50
+    check_space_saving_bounds(sketch, truth)
+    assert [value for value, _, _ in sketch.top(3)] == [value for value, _ in truth.most_common(3)]
+
+
+def test_space_saving_weighted_adds():
+    sketch = SpaceSaving(capacity=2)
+    sketch.add('a', 5)
+    sketch.add('b', 1)
+    sketch.add('c', 2)  # 가장 작은 b(1)를 교체 -> c: count 3, error 1
+    assert sketch.top() == [('a', 5, 0), ('c', 3, 1)]
+
+
+def test_space_saving_merge_keeps_bounds():
+    stream = zipf_stream(1000, 20000, seed=3)
+    truth = Counter(stream)
+    left, right = SpaceSaving(40), SpaceSaving(40)
+    for i, value in enumerate(stream):
+        (left if i % 3 else right).add(value)
+    left.merge(right)
+    assert len(left.counters) <= 40
+    check_space_saving_bounds(left, truth)
+    # 병합 후에도 힙이 카운터와 맞아야 이어서 add할 수 있음
+    left.add('new-item', 1)
+    assert 'new-item' in left.counters
+
+
+def test_daily_sketch_merge_and_summary():
+    days = []
+    for day in range(3):
+        sketch = DailySketch(precision=10, capacity=20)
+        for user in range(day * 10, day * 10 + 20):
+            sketch.add_user(f"u{user}")
+        sketch.add_field('반도체/전자', 10 + day)
+        sketch.add_field('AI/머신러닝', 5)
+        sketch.add_keyword('배터리', 4)
+        sketch.total = 15 + day
+        days.append(sketch)
+
+    merged = DailySketch(precision=10, capacity=20)
+    for sketch in days:
+        merged.merge(sketch)
+    summary = merged.summary(top_n=2)
+    assert summary['total'] == 48
+    assert abs(summary['distinct_users']['estimate'] - 40) <= 3
+    assert summary['top_fields'][0]['value'] == '반도체/전자'
+    assert summary['top_fields'][0]['count'] == 33
+    assert summary['top_fields'][0]['lower_bound'] == 33
+    assert summary['top_keywords'] == [{'value': '배터리', 'count': 12, 'lower_bound': 12}]
+    assert summary['confidence'] == pytest.approx(0.99)
+
+
+def test_incremental_start_day_drops_expired_and_reread_days():
+    sketches = {date(2026, 7, 8): 'expired', date(2026, 7, 10): 'kept', date(2026, 10, 16): 'partial'}
+    cursor = FakeCursor([(date(2026, 7, 9),)])
+    start_day = DashboardDataAnalyzer({})._incremental_start_day(cursor, list(sketches), sketches.pop)
+
+    assert start_day == date(2026, 10, 16)
+    assert sketches == {date(2026, 7, 10): 'kept'}
+    assert cursor.executed[0][1] == (100,)
+
+
+def test_incremental_start_day_without_days_starts_at_cutoff():
+    cursor = FakeCursor([(date(2026, 7, 9),)])
+    assert DashboardDataAnalyzer({})._incremental_start_day(cursor, [], None) == date(2026, 7, 9)
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""스냅샷 벡터 연산 커널 (export_snapshot과 같은 형식의 합성 스냅샷 디렉터리 사용)"""
+
+import json
+import os
+from collections import Counter
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard_snapshot import (MICROSECONDS_PER_DAY, SNAPSHOT_SOURCES, SNAPSHOT_VERSION, AnalyzerSnapshot,
+                                _encode, _encode_ipc, _percentages)
+
+
+EXPORTED_AT_US = 1_790_000_000 * 1_000_000
+USERS = ['u-a', 'u-b', 'u-c']
+
+# (경과 일수, user_id, 기술 분야, ipc_codes, 텍스트 컬럼 값)
+SEARCH_ROWS = [
+    (120, 'u-a', 'AI/머신러닝', ['G06N3/08'], '만료됨'),
+    (60, 'u-a', 'AI/머신러닝', ['G06N3/08', 'G06F16/00'], '인공지능'),
+    (30, 'u-b', None, [], '검색'),
+    (20, 'u-b', 'General', ['H01M10/052'], '배터리'),
+    (10, 'u-a', '반도체/전자', ['H01L21/00'], '반도체'),
+    (5, 'u-c', 'AI/머신러닝', ['G06N3/08'], '학습'),
+    (1, 'u-b', 'AI/머신러닝', ['G06N3/04', 'G06N3/08'], '신경망'),
+    (0.5, 'u-x', '반도체/전자', [], '탈퇴 사용자'),
+]
+REPORT_ROWS = [
+    (3, 'u-a', '바이오/의료', ['A61K31/00'], '리포트'),
+]
+
+
+def write_snapshot(path: str):
+    arrays, dictionaries = {}, {}
+    user_index = pd.Index(USERS)
+    rows = {'search': SEARCH_ROWS, 'report': REPORT_ROWS}
+    for source, source_rows in rows.items():
+        _, text_columns = SNAPSHOT_SOURCES[source]
+        df = pd.DataFrame(sorted(source_rows, key=lambda row: -row[0]),
+                          columns=['days_ago', 'user_id', 'technology_field', 'ipc_codes', 'text'])
+        created = EXPORTED_AT_US - (df['days_ago'] * MICROSECONDS_PER_DAY).astype(np.int64)
+        arrays[f'{source}.created_at'] = created.to_numpy(np.int64)
+        arrays[f'{source}.field'], dictionaries[f'{source}.field'] = _encode(df['technology_field'])
+        ipc = df['ipc_codes'].map(lambda codes: '\x1f'.join(codes) or None)
+        offsets, codes, dictionaries[f'{source}.ipc'] = _encode_ipc(ipc)
+        arrays[f'{source}.ipc_offsets'], arrays[f'{source}.ipc_codes'] = offsets, codes
+        for column in text_columns:
+            arrays[f'{source}.{column}'], dictionaries[f'{source}.{column}'] = _encode(df['text'])
+        user_index = user_index.append(pd.Index(df['user_id'].unique()).difference(user_index))
+        rows[source] = df
+    for source, df in rows.items():
+        arrays[f'{source}.user'] = user_index.get_indexer(df['user_id']).astype(np.int32)
+    dictionaries['users'] = list(user_index)
+
+    os.makedirs(path)
+    for name, array in arrays.items():
+        np.save(os.path.join(path, f'{name}.npy'), array)
+    with open(os.path.join(path, 'dictionaries.json'), 'w', encoding='utf-8') as f:
+        json.dump(dictionaries, f, ensure_ascii=False)
+    manifest = {'version': SNAPSHOT_VERSION, 'snapshot_id': 'test', 'exported_at_us': EXPORTED_AT_US,
+                'timezone': 'Asia/Seoul', 'retention_days': 100, 'total_users': len(USERS)}
+    with open(os.path.join(path, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+
+
+@pytest.fixture
+def snapshot(tmp_path):
+    path = str(tmp_path / 'snapshot')
+    write_snapshot(path)
+    return AnalyzerSnapshot(path)
+
+
+def in_window(days: int, rows=SEARCH_ROWS):
+    return [row for row in rows if row[0] <= days]
+
+
+def test_percentages_round_half_up_like_sql():
+    counts = np.array([1, 1, 1])
+    assert list(_percentages(counts, 3)) == [33.33, 33.33, 33.33]
+    # 1/32 = 3.125% -> ROUND(..., 2) = 3.13 (Python round는 3.12)
+    assert list(_percentages(np.array([1, 2]), 32)) == [3.13, 6.25]
+    assert list(_percentages(np.array([0, 0]), 0)) == [0.0, 0.0]
+
+
+def test_encode_ipc_csr():
+    offsets, codes, dictionary = _encode_ipc(pd.Series(['A\x1fB', None, 'B', '']))
+    assert list(offsets) == [0, 2, 2, 3, 3]
+    assert [dictionary[code] for code in codes] == ['A', 'B', 'B']
+
+
+def test_window_is_tail_slice(snapshot):
+    rows = snapshot.window('search', 100)
+    assert rows.stop - rows.start == len(in_window(100))
+    rows = snapshot.window('search', 7)
+    assert rows.stop - rows.start == len(in_window(7))
+    with pytest.raises(ValueError):
+        snapshot.window('search', 365)
+
+
+def test_field_distribution_matches_group_by(snapshot):
+    rows = snapshot.field_distribution_rows('search', 100)
+    # NULL과 'General'은 GROUP BY technology_field처럼 별도 행 (둘 다 'General'로 표시)
+    expected = Counter(row[2] for row in in_window(100))
+    assert sorted((field, count) for field, count, _ in rows) == sorted(
+        (field or 'General', count) for field, count in expected.items())
+    assert [count for _, count, _ in rows] == sorted([count for _, count, _ in rows], reverse=True)
+    assert sum(percentage for _, _, percentage in rows) == pytest.approx(100, abs=0.05)
+
+
+def test_field_distribution_for_user_and_unknown_user(snapshot):
+    rows = snapshot.field_distribution_rows('search', 100, user_id='u-b')
+    assert sorted(rows) == [('AI/머신러닝', 1, 33.33), ('General', 1, 33.33), ('General', 1, 33.33)]
+    assert snapshot.field_distribution_rows('search', 100, user_id='nobody') == []
+
+
+def test_users_field_frame_counts_and_order(snapshot):
+    df = snapshot.users_field_frame('search', 100)
+    expected = Counter((row[1], row[2] or 'General') for row in in_window(100))
+    got = Counter()
+    for user_id, field, count in df.itertuples(index=False):
+        got[(user_id, field)] += count
+    assert got == expected
+    assert list(df['user_id']) == sorted(df['user_id'])
+
+    selected = snapshot.users_field_frame('search', 100, user_ids=['u-c', 'nobody'])
+    assert selected.to_dict('records') == [{'user_id': 'u-c', 'field': 'AI/머신러닝', 'field_count': 1}]
+
+
+def test_iter_user_distributions_percentages(snapshot):
+    distributions = dict(snapshot.iter_user_distributions('search', 100))
+    assert set(distributions) == {'u-a', 'u-b', 'u-c', 'u-x'}
+    assert distributions['u-a']['percentage'].tolist() == [50.0, 50.0]
+    assert distributions['u-c']['percentage'].tolist() == [100.0]
+
+
+def test_ipc_code_counts(snapshot):
+    counts = {code: (user, market) for code, user, market in snapshot.ipc_code_counts('search', 100, user_id='u-b')}
+    assert counts == {
+        'G06N3/08': (1, 3), 'G06F16/00': (0, 1), 'H01M10/052': (1, 1), 'H01L21/00': (0, 1), 'G06N3/04': (1, 1),
+    }
+    market_only = snapshot.ipc_code_counts('search', 7)
+    assert {code: market for code, _, market in market_only} == {'G06N3/08': 2, 'G06N3/04': 1}
+
+
+def test_recent_rows_newest_first(snapshot):
+    rows = snapshot.recent_rows('search', 100, limit=3)
+    assert [row[0] for row in rows] == ['탈퇴 사용자', '신경망', '학습']
+    assert [row[-1] for row in rows] == ['u-x', 'u-b', 'u-c']
+    created_at = rows[1][2]
+    assert created_at.tzinfo is not None
+    assert created_at == datetime.fromtimestamp((EXPORTED_AT_US - MICROSECONDS_PER_DAY) / 1e6, tz=timezone.utc)
+
+
+def test_recent_frame_fills_general_for_search(snapshot):
+    df = snapshot.recent_frame('search', 100, limit=10)
+    assert len(df) == len(in_window(100))
+    assert df.loc[df['keyword'] == '검색', 'technology_field'].tolist() == ['General']
+    assert df['created_at'].dt.tz is None
+
+
+def test_summary_stats_and_coverage(snapshot):
+    assert snapshot.summary_stats(100) == (3, len(in_window(100)), 1, 3, 1)
+    assert snapshot.field_coverage('search', 100) == (len(in_window(100)), len(in_window(100)) - 1)
+    assert snapshot.first_user_id() == 'u-a'
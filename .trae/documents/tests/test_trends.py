@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""검색/리포트 추이와 전환율 시계열 (DB 없이 일별 건수를 직접 채워 확인)"""
+
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from dashboard_data_analysis_test import DashboardDataAnalyzer
+
+MON, TUE, WED, NEXT_MON = date(2026, 10, 5), date(2026, 10, 6), date(2026, 10, 7), date(2026, 10, 12)
+
+
+class ScriptedCursor:
+    """execute 순서대로 정해 둔 결과를 돌려주는 커서"""
+
+    def __init__(self, results):
+        self.results = list(results)
+        self.executed = []
+        self.rows = []
+
+    def execute(self, query, params=None):
+        self.executed.append((query, params))
+        self.rows = self.results.pop(0)
+
+    def fetchone(self):
+        return self.rows[0]
+
+    def __iter__(self):
+        return iter(self.rows)
+
+
+class ScriptedConnection:
+    def __init__(self, cursor):
+        self.cursor_obj = cursor
+
+    def cursor(self):
+        return self.cursor_obj
+
+
+@pytest.fixture
+def analyzer():
+    analyzer = DashboardDataAnalyzer({})
+    analyzer._trend_daily = {
+        'search': {
+            MON: {('market', 'market'): 4, ('user', 'u1'): 3, ('field', 'AI'): 4},
+            WED: {('market', 'market'): 2, ('user', 'u1'): 2, ('field', 'AI'): 2},
+            NEXT_MON: {('market', 'market'): 5, ('field', 'AI'): 5},
+        },
+        'report': {
+            MON: {('market', 'market'): 1, ('user', 'u1'): 1, ('field', 'AI'): 1},
+            TUE: {('market', 'market'): 2, ('user', 'u1'): 2, ('field', '바이오'): 2},
+        },
+    }
+    return analyzer
+
+
+def test_daily_market_fills_missing_days_and_rates(analyzer):
+    df = analyzer.trend_frame('market', refresh=False)
+
+    assert list(df.columns) == ['key', 'period', 'searches', 'reports', 'conversion_rate']
+    assert list(df['period']) == list(pd.date_range(MON, NEXT_MON, freq='D'))
+    assert df['searches'].tolist()[:3] == [4, 0, 2] and df['reports'].tolist()[:3] == [1, 2, 0]
+    assert df['conversion_rate'].iloc[0] == 25.0
+    assert pd.isna(df['conversion_rate'].iloc[1])  # 검색이 없는 날은 NaN
+    assert df['conversion_rate'].iloc[2] == 0.0
+
+
+def test_weekly_sums_from_monday(analyzer):
+    df = analyzer.trend_frame('market', 'W', refresh=False)
+    assert df['period'].tolist() == [pd.Timestamp(MON), pd.Timestamp(NEXT_MON)]
+    assert df[['searches', 'reports']].values.tolist() == [[6, 3], [5, 0]]
+    assert df['conversion_rate'].tolist() == [50.0, 0.0]
+
+
+def test_scope_and_key_filters(analyzer):
+    user = analyzer.trend_frame('user', 'W', key='u1', refresh=False)
+    assert set(user['key']) == {'u1'}
+    assert user[['searches', 'reports']].values.tolist() == [[5, 3], [0, 0]]
+
+    fields = analyzer.trend_frame('field', 'W', refresh=False)
+    assert sorted(set(fields['key'])) == ['AI', '바이오']
+    biotech = fields[fields['key'] == '바이오']
+    assert biotech['reports'].tolist() == [2, 0] and biotech['conversion_rate'].isna().all()
+
+    assert analyzer.trend_frame('user', key='missing', refresh=False).empty
+
+
+def test_invalid_arguments(analyzer):
+    with pytest.raises(ValueError):
+        analyzer.trend_frame('country', refresh=False)
+    with pytest.raises(ValueError):
+        analyzer.trend_frame('market', 'M', refresh=False)
+
+
+def test_refresh_rereads_last_day_and_stores_grouping_sets():
+    analyzer = DashboardDataAnalyzer({})
+    analyzer._trend_daily = {'search': {MON: {('market', 'market'): 1}, TUE: {('market', 'market'): 1}}}
+    cursor = ScriptedCursor([
+        [(MON,)],  # 보존 기간 시작일
+        [
+            (TUE, False, False, None, None, 3),
+            (TUE, True, False, 'u1', None, 2),
+            (TUE, True, False, None, None, 1),  # user_id가 NULL인 그룹은 버림
+            (TUE, False, True, None, 'AI', 3),
+            (WED, False, False, None, None, 4),
+        ],
+    ])
+    analyzer.conn = ScriptedConnection(cursor)
+
+    assert analyzer.refresh_trends('search') == 2
+    assert cursor.executed[1][1] == (TUE,)
+    assert analyzer._trend_daily['search'] == {
+        MON: {('market', 'market'): 1},
+        TUE: {('market', 'market'): 3, ('user', 'u1'): 2, ('field', 'AI'): 3},
+        WED: {('market', 'market'): 4},
+    }
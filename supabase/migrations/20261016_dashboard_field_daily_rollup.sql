@@ -0,0 +1,31 @@
+-- 대시보드 기술 분야 일별 롤업 테이블
+-- DashboardDataAnalyzer.refresh_rollups()가 high-water mark 이후의 완료된 날짜(UTC)만
+-- 증분 집계하고, use_rollups 모드의 analyze_* 메서드가 최근 100일 버킷을 합산해 조회한다.
+-- UNIQUE NULLS NOT DISTINCT 제약을 사용하므로 PostgreSQL 15 이상이 필요하다.
+
+CREATE TABLE IF NOT EXISTS dashboard_field_daily_rollup (
+    source TEXT NOT NULL CHECK (source IN ('search', 'report')),
+    bucket_date DATE NOT NULL,
+    user_id UUID,
+    technology_field TEXT,
+    record_count BIGINT NOT NULL DEFAULT 0,
+    -- technology_field/user_id가 NULL인 행도 원본 쿼리와 같은 그룹으로 집계되도록 NULL을 같은 값으로 취급
+    -- (NULLS NOT DISTINCT는 PostgreSQL 15부터 지원)
+    CONSTRAINT dashboard_field_daily_rollup_key
+        UNIQUE NULLS NOT DISTINCT (source, bucket_date, user_id, technology_field)
+);
+
+CREATE INDEX IF NOT EXISTS idx_dashboard_field_daily_rollup_source_date
+    ON dashboard_field_daily_rollup(source, bucket_date);
+CREATE INDEX IF NOT EXISTS idx_dashboard_field_daily_rollup_user_date
+    ON dashboard_field_daily_rollup(source, user_id, bucket_date);
+
+-- source별 집계 완료 시점 (이 날짜 이전의 완료된 날짜는 롤업에 반영됨)
+CREATE TABLE IF NOT EXISTS dashboard_rollup_watermarks (
+    source TEXT PRIMARY KEY CHECK (source IN ('search', 'report')),
+    high_water_date DATE NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- 원본 구간(보존 기간 시작일, high-water mark 이후) 조회용 인덱스
+CREATE INDEX IF NOT EXISTS idx_ai_analysis_reports_created_at_desc ON ai_analysis_reports(created_at DESC);
@@ -0,0 +1,9 @@
+-- 대시보드 분석기 이력 페이지 인덱스
+-- DashboardDataAnalyzer.browse_history()가 사용자/기술 분야 필터와 함께
+-- (created_at, id) 키셋 커서로 페이지를 넘길 때 필터 컬럼 뒤에 정렬 키가 오는 복합 인덱스를 사용한다.
+-- 필터가 없는 조회는 20261016_dashboard_keyset_indexes.sql의 (created_at, id) 인덱스를 사용한다.
+
+CREATE INDEX IF NOT EXISTS idx_search_history_user_created_id ON search_history(user_id, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_search_history_field_created_id ON search_history(technology_field, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_ai_analysis_reports_user_created_id ON ai_analysis_reports(user_id, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_ai_analysis_reports_field_created_id ON ai_analysis_reports(technology_field, created_at, id);
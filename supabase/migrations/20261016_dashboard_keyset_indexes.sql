@@ -0,0 +1,7 @@
+-- 대시보드 분석기 키셋 인덱스
+-- 보존 기간 배치 정리(cleanup_old_data batch 모드)가 (created_at, id) 순서로
+-- 삭제 범위를 탐색할 수 있도록 복합 인덱스를 추가
+
+CREATE INDEX IF NOT EXISTS idx_search_history_created_id ON search_history(created_at, id);
+CREATE INDEX IF NOT EXISTS idx_ai_analysis_reports_created_id ON ai_analysis_reports(created_at, id);
+CREATE INDEX IF NOT EXISTS idx_user_activities_created_id ON user_activities(created_at, id);
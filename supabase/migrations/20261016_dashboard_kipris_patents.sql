@@ -0,0 +1,23 @@
+-- KIPRIS 검색 응답 특허 테이블
+-- dashboard_ingest.KiprisIngestor가 응답 item을 스트리밍으로 평탄화하고 IPC 코드/기술 분야를
+-- 미리 계산해 COPY로 적재한다. 행마다 정규식으로 분류하는 트리거를 두지 않는다.
+
+CREATE TABLE IF NOT EXISTS kipris_patents (
+    application_number TEXT PRIMARY KEY,
+    invention_title TEXT,
+    applicant_name TEXT,
+    abstract TEXT,
+    ipc_codes TEXT[] NOT NULL DEFAULT '{}',
+    main_ipc TEXT,
+    technology_field TEXT NOT NULL,
+    field_confidence NUMERIC(3,2),
+    application_date DATE,
+    open_date DATE,
+    register_date DATE,
+    register_status TEXT,
+    first_seen_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_kipris_patents_technology_field ON kipris_patents(technology_field);
+CREATE INDEX IF NOT EXISTS idx_kipris_patents_ipc_codes ON kipris_patents USING GIN (ipc_codes);
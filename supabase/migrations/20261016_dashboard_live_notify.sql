@@ -0,0 +1,74 @@
+-- 대시보드 실시간 카운터 변경 알림
+-- search_history/ai_analysis_reports의 INSERT/DELETE를 문장 단위 트리거에서 (user_id, technology_field)별
+-- 건수로 묶어 NOTIFY dashboard_changes로 보낸다. dashboard_live.LiveDashboardListener가 이 알림을
+-- 메모리 카운터에 증감으로 반영하므로 일괄 삭제도 행 수가 아닌 그룹 수만큼만 알린다.
+-- 카운터는 보존 기간(트리거 세 번째 인자, 100일) 안의 행만 세므로 그보다 오래된 행의
+-- 변경은 알리지 않는다. 따라서 cleanup_old_data의 만료 행 삭제는 알림을 만들지 않는다.
+-- 리스너는 이 값과 같은 dashboard_live.NOTIFY_RETENTION_DAYS 외의 보존 기간을 거부하므로,
+-- 보존 기간을 바꾸려면 아래 네 트리거의 인자와 그 상수를 함께 바꾼다.
+--
+-- 페이로드: {"s": source, "o": +1/-1, "x": txid, "q": 순번, "d": [[user_id, technology_field, 건수], ...]}
+-- - x는 리스너가 주기적 재조정 스냅샷에 이미 포함된 트랜잭션의 알림을 건너뛰는 데 쓴다.
+-- - q는 같은 트랜잭션 안의 동일한 페이로드가 NOTIFY에서 하나로 합쳐지지 않도록 붙인다.
+-- - NOTIFY 페이로드 상한(8000바이트) 아래에서 여러 알림으로 나눠 보낸다.
+
+CREATE SEQUENCE IF NOT EXISTS dashboard_notify_seq;
+
+CREATE OR REPLACE FUNCTION dashboard_notify_changes()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    header TEXT;
+    entries TEXT := '';
+    entry TEXT;
+    rec RECORD;
+BEGIN
+    FOR rec IN
+        SELECT user_id, technology_field, COUNT(*) AS row_count
+        FROM changed_rows
+        WHERE created_at >= NOW() - make_interval(days => TG_ARGV[2]::int)
+        GROUP BY user_id, technology_field
+    LOOP
+        entry := json_build_array(rec.user_id, rec.technology_field, rec.row_count)::text;
+        IF entries <> '' AND octet_length(entries) + octet_length(entry) > 7500 THEN
+            header := json_build_object('s', TG_ARGV[0], 'o', TG_ARGV[1]::int, 'x', txid_current(),
+                                        'q', nextval('dashboard_notify_seq'))::text;
+            PERFORM pg_notify('dashboard_changes', left(header, -1) || ', "d" : [' || entries || ']}');
+            entries := '';
+        END IF;
+        entries := entries || CASE WHEN entries = '' THEN '' ELSE ',' END || entry;
+    END LOOP;
+
+    IF entries <> '' THEN
+        header := json_build_object('s', TG_ARGV[0], 'o', TG_ARGV[1]::int, 'x', txid_current(),
+                                    'q', nextval('dashboard_notify_seq'))::text;
+        PERFORM pg_notify('dashboard_changes', left(header, -1) || ', "d" : [' || entries || ']}');
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS search_history_dashboard_notify_insert ON search_history;
+CREATE TRIGGER search_history_dashboard_notify_insert
+    AFTER INSERT ON search_history
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION dashboard_notify_changes('search', '1', '100');
+
+DROP TRIGGER IF EXISTS search_history_dashboard_notify_delete ON search_history;
+CREATE TRIGGER search_history_dashboard_notify_delete
+    AFTER DELETE ON search_history
+    REFERENCING OLD TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION dashboard_notify_changes('search', '-1', '100');
+
+DROP TRIGGER IF EXISTS ai_analysis_reports_dashboard_notify_insert ON ai_analysis_reports;
+CREATE TRIGGER ai_analysis_reports_dashboard_notify_insert
+    AFTER INSERT ON ai_analysis_reports
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION dashboard_notify_changes('report', '1', '100');
+
+DROP TRIGGER IF EXISTS ai_analysis_reports_dashboard_notify_delete ON ai_analysis_reports;
+CREATE TRIGGER ai_analysis_reports_dashboard_notify_delete
+    AFTER DELETE ON ai_analysis_reports
+    REFERENCING OLD TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION dashboard_notify_changes('report', '-1', '100');
@@ -0,0 +1,6 @@
+-- 대시보드 분석기 사용자 해시 인덱스
+-- 샤드 배치 분석(dashboard_sharding)이 hashtext(user_id) 구간별로
+-- 자기 샤드 사용자의 보존 기간 행만 범위 스캔하도록 표현식 인덱스를 추가
+
+CREATE INDEX IF NOT EXISTS idx_search_history_user_hash ON search_history((hashtext(user_id::text)), created_at);
+CREATE INDEX IF NOT EXISTS idx_ai_analysis_reports_user_hash ON ai_analysis_reports((hashtext(user_id::text)), created_at);
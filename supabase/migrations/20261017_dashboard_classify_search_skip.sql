@@ -0,0 +1,14 @@
+-- 분류 값이 모두 채워진 검색 기록은 자동 분류 트리거를 건너뜀
+-- trigger_classify_search_technology(20250130_final_ipc_analysis.sql)는 technology_field가 NULL일 때만 분야를,
+-- ipc_codes가 NULL이거나 비어 있을 때만 IPC 코드를 채우지만, 트리거는 모든 행에서 함수를 호출했다.
+-- WHEN 조건을 함수가 실제로 값을 채우는 경우와 같게 두어, 두 값이 모두 있는 행(dashboard_ingest.py의
+-- COPY 적재 등)에서는 함수 호출을 생략한다. 결과는 이전과 같다. 앱의 검색 기록 저장(api/search.js)은
+-- technology_field(기본값 '기타')와 ipc_codes를 항상 보내며, ipc_codes가 빈 배열이면 지금처럼 검색어에서
+-- IPC 코드를 추출한다.
+
+DROP TRIGGER IF EXISTS trigger_auto_classify_search ON search_history;
+CREATE TRIGGER trigger_auto_classify_search
+    BEFORE INSERT OR UPDATE ON search_history
+    FOR EACH ROW
+    WHEN (NEW.technology_field IS NULL OR NEW.ipc_codes IS NULL OR cardinality(NEW.ipc_codes) = 0)
+    EXECUTE FUNCTION trigger_classify_search_technology();
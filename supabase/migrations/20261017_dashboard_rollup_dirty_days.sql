@@ -0,0 +1,73 @@
+-- 대시보드 롤업 재집계 대상 날짜
+-- refresh_rollups()는 high-water mark 이후의 새 날짜만 집계하므로, 이미 집계한 날짜의 행이 나중에
+-- 수정/삭제되거나(정리 작업 포함) 과거 날짜로 삽입되면 롤업이 원본과 어긋난다. 문장 단위 트리거가
+-- 변경된 행의 완료된 날짜(UTC, 오늘 이전)를 여기에 기록하고, 다음 refresh_rollups()가 그 날짜의 버킷을
+-- 원본에서 다시 집계한 뒤 기록을 지운다. 오늘 날짜는 아직 롤업 대상이 아니므로 기록하지 않는다.
+-- TRUNCATE는 전이 테이블이 없으므로 refresh_rollups(rebuild=True)로 다시 만든다.
+
+CREATE TABLE IF NOT EXISTS dashboard_rollup_dirty_days (
+    source TEXT NOT NULL CHECK (source IN ('search', 'report')),
+    bucket_date DATE NOT NULL,
+    PRIMARY KEY (source, bucket_date)
+);
+
+CREATE OR REPLACE FUNCTION dashboard_mark_rollup_dirty()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    -- 전이 테이블은 트리거 이벤트에 따라 old_rows/new_rows 중 있는 것만 참조
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        INSERT INTO dashboard_rollup_dirty_days (source, bucket_date)
+        SELECT DISTINCT TG_ARGV[0], (created_at AT TIME ZONE 'UTC')::date
+        FROM old_rows
+        WHERE created_at < ((NOW() AT TIME ZONE 'UTC')::date::timestamp AT TIME ZONE 'UTC')
+        ON CONFLICT DO NOTHING;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO dashboard_rollup_dirty_days (source, bucket_date)
+        SELECT DISTINCT TG_ARGV[0], (created_at AT TIME ZONE 'UTC')::date
+        FROM new_rows
+        WHERE created_at < ((NOW() AT TIME ZONE 'UTC')::date::timestamp AT TIME ZONE 'UTC')
+        ON CONFLICT DO NOTHING;
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+-- 전이 테이블을 쓰는 트리거는 이벤트를 하나만 지정할 수 있으므로 이벤트별로 만든다
+DROP TRIGGER IF EXISTS search_history_rollup_dirty_insert ON search_history;
+CREATE TRIGGER search_history_rollup_dirty_insert
+    AFTER INSERT ON search_history
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION dashboard_mark_rollup_dirty('search');
+
+DROP TRIGGER IF EXISTS search_history_rollup_dirty_update ON search_history;
+CREATE TRIGGER search_history_rollup_dirty_update
+    AFTER UPDATE ON search_history
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION dashboard_mark_rollup_dirty('search');
+
+DROP TRIGGER IF EXISTS search_history_rollup_dirty_delete ON search_history;
+CREATE TRIGGER search_history_rollup_dirty_delete
+    AFTER DELETE ON search_history
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION dashboard_mark_rollup_dirty('search');
+
+DROP TRIGGER IF EXISTS ai_analysis_reports_rollup_dirty_insert ON ai_analysis_reports;
+CREATE TRIGGER ai_analysis_reports_rollup_dirty_insert
+    AFTER INSERT ON ai_analysis_reports
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION dashboard_mark_rollup_dirty('report');
+
+DROP TRIGGER IF EXISTS ai_analysis_reports_rollup_dirty_update ON ai_analysis_reports;
+CREATE TRIGGER ai_analysis_reports_rollup_dirty_update
+    AFTER UPDATE ON ai_analysis_reports
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION dashboard_mark_rollup_dirty('report');
+
+DROP TRIGGER IF EXISTS ai_analysis_reports_rollup_dirty_delete ON ai_analysis_reports;
+CREATE TRIGGER ai_analysis_reports_rollup_dirty_delete
+    AFTER DELETE ON ai_analysis_reports
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION dashboard_mark_rollup_dirty('report');